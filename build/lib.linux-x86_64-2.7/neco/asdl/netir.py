@@ -0,0 +1,890 @@
+# this file has been automatically generated running:
+# setup.py build build_ext --inplace
+# timestamp: 2026-10-18 12:04:40.060269
+
+from snakes.lang import ast
+from ast import *
+
+class _AST (ast.AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self, **ARGS):
+        ast.AST.__init__(self)
+        for k, v in ARGS.items():
+            setattr(self, k, v)
+    
+    def isAddMarking(self):
+        return False
+    
+    def isAddPid(self):
+        return False
+    
+    def isAddToken(self):
+        return False
+    
+    def isAssign(self):
+        return False
+    
+    def isBlock(self):
+        return False
+    
+    def isCheckTuple(self):
+        return False
+    
+    def isCheckType(self):
+        return False
+    
+    def isComment(self):
+        return False
+    
+    def isCompare(self):
+        return False
+    
+    def isDisableSpawns(self):
+        return False
+    
+    def isEQ(self):
+        return False
+    
+    def isExpr(self):
+        return False
+    
+    def isFlowCheck(self):
+        return False
+    
+    def isFlushIn(self):
+        return False
+    
+    def isFlushOut(self):
+        return False
+    
+    def isFunctionCall(self):
+        return False
+    
+    def isFunctionDef(self):
+        return False
+    
+    def isGuardCheck(self):
+        return False
+    
+    def isIf(self):
+        return False
+    
+    def isInit(self):
+        return False
+    
+    def isInitGeneratorPlace(self):
+        return False
+    
+    def isInitialPid(self):
+        return False
+    
+    def isIsFireable(self):
+        return False
+    
+    def isMarkingCopy(self):
+        return False
+    
+    def isMatch(self):
+        return False
+    
+    def isMultiTokenEnumeration(self):
+        return False
+    
+    def isName(self):
+        return False
+    
+    def isNode(self):
+        return False
+    
+    def isNormalizeMarking(self):
+        return False
+    
+    def isNotEmpty(self):
+        return False
+    
+    def isOperator(self):
+        return False
+    
+    def isPComponent(self):
+        return False
+    
+    def isPValue(self):
+        return False
+    
+    def isPVar(self):
+        return False
+    
+    def isPickle(self):
+        return False
+    
+    def isPrint(self):
+        return False
+    
+    def isProcedureCall(self):
+        return False
+    
+    def isPyExpr(self):
+        return False
+    
+    def isReadFlow(self):
+        return False
+    
+    def isRemAllTokens(self):
+        return False
+    
+    def isRemToken(self):
+        return False
+    
+    def isRemTuple(self):
+        return False
+    
+    def isReturn(self):
+        return False
+    
+    def isSpawnPid(self):
+        return False
+    
+    def isStmt(self):
+        return False
+    
+    def isSuccP(self):
+        return False
+    
+    def isSuccT(self):
+        return False
+    
+    def isSuccs(self):
+        return False
+    
+    def isToken(self):
+        return False
+    
+    def isTokenEnumeration(self):
+        return False
+    
+    def isTokenLookup(self):
+        return False
+    
+    def isTuple(self):
+        return False
+    
+    def isTupleOut(self):
+        return False
+    
+    def isUpdateFlow(self):
+        return False
+    
+    def isUpdateHashSet(self):
+        return False
+    
+    def isUpdateSpawns(self):
+        return False
+    
+    def isValue(self):
+        return False
+
+class PComponent (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isPComponent(self):
+        return True
+
+class Node (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isNode(self):
+        return True
+
+class Block (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isBlock(self):
+        return True
+
+class Operator (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isOperator(self):
+        return True
+
+class TokenEnumeration (Block):
+    _fields = ('arc', 'token_var', 'marking_var', 'place_name', 'body')
+    _attributes = ()
+    
+    def __init__ (self, arc, token_var, marking_var, place_name, body=[],  **ARGS):
+        Block.__init__(self, **ARGS)
+        self.arc = arc
+        self.token_var = token_var
+        self.marking_var = marking_var
+        self.place_name = place_name
+        self.body = list(body)
+    
+    def isTokenEnumeration(self):
+        return True
+
+class CheckType (Block):
+    _fields = ('variable', 'type', 'body')
+    _attributes = ()
+    
+    def __init__ (self, variable, type, body=[],  **ARGS):
+        Block.__init__(self, **ARGS)
+        self.variable = variable
+        self.type = type
+        self.body = list(body)
+    
+    def isCheckType(self):
+        return True
+
+class PVar (PComponent):
+    _fields = ('name',)
+    _attributes = ()
+    
+    def __init__ (self, name,  **ARGS):
+        PComponent.__init__(self, **ARGS)
+        self.name = name
+    
+    def isPVar(self):
+        return True
+
+class MultiTokenEnumeration (Block):
+    _fields = ('multiarc', 'marking_var', 'place_name', 'body')
+    _attributes = ()
+    
+    def __init__ (self, multiarc, marking_var, place_name, body=[],  **ARGS):
+        Block.__init__(self, **ARGS)
+        self.multiarc = multiarc
+        self.marking_var = marking_var
+        self.place_name = place_name
+        self.body = list(body)
+    
+    def isMultiTokenEnumeration(self):
+        return True
+
+class Match (Block):
+    _fields = ('tuple_info', 'body')
+    _attributes = ()
+    
+    def __init__ (self, tuple_info, body=[],  **ARGS):
+        Block.__init__(self, **ARGS)
+        self.tuple_info = tuple_info
+        self.body = list(body)
+    
+    def isMatch(self):
+        return True
+
+class EQ (Operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        Operator.__init__(self, **ARGS)
+    
+    def isEQ(self):
+        return True
+
+class Stmt (Node):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        Node.__init__(self, **ARGS)
+    
+    def isStmt(self):
+        return True
+
+class GuardCheck (Block):
+    _fields = ('condition', 'body')
+    _attributes = ()
+    
+    def __init__ (self, condition, body=[],  **ARGS):
+        Block.__init__(self, **ARGS)
+        self.condition = condition
+        self.body = list(body)
+    
+    def isGuardCheck(self):
+        return True
+
+class Expr (Node):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        Node.__init__(self, **ARGS)
+    
+    def isExpr(self):
+        return True
+
+class FunctionDef (Node):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        Node.__init__(self, **ARGS)
+    
+    def isFunctionDef(self):
+        return True
+
+class NotEmpty (Block):
+    _fields = ('marking_var', 'place_name', 'body')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, place_name, body=[],  **ARGS):
+        Block.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.place_name = place_name
+        self.body = list(body)
+    
+    def isNotEmpty(self):
+        return True
+
+class TokenLookup (Block):
+    _fields = ('arc', 'token_var', 'token_expr', 'marking_var', 'place_name', 'body')
+    _attributes = ()
+    
+    def __init__ (self, arc, token_var, token_expr, marking_var, place_name, body=[],  **ARGS):
+        Block.__init__(self, **ARGS)
+        self.arc = arc
+        self.token_var = token_var
+        self.token_expr = token_expr
+        self.marking_var = marking_var
+        self.place_name = place_name
+        self.body = list(body)
+    
+    def isTokenLookup(self):
+        return True
+
+class CheckTuple (Block):
+    _fields = ('tuple_var', 'tuple_info', 'body')
+    _attributes = ()
+    
+    def __init__ (self, tuple_var, tuple_info, body=[],  **ARGS):
+        Block.__init__(self, **ARGS)
+        self.tuple_var = tuple_var
+        self.tuple_info = tuple_info
+        self.body = list(body)
+    
+    def isCheckTuple(self):
+        return True
+
+class PValue (PComponent):
+    _fields = ('value',)
+    _attributes = ()
+    
+    def __init__ (self, value,  **ARGS):
+        PComponent.__init__(self, **ARGS)
+        self.value = value
+    
+    def isPValue(self):
+        return True
+
+class If (Block):
+    _fields = ('condition', 'body', 'orelse')
+    _attributes = ()
+    
+    def __init__ (self, condition, body=[], orelse=[],  **ARGS):
+        Block.__init__(self, **ARGS)
+        self.condition = condition
+        self.body = list(body)
+        self.orelse = list(orelse)
+    
+    def isIf(self):
+        return True
+
+class FlushOut (Stmt):
+    _fields = ('marking_var', 'place_name', 'token_expr')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, place_name, token_expr,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.place_name = place_name
+        self.token_expr = token_expr
+    
+    def isFlushOut(self):
+        return True
+
+class ReadFlow (Expr):
+    _fields = ('marking_var', 'process_name')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, process_name,  **ARGS):
+        Expr.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.process_name = process_name
+    
+    def isReadFlow(self):
+        return True
+
+class FlushIn (Stmt):
+    _fields = ('token_var', 'marking_var', 'place_name')
+    _attributes = ()
+    
+    def __init__ (self, token_var, marking_var, place_name,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.token_var = token_var
+        self.marking_var = marking_var
+        self.place_name = place_name
+    
+    def isFlushIn(self):
+        return True
+
+class Init (FunctionDef):
+    _fields = ('function_name', 'marking_var', 'variable_provider', 'body')
+    _attributes = ()
+    
+    def __init__ (self, function_name, marking_var, variable_provider, body=[],  **ARGS):
+        FunctionDef.__init__(self, **ARGS)
+        self.function_name = function_name
+        self.marking_var = marking_var
+        self.variable_provider = variable_provider
+        self.body = list(body)
+    
+    def isInit(self):
+        return True
+
+class TupleOut (Stmt):
+    _fields = ('marking_var', 'place_name', 'tuple_info')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, place_name, tuple_info,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.place_name = place_name
+        self.tuple_info = tuple_info
+    
+    def isTupleOut(self):
+        return True
+
+class Print (Stmt):
+    _fields = ('message',)
+    _attributes = ()
+    
+    def __init__ (self, message,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.message = message
+    
+    def isPrint(self):
+        return True
+
+class UpdateHashSet (Stmt):
+    _fields = ('ctx_var', 'marking_var')
+    _attributes = ()
+    
+    def __init__ (self, ctx_var, marking_var,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.ctx_var = ctx_var
+        self.marking_var = marking_var
+    
+    def isUpdateHashSet(self):
+        return True
+
+class AddPid (Stmt):
+    _fields = ('marking_var', 'place_name', 'token_expr')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, place_name, token_expr,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.place_name = place_name
+        self.token_expr = token_expr
+    
+    def isAddPid(self):
+        return True
+
+class Return (Stmt):
+    _fields = ('expr',)
+    _attributes = ()
+    
+    def __init__ (self, expr,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.expr = expr
+    
+    def isReturn(self):
+        return True
+
+class IsFireable (FunctionDef):
+    _fields = ('function_name', 'arg_marking_var', 'transition_info', 'variable_provider', 'body')
+    _attributes = ()
+    
+    def __init__ (self, function_name, arg_marking_var, transition_info, variable_provider, body=[],  **ARGS):
+        FunctionDef.__init__(self, **ARGS)
+        self.function_name = function_name
+        self.arg_marking_var = arg_marking_var
+        self.transition_info = transition_info
+        self.variable_provider = variable_provider
+        self.body = list(body)
+    
+    def isIsFireable(self):
+        return True
+
+class Tuple (Expr):
+    _fields = ('components',)
+    _attributes = ()
+    
+    def __init__ (self, components=[],  **ARGS):
+        Expr.__init__(self, **ARGS)
+        self.components = list(components)
+    
+    def isTuple(self):
+        return True
+
+class InitialPid (Expr):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        Expr.__init__(self, **ARGS)
+    
+    def isInitialPid(self):
+        return True
+
+class RemAllTokens (Stmt):
+    _fields = ('marking_var', 'place_name')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, place_name,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.place_name = place_name
+    
+    def isRemAllTokens(self):
+        return True
+
+class PyExpr (Expr):
+    _fields = ('expr',)
+    _attributes = ()
+    
+    def __init__ (self, expr,  **ARGS):
+        Expr.__init__(self, **ARGS)
+        self.expr = expr
+    
+    def isPyExpr(self):
+        return True
+
+class FlowCheck (Expr):
+    _fields = ('marking_var', 'place_info', 'current_flow')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, place_info, current_flow=None,  **ARGS):
+        Expr.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.place_info = place_info
+        self.current_flow = current_flow
+    
+    def isFlowCheck(self):
+        return True
+
+class MarkingCopy (Stmt):
+    _fields = ('dst', 'src', 'mod')
+    _attributes = ()
+    
+    def __init__ (self, dst, src, mod=[],  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.dst = dst
+        self.src = src
+        self.mod = list(mod)
+    
+    def isMarkingCopy(self):
+        return True
+
+class AddMarking (Stmt):
+    _fields = ('marking_set_var', 'marking_var')
+    _attributes = ()
+    
+    def __init__ (self, marking_set_var, marking_var,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_set_var = marking_set_var
+        self.marking_var = marking_var
+    
+    def isAddMarking(self):
+        return True
+
+class Name (Expr):
+    _fields = ('name',)
+    _attributes = ()
+    
+    def __init__ (self, name,  **ARGS):
+        Expr.__init__(self, **ARGS)
+        self.name = name
+    
+    def isName(self):
+        return True
+
+class NormalizeMarking (Stmt):
+    _fields = ('normalized_marking_var', 'marking_var', 'marking_acc_var', 'arg_ctx_var')
+    _attributes = ()
+    
+    def __init__ (self, normalized_marking_var, marking_var, marking_acc_var, arg_ctx_var,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.normalized_marking_var = normalized_marking_var
+        self.marking_var = marking_var
+        self.marking_acc_var = marking_acc_var
+        self.arg_ctx_var = arg_ctx_var
+    
+    def isNormalizeMarking(self):
+        return True
+
+class InitGeneratorPlace (Stmt):
+    _fields = ('marking_var',)
+    _attributes = ()
+    
+    def __init__ (self, marking_var,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+    
+    def isInitGeneratorPlace(self):
+        return True
+
+class DisableSpawns (Stmt):
+    _fields = ('marking_var', 'pid_var')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, pid_var,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.pid_var = pid_var
+    
+    def isDisableSpawns(self):
+        return True
+
+class Value (Expr):
+    _fields = ('value', 'place_name')
+    _attributes = ()
+    
+    def __init__ (self, value, place_name,  **ARGS):
+        Expr.__init__(self, **ARGS)
+        self.value = value
+        self.place_name = place_name
+    
+    def isValue(self):
+        return True
+
+class SpawnPid (Stmt):
+    _fields = ('marking_var', 'parent_pid_var', 'spawned_pid')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, parent_pid_var, spawned_pid,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.parent_pid_var = parent_pid_var
+        self.spawned_pid = spawned_pid
+    
+    def isSpawnPid(self):
+        return True
+
+class Token (Expr):
+    _fields = ('value', 'place_name')
+    _attributes = ()
+    
+    def __init__ (self, value, place_name,  **ARGS):
+        Expr.__init__(self, **ARGS)
+        self.value = value
+        self.place_name = place_name
+    
+    def isToken(self):
+        return True
+
+class UpdateSpawns (Stmt):
+    _fields = ('marking_var', 'pid_var', 'count')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, pid_var, count,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.pid_var = pid_var
+        self.count = count
+    
+    def isUpdateSpawns(self):
+        return True
+
+class Succs (FunctionDef):
+    _fields = ('function_name', 'arg_marking_var', 'arg_marking_acc_var', 'arg_ctx_var', 'variable_provider', 'body')
+    _attributes = ()
+    
+    def __init__ (self, function_name, arg_marking_var, arg_marking_acc_var, arg_ctx_var, variable_provider, body=[],  **ARGS):
+        FunctionDef.__init__(self, **ARGS)
+        self.function_name = function_name
+        self.arg_marking_var = arg_marking_var
+        self.arg_marking_acc_var = arg_marking_acc_var
+        self.arg_ctx_var = arg_ctx_var
+        self.variable_provider = variable_provider
+        self.body = list(body)
+    
+    def isSuccs(self):
+        return True
+
+class RemTuple (Stmt):
+    _fields = ('marking_var', 'place_name', 'tuple_expr')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, place_name, tuple_expr,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.place_name = place_name
+        self.tuple_expr = tuple_expr
+    
+    def isRemTuple(self):
+        return True
+
+class Pickle (Expr):
+    _fields = ('obj',)
+    _attributes = ()
+    
+    def __init__ (self, obj,  **ARGS):
+        Expr.__init__(self, **ARGS)
+        self.obj = obj
+    
+    def isPickle(self):
+        return True
+
+class Assign (Stmt):
+    _fields = ('variable', 'expr')
+    _attributes = ()
+    
+    def __init__ (self, variable, expr,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.variable = variable
+        self.expr = expr
+    
+    def isAssign(self):
+        return True
+
+class Comment (Stmt):
+    _fields = ('message',)
+    _attributes = ()
+    
+    def __init__ (self, message,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.message = message
+    
+    def isComment(self):
+        return True
+
+class Compare (Expr):
+    _fields = ('left', 'ops', 'comparators')
+    _attributes = ()
+    
+    def __init__ (self, left, ops=[], comparators=[],  **ARGS):
+        Expr.__init__(self, **ARGS)
+        self.left = left
+        self.ops = list(ops)
+        self.comparators = list(comparators)
+    
+    def isCompare(self):
+        return True
+
+class RemToken (Stmt):
+    _fields = ('marking_var', 'place_name', 'token_expr', 'use_index')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, place_name, token_expr, use_index=None,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.place_name = place_name
+        self.token_expr = token_expr
+        self.use_index = use_index
+    
+    def isRemToken(self):
+        return True
+
+class UpdateFlow (Stmt):
+    _fields = ('marking_var', 'place_info')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, place_info,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.place_info = place_info
+    
+    def isUpdateFlow(self):
+        return True
+
+class SuccT (FunctionDef):
+    _fields = ('function_name', 'arg_marking_var', 'arg_marking_acc_var', 'arg_ctx_var', 'transition_info', 'variable_provider', 'body')
+    _attributes = ()
+    
+    def __init__ (self, function_name, arg_marking_var, arg_marking_acc_var, arg_ctx_var, transition_info, variable_provider, body=[],  **ARGS):
+        FunctionDef.__init__(self, **ARGS)
+        self.function_name = function_name
+        self.arg_marking_var = arg_marking_var
+        self.arg_marking_acc_var = arg_marking_acc_var
+        self.arg_ctx_var = arg_ctx_var
+        self.transition_info = transition_info
+        self.variable_provider = variable_provider
+        self.body = list(body)
+    
+    def isSuccT(self):
+        return True
+
+class FunctionCall (Expr):
+    _fields = ('function_name', 'arguments')
+    _attributes = ()
+    
+    def __init__ (self, function_name, arguments=[],  **ARGS):
+        Expr.__init__(self, **ARGS)
+        self.function_name = function_name
+        self.arguments = list(arguments)
+    
+    def isFunctionCall(self):
+        return True
+
+class SuccP (FunctionDef):
+    _fields = ('function_name', 'arg_marking_var', 'arg_marking_acc_var', 'arg_ctx_var', 'flow_variable', 'process_info', 'variable_provider', 'body')
+    _attributes = ()
+    
+    def __init__ (self, function_name, arg_marking_var, arg_marking_acc_var, arg_ctx_var, flow_variable, process_info, variable_provider, body=[],  **ARGS):
+        FunctionDef.__init__(self, **ARGS)
+        self.function_name = function_name
+        self.arg_marking_var = arg_marking_var
+        self.arg_marking_acc_var = arg_marking_acc_var
+        self.arg_ctx_var = arg_ctx_var
+        self.flow_variable = flow_variable
+        self.process_info = process_info
+        self.variable_provider = variable_provider
+        self.body = list(body)
+    
+    def isSuccP(self):
+        return True
+
+class AddToken (Stmt):
+    _fields = ('marking_var', 'place_name', 'token_expr')
+    _attributes = ()
+    
+    def __init__ (self, marking_var, place_name, token_expr,  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.marking_var = marking_var
+        self.place_name = place_name
+        self.token_expr = token_expr
+    
+    def isAddToken(self):
+        return True
+
+class ProcedureCall (Stmt):
+    _fields = ('function_name', 'arguments')
+    _attributes = ()
+    
+    def __init__ (self, function_name, arguments=[],  **ARGS):
+        Stmt.__init__(self, **ARGS)
+        self.function_name = function_name
+        self.arguments = list(arguments)
+    
+    def isProcedureCall(self):
+        return True
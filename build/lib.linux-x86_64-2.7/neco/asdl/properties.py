@@ -0,0 +1,650 @@
+# this file has been automatically generated running:
+# setup.py build build_ext --inplace
+# timestamp: 2026-10-18 12:04:39.966861
+
+from snakes.lang import ast
+from ast import *
+
+class _AST (ast.AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self, **ARGS):
+        ast.AST.__init__(self)
+        for k, v in ARGS.items():
+            setattr(self, k, v)
+    
+    def isAll(self):
+        return False
+    
+    def isAny(self):
+        return False
+    
+    def isAtomicProposition(self):
+        return False
+    
+    def isBinaryLogicOperator(self):
+        return False
+    
+    def isBinaryTemporalLogicOperator(self):
+        return False
+    
+    def isBool(self):
+        return False
+    
+    def isBooleanExpression(self):
+        return False
+    
+    def isComparisonOperator(self):
+        return False
+    
+    def isConjunction(self):
+        return False
+    
+    def isDeadlock(self):
+        return False
+    
+    def isDisjunction(self):
+        return False
+    
+    def isEQ(self):
+        return False
+    
+    def isEquivalence(self):
+        return False
+    
+    def isExclusiveDisjunction(self):
+        return False
+    
+    def isFireable(self):
+        return False
+    
+    def isFuture(self):
+        return False
+    
+    def isGE(self):
+        return False
+    
+    def isGT(self):
+        return False
+    
+    def isGlobally(self):
+        return False
+    
+    def isImplication(self):
+        return False
+    
+    def isIntegerComparison(self):
+        return False
+    
+    def isIntegerConstant(self):
+        return False
+    
+    def isIntegerExpression(self):
+        return False
+    
+    def isLE(self):
+        return False
+    
+    def isLT(self):
+        return False
+    
+    def isLTLFormula(self):
+        return False
+    
+    def isLive(self):
+        return False
+    
+    def isLogicOperator(self):
+        return False
+    
+    def isMultisetCardinality(self):
+        return False
+    
+    def isMultisetComparison(self):
+        return False
+    
+    def isMultisetConstant(self):
+        return False
+    
+    def isMultisetExpression(self):
+        return False
+    
+    def isMultisetPythonExpression(self):
+        return False
+    
+    def isNE(self):
+        return False
+    
+    def isNaryLogicOperator(self):
+        return False
+    
+    def isNegation(self):
+        return False
+    
+    def isNext(self):
+        return False
+    
+    def isOperator(self):
+        return False
+    
+    def isPlaceBound(self):
+        return False
+    
+    def isPlaceMarking(self):
+        return False
+    
+    def isRelease(self):
+        return False
+    
+    def isSum(self):
+        return False
+    
+    def isTemporalLogicOperator(self):
+        return False
+    
+    def isUnaryLogicOperator(self):
+        return False
+    
+    def isUnaryTemporalLogicOperator(self):
+        return False
+    
+    def isUntil(self):
+        return False
+
+class IntegerExpression (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isIntegerExpression(self):
+        return True
+
+class LTLFormula (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isLTLFormula(self):
+        return True
+
+class MultisetExpression (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isMultisetExpression(self):
+        return True
+
+class UnaryTemporalLogicOperator (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isUnaryTemporalLogicOperator(self):
+        return True
+
+class LogicOperator (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isLogicOperator(self):
+        return True
+
+class BinaryLogicOperator (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isBinaryLogicOperator(self):
+        return True
+
+class UnaryLogicOperator (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isUnaryLogicOperator(self):
+        return True
+
+class ComparisonOperator (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isComparisonOperator(self):
+        return True
+
+class BinaryTemporalLogicOperator (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isBinaryTemporalLogicOperator(self):
+        return True
+
+class PlaceMarking (MultisetExpression):
+    _fields = ('place_name',)
+    _attributes = ()
+    
+    def __init__ (self, place_name,  **ARGS):
+        MultisetExpression.__init__(self, **ARGS)
+        self.place_name = place_name
+    
+    def isPlaceMarking(self):
+        return True
+
+class Sum (IntegerExpression):
+    _fields = ('operands',)
+    _attributes = ()
+    
+    def __init__ (self, operands=[],  **ARGS):
+        IntegerExpression.__init__(self, **ARGS)
+        self.operands = list(operands)
+    
+    def isSum(self):
+        return True
+
+class Equivalence (BinaryLogicOperator):
+    _fields = ('left', 'right')
+    _attributes = ()
+    
+    def __init__ (self, left, right,  **ARGS):
+        BinaryLogicOperator.__init__(self, **ARGS)
+        self.left = left
+        self.right = right
+    
+    def isEquivalence(self):
+        return True
+
+class Negation (UnaryLogicOperator):
+    _fields = ('formula',)
+    _attributes = ()
+    
+    def __init__ (self, formula,  **ARGS):
+        UnaryLogicOperator.__init__(self, **ARGS)
+        self.formula = formula
+    
+    def isNegation(self):
+        return True
+
+class Next (UnaryTemporalLogicOperator):
+    _fields = ('formula',)
+    _attributes = ()
+    
+    def __init__ (self, formula,  **ARGS):
+        UnaryTemporalLogicOperator.__init__(self, **ARGS)
+        self.formula = formula
+    
+    def isNext(self):
+        return True
+
+class MultisetPythonExpression (MultisetExpression):
+    _fields = ('expr',)
+    _attributes = ()
+    
+    def __init__ (self, expr,  **ARGS):
+        MultisetExpression.__init__(self, **ARGS)
+        self.expr = expr
+    
+    def isMultisetPythonExpression(self):
+        return True
+
+class Until (BinaryTemporalLogicOperator):
+    _fields = ('left', 'right')
+    _attributes = ()
+    
+    def __init__ (self, left, right,  **ARGS):
+        BinaryTemporalLogicOperator.__init__(self, **ARGS)
+        self.left = left
+        self.right = right
+    
+    def isUntil(self):
+        return True
+
+class LE (ComparisonOperator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        ComparisonOperator.__init__(self, **ARGS)
+    
+    def isLE(self):
+        return True
+
+class PlaceBound (IntegerExpression):
+    _fields = ('place_name',)
+    _attributes = ()
+    
+    def __init__ (self, place_name,  **ARGS):
+        IntegerExpression.__init__(self, **ARGS)
+        self.place_name = place_name
+    
+    def isPlaceBound(self):
+        return True
+
+class NE (ComparisonOperator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        ComparisonOperator.__init__(self, **ARGS)
+    
+    def isNE(self):
+        return True
+
+class IntegerConstant (IntegerExpression):
+    _fields = ('value',)
+    _attributes = ()
+    
+    def __init__ (self, value,  **ARGS):
+        IntegerExpression.__init__(self, **ARGS)
+        self.value = value
+    
+    def isIntegerConstant(self):
+        return True
+
+class LT (ComparisonOperator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        ComparisonOperator.__init__(self, **ARGS)
+    
+    def isLT(self):
+        return True
+
+class NaryLogicOperator (LogicOperator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        LogicOperator.__init__(self, **ARGS)
+    
+    def isNaryLogicOperator(self):
+        return True
+
+class MultisetCardinality (IntegerExpression):
+    _fields = ('multiset',)
+    _attributes = ()
+    
+    def __init__ (self, multiset,  **ARGS):
+        IntegerExpression.__init__(self, **ARGS)
+        self.multiset = multiset
+    
+    def isMultisetCardinality(self):
+        return True
+
+class GT (ComparisonOperator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        ComparisonOperator.__init__(self, **ARGS)
+    
+    def isGT(self):
+        return True
+
+class GE (ComparisonOperator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        ComparisonOperator.__init__(self, **ARGS)
+    
+    def isGE(self):
+        return True
+
+class Future (UnaryTemporalLogicOperator):
+    _fields = ('formula',)
+    _attributes = ()
+    
+    def __init__ (self, formula,  **ARGS):
+        UnaryTemporalLogicOperator.__init__(self, **ARGS)
+        self.formula = formula
+    
+    def isFuture(self):
+        return True
+
+class Release (BinaryTemporalLogicOperator):
+    _fields = ('left', 'right')
+    _attributes = ()
+    
+    def __init__ (self, left, right,  **ARGS):
+        BinaryTemporalLogicOperator.__init__(self, **ARGS)
+        self.left = left
+        self.right = right
+    
+    def isRelease(self):
+        return True
+
+class Implication (BinaryLogicOperator):
+    _fields = ('left', 'right')
+    _attributes = ()
+    
+    def __init__ (self, left, right,  **ARGS):
+        BinaryLogicOperator.__init__(self, **ARGS)
+        self.left = left
+        self.right = right
+    
+    def isImplication(self):
+        return True
+
+class EQ (ComparisonOperator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        ComparisonOperator.__init__(self, **ARGS)
+    
+    def isEQ(self):
+        return True
+
+class MultisetConstant (MultisetExpression):
+    _fields = ('elements',)
+    _attributes = ()
+    
+    def __init__ (self, elements=[],  **ARGS):
+        MultisetExpression.__init__(self, **ARGS)
+        self.elements = list(elements)
+    
+    def isMultisetConstant(self):
+        return True
+
+class BooleanExpression (LTLFormula):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        LTLFormula.__init__(self, **ARGS)
+    
+    def isBooleanExpression(self):
+        return True
+
+class Globally (UnaryTemporalLogicOperator):
+    _fields = ('formula',)
+    _attributes = ()
+    
+    def __init__ (self, formula,  **ARGS):
+        UnaryTemporalLogicOperator.__init__(self, **ARGS)
+        self.formula = formula
+    
+    def isGlobally(self):
+        return True
+
+class Operator (LTLFormula):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        LTLFormula.__init__(self, **ARGS)
+    
+    def isOperator(self):
+        return True
+
+class Fireable (BooleanExpression):
+    _fields = ('transition_name',)
+    _attributes = ()
+    
+    def __init__ (self, transition_name,  **ARGS):
+        BooleanExpression.__init__(self, **ARGS)
+        self.transition_name = transition_name
+    
+    def isFireable(self):
+        return True
+
+class Live (BooleanExpression):
+    _fields = ('level', 'transition_name')
+    _attributes = ()
+    
+    def __init__ (self, level, transition_name,  **ARGS):
+        BooleanExpression.__init__(self, **ARGS)
+        self.level = level
+        self.transition_name = transition_name
+    
+    def isLive(self):
+        return True
+
+class MultisetComparison (BooleanExpression):
+    _fields = ('operator', 'left', 'right')
+    _attributes = ()
+    
+    def __init__ (self, operator, left, right,  **ARGS):
+        BooleanExpression.__init__(self, **ARGS)
+        self.operator = operator
+        self.left = left
+        self.right = right
+    
+    def isMultisetComparison(self):
+        return True
+
+class Conjunction (NaryLogicOperator):
+    _fields = ('operands',)
+    _attributes = ()
+    
+    def __init__ (self, operands=[],  **ARGS):
+        NaryLogicOperator.__init__(self, **ARGS)
+        self.operands = list(operands)
+    
+    def isConjunction(self):
+        return True
+
+class ExclusiveDisjunction (NaryLogicOperator):
+    _fields = ('operands',)
+    _attributes = ()
+    
+    def __init__ (self, operands=[],  **ARGS):
+        NaryLogicOperator.__init__(self, **ARGS)
+        self.operands = list(operands)
+    
+    def isExclusiveDisjunction(self):
+        return True
+
+class Disjunction (NaryLogicOperator):
+    _fields = ('operands',)
+    _attributes = ()
+    
+    def __init__ (self, operands=[],  **ARGS):
+        NaryLogicOperator.__init__(self, **ARGS)
+        self.operands = list(operands)
+    
+    def isDisjunction(self):
+        return True
+
+class TemporalLogicOperator (Operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        Operator.__init__(self, **ARGS)
+    
+    def isTemporalLogicOperator(self):
+        return True
+
+class Deadlock (BooleanExpression):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        BooleanExpression.__init__(self, **ARGS)
+    
+    def isDeadlock(self):
+        return True
+
+class All (BooleanExpression):
+    _fields = ('place_name', 'function_name')
+    _attributes = ()
+    
+    def __init__ (self, place_name, function_name,  **ARGS):
+        BooleanExpression.__init__(self, **ARGS)
+        self.place_name = place_name
+        self.function_name = function_name
+    
+    def isAll(self):
+        return True
+
+class IntegerComparison (BooleanExpression):
+    _fields = ('operator', 'left', 'right')
+    _attributes = ()
+    
+    def __init__ (self, operator, left, right,  **ARGS):
+        BooleanExpression.__init__(self, **ARGS)
+        self.operator = operator
+        self.left = left
+        self.right = right
+    
+    def isIntegerComparison(self):
+        return True
+
+class AtomicProposition (BooleanExpression):
+    _fields = ('formula',)
+    _attributes = ()
+    
+    def __init__ (self, formula,  **ARGS):
+        BooleanExpression.__init__(self, **ARGS)
+        self.formula = formula
+    
+    def isAtomicProposition(self):
+        return True
+
+class Bool (BooleanExpression):
+    _fields = ('value',)
+    _attributes = ()
+    
+    def __init__ (self, value,  **ARGS):
+        BooleanExpression.__init__(self, **ARGS)
+        self.value = value
+    
+    def isBool(self):
+        return True
+
+class Any (BooleanExpression):
+    _fields = ('place_name', 'function_name')
+    _attributes = ()
+    
+    def __init__ (self, place_name, function_name,  **ARGS):
+        BooleanExpression.__init__(self, **ARGS)
+        self.place_name = place_name
+        self.function_name = function_name
+    
+    def isAny(self):
+        return True
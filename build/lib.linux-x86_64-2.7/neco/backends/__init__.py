@@ -0,0 +1,6 @@
+""" package containing backends
+"""
+
+import python
+import cython
+import cpp
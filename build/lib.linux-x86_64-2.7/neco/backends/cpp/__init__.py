@@ -0,0 +1,10 @@
+""" C++ backend plugin. """
+
+
+################################################################################
+
+_backend_ = "cpp"
+
+################################################################################
+
+import compile_impl
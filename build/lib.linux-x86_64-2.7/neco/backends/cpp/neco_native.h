@@ -0,0 +1,187 @@
+////////////////////////////////////////////////////////////////////////////////
+// Runtime of nets compiled with the cpp backend, inlined in generated sources.
+////////////////////////////////////////////////////////////////////////////////
+
+#include <algorithm>
+#include <array>
+#include <cstddef>
+#include <cstdlib>
+#include <cstring>
+#include <functional>
+#include <ostream>
+#include <sstream>
+#include <string>
+#include <tuple>
+#include <unordered_set>
+#include <utility>
+#include <vector>
+
+typedef std::vector<void*> neco_list_t;
+
+namespace neco {
+
+    inline void hash_combine(std::size_t& seed, std::size_t value)
+    {
+        seed ^= value + 0x9e3779b9 + (seed << 6) + (seed >> 2);
+    }
+
+    //////////////////////////////////////////////////
+    // tokens are ints or fixed size arrays of ints
+    //////////////////////////////////////////////////
+
+    inline std::size_t token_hash(int token)
+    {
+        return std::hash<int>()(token);
+    }
+
+    template <std::size_t N>
+    inline std::size_t token_hash(const std::array<int, N>& token)
+    {
+        std::size_t seed = N;
+        for (std::size_t i = 0; i < N; ++i) {
+            hash_combine(seed, std::hash<int>()(token[i]));
+        }
+        return seed;
+    }
+
+    inline void dump_token(std::ostream& out, int token)
+    {
+        out << token;
+    }
+
+    template <std::size_t N>
+    inline void dump_token(std::ostream& out, const std::array<int, N>& token)
+    {
+        out << '(';
+        for (std::size_t i = 0; i < N; ++i) {
+            if (i > 0) {
+                out << ", ";
+            }
+            out << token[i];
+        }
+        if (N == 1) {
+            out << ',';
+        }
+        out << ')';
+    }
+
+    inline void dump_black_tokens(std::ostream& out, int count)
+    {
+        out << '[';
+        for (int i = 0; i < count; ++i) {
+            out << "dot, ";
+        }
+        out << ']';
+    }
+
+    //////////////////////////////////////////////////
+    // Python semantics of integer operations
+    //////////////////////////////////////////////////
+
+    inline int floordiv(int left, int right)
+    {
+        int quotient = left / right;
+        if (left % right != 0 && ((left < 0) != (right < 0))) {
+            --quotient;
+        }
+        return quotient;
+    }
+
+    inline int mod(int left, int right)
+    {
+        int remainder = left % right;
+        if (remainder != 0 && ((remainder < 0) != (right < 0))) {
+            remainder += right;
+        }
+        return remainder;
+    }
+
+    //////////////////////////////////////////////////
+    // multisets of tokens
+    //////////////////////////////////////////////////
+
+    //! Multiset stored as a vector of distinct tokens, sorted, with
+    //! their number of occurrences.
+    template <typename T>
+    class multiset
+    {
+    public:
+        typedef std::pair<T, int>                           entry_t;
+        typedef typename std::vector<entry_t>::const_iterator const_iterator;
+
+        const_iterator begin() const        { return m_entries.begin(); }
+        const_iterator end() const          { return m_entries.end(); }
+        bool empty() const                  { return m_entries.empty(); }
+
+        int count(const T& token) const
+        {
+            const_iterator it = find(token);
+            return (it != m_entries.end() && it->first == token) ? it->second : 0;
+        }
+
+        void add(const T& token)
+        {
+            typename std::vector<entry_t>::iterator it = find(token);
+            if (it != m_entries.end() && it->first == token) {
+                ++it->second;
+            }
+            else {
+                m_entries.insert(it, entry_t(token, 1));
+            }
+        }
+
+        //! Remove a token, the token must belong to the multiset.
+        void remove(const T& token)
+        {
+            typename std::vector<entry_t>::iterator it = find(token);
+            if (--it->second == 0) {
+                m_entries.erase(it);
+            }
+        }
+
+        bool operator==(const multiset& other) const    { return m_entries == other.m_entries; }
+        bool operator<(const multiset& other) const     { return m_entries < other.m_entries; }
+
+        std::size_t hash() const
+        {
+            std::size_t seed = m_entries.size();
+            for (const_iterator it = m_entries.begin(); it != m_entries.end(); ++it) {
+                hash_combine(seed, token_hash(it->first));
+                hash_combine(seed, std::hash<int>()(it->second));
+            }
+            return seed;
+        }
+
+        void dump(std::ostream& out) const
+        {
+            out << '[';
+            for (const_iterator it = m_entries.begin(); it != m_entries.end(); ++it) {
+                for (int i = 0; i < it->second; ++i) {
+                    dump_token(out, it->first);
+                    out << ", ";
+                }
+            }
+            out << ']';
+        }
+
+    private:
+        static bool less_token(const entry_t& entry, const T& token) { return entry.first < token; }
+
+        typename std::vector<entry_t>::iterator find(const T& token)
+        {
+            return std::lower_bound(m_entries.begin(), m_entries.end(), token, less_token);
+        }
+
+        const_iterator find(const T& token) const
+        {
+            return std::lower_bound(m_entries.begin(), m_entries.end(), token, less_token);
+        }
+
+        std::vector<entry_t> m_entries;
+    };
+
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// generated code
+////////////////////////////////////////////////////////////////////////////////
@@ -0,0 +1,141 @@
+////////////////////////////////////////////////////////////////////////////////
+// Exploration driver of nets compiled with the cpp backend, appended to
+// generated sources. It relies on Marking, MarkingSet, NecoCtx, init, succs
+// and dump.
+////////////////////////////////////////////////////////////////////////////////
+
+namespace {
+
+    //! Reachable markings in discovery order.
+    struct StateSpace
+    {
+        MarkingSet                      visited;
+        std::vector<const Marking*>     markings;
+    };
+
+    //! Explore the state space depth first, set elements are stable so the
+    //! stack and the discovery order refer to them.
+    void explore(StateSpace& state_space)
+    {
+        NecoCtx ctx;
+        MarkingSet succ;
+        std::vector<const Marking*> todo;
+
+        const Marking* initial = &*state_space.visited.insert(init()).first;
+        state_space.markings.push_back(initial);
+        todo.push_back(initial);
+
+        while (!todo.empty()) {
+            const Marking* marking = todo.back();
+            todo.pop_back();
+
+            succ.clear();
+            succs(*marking, succ, ctx);
+            for (MarkingSet::const_iterator it = succ.begin(); it != succ.end(); ++it) {
+                std::pair<MarkingSet::iterator, bool> inserted = state_space.visited.insert(*it);
+                if (inserted.second) {
+                    state_space.markings.push_back(&*inserted.first);
+                    todo.push_back(&*inserted.first);
+                }
+            }
+        }
+    }
+
+    char* new_c_string(const std::string& string)
+    {
+        char* result = static_cast<char*>(std::malloc(string.size() + 1));
+        std::memcpy(result, string.c_str(), string.size() + 1);
+        return result;
+    }
+
+}
+
+extern "C" {
+
+    //////////////////////////////////////////////////
+    // neco-spot interface, see net_api.h
+    //////////////////////////////////////////////////
+
+    struct Marking* neco_init(void)
+    {
+        return new Marking(init());
+    }
+
+    struct NecoCtx* neco_ctx(struct Marking* marking)
+    {
+        return new NecoCtx();
+    }
+
+    neco_list_t* neco_succs(struct Marking* marking, struct NecoCtx* ctx)
+    {
+        MarkingSet succ;
+        succs(*marking, succ, *ctx);
+
+        neco_list_t* list = new neco_list_t();
+        list->reserve(succ.size());
+        for (MarkingSet::const_iterator it = succ.begin(); it != succ.end(); ++it) {
+            list->push_back(new Marking(*it));
+        }
+        return list;
+    }
+
+    char* neco_marking_dump(struct Marking* marking)
+    {
+        return new_c_string(dump(*marking));
+    }
+
+    struct Marking* neco_marking_copy(struct Marking* marking)
+    {
+        return new Marking(*marking);
+    }
+
+    int neco_marking_compare(struct Marking* left, struct Marking* right)
+    {
+        if (*left < *right) {
+            return -1;
+        }
+        return (*right < *left) ? 1 : 0;
+    }
+
+    int neco_marking_hash(struct Marking* marking)
+    {
+        return static_cast<int>(MarkingHash()(*marking));
+    }
+
+    void neco_marking_delete(void* marking)
+    {
+        delete static_cast<Marking*>(marking);
+    }
+
+    //////////////////////////////////////////////////
+    // state space interface, used by the Python module
+    //////////////////////////////////////////////////
+
+    void* neco_state_space(void)
+    {
+        StateSpace* state_space = new StateSpace();
+        explore(*state_space);
+        return state_space;
+    }
+
+    long neco_state_space_size(void* state_space)
+    {
+        return static_cast<long>(static_cast<StateSpace*>(state_space)->markings.size());
+    }
+
+    char* neco_state_space_dump(void* state_space, long index)
+    {
+        return neco_marking_dump(const_cast<Marking*>(static_cast<StateSpace*>(state_space)->markings[index]));
+    }
+
+    void neco_state_space_delete(void* state_space)
+    {
+        delete static_cast<StateSpace*>(state_space);
+    }
+
+    void neco_free(char* string)
+    {
+        std::free(string);
+    }
+
+}
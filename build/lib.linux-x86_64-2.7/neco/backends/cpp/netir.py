@@ -0,0 +1,520 @@
+""" C++ AST compiler. """
+
+from neco.asdl.cpp import Block, FunctionDef, ParamDecl, UserType, Verbatim, Void
+from neco.core import typeinfer
+from neco.core.info import TypeInfo
+from neco.core.netir import CannotCompile
+from neco.utils import flatten_ast
+from nettypes import type2str, native_value
+import ast
+import neco.core.netir as coreir
+
+################################################################################
+
+_KEYWORDS = frozenset([ 'auto', 'bool', 'break', 'case', 'char', 'class', 'const', 'default',
+                        'delete', 'do', 'double', 'else', 'enum', 'explicit', 'extern', 'false',
+                        'float', 'for', 'friend', 'goto', 'if', 'inline', 'int', 'long',
+                        'namespace', 'new', 'operator', 'private', 'protected', 'public',
+                        'register', 'return', 'short', 'signed', 'sizeof', 'static', 'struct',
+                        'switch', 'template', 'this', 'throw', 'true', 'try', 'typedef',
+                        'typename', 'union', 'unsigned', 'using', 'virtual', 'void',
+                        'volatile', 'while', 'neco', 'std' ])
+
+def identifier(name):
+    """ C++ identifier of a variable.
+
+    >>> identifier('x'), identifier('new')
+    ('x', 'new_')
+    """
+    if name in _KEYWORDS:
+        return name + '_'
+    return name
+
+def _numeric(type_info):
+    return type_info.is_Int or type_info.is_Bool
+
+class ExpressionTranslator(ast.NodeVisitor):
+    """ Translation of Python expressions on native values to C++.
+
+    Each visit returns the C++ expression and its type.
+    """
+
+    _operators = { ast.Add : '+', ast.Sub : '-', ast.Mult : '*',
+                   ast.LShift : '<<', ast.RShift : '>>',
+                   ast.BitOr : '|', ast.BitXor : '^', ast.BitAnd : '&' }
+
+    _functions = { ast.Div : 'neco::floordiv', ast.FloorDiv : 'neco::floordiv', ast.Mod : 'neco::mod' }
+
+    _comparisons = { ast.Eq : '==', ast.NotEq : '!=', ast.Lt : '<',
+                     ast.LtE : '<=', ast.Gt : '>', ast.GtE : '>=' }
+
+    def __init__(self, source, types):
+        self.source = source
+        self.types = types
+
+    def fail(self):
+        raise CannotCompile("expression '{}' has no C++ translation".format(self.source))
+
+    def generic_visit(self, node):
+        self.fail()
+
+    def condition(self, node):
+        """ Translate an expression used as a truth value. """
+        if isinstance(node, ast.BoolOp):
+            operands = [ self.condition(value) for value in node.values ]
+            operator = ' && ' if isinstance(node.op, ast.And) else ' || '
+            return '(' + operator.join(operands) + ')'
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return '(!' + self.condition(node.operand) + ')'
+
+        code, type_info = self.visit(node)
+        if not _numeric(type_info):
+            self.fail()
+        return code
+
+    def visit_Num(self, node):
+        if type(node.n) is not int or not -2 ** 31 <= node.n < 2 ** 31:
+            self.fail()
+        return repr(node.n), TypeInfo.Int
+
+    def visit_Name(self, node):
+        if node.id in self.types:
+            type_info = self.types[node.id]
+            type2str(type_info)
+            return identifier(node.id), type_info
+        elif node.id in ('True', 'False'):
+            return node.id.lower(), TypeInfo.Bool
+        self.fail()
+
+    def visit_Tuple(self, node):
+        elts = [ self.visit(elt) for elt in node.elts ]
+        if not all( type_info.is_Int for _, type_info in elts ):
+            self.fail()
+        type_info = TypeInfo.TupleType([ type_info for _, type_info in elts ])
+        return '{}{{{{{}}}}}'.format(type2str(type_info), ', '.join( code for code, _ in elts )), type_info
+
+    def visit_BinOp(self, node):
+        (left, left_type), (right, right_type) = self.visit(node.left), self.visit(node.right)
+        if not (left_type.is_Int and right_type.is_Int):
+            self.fail()
+        op = type(node.op)
+        if op in self._operators:
+            return '({} {} {})'.format(left, self._operators[op], right), TypeInfo.Int
+        elif op in self._functions:
+            return '{}({}, {})'.format(self._functions[op], left, right), TypeInfo.Int
+        self.fail()
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            return self.condition(node), TypeInfo.Bool
+        operand, operand_type = self.visit(node.operand)
+        if not operand_type.is_Int:
+            self.fail()
+        if isinstance(node.op, ast.UAdd):
+            return operand, TypeInfo.Int
+        operator = '-' if isinstance(node.op, ast.USub) else '~'
+        return '({}{})'.format(operator, operand), TypeInfo.Int
+
+    def visit_BoolOp(self, node):
+        # the value of a boolean operation is one of its operands
+        if not all( self.visit(value)[1].is_Bool for value in node.values ):
+            self.fail()
+        return self.condition(node), TypeInfo.Bool
+
+    def visit_Compare(self, node):
+        tests = []
+        left, left_type = self.visit(node.left)
+        for op, comparator in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                if not isinstance(comparator, ast.Tuple):
+                    self.fail()
+                equalities = [ self.compare(left, left_type, '==', self.visit(elt)) for elt in comparator.elts ]
+                test = '(' + (' || '.join(equalities) or 'false') + ')'
+                tests.append(test if isinstance(op, ast.In) else '(!' + test + ')')
+                continue
+            right, right_type = self.visit(comparator)
+            if type(op) not in self._comparisons:
+                self.fail()
+            tests.append(self.compare(left, left_type, self._comparisons[type(op)], (right, right_type)))
+            left, left_type = right, right_type
+        return '(' + ' && '.join(tests) + ')', TypeInfo.Bool
+
+    def compare(self, left, left_type, operator, (right, right_type)):
+        if not ((_numeric(left_type) and _numeric(right_type)) or typeinfer.same_type(left_type, right_type)):
+            self.fail()
+        return '{} {} {}'.format(left, operator, right)
+
+    def visit_IfExp(self, node):
+        (body, body_type), (orelse, orelse_type) = self.visit(node.body), self.visit(node.orelse)
+        if not typeinfer.same_type(body_type, orelse_type):
+            self.fail()
+        return '({} ? {} : {})'.format(self.condition(node.test), body, orelse), body_type
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.keywords or node.starargs or node.kwargs:
+            self.fail()
+        args = [ self.visit(arg) for arg in node.args ]
+        name = node.func.id
+        if name == 'len' and len(args) == 1 and args[0][1].is_TupleType:
+            return str(len(args[0][1])), TypeInfo.Int
+        if not args or not all( type_info.is_Int for _, type_info in args ):
+            self.fail()
+        if name == 'abs' and len(args) == 1:
+            return 'std::abs({})'.format(args[0][0]), TypeInfo.Int
+        elif name in ('min', 'max') and len(args) > 1:
+            code = args[-1][0]
+            for arg, _ in reversed(args[:-1]):
+                code = 'std::{}({}, {})'.format(name, arg, code)
+            return code, TypeInfo.Int
+        self.fail()
+
+    def visit_Subscript(self, node):
+        value, value_type = self.visit(node.value)
+        if (not value_type.is_TupleType or not isinstance(node.slice, ast.Index)
+            or not isinstance(node.slice.value, ast.Num) or type(node.slice.value.n) is not int):
+            self.fail()
+        index = node.slice.value.n
+        if not -len(value_type) <= index < len(value_type):
+            self.fail()
+        return '{}[{}]'.format(value, index % len(value_type)), value_type.split()[index]
+
+def translate(source, types, condition = False):
+    """ Translate a Python expression to C++.
+
+    >>> types = { 'x' : TypeInfo.Int, 't' : TypeInfo.TupleType([ TypeInfo.Int, TypeInfo.Int ]) }
+    >>> translate('x // 2 + t[-1]', types)[0]
+    '(neco::floordiv(x, 2) + t[1])'
+    >>> translate('0 < x < 3 and x not in (1, 2)', types, condition = True)
+    '((0 < x && x < 3) && ((!(x == 1 || x == 2))))'
+    >>> translate('(x, max(x, 1, -x))', types)[0]
+    'std::array<int, 2>{{x, std::max(x, std::max(1, (-x)))}}'
+    >>> translate('f(x)', types)
+    Traceback (most recent call last):
+        ...
+    CannotCompile: expression 'f(x)' has no C++ translation
+
+    @param source: Python expression.
+    @type source: C{str}
+    @param types: types of variables, other names are not allowed.
+    @type types: C{dict(str -> TypeInfo)}
+    @param condition: translate the truth value of the expression.
+    @type condition: C{bool}
+    @return: C++ expression and its type, C{None} when translating a condition.
+    @raise CannotCompile: if the expression cannot be translated.
+    """
+    translator = ExpressionTranslator(source, types)
+    try:
+        tree = ast.parse(source.strip(), mode = 'eval').body
+    except SyntaxError:
+        translator.fail()
+    if condition:
+        return translator.condition(tree)
+    return translator.visit(tree)
+
+################################################################################
+
+class CompilerVisitor(coreir.CompilerVisitor):
+    """ C++ compiler visitor class. """
+
+    backend = "cpp"
+
+    def __init__(self, env, config):
+        self.env = env
+        self.config = config
+        # types of the variables of the current function
+        self.types = {}
+        # variables assigned by the current function, declared on entry
+        self.assigned = set()
+
+    def compile(self, node):
+        return super(CompilerVisitor, self).compile(node)
+
+    def block(self, nodes):
+        return flatten_ast(self.compile(nodes))
+
+    def place_type(self, place_name):
+        return self.env.marking_type.get_place_type_by_name(place_name)
+
+    ################################################################################
+    # Variables
+    ################################################################################
+
+    def expr_type(self, node):
+        if isinstance(node, list):
+            assert len(node) == 1
+            return self.expr_type(node[0])
+        elif isinstance(node, coreir.PyExpr):
+            return typeinfer.expression_type(node.expr.raw, self.types)
+        elif isinstance(node, coreir.Name):
+            return self.types.get(node.name)
+        elif isinstance(node, (coreir.Value, coreir.Token)):
+            value = node.value.raw if isinstance(node, coreir.Value) else node.value
+            return TypeInfo.from_raw(value)
+        return None
+
+    def bind_types(self, statements):
+        """ Infer the types of the variables bound or assigned by statements. """
+        for stmt in statements:
+            if isinstance(stmt, (coreir.TokenEnumeration, coreir.TokenLookup)):
+                self.types[stmt.token_var.name] = self.place_type(stmt.place_name).token_type
+
+            elif isinstance(stmt, coreir.MultiTokenEnumeration):
+                token_type = self.place_type(stmt.place_name).token_type
+                for sub_arc in stmt.multiarc.sub_arcs:
+                    self.types[sub_arc.data['local_variable'].name] = token_type
+
+            elif isinstance(stmt, coreir.Match):
+                tuple_info = stmt.tuple_info
+                tuple_type = self.types.get(tuple_info.data['local_variable'].name)
+                if tuple_type is not None and tuple_type.is_TupleType and len(tuple_type) == len(tuple_info):
+                    for component, component_type in zip(tuple_info.components, tuple_type.split()):
+                        self.types[component.data['local_variable'].name] = component_type
+
+            elif isinstance(stmt, coreir.Assign):
+                name = stmt.variable.name
+                self.assigned.add(name)
+                self.types[name] = typeinfer.join(self.types.get(name), self.expr_type(stmt.expr) or TypeInfo.AnyType)
+
+            for body in [ getattr(stmt, 'body', None), getattr(stmt, 'orelse', None) ]:
+                if isinstance(body, list):
+                    self.bind_types(body)
+
+    def begin_function(self, node):
+        self.types = {}
+        self.assigned = set()
+        self.bind_types(node.body)
+
+        declarations = []
+        for name in sorted(self.assigned):
+            if self.types[name].is_BlackToken:
+                continue
+            try:
+                cpp_type = type2str(self.types[name])
+            except CannotCompile:
+                raise CannotCompile("variable {} of function {} has no native type".format(name, node.function_name))
+            declarations.append(Verbatim("{} {}{{}};".format(cpp_type, identifier(name))))
+        return declarations
+
+    def bind(self, name, value):
+        """ Statements giving a value to a variable bound by a block. """
+        if name not in self.types:
+            raise CannotCompile("variable {} has no native type".format(name))
+        if self.types[name].is_BlackToken:
+            return []
+        if name in self.assigned:
+            return [ Verbatim("{} = {};".format(identifier(name), value)) ]
+        return [ Verbatim("const {} {} = {};".format(type2str(self.types[name]), identifier(name), value)) ]
+
+    def token_expr(self, node, place_type):
+        """ Expression of a token added to or removed from a place. """
+        if place_type.token_type.is_BlackToken:
+            return None
+        if not typeinfer.same_type(self.expr_type(node), place_type.token_type):
+            raise CannotCompile("token {} cannot be stored in place {}".format(node, place_type.info.name))
+        return self.compile(node)
+
+    ################################################################################
+    # Statements and expressions
+    ################################################################################
+
+    def compile_list(self, node):
+        if len(node) == 1 and isinstance(node[0], coreir.Expr):
+            return self.compile(node[0])
+        return super(CompilerVisitor, self).compile_list(node)
+
+    def compile_Comment(self, node):
+        return []
+
+    def compile_If(self, node):
+        stmts = [ Block("if ({})".format(self.compile(node.condition)), self.block(node.body)) ]
+        if node.orelse:
+            stmts.append(Block("else", self.block(node.orelse)))
+        return stmts
+
+    def compile_Compare(self, node):
+        left = node.left
+        tests = []
+        for op, comparator in zip(node.ops, node.comparators):
+            if not isinstance(op, coreir.EQ):
+                return self.cannot_compile(op)
+            left_type, right_type = self.expr_type(left), self.expr_type(comparator)
+            if left_type is None or not typeinfer.same_type(left_type, right_type):
+                raise CannotCompile("cannot compare {} and {}".format(left_type, right_type))
+            if not left_type.is_BlackToken:
+                tests.append("{} == {}".format(self.compile(left), self.compile(comparator)))
+        return " && ".join(tests) or "true"
+
+    def compile_CheckTuple(self, node):
+        # tuple types are known statically
+        tuple_type = self.types.get(node.tuple_var.name)
+        if tuple_type is not None and tuple_type.is_TupleType and len(tuple_type) == len(node.tuple_info):
+            return self.block(node.body)
+        return []
+
+    def compile_CheckType(self, node):
+        # variable types are known statically
+        if node.type.is_AnyType or typeinfer.same_type(self.types.get(node.variable.name), node.type):
+            return self.block(node.body)
+        return []
+
+    def compile_Match(self, node):
+        tuple_info = node.tuple_info
+        tuple_var = identifier(tuple_info.data['local_variable'].name)
+
+        stmts = []
+        tests = []
+        for index, component in enumerate(tuple_info.components):
+            name = component.data['local_variable'].name
+            stmts.extend(self.bind(name, "{}[{}]".format(tuple_var, index)))
+            if component.is_Value:
+                tests.append("{} == {}".format(identifier(name), native_value(component.raw)))
+
+        body = self.block(node.body)
+        if tests:
+            body = [ Block("if ({})".format(" && ".join(tests)), body) ]
+        return stmts + body
+
+    def compile_Assign(self, node):
+        if self.types[node.variable.name].is_BlackToken:
+            return []
+        return Verbatim("{} = {};".format(identifier(node.variable.name), self.compile(node.expr)))
+
+    def compile_Value(self, node):
+        return native_value(node.value.raw)
+
+    def compile_TokenEnumeration(self, node):
+        place_type = self.place_type(node.place_name)
+        return place_type.enumerate(self.env, node.marking_var.name,
+                                    lambda value : self.bind(node.token_var.name, value),
+                                    self.block(node.body))
+
+    def compile_TokenLookup(self, node):
+        place_type = self.place_type(node.place_name)
+        if place_type.token_type.is_BlackToken:
+            return place_type.lookup(self.env, node.marking_var.name, None, self.block(node.body))
+        return self.bind(node.token_var.name, self.compile(node.token_expr)) + \
+            [ place_type.lookup(self.env, node.marking_var.name, identifier(node.token_var.name), self.block(node.body)) ]
+
+    def compile_MultiTokenEnumeration(self, node):
+        place_type = self.place_type(node.place_name)
+        bindings = []
+        for sub_arc in node.multiarc.sub_arcs:
+            name = sub_arc.data['local_variable'].name
+            bindings.append((identifier(name), lambda value, name = name : self.bind(name, value)))
+        return place_type.enumerate_distinct(self.env, node.marking_var.name, bindings, self.block(node.body))
+
+    def compile_GuardCheck(self, node):
+        if isinstance(node.condition, coreir.PyExpr):
+            condition = translate(node.condition.expr.raw, self.types, condition = True)
+        else:
+            condition = self.compile(node.condition)
+        return Block("if ({})".format(condition), self.block(node.body))
+
+    def compile_PyExpr(self, node):
+        return translate(node.expr.raw, self.types)[0]
+
+    def compile_Name(self, node):
+        return identifier(node.name)
+
+    def compile_ProcedureCall(self, node):
+        return Verbatim("{}({});".format(node.function_name,
+                                         ", ".join( self.compile(arg) for arg in node.arguments )))
+
+    def compile_MarkingCopy(self, node):
+        # places are copied by value, the copy can be updated in place
+        return Verbatim("Marking {}({});".format(identifier(node.dst.name), identifier(node.src.name)))
+
+    def compile_AddMarking(self, node):
+        return self.env.marking_set_type.add_marking_stmt(self.env,
+                                                          identifier(node.marking_set_var.name),
+                                                          identifier(node.marking_var.name))
+
+    def compile_AddToken(self, node):
+        place_type = self.place_type(node.place_name)
+        return place_type.add_token_stmt(self.env,
+                                         self.token_expr(node.token_expr, place_type),
+                                         identifier(node.marking_var.name))
+
+    def compile_RemToken(self, node):
+        place_type = self.place_type(node.place_name)
+        return place_type.remove_token_stmt(self.env,
+                                            self.token_expr(node.token_expr, place_type),
+                                            identifier(node.marking_var.name))
+
+    def compile_RemTuple(self, node):
+        place_type = self.place_type(node.place_name)
+        return place_type.remove_token_stmt(self.env,
+                                            self.token_expr(node.tuple_expr, place_type),
+                                            identifier(node.marking_var.name))
+
+    def gen_tuple(self, tuple_info):
+        elts = []
+        for info in tuple_info:
+            if info.is_Value:
+                elts.append(native_value(info.raw))
+            elif info.is_Variable:
+                if not typeinfer.same_type(self.types.get(info.name), TypeInfo.Int):
+                    raise CannotCompile("variable {} has no native type".format(info.name))
+                elts.append(identifier(info.name))
+            elif info.is_Expression:
+                code, type_info = translate(info.raw, self.types)
+                if not type_info.is_Int:
+                    raise CannotCompile("expression {} has no native type".format(info.raw))
+                elts.append(code)
+            else:
+                raise CannotCompile("tuple component {} has no native type".format(info))
+        return "std::array<int, {}>{{{{{}}}}}".format(len(elts), ", ".join(elts))
+
+    def compile_TupleOut(self, node):
+        place_type = self.place_type(node.place_name)
+        if not (place_type.token_type.is_TupleType and len(place_type.token_type) == len(node.tuple_info)):
+            raise CannotCompile("tuple {} cannot be stored in place {}".format(node.tuple_info, node.place_name))
+        return place_type.add_token_stmt(self.env,
+                                         self.gen_tuple(node.tuple_info),
+                                         identifier(node.marking_var.name))
+
+    def compile_Token(self, node):
+        return native_value(node.value)
+
+    ################################################################################
+    # Functions
+    ################################################################################
+
+    def succ_params(self, node):
+        return [ ParamDecl(UserType('const Marking&'), identifier(node.arg_marking_var.name)),
+                 ParamDecl(UserType('MarkingSet&'), identifier(node.arg_marking_acc_var.name)),
+                 ParamDecl(UserType('NecoCtx&'), identifier(node.arg_ctx_var.name)) ]
+
+    def compile_SuccT(self, node):
+        self.env.push_variable_provider(node.variable_provider)
+        body = self.begin_function(node) + self.block(node.body)
+        self.env.pop_variable_provider()
+        return FunctionDef(returns = Void(),
+                           name = node.function_name,
+                           params = self.succ_params(node),
+                           body = body,
+                           qualifiers = 'static')
+
+    def compile_Succs(self, node):
+        return FunctionDef(returns = Void(),
+                           name = node.function_name,
+                           params = self.succ_params(node),
+                           body = self.block(node.body),
+                           qualifiers = 'static')
+
+    def compile_Init(self, node):
+        self.types = {}
+        self.assigned = set()
+        marking = identifier(node.marking_var.name)
+        body = [ Verbatim("Marking {} = {};".format(marking, self.env.marking_type.new_marking_expr(self.env))) ]
+        body.extend(self.block(node.body))
+        body.append(Verbatim("return {};".format(marking)))
+        return FunctionDef(returns = UserType('Marking'),
+                           name = node.function_name,
+                           params = [],
+                           body = body,
+                           qualifiers = 'static')
+
+################################################################################
+# EOF
+################################################################################
@@ -0,0 +1,10 @@
+""" Python backend plugin. """
+
+_backend_ = "cython"
+
+import check_impl
+import compile_impl
+
+################################################################################
+# EOF
+################################################################################
@@ -0,0 +1,10 @@
+""" Python backend plugin. """
+
+
+################################################################################
+
+_backend_ = "python"
+
+################################################################################
+
+import compile_impl
\ No newline at end of file
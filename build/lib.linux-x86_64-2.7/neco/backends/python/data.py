@@ -0,0 +1,1394 @@
+""" data structures designed for the compiled petrinet """
+
+from collections import Iterable, OrderedDict
+from copy import copy # a swallow copy is enough here
+from neco.extsnakes import Pid
+from process import PidTree
+from snakes.hashables import hdict, hashable
+from functools import partial
+import array
+import cPickle
+import cStringIO
+import hashlib
+import json
+import mmap
+import operator
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import traceback
+
+def pid_free_tuple_count_compare(ignore_set, left_pair, right_pair):
+    left,  left_count  = left_pair
+    right, right_count = right_pair
+    
+    length = len(left)
+    for i in xrange(length):
+        if i in ignore_set:
+            continue
+        li = left[i]
+        ri = right[i]
+        if li < ri:
+            return -1
+        elif li > ri:
+            return 1
+        d = left_count - right_count
+        if d != 0:
+            return d
+
+    return 0
+
+def build_pid_count_map(place):
+    pid_count_map = {}
+    for token in place:
+        try:
+            pid_count_map[token] += 1
+        except KeyError:
+            pid_count_map[token] = 0
+    return pid_count_map
+
+def pid_free_pid_count_compare(left_pair, right_pair):
+    _,  left_count = left_pair
+    _, right_count = right_pair
+    tmp = left_count - right_count
+    if tmp != 0:
+        return tmp
+    return 0
+
+def dump(e):
+    if hasattr(e, '__dump__'):
+        return e.__dump__()
+
+    else:
+        return repr(e)
+
+def canonical(obj):
+    """ Replace values by a canonical equal value of the same hash.
+
+    Booleans and longs become ints, ascii unicode strings become
+    strings, tuples are handled recursively.
+
+    >>> canonical((True, 1L, (u'a', 2.5)))
+    (1, 1, ('a', 2.5))
+
+    @param obj: object to normalize.
+    @type obj: C{object}
+    """
+    t = type(obj)
+    if t is tuple:
+        return tuple([ canonical(item) for item in obj ])
+    elif t is bool or t is long:
+        return int(obj)
+    elif t is unicode:
+        try:
+            return str(obj)
+        except UnicodeEncodeError:
+            return obj
+    return obj
+
+def pack(obj):
+    """ Encode an object into a byte string.
+
+    The pickler memo is disabled and values are made canonical
+    (see C{canonical}), thus equal objects are encoded using equal
+    strings.
+
+    >>> pack((1, 'a')) == pack((1, ''.join(['a'])))
+    True
+    >>> pack((1, 0)) == pack((1L, False))
+    True
+    >>> unpack(pack((1, 'a')))
+    (1, 'a')
+
+    @param obj: object to encode (must not be recursive).
+    @type obj: C{object}
+    @return: encoded object.
+    @rtype: C{str}
+    """
+    output = cStringIO.StringIO()
+    pickler = cPickle.Pickler(output, 2)
+    pickler.fast = 1
+    pickler.dump(canonical(obj))
+    return output.getvalue()
+
+def unpack(string):
+    """ Decode a byte string produced by C{pack}.
+
+    @param string: encoded object.
+    @type string: C{str}
+    """
+    return cPickle.loads(string)
+
+class VisitedStore(object):
+    """ Disk backed set of packed markings.
+
+    Keys are appended to a record file, an open addressing hash
+    table indexing them is memory mapped from a second file. Keys
+    are inserted by batches (C{merge}) sorted by slot such that the
+    table is swept in order instead of being randomly accessed.
+
+    >>> import tempfile, shutil
+    >>> directory = tempfile.mkdtemp()
+    >>> store = VisitedStore(directory, 4)
+    >>> sorted(store.merge(['b', 'a', 'b', 'c']))
+    ['a', 'b', 'c']
+    >>> sorted(store.merge(['c', 'd'] + [ str(i) for i in range(16) ]))[:2]
+    ['0', '1']
+    >>> len(store), 'd' in store, 'e' in store
+    (20, True, False)
+    >>> sorted(store)[-4:]
+    ['a', 'b', 'c', 'd']
+    >>> store.close()
+    >>> shutil.rmtree(directory)
+    """
+
+    _slot = struct.Struct('<QQ')
+    _length = struct.Struct('<I')
+
+    def __init__(self, directory, capacity=1 << 20):
+        """ Initialize the store in a fresh subdirectory of C{directory}.
+
+        @param directory: where store files are created.
+        @type directory: C{str}
+        @param capacity: initial number of table slots (power of 2).
+        @type capacity: C{int}
+        """
+        self.directory = tempfile.mkdtemp(prefix='neco-', dir=directory)
+        self.records = open(os.path.join(self.directory, 'records'), 'w+b')
+        self.reader = open(self.records.name, 'rb')
+        self.end = 0
+        self.flushed = 0
+        self.count = 0
+        self._map_table(capacity)
+
+    def _map_table(self, capacity):
+        name = os.path.join(self.directory, 'table.{}'.format(capacity))
+        table_file = open(name, 'w+b')
+        table_file.truncate(capacity * self._slot.size)
+        self.table_file = table_file
+        self.table = mmap.mmap(table_file.fileno(), 0)
+        self.capacity = capacity
+        self.mask = capacity - 1
+
+    def _grow(self):
+        old_file, old_table, old_capacity = self.table_file, self.table, self.capacity
+        self._map_table(old_capacity * 2)
+        slot_size = self._slot.size
+        for index in xrange(old_capacity):
+            h, ref = self._slot.unpack_from(old_table, index * slot_size)
+            if ref:
+                self._place(h, ref)
+        old_table.close()
+        old_file.close()
+        os.remove(old_file.name)
+
+    def _place(self, h, ref):
+        table, mask, slot_size = self.table, self.mask, self._slot.size
+        index = h & mask
+        while self._slot.unpack_from(table, index * slot_size)[1]:
+            index = (index + 1) & mask
+        self._slot.pack_into(table, index * slot_size, h, ref)
+
+    def _read(self, offset):
+        if offset >= self.flushed:
+            self.records.flush()
+            self.flushed = self.end
+        self.reader.seek(offset)
+        length, = self._length.unpack(self.reader.read(self._length.size))
+        return self.reader.read(length)
+
+    def _lookup(self, h, key):
+        table, mask, slot_size = self.table, self.mask, self._slot.size
+        index = h & mask
+        while True:
+            slot_h, ref = self._slot.unpack_from(table, index * slot_size)
+            if not ref:
+                return index
+            if slot_h == h and self._read(ref - 1) == key:
+                return -1
+            index = (index + 1) & mask
+
+    def merge(self, keys):
+        """ Insert a batch of keys (delayed duplicate detection).
+
+        @param keys: packed markings, duplicates are allowed.
+        @type keys: C{iterable}
+        @return: keys that were not already in the store, in table order.
+        @rtype: C{list}
+        """
+        while (self.count + len(keys)) * 2 > self.capacity:
+            self._grow()
+
+        mask = self.mask
+        batch = [ (hash(key) & 0xFFFFFFFFFFFFFFFF, key) for key in keys ]
+        batch.sort(key=lambda (h, key): (h & mask, h, key))
+
+        added = []
+        last = None
+        self.records.seek(self.end)
+        for h, key in batch:
+            if (h, key) == last:
+                continue
+            last = (h, key)
+            index = self._lookup(h, key)
+            if index < 0:
+                continue
+            self._slot.pack_into(self.table, index * self._slot.size, h, self.end + 1)
+            self.records.write(self._length.pack(len(key)))
+            self.records.write(key)
+            self.end += self._length.size + len(key)
+            added.append(key)
+
+        self.count += len(added)
+        return added
+
+    def keys(self, start=0, end=None):
+        """ Iterate over stored keys in insertion order.
+
+        @param start: offset of the first record.
+        @param end: offset after the last record (defaults to the end).
+        """
+        if end is None:
+            end = self.end
+        offset = start
+        while offset < end:
+            key = self._read(offset)
+            offset += self._length.size + len(key)
+            yield key
+
+    def __iter__(self):
+        return self.keys()
+
+    def __contains__(self, key):
+        return self._lookup(hash(key) & 0xFFFFFFFFFFFFFFFF, key) < 0
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        """ Release the store and remove its files. """
+        self.table.close()
+        self.table_file.close()
+        self.reader.close()
+        self.records.close()
+        shutil.rmtree(self.directory)
+
+def mix64(h):
+    """ 64 bits finalizer (splitmix64), spreads hash bits.
+
+    >>> mix64(1) != mix64(2), 0 <= mix64(-1) < 2 ** 64
+    (True, True)
+
+    @param h: value to mix (truncated to 64 bits).
+    @type h: C{int}
+    @rtype: C{int}
+    """
+    h &= 0xFFFFFFFFFFFFFFFF
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return h ^ (h >> 31)
+
+_fingerprint = struct.Struct('<Q')
+
+def fingerprint(string):
+    """ 64 bits fingerprint of a byte string, ie., the first bits of
+    its md5 digest. Markings are fingerprinted from their packed form
+    (see C{pack}), builtin hashes collide too often to be used.
+
+    >>> fingerprint(pack((-1,))) != fingerprint(pack((-2,)))
+    True
+    >>> 0 <= fingerprint('') < 2 ** 64
+    True
+
+    @param string: packed marking.
+    @type string: C{str}
+    @rtype: C{int}
+    """
+    return _fingerprint.unpack_from(hashlib.md5(string).digest())[0]
+
+# marking hashes are sums of token hashes, masked to keep them small
+TOKEN_HASH_MASK = 0xFFFFFFFFFFFF
+
+def token_hash(salt, token):
+    """ Contribution of a token to the hash of a marking.
+
+    Python tuple hashes are close to linear in their items, they are
+    mixed so that sums of contributions of distinct markings differ.
+
+    >>> token_hash(7, 1) + token_hash(7, 4) != token_hash(7, 2) + token_hash(7, 3)
+    True
+
+    @param salt: place specific salt.
+    @type salt: C{int}
+    @param token: token of the place.
+    @rtype: C{int}
+    """
+    return mix64(hash((salt, token))) & TOKEN_HASH_MASK
+
+class BitState(object):
+    """ Fixed size bit array of visited markings (supertrace).
+
+    A marking is represented by C{hashes} bits selected using its 64 bits
+    fingerprint, markings whose bits are all already set are considered
+    visited, some states may thus be omitted. Fingerprints are used
+    rather than C{__hash__} values that are more likely to collide.
+
+    >>> bitstate = BitState(1024, 3)
+    >>> bitstate.add(mix64(1)), bitstate.add(mix64(1))
+    (True, False)
+    >>> len(bitstate), bitstate.omission_probability() < 1e-6
+    (1, True)
+    """
+
+    def __init__(self, size, hashes=3):
+        """ Initialize an empty bit array.
+
+        @param size: size of the bit array in bytes.
+        @type size: C{int}
+        @param hashes: number of bits per marking.
+        @type hashes: C{int}
+        """
+        self.bits = bytearray(size)
+        self.size = size * 8
+        self.hashes = hashes
+        self.count = 0
+        self.set_bits = 0
+        self.expected_omissions = 0.0
+
+    def add(self, fp):
+        """ Set the bits of a marking.
+
+        Bit indexes are obtained by double hashing from C{fp}.
+
+        @param fp: fingerprint of the marking (see C{__fingerprint__}).
+        @type fp: C{int}
+        @return: C{True} if the marking was not already visited.
+        @rtype: C{bool}
+        """
+        bits, size = self.bits, self.size
+        h1 = mix64(fp)
+        h2 = mix64(h1) | 1
+        new = False
+        for i in xrange(self.hashes):
+            index = (h1 + i * h2) % size
+            byte, mask = index >> 3, 1 << (index & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                self.set_bits += 1
+                new = True
+        if new:
+            self.count += 1
+            # chance that the next new marking finds its bits set
+            self.expected_omissions += (float(self.set_bits) / size) ** self.hashes
+        return new
+
+    def omission_probability(self):
+        """ Estimated probability that a reachable marking was omitted.
+
+        @rtype: C{float}
+        """
+        if not self.count:
+            return 0.0
+        return min(1.0, self.expected_omissions / self.count)
+
+    def __len__(self):
+        return self.count
+
+class FingerprintSet(object):
+    """ Set of 64 bits marking fingerprints (hash compaction).
+
+    Fingerprints are stored in an open addressing table of unsigned
+    longs, thus a marking uses 8 to 16 bytes. Markings with equal
+    fingerprints are considered equal, some states may be omitted.
+
+    >>> fingerprints = FingerprintSet(4)
+    >>> [ fingerprints.add(fp) for fp in [1, 2, 1, 5, 6] ]
+    [True, True, False, True, True]
+    >>> len(fingerprints), 2 in fingerprints, 3 in fingerprints
+    (4, True, False)
+    """
+
+    def __init__(self, capacity=1 << 16):
+        """ Initialize an empty set.
+
+        @param capacity: initial number of slots (power of 2).
+        @type capacity: C{int}
+        """
+        self.table = array.array('L', [0]) * capacity
+        self.mask = capacity - 1
+        self.count = 0
+
+    def _index(self, fp):
+        table, mask = self.table, self.mask
+        index = mix64(fp) & mask
+        while table[index] and table[index] != fp:
+            index = (index + 1) & mask
+        return index
+
+    def _grow(self):
+        old_table = self.table
+        self.table = array.array('L', [0]) * (len(old_table) * 2)
+        self.mask = len(self.table) - 1
+        for fp in old_table:
+            if fp:
+                self.table[self._index(fp)] = fp
+
+    def add(self, fp):
+        """ Add a fingerprint.
+
+        @param fp: 64 bits fingerprint (0 is mapped to 1).
+        @type fp: C{int}
+        @return: C{True} if the fingerprint was not in the set.
+        @rtype: C{bool}
+        """
+        fp = fp or 1
+        index = self._index(fp)
+        if self.table[index]:
+            return False
+        self.table[index] = fp
+        self.count += 1
+        if self.count * 4 > len(self.table) * 3:
+            self._grow()
+        return True
+
+    def omission_probability(self):
+        """ Estimated probability that a reachable marking was omitted.
+
+        @rtype: C{float}
+        """
+        return min(1.0, self.count / 2.0 ** 65)
+
+    def __contains__(self, fp):
+        return self.table[self._index(fp or 1)] != 0
+
+    def __len__(self):
+        return self.count
+
+class CollapsedStore(object):
+    """ Set of markings stored as vectors of interned place contents
+    (collapse compression).
+
+    Each distinct content of a place is stored once in a per place
+    intern table, markings are tuples of indices in these tables,
+    thus equality and hashing only involve shared small integers.
+
+    >>> store = CollapsedStore()
+    >>> [ store.add(c) for c in [((1,), ()), ((1,), ('a',)), ((1,), ())] ]
+    [True, True, False]
+    >>> len(store), store.sizes()
+    (2, [1, 2])
+    >>> ((1,), ('a',)) in store, ((2,), ()) in store
+    (True, False)
+    >>> sorted(store)
+    [((1,), ()), ((1,), ('a',))]
+    """
+
+    def __init__(self):
+        self.tables = None      # content -> index, one per place
+        self.contents = None    # index -> content, one per place
+        self.states = set()
+
+    def _key(self, components, intern):
+        if self.tables is None:
+            self.tables = [ {} for _ in components ]
+            self.contents = [ [] for _ in components ]
+        key = []
+        for table, contents, component in zip(self.tables, self.contents, components):
+            index = table.get(component)
+            if index is None:
+                if not intern:
+                    return None
+                index = table[component] = len(contents)
+                contents.append(component)
+            key.append(index)
+        return tuple(key)
+
+    def add(self, components):
+        """ Add a marking.
+
+        @param components: place contents, see C{Marking.__components__}.
+        @type components: C{tuple}
+        @return: C{True} if the marking was not in the set.
+        @rtype: C{bool}
+        """
+        key = self._key(components, True)
+        if key in self.states:
+            return False
+        self.states.add(key)
+        return True
+
+    def sizes(self):
+        """ Number of distinct contents of each place.
+
+        @rtype: C{list(int)}
+        """
+        return [ len(contents) for contents in self.contents or [] ]
+
+    def __contains__(self, components):
+        return self._key(components, False) in self.states
+
+    def __iter__(self):
+        for key in self.states:
+            yield tuple( contents[index] for contents, index in zip(self.contents, key) )
+
+    def __len__(self):
+        return len(self.states)
+
+class Checkpoint(object):
+    """ Periodic on disk snapshot of an exploration.
+
+    The directory holds an append only C{visited} file of packed
+    markings, a C{frontier.<generation>} file and a C{manifest}
+    telling which prefix of C{visited} and which frontier belong to
+    the last complete checkpoint. Checkpoints are written by a forked
+    process working on a copy on write snapshot of the explorer, the
+    manifest is replaced atomically once all data is on disk.
+
+    >>> import tempfile, shutil
+    >>> directory = tempfile.mkdtemp()
+    >>> checkpoint = Checkpoint(directory)
+    >>> checkpoint.save(['a', 'b'], ['c'], pack=str), checkpoint.wait()
+    (True, True)
+    >>> checkpoint.save(['c'], ['d', 'e'], pack=str), checkpoint.wait()
+    (True, True)
+    >>> visited, frontier = Checkpoint(directory).load()
+    >>> visited, frontier
+    (['a', 'b', 'c'], ['d', 'e'])
+    >>> shutil.rmtree(directory)
+    """
+
+    _length = struct.Struct('<I')
+
+    def __init__(self, directory):
+        """ Initialize checkpointing in C{directory}, created if needed.
+
+        @param directory: checkpoint directory.
+        @type directory: C{str}
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.directory = directory
+        self.manifest = os.path.join(directory, 'manifest')
+        self.generation = 0
+        self.offset = 0
+        self.count = 0
+        self.frontier = None
+        self.child = None
+        self.writing = []
+        if os.path.exists(self.manifest):
+            self._read_manifest()
+
+    def _read_manifest(self):
+        with open(self.manifest) as f:
+            manifest = json.load(f)
+        self.generation = manifest['generation']
+        self.offset = manifest['visited_offset']
+        self.count = manifest['visited_count']
+        self.frontier = manifest['frontier']
+
+    def _write_records(self, f, keys):
+        size = 0
+        for key in keys:
+            f.write(self._length.pack(len(key)))
+            f.write(key)
+            size += self._length.size + len(key)
+        return size
+
+    def _read_records(self, name, end=None):
+        keys = []
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            offset = 0
+            while end is None or offset < end:
+                header = f.read(self._length.size)
+                if len(header) < self._length.size:
+                    break
+                length, = self._length.unpack(header)
+                keys.append(f.read(length))
+                offset += self._length.size + length
+        return keys
+
+    def _write(self, visited, frontier, pack):
+        """ Write a checkpoint, runs in the forked process. """
+        generation = self.generation + 1
+        name = os.path.join(self.directory, 'visited')
+        with open(name, 'ab') as f:
+            # drop records left by an interrupted checkpoint
+            f.truncate(self.offset)
+            offset = self.offset + self._write_records(f, ( pack(m) for m in visited ))
+            f.flush()
+            os.fsync(f.fileno())
+
+        frontier_name = 'frontier.{}'.format(generation)
+        with open(os.path.join(self.directory, frontier_name), 'wb') as f:
+            self._write_records(f, ( pack(m) for m in frontier ))
+            f.flush()
+            os.fsync(f.fileno())
+
+        manifest = { 'generation' : generation,
+                     'visited_offset' : offset,
+                     'visited_count' : self.count + len(visited),
+                     'frontier' : frontier_name }
+        with open(self.manifest + '.tmp', 'w') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(self.manifest + '.tmp', self.manifest)
+
+        if self.frontier and self.frontier != frontier_name:
+            os.remove(os.path.join(self.directory, self.frontier))
+
+    def _reap(self, options):
+        pid, status = os.waitpid(self.child, options)
+        if not pid:
+            return False
+        self.child = None
+        if status == 0:
+            self._read_manifest()
+            self.writing = []
+        else:
+            print >> sys.stderr, "checkpoint failed, will retry"
+        return True
+
+    def save(self, visited, frontier, pack=operator.methodcaller('__pack__')):
+        """ Start writing a checkpoint in the background.
+
+        Nothing is done if the previous checkpoint is still being
+        written, the caller should then keep accumulating markings.
+
+        @param visited: markings visited since the last call that returned C{True}.
+        @type visited: C{list}
+        @param frontier: markings to be explored.
+        @type frontier: C{iterable}
+        @param pack: function returning the packed form of a marking.
+        @return: C{True} if a checkpoint was started.
+        @rtype: C{bool}
+        """
+        if self.child is not None and not self._reap(os.WNOHANG):
+            return False
+        # markings of a failed checkpoint are written again
+        self.writing.extend(visited)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                self._write(self.writing, frontier, pack)
+                status = 0
+            except:
+                traceback.print_exc()
+            finally:
+                os._exit(status)
+        self.child = pid
+        return True
+
+    def wait(self):
+        """ Wait for the checkpoint being written.
+
+        @return: C{True} if the last checkpoint is complete.
+        @rtype: C{bool}
+        """
+        if self.child is not None:
+            self._reap(0)
+        return not self.writing
+
+    def load(self):
+        """ Read the last complete checkpoint.
+
+        @return: packed visited markings and packed frontier.
+        @rtype: C{tuple}
+        """
+        if self.frontier is None:
+            return [], []
+        return (self._read_records('visited', self.offset),
+                self._read_records(self.frontier))
+
+class NormalizationCache(object):
+    """ Bounded LRU cache of pid bijections computed by marking
+    normalization, indexed by packed markings.
+
+    >>> cache = NormalizationCache(2)
+    >>> cache.put('a', 1); cache.put('b', 2)
+    >>> cache.get('a'), cache.get('c')
+    (1, None)
+    >>> cache.put('c', 3)
+    >>> cache.get('b'), cache.get('a'), len(cache)
+    (None, 1, 2)
+    >>> cache.hits, cache.misses
+    (2, 2)
+    """
+
+    def __init__(self, size=4096):
+        """ Initialize an empty cache.
+
+        @param size: maximal number of entries, 0 disables the cache.
+        @type size: C{int}
+        """
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """ Bijection stored for C{key}, None if missing. """
+        try:
+            value = self.entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self.entries[key] = value    # most recently used
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+class multiset(hdict):
+    """
+    """
+
+    def __hash__(self):
+        return reduce(operator.xor, (hash(i) for i in self.items()), 252756382)
+
+    def token_hash(self, salt):
+        """ Sum of the contributions of the tokens to a marking hash.
+
+        Each token contributes C{token_hash(salt, token)}, generated
+        successor functions update marking hashes using the same function
+        when tokens are added or removed.
+
+        >>> m = multiset(['foo', 'foo', 'bar'])
+        >>> m.token_hash(7) == 2 * token_hash(7, 'foo') + token_hash(7, 'bar')
+        True
+        >>> multiset().token_hash(7)
+        0
+
+        @param salt: place specific salt.
+        @type salt: C{int}
+        @rtype: C{int}
+        """
+        return sum([ token_hash(salt, token) * count for token, count in self.iteritems() ])
+
+    def __init__(self, initial_data=[]):
+        """ builds a brand new multiset from some initial data
+
+        @param initial_data: list of elements (eventually with repetitions
+        @type initial_data: C{}
+        """
+        hdict.__init__(self)
+
+        for elt in initial_data:
+            self.add(elt)
+
+    def __add__(self, other):
+        new = self.copy()
+        new.add_items(other)
+        return new
+
+    def copy(self):
+        """ copy the multiset
+
+        @return: a copy of the multiset
+        @rtype: C{multiset}
+        """
+        result = multiset()
+        result.update(self)
+        return result
+
+    def add(self, elt):
+        """ adds an element to the multiset
+
+        >>> m = multiset()
+        >>> m
+        multiset([])
+        >>> m.add('foo')
+        >>> m
+        multiset(['foo'])
+        >>> m.add('foo')
+        >>> m
+        multiset(['foo', 'foo'])
+        >>> m.add('bar')
+        >>> m
+        multiset(['foo', 'foo', 'bar'])
+
+        @param elt: element to be added
+        @type elt: C{object}
+        """
+        try :
+            self[elt] += 1
+        except KeyError :
+            self[elt] = 1
+
+    def add_items(self, items):
+        """ adds a list of items to the multiset
+
+        >>> m = multiset()
+        >>> m.add_items(['foo', 'foo', 'bar'])
+        >>> m
+        multiset(['foo', 'foo', 'bar'])
+
+        @param items: items to be added
+        @type items: C{iterable}
+        """
+        for item in items:
+            self.add(item)
+
+    def remove(self, elt):
+        """ removes an element from the multiset
+
+        >>> m = multiset(['foo'])
+        >>> m
+        multiset(['foo'])
+        >>> m.remove('foo')
+        >>> m
+        multiset([])
+        >>> m = multiset(['foo', 'foo'])
+        >>> m
+        multiset(['foo', 'foo'])
+        >>> m.remove('foo')
+        >>> m
+        multiset(['foo'])
+
+        @param elt: element to be removed
+        @type elt: C{object}
+        """
+        if self.get(elt, 0) <= 0:
+            raise ValueError, "not enough occurrences"
+        self[elt] -= 1
+        if self[elt] == 0:
+            del self[elt]
+
+    def __iter__(self):
+        """ iterator over the values (with repetitions)
+
+        >>> m = multiset(['foo', 'foo', 'bar'])
+        >>> for e in m:
+        ...     e
+        'foo'
+        'foo'
+        'bar'
+
+        """
+        for value in dict.__iter__(self):
+            for count in range(self[value]):
+                yield value
+
+    def __str__(self):
+        """ return a human readable string representation
+
+        @return: human readable string representation of the multiset
+        @rtype: C{str}
+        """
+        return "{%s}" % ", ".join(str(x) for x in self)
+
+    def __repr__(self):
+        """ return a string representation that is suitable for C{eval}
+
+        @return: precise string representation of the multiset
+        @rtype: C{str}
+        """
+        return "multiset([%s])" % ", ".join(repr(x) for x in self)
+
+    def __len__(self):
+        """ number of elements, including repetitions
+
+        >>> len( multiset() )
+        0
+        >>> len( multiset(['foo']) )
+        1
+        >>> len( multiset(['foo', 'foo']) )
+        2
+        >>> len( multiset(['foo', 'bar', 'foo']) )
+        3
+
+        @rtype: C{int}
+        """
+        return reduce(operator.add, self.values(), 0)
+
+    def size(self):
+        """ number of elements, excluding repetitions
+
+        >>> multiset().size()
+        0
+        >>> multiset(['foo']).size()
+        1
+        >>> multiset(['foo', 'foo']).size()
+        1
+        >>> multiset(['foo', 'bar', 'foo']).size()
+        2
+
+        @rtype: C{int}
+        """
+        return dict.__len__(self)
+
+    def count(self, elt):
+        """ number of occurrences of an element
+
+        >>> m = multiset(['foo', 'bar', 'foo'])
+        >>> m.count('foo'), m.count('bar'), m.count('baz')
+        (2, 1, 0)
+
+        @rtype: C{int}
+        """
+        return self.get(elt, 0)
+
+    def __eq__(self, other):
+        """ test for equality
+
+        >>> multiset([1, 2, 3]*2) == multiset([1, 2, 3]*2)
+        True
+        >>> multiset([1, 2, 3]) == multiset([1, 2, 3, 3])
+        False
+
+        @param other: multiset to compare with
+        @type other: C{multiset}
+        @rtype{bool}
+        """
+        if len(self) != len(other):
+            return False
+        else:
+            for val in self:
+                try :
+                    if self[val] != other[val] :
+                        return False
+                except (KeyError, TypeError) :
+                    return False
+            for val in other:
+                try :
+                    if self[val] != other[val] :
+                        return False
+                except (KeyError, TypeError) :
+                    return False
+        return True
+
+    def __ne__(self, other):
+        """ test for difference
+
+        >>> multiset([1, 2, 3]*2) != multiset([1, 2, 3]*2)
+        False
+        >>> multiset([1, 2, 3]) != multiset([1, 2, 3, 3])
+        True
+
+        @param other: multiset to compare with
+        @type other: C{multiset}
+        """
+        return not (self == other)
+
+    def __lt__(self, other):
+        """ test for strict inclusion
+
+        >>> multiset([1, 2, 3]) < multiset([1, 2, 3, 4])
+        True
+        >>> multiset([1, 2, 3]) < multiset([1, 2, 3, 3])
+        True
+        >>> multiset([1, 2, 3]) < multiset([1, 2, 3])
+        False
+        >>> multiset([1, 2, 3]) < multiset([1, 2])
+        False
+        >>> multiset([1, 2, 2]) < multiset([1, 2, 3, 4])
+        False
+
+
+        @param other: multiset to compare with
+        @type other: C{multiset}
+        """
+        if not set(self.keys()) <= set(other.keys()):
+            return False
+        result = False
+        for value, times in dict.items(self):
+            count = other.get(value, 0)
+            if times > count:
+                return False
+            elif times < count:
+                result = True
+        return result or (dict.__len__(self) < dict.__len__(other))
+
+
+    def __le__ (self, other) :
+        """Test for inclusion inclusion
+
+        >>> multiset([1, 2, 3]) <= multiset([1, 2, 3, 4])
+        True
+        >>> multiset([1, 2, 3]) <= multiset([1, 2, 3, 3])
+        True
+        >>> multiset([1, 2, 3]) <= multiset([1, 2, 3])
+        True
+        >>> multiset([1, 2, 3]) <= multiset([1, 2])
+        False
+        >>> multiset([1, 2, 2]) <= multiset([1, 2, 3, 4])
+        False
+
+        @param other: the multiset to compare with
+        @type other: C{multiset}
+        @rtype: C{bool}
+        """
+        if not set(self.keys()) <= set(other.keys()):
+            return False
+        for value, times in dict.items(self):
+            count = other.get(value, 0)
+            if times > count:
+                return False
+        return True
+
+    def __gt__ (self, other) :
+        """Test for strict inclusion
+
+        >>> multiset([1, 2, 3, 4]) > multiset([1, 2, 3])
+        True
+        >>> multiset([1, 2, 3, 3]) > multiset([1, 2, 3])
+        True
+        >>> multiset([1, 2, 3]) > multiset([1, 2, 3])
+        False
+        >>> multiset([1, 2]) > multiset([1, 2, 3])
+        False
+        >>> multiset([1, 2, 3, 4]) > multiset([1, 2, 2])
+        False
+
+        @param other: the multiset to compare with
+        @type other: C{multiset}
+        @rtype: C{bool}
+        """
+        return other.__lt__(self)
+
+    def __ge__ (self, other) :
+        """Test for inclusion
+
+        >>> multiset([1, 2, 3, 4]) >= multiset([1, 2, 3])
+        True
+        >>> multiset([1, 2, 3, 3]) >= multiset([1, 2, 3])
+        True
+        >>> multiset([1, 2, 3]) >= multiset([1, 2, 3])
+        True
+        >>> multiset([1, 2]) >= multiset([1, 2, 3])
+        False
+        >>> multiset([1, 2, 3, 4]) >= multiset([1, 2, 2])
+        False
+
+        @param other: the multiset to compare with
+        @type other: C{multiset}
+        @rtype: C{bool}
+        """
+        return other.__le__(self)
+    def compare(self, other):
+        if self < other:
+            return -1
+        elif self > other:
+            return 1
+        else:
+            return 0
+
+    def pid_free_tuple_compare(self, other, ignore):
+
+        self_keys = self.keys()
+        other_keys = other.keys()
+        self_len = len(self_keys)
+        
+        tmp = len(self_keys) - len(other_keys)
+        if tmp != 0:
+            return tmp
+        if self_len == 0:
+            return 0
+        
+        # order items x values
+        cmp_fun = partial(pid_free_tuple_count_compare, ignore)
+        left  = sorted( self.iteritems(),  cmp = cmp_fun )
+        right = sorted( other.iteritems(), cmp = cmp_fun )
+        
+        for i in xrange(self_len):
+            tmp = cmp_fun(left[i], right[i])
+            if tmp != 0:
+                return tmp
+        return 0
+
+    def pid_free_hash(self, ignore):
+        # ignore = [1]
+        h = len(self)
+        for elt, count in self.items():
+            h ^= reduce(operator.xor, (hash(e) for i, e in enumerate(elt) if i not in ignore), 0xDEED1337) ^ count 
+        #h = reduce(operator.xor, (hash(e) for e in self.items()), 0x252756382)
+        return h
+    
+    def pid_pid_free_hash(self):
+        def f(p1, p2):
+            a1, a2 = p1
+            b1, b2 = p2
+            tmp = len(a1) - len(b1)
+            if tmp != 0:
+                return tmp
+            return a2 - b2
+            
+        sitems = sorted( self.iteritems(),  cmp = f)
+        
+        h = len(self)
+        magic = 0xC0FFEE
+        for i, (_, c) in enumerate(sitems):
+            h ^= c ^ (i * magic)
+
+        return h
+        
+
+    def pid_free_pid_compare(self, other):
+        self_keys  = self.keys()
+        other_keys = other.keys()
+        
+        self_len  = len(self_keys)
+        other_len = len(other_keys)
+        
+        tmp = self_len - other_len
+        if tmp != 0:
+            return tmp
+
+        left_map = build_pid_count_map(self_keys)
+        right_map = build_pid_count_map(other_keys)
+
+        left  = sorted(left_map.iteritems(), cmp = pid_free_pid_count_compare )
+        right = sorted(right_map.iteritems(), cmp = pid_free_pid_count_compare )
+        
+        for i in range(self_len):
+            tmp = pid_free_pid_count_compare(left[i], right[i])
+            if tmp != 0:
+                return tmp
+        return 0
+
+    def pid_free_first_tuple_compare(self, other):
+        self_keys = self.keys()
+        other_keys = other.keys()
+        l1 = len(self_keys)
+        l2 = len(other_keys)
+        i = 0
+
+        if l1 < l2:
+            return -1
+        elif l1 > l2:
+            return 1
+
+        # ensure we are working on sorted domain
+        self_keys.sort()
+        other_keys.sort()
+
+        for i in xrange(0,l1):
+            lkey = self_keys[i]
+            rkey = other_keys[i]
+
+            ltuplefree = lkey[:-1]
+            rtuplefree = rkey[:-1]
+            if ltuplefree == rtuplefree: # equal tuples, without pids
+                v1 = self[lkey]
+                v2 = other[rkey]
+                cmp = v1 - v2
+                if cmp != 0:
+                    return cmp
+                continue
+            elif ltuplefree < rtuplefree:
+                return -1
+            else:
+                return 1
+        return 0
+
+    def update(self, other):
+        hdict.update(self, other)
+
+    def domain(self):
+        """!
+        >>> multiset(['foo', 'foo', 'bar']).domain()
+        ['foo', 'bar']
+
+        """
+        return self.keys()
+
+    def pack(self):
+        """ Canonical representation of the multiset, ie., sorted
+        (token, count) pairs.
+
+        >>> multiset(['foo', 'bar', 'foo']).pack()
+        (('bar', 1), ('foo', 2))
+
+        @rtype: C{tuple}
+        """
+        return tuple(sorted(self.iteritems()))
+
+    @classmethod
+    def unpack(cls, items):
+        """ Build a multiset from its canonical representation.
+
+        >>> multiset.unpack((('bar', 1), ('foo', 2))) == multiset(['foo', 'bar', 'foo'])
+        True
+
+        @param items: (token, count) pairs.
+        @type items: C{tuple}
+        @rtype: C{multiset}
+        """
+        result = cls()
+        for token, count in items:
+            result[token] = count
+        return result
+
+    def __dump__(self):
+        l = ['[']
+        for token in self:
+            l.append(dump(token))
+            l.append(', ')
+        l.append(']')
+        return "".join(l) 
+
+def neco__tuple_update_pids(tup, new_pid_dict):
+    """
+    This function updates pids, with respect to C{new_pid_dict}, of a tuple object (C{tup}). 
+    
+    For example lets consider the dictionary
+
+    >>> pid_dict = { Pid.from_str('2') : Pid.from_str('1'), Pid.from_str('2.4') : Pid.from_str('1.1') }
+    
+    and token 
+
+    >>> token = (Pid.from_str('2'), Pid.from_str('2.4'), 42, Pid.from_str('2'))
+    
+    then this function updates the tuple in the following way
+
+    >>> neco__tuple_update_pids(token, pid_dict)
+    (Pid.from_str('1'), Pid.from_str('1.1'), 42, Pid.from_str('1'))
+    
+    The transformation is recursive on tuples
+
+    >>> token = (Pid.from_str('2'), Pid.from_str('2.4'), (42, Pid.from_str('2.4'), (Pid.from_str('2'), )), Pid.from_str('2'))
+    >>> neco__tuple_update_pids(token, pid_dict)
+    (Pid.from_str('1'), Pid.from_str('1.1'), (42, Pid.from_str('1.1'), (Pid.from_str('1'),)), Pid.from_str('1'))
+    
+    """
+    new_iterable = []
+    for tok in tup:
+        if isinstance(tok, Pid):
+            new_tok = Pid.from_list(new_pid_dict[tuple(tok.data)])
+        elif isinstance(tok, tuple):
+            new_tok = neco__tuple_update_pids(tok, new_pid_dict)
+        else:
+            new_tok = tok
+        new_iterable.append(new_tok)
+    return tuple(new_iterable)
+
+
+def neco__multiset_update_pids(ms, new_pid_dict):
+    """
+    This function updates pids within a multiset C{ms} with resepect to C{new_pid_dict}.
+    
+    >>> ms = multiset()
+    >>> ms.add_items([1, 2, Pid.from_str('2'), Pid.from_str('3')])
+    >>> neco__multiset_update_pids(ms, {Pid.from_str('2') : Pid.from_str('1'), Pid.from_str('3') : Pid.from_str('2')})
+    multiset([Pid.from_str('1'), 1, 2, Pid.from_str('2')])
+    
+    See L{neco__iterable_update_pids}.
+    """
+    new_ms = multiset()
+    for tok, count in ms.iteritems():
+        if isinstance(tok, Pid):
+            new_tok = Pid.from_list(new_pid_dict[tuple(tok.data)])
+        elif isinstance(tok, tuple):
+            new_tok = neco__tuple_update_pids(tok, new_pid_dict)
+        else:
+            new_tok = tok
+        new_ms[new_tok] = count
+    return new_ms
+
+def pid_place_type_update_pids(ms, new_pid_dict):
+    new_ms = multiset()
+    for tok, count in ms.iteritems():
+        new_tok = Pid.from_list(new_pid_dict[tuple(tok.data)])
+        new_ms[new_tok] = count
+    return new_ms
+    
+
+def generator_place_update_pids(ms, new_pid_dict):
+    """
+    This function updated a generator place multiset C{ms} with resepect to C{new_pid_dict}.
+
+    >>> sgen = multiset([ (Pid.from_str('1'), 6), (Pid.from_str('1.4'), 2) ])
+    >>> pid_tree = neco__create_pid_tree() 
+    >>> neco__generator_multiset_update_pid_tree(sgen, pid_tree)
+    >>> new_pid_dict = neco__normalize_pid_tree(pid_tree)
+    >>> new_pid_dict
+    {Pid.from_str('1'): Pid.from_str('1'), Pid.from_str('1.7'): Pid.from_str('1.3'), Pid.from_str('1.4.3'): Pid.from_str('1.1.1'),
+    Pid.from_str('1.4'): Pid.from_str('1.1')}
+    >>> neco__generator_token_transformer(sgen, new_pid_dict)
+    multiset([(Pid.from_str('1.1'), 0), (Pid.from_str('1'), 2)])
+
+    """
+    # print ">>> ", new_pid_dict
+    new_ms = multiset()
+    for pid, n in ms:
+        new_pid = Pid.from_list(new_pid_dict[tuple(pid.data)])
+        new_n = Pid.from_list(new_pid_dict[ tuple(pid.next(n).data) ]).ends_with() - 1
+        new_ms.add((new_pid, new_n))
+    return new_ms
+
+
+def neco__generator_multiset_update_pid_tree(ms, pid_tree):
+    """
+    This function updates a pid tree (C{pid_tree}) retrieving data from a generator place multiset C{ms}.
+    
+    >>> sgen = multiset([ (Pid.from_str('1'), 6), (Pid.from_str('1.4'), 2) ])
+    >>> pid_tree = neco__create_pid_tree() 
+    >>> neco__generator_multiset_update_pid_tree(sgen, pid_tree)
+    >>> pid_tree.print_structure()
+    <active=F>
+    |-1-<active=T>
+      |-4-<active=T>
+      | |-3-<active=T>
+      |-7-<active=T>
+
+    """
+    for pid, n in ms:
+        pid_tree.expanded_insert(pid)
+        pid_tree.expanded_insert(pid.next(n))
+
+def neco__iterable_update_pid_tree(iterable, pid_tree):
+    """
+    This function inserts pids to a pid tree (C{pid_tree}) from an iterable object (C{iterable}). 
+    
+    For example consider an empty tree and the token
+
+    >>> tree = PidTree()
+    >>> token = (Pid.from_str('1.1'), 42, Pid.from_str('1.2'), Pid.from_str('1.1'))
+    
+    then the call of the function modifies the tree as follows  
+
+    >>> neco__iterable_update_pid_tree(token, tree)
+    >>> tree.print_structure()
+    <active=F>
+    |-1-<active=F>
+      |-1-<active=T>
+      |-2-<active=T>
+    
+    Pids are also grabed from inner tuples if the iterable object is a tuple.
+
+    >>> token = (Pid.from_str('1.1'), (42, Pid.from_str('1'), (Pid.from_str('1.1.1'),)), Pid.from_str('1.2'), Pid.from_str('1.1'))
+    >>> neco__iterable_update_pid_tree(token, tree)
+    >>> tree.print_structure()
+    <active=F>
+    |-1-<active=T>
+      |-1-<active=T>
+      | |-1-<active=T>
+      |-2-<active=T>
+    """
+    for tok in iterable:
+        if isinstance(tok, Pid):
+            pid_tree.expanded_insert(tok)
+        elif isinstance(tok, tuple):
+            neco__iterable_update_pid_tree(tok, pid_tree)
+
+def neco__create_pid_tree():
+    return PidTree(0)
+
+def neco__normalize_pid_tree(pid_tree):
+    return pid_tree.reduce_sibling_offsets()
+
+            
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,328 @@
+from neco.core.info import VariableProvider
+from neco.core.nettypes import MarkingTypeMethodGenerator
+import pyast
+
+class InitGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        function = pyast.FunctionDef(name = '__init__',
+                                     args = pyast.A('self').param('alloc', default = 'True').ast())
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, name = 'self')
+
+        if_block = pyast.If(test = pyast.Name(id = 'alloc'))
+
+        for place_type in marking_type.place_types.values():
+            if_block.body.append(place_type.new_place_stmt(env, self_var))
+
+        function.body = [ pyast.E('self.{} = None'.format(marking_type.get_field('_hash').name)), if_block ]
+        return function
+
+class CopyGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, name = 'self')
+        marking_var = vp.new_variable(marking_type.type)
+
+        function = pyast.FunctionDef(name = 'copy',
+                                     args = pyast.A(self_var.name).param('alloc', default = 'True').ast())
+
+        tmp = [ pyast.Assign(targets = [pyast.Name(id = marking_var.name)],
+                             value = pyast.E('Marking(False)')) ]
+
+        for place_type in marking_type.place_types.values():
+            tmp.append(place_type.copy_stmt(env, marking_var, self_var))
+
+        tmp.append(pyast.Return(pyast.Name(id = marking_var.name)))
+        function.body = tmp
+        return function
+
+class EqGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, 'self')
+        other_var = vp.new_variable(marking_type.type, 'other')
+
+        function = pyast.FunctionDef(name = '__eq__', args = pyast.A(self_var.name).param(other_var.name).ast())
+
+        return_str = "return ("
+        for i, place_type in enumerate(marking_type.place_types.values()):
+            if i > 0:
+                return_str += " and "
+            field = place_type.field
+            return_str += "({} == {})".format(field.access_from(self_var),
+                                              field.access_from(other_var))
+        return_str += ")"
+
+        function.body = [ pyast.E(return_str) ]
+        return function
+
+class HashGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, 'self')
+
+        builder = pyast.Builder()
+        builder.begin_FunctionDef(name = '__hash__', args = pyast.A(self_var.name).ast())
+
+        builder.begin_If(test = pyast.E('self.{} != None'.format(marking_type.get_field('_hash').name)))
+        builder.emit_Return(pyast.E('self.{}'.format(marking_type.get_field('_hash').name)))
+        builder.end_If()
+
+        # sum of token contributions, successor functions derive the hash
+        # of new markings from the one of their parent (see CompilerVisitor)
+        builder.emit(pyast.E('h = 0'))
+
+        for place_type in marking_type.place_types.itervalues():
+            builder.emit(pyast.AugAssign(target = pyast.Name(id = 'h'),
+                                         op = pyast.Add(),
+                                         value = place_type.hash_expr(env, self_var)))
+
+        builder.emit(pyast.E('self.{} = h'.format(marking_type.get_field('_hash').name)))
+        # builder.emit(pyast.E("print h"))
+        builder.emit_Return(pyast.E("h"))
+        builder.end_FunctionDef()
+        return builder.ast()
+
+class FingerprintGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, 'self')
+
+        function = pyast.FunctionDef(name = '__fingerprint__',
+                                     args = pyast.A(self_var.name).ast())
+
+        # 64 bits, independent of __hash__: digest of the packed marking
+        function.body = [ pyast.Return(pyast.Call(func = pyast.E('data.fingerprint'),
+                                                  args = [ pyast.E('{}.__pack__()'.format(self_var.name)) ])) ]
+        return function
+
+class ReprGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        items = list(marking_type.place_types.iteritems())
+        items.sort(lambda (n1, t1), (n2, t2) : cmp(n1, n2))
+
+        builder = pyast.Builder()
+        builder.begin_FunctionDef(name = "__repr__", args = pyast.A("self").ast())
+
+        builder.emit(pyast.E('s = "hdict({"'))
+        for (i, (place_name, place_type)) in enumerate(items):
+            tmp = ',\n ' if i > 0 else ''
+            builder.emit(pyast.AugAssign(target = pyast.Name(id = 's'),
+                                       op = pyast.Add(),
+                                       value = pyast.BinOp(left = pyast.Str(s = tmp + "'" + place_name + "' : "),
+                                                           op = pyast.Add(),
+                                                           right = pyast.E('repr(self.' + place_type.field.name + ')')
+                                                           )
+                                       )
+                         )
+        builder.emit(pyast.E('s += "})"'))
+        builder.emit_Return(pyast.E('s'))
+
+        builder.end_FunctionDef()
+        return builder.ast()
+
+class DumpGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        items = list(marking_type.place_types.iteritems())
+        items.sort(lambda (n1, t1), (n2, t2) : cmp(n1, n2))
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, name = 'self')
+        list_var = vp.new_variable()
+
+        builder = pyast.Builder()
+        builder.begin_FunctionDef(name = "__dump__", args = pyast.A(self_var.name).ast())
+
+        builder.emit(pyast.E('%s = ["{"]' % list_var.name))
+        for (place_name, place_type) in items:
+            if place_type.is_ProcessPlace:
+                builder.emit(place_type.dump_expr(env, self_var, list_var))
+            else:
+                builder.emit(pyast.stmt(pyast.Call(func = pyast.E('{}.append'.format(list_var.name)),
+                                           args = [ pyast.BinOp(left = pyast.Str(s = repr(place_name) + " : "),
+                                                                op = pyast.Add(),
+                                                                right = pyast.BinOp(left = place_type.dump_expr(env, self_var),
+                                                                                    op = pyast.Add(),
+                                                                                    right = pyast.Str(', '))
+                                                            ) ]
+                                           )
+                                  )
+                             )
+
+        builder.emit(pyast.stmt(pyast.E('%s.append("}")' % list_var.name)))
+        builder.emit_Return(pyast.E('"\\n".join({})'.format(list_var.name)))
+
+        builder.end_FunctionDef()
+        return builder.ast()
+
+def pack_values(env, marking_type, self_var):
+    """ Per place packed values, in place name order. """
+    items = list(marking_type.place_types.iteritems())
+    items.sort(lambda (n1, t1), (n2, t2) : cmp(n1, n2))
+    return [ place_type.pack_expr(env, self_var) for (_, place_type) in items ]
+
+class PackGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, name = 'self')
+
+        function = pyast.FunctionDef(name = '__pack__',
+                                     args = pyast.A(self_var.name).ast())
+
+        values = pack_values(env, marking_type, self_var)
+        function.body = [ pyast.Return(pyast.Call(func = pyast.E('data.pack'),
+                                                  args = [ pyast.Tuple(values) ])) ]
+        return function
+
+class ComponentsGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, name = 'self')
+
+        function = pyast.FunctionDef(name = '__components__',
+                                     args = pyast.A(self_var.name).ast())
+
+        # hashable place contents, interned by collapse compression
+        function.body = [ pyast.Return(pyast.Tuple(pack_values(env, marking_type, self_var))) ]
+        return function
+
+class FromComponentsGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        items = list(marking_type.place_types.iteritems())
+        items.sort(lambda (n1, t1), (n2, t2) : cmp(n1, n2))
+
+        vp = VariableProvider()
+        marking_var = vp.new_variable(marking_type.type)
+
+        function = pyast.FunctionDef(name = '__from_components__',
+                                     args = pyast.A('values').ast(),
+                                     decorator_list = [ pyast.Name(id = 'staticmethod') ])
+
+        body = [ pyast.E('{} = Marking(False)'.format(marking_var.name)) ]
+        for index, (_, place_type) in enumerate(items):
+            value_expr = pyast.E('values[{}]'.format(index))
+            body.append(place_type.unpack_stmt(env, marking_var, value_expr))
+        body.append(pyast.Return(pyast.Name(id = marking_var.name)))
+
+        function.body = body
+        return function
+
+class UnpackGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        function = pyast.FunctionDef(name = '__unpack__',
+                                     args = pyast.A('string').ast(),
+                                     decorator_list = [ pyast.Name(id = 'staticmethod') ])
+        function.body = [ pyast.E('return Marking.__from_components__(data.unpack(string))') ]
+        return function
+
+class LineDumpGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        items = list(marking_type.place_types.iteritems())
+        items.sort(lambda (n1, t1), (n2, t2) : cmp(n1, n2))
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, name = 'self')
+        list_var = vp.new_variable()
+
+        builder = pyast.Builder()
+        builder.begin_FunctionDef(name = "__line_dump__", args = pyast.A(self_var.name).ast())
+
+        builder.emit(pyast.E('%s = ["{"]' % list_var.name))
+        for (place_name, place_type) in items:
+            if place_type.is_ProcessPlace:
+                builder.emit(place_type.dump_expr(env, self_var, list_var))
+            else:
+                builder.begin_If(test = place_type.place_expr(env, self_var))
+                builder.emit(pyast.stmt(pyast.Call(func = pyast.E('{}.append'.format(list_var.name)),
+                                           args = [ pyast.BinOp(left = pyast.Str(s = repr(place_name) + " : "),
+                                                              op = pyast.Add(),
+                                                              right = pyast.BinOp(left = place_type.dump_expr(env, self_var),
+                                                                                  op = pyast.Add(),
+                                                                                  right = pyast.Str(', '))
+                                                              ) ]
+                                           )
+                                  )
+                             )
+                builder.end_If()
+
+        builder.emit(pyast.stmt(pyast.E('%s.append("}")' % list_var.name)))
+        builder.emit_Return(pyast.E('"".join({})'.format(list_var.name)))
+
+        builder.end_FunctionDef()
+        return builder.ast()
+
+#
+# class DotGenerator(MarkingTypeMethodGenerator):
+#
+#    def generate(self, env):
+#        marking_type = env.marking_type
+#
+#        items = list(marking_type.place_types.iteritems())
+#        items.sort(lambda (n1, t1), (n2, t2) : cmp(n1, n2))
+#
+#        vp = VariableProvider()
+#        self_var = vp.new_variable(marking_type.type, name='self')
+#        list_var = vp.new_variable()
+#
+#        builder = pyast.Builder()
+#        builder.begin_FunctionDef( name = "__dot__", args = pyast.A(self_var.name).ast() )
+#
+#        builder.emit( pyast.E('%s = ["[shape=record,label=\\\"{"]' % list_var.name) )
+#        for i, (place_name, place_type) in enumerate(items):
+#            if i > 0:
+#                builder.emit( pyast.stmt( pyast.E('%s.append("\l|")' % list_var.name) ) )
+#
+#            if place_type.is_ProcessPlace:
+#                builder.emit( place_type.dump_expr(env, self_var, list_var) )
+#            else:
+#                builder.emit(pyast.stmt(pyast.Call(func=pyast.E('{}.append'.format(list_var.name)),
+#                                           args=[ pyast.BinOp(left = pyast.Str(s = repr(place_name) + " : "),
+#                                                            op = pyast.Add(),
+#                                                            right = pyast.BinOp(left = pyast.B('dot_protect_string').call([place_type.dump_expr(env, self_var)]).ast(),
+#                                                                              op = pyast.Add(),
+#                                                                              right = pyast.Str(', '))
+#                                                            ) ]
+#                                           )
+#                                  )
+#                             )
+#
+#        builder.emit(pyast.stmt(pyast.E('%s.append("\l}\\\"]")' % list_var.name)))
+#        builder.emit_Return(pyast.E('"".join({})'.format(list_var.name)))
+#
+#        builder.end_FunctionDef()
+#        return builder.ast()
@@ -0,0 +1,409 @@
+from copy import copy
+from neco.extsnakes import Pid
+
+def sibling_order(left, right):
+    return left.frag - right.frag
+
+def pid_free_marking_order(left, right):
+    # forbids
+    if left.is_next_pid():
+        if right.is_next_pid():
+            return 0
+        return 1
+    elif right.is_next_pid():
+        return -1
+
+    if left.marking:
+        res = left.marking.pid_free_compare(right.marking) if right.marking else 1
+    else:
+        res = -1 if right.marking else 0
+    if res == 0:
+        tmp = len(left.children) - len(right.children)
+        if tmp != 0:
+            return -tmp
+
+        for li, ri in zip(left.children, right.children):
+            tmp = pid_free_marking_order(li, ri)
+            if tmp != 0:
+                return tmp
+    return -res
+
+class mydefaultdict(dict):
+    def __missing__(self, key):
+        l = [key]
+        self[key] = l
+        return l
+
+NEXT_PID = "next_pid"
+
+class _References(dict):
+    """ Identity pid mapping recording the pids it is queried for. """
+
+    def __init__(self):
+        dict.__init__(self)
+        self.pids = set()
+
+    def __missing__(self, pid):
+        self.pids.add(pid)
+        return pid
+
+
+class PidTree(object):
+
+    def __init__(self, frag):
+        self.frag = frag
+        self.children = {}    # defaultdict(lambda : PidTree())
+        self.marking = None
+        self.orbits = None    # will be build during orderings
+
+    def set_nextpid(self):
+        self.marking = NEXT_PID
+
+    def is_next_pid(self):
+        return isinstance(self.marking, str)
+
+    def add_marking(self, pid, marking):
+        if len(pid) == 0:
+            self.marking = marking
+        else:
+            frag = pid[0]
+            if self.children.has_key(frag):
+                self.children[frag].add_marking(pid[1:], marking)
+            else:
+                tree = PidTree(frag)
+                self.children[frag] = tree
+                tree.add_marking(pid[1:], marking)
+
+    def strip(self, parent = None):
+        # strip children
+        for child in self.children.itervalues():
+            child.strip(self)
+
+        # true iff the node is not referenced
+        if self.marking is None:
+            if parent:
+                # add children to parent anremove the node
+                for child_frag, child in self.children.iteritems():
+                    parent.children[ self.frag + child_frag ] = child
+                del parent.children[self.frag]
+            else:
+                # if the current node is the root, replace the fragment by <1>
+                self.frag = Pid([1])
+
+    def order_tree(self, compare):
+        #
+        # Each time a child is ordered, its orbits are updated.
+        # In initial state, all children have singleton orbits.
+        # When compare detects an equality orbits are fused together.
+        #
+        # We use fragments as unique identifiers in orbits because
+        # there are no clashes (cf. Pid-tree definition)
+        #
+
+        # order children and populate orbits with singletons
+        orbits = {}
+        for child in self.children.itervalues():
+            child.order_tree(compare)
+            orbits[child.frag] = set([child])
+
+        # the following function is used to order children, it will use order
+        # to compare elements and if they are equal update respective orbits
+
+        def comparison_function(left, right):
+            # left and right are (pid-fragment x pid-tree) pairs.
+            comparison_result = compare(left, right)
+            # assert( comparison_result == -(compare(right, left)) )
+            if comparison_result == 0:
+                if left.is_next_pid():
+                    return comparison_result
+                # fuse orbits
+                left_frag, right_frag = left.frag, right.frag
+                left_orbit = orbits[left_frag]
+                right_orbit = orbits[right_frag]
+
+                left_orbit = left_orbit.union(right_orbit)
+
+                for c in left_orbit:
+                    orbits[c.frag] = left_orbit
+
+            # return the comparison_result since it's a comparison function
+            return comparison_result
+
+        # sort children and rebuild orbits
+        self.children = sorted(list(self.children.itervalues()), cmp = comparison_function)
+        # don't forget to store orbits
+        self.orbits = orbits
+
+    def order_tree_without_orbits(self, compare):
+        for child in self.children.itervalues():
+            child.order_tree_without_orbits(compare)
+        self.children = sorted(list(self.children.itervalues()), cmp = compare)
+
+    def _flatten(self, prefix, parent, nodes, pids, parents, groups):
+        group = []
+        for child in self.children.itervalues():
+            index = len(nodes)
+            prefix.append(child.frag)
+            nodes.append(child)
+            pids.append(tuple(prefix))
+            parents.append(parent)
+            group.append(index)
+            child._flatten(prefix, index, nodes, pids, parents, groups)
+            prefix.pop()
+        if group:
+            groups[parent] = group
+
+    def canonical_form(self, marking):
+        """ Compute the canonical representative of C{marking} with
+        respect to pid permutations.
+
+        Pids are labelled by partition refinement in the spirit of
+        nauty: nodes are coloured, colours are refined using the
+        colours of parents, children, and pids referenced by or
+        referencing their tokens, then ties between siblings are
+        broken by individualization.
+        The smallest packed marking reached is kept, and branches
+        reaching a marking through an automorphism of an already
+        explored branch are pruned. The tree must be stripped but
+        not ordered.
+
+        >>> from neco.backends.python.data import multiset
+        >>> class M(object):
+        ...     def __init__(self, tokens): self.p = multiset(tokens)
+        ...     def copy(self): return M(self.p)
+        ...     def update_pids(self, d):
+        ...         self.p = multiset( tuple(Pid.from_list(d[tuple(x.data)]) for x in t) for t in self.p )
+        ...     def __pack__(self): return repr(self.p.pack())
+        >>> def canonical(tokens):
+        ...     m, tree = M(tokens), PidTree(0)
+        ...     for t in tokens: tree.add_marking(t[0], M([t]))
+        ...     tree.strip()
+        ...     return tree.canonical_form(m)[1].p.pack()
+        >>> p1, p2, p3, p4 = [ Pid.from_str(s) for s in ('1', '2', '3', '4') ]
+        >>> canonical([(p1, p2), (p2, p1), (p3, p3)]) == canonical([(p4, p4), (p1, p3), (p3, p1)])
+        True
+        >>> canonical([(p1, p2), (p2, p1), (p3, p3)]) == canonical([(p1, p1), (p2, p3), (p3, p2)])
+        True
+        >>> canonical([(p1, p2), (p2, p1), (p3, p3)]) == canonical([(p1, p2), (p2, p3), (p3, p1)])
+        False
+
+        @param marking: marking the tree was built from.
+        @return: pid bijection (see L{build_map}) and normalized copy
+        of C{marking}.
+        """
+        nodes, pids, parents, groups = [], [], [], {}
+        self._flatten([], -1, nodes, pids, parents, groups)
+
+        # referrers[j] lists nodes owning tokens that reference pid j
+        index = dict( (pid, i) for i, pid in enumerate(pids) )
+        referrers = [ [] for _ in nodes ]
+        references = [ () for _ in nodes ]
+        for i, node in enumerate(nodes):
+            if not node.is_next_pid():
+                recorder = _References()
+                copy(node.marking).update_pids(recorder)
+                references[i] = tuple(recorder.pids)
+                for pid in recorder.pids:
+                    if index[pid] != i:
+                        referrers[index[pid]].append(i)
+
+        contents = {}
+
+        def content(i, relabel):
+            # only depends on the labels of referenced pids
+            key = (i, tuple( relabel[pid] for pid in references[i] ))
+            try:
+                return contents[key]
+            except KeyError:
+                # update_pids replaces places, no need for a deep copy
+                tmp = copy(nodes[i].marking)
+                tmp.update_pids(relabel)
+                contents[key] = value = tmp.__pack__()
+                return value
+
+        refined_cache = {}
+
+        def refine(colours):
+            key = tuple(colours)
+            if key in refined_cache:
+                return refined_cache[key]
+            while True:
+                relabel = dict( (pid, (colours[i],)) for i, pid in enumerate(pids) )
+                signatures = []
+                for i, node in enumerate(nodes):
+                    own = None if node.is_next_pid() else content(i, relabel)
+                    # how the node is seen by nodes referencing it
+                    relabel[pids[i]] = (-1,)
+                    seen = tuple(sorted( (colours[j], content(j, relabel)) for j in referrers[i] ))
+                    relabel[pids[i]] = (colours[i],)
+                    parent = colours[parents[i]] if parents[i] >= 0 else -1
+                    children = tuple(sorted( colours[j] for j in groups.get(i, ()) ))
+                    signatures.append( (colours[i], parent, own, seen, children) )
+                ranks = dict( (s, r) for r, s in enumerate(sorted(set(signatures))) )
+                refined = [ ranks[s] for s in signatures ]
+                if len(ranks) == len(set(colours)):
+                    refined_cache[key] = refined
+                    return refined
+                colours = refined
+
+        def target(colours):
+            # smallest colour shared by two siblings
+            cell = None
+            for group in groups.itervalues():
+                seen = set()
+                for i in group:
+                    if colours[i] in seen and (cell is None or colours[i] < cell):
+                        cell = colours[i]
+                    seen.add(colours[i])
+            return cell
+
+        def individualize(colours, cell, v):
+            return [ 2 * c + (c == cell and i != v) for i, c in enumerate(colours) ]
+
+        def leaf(colours):
+            labels = {}
+            for group in groups.itervalues():
+                for rank, i in enumerate(sorted(group, key = colours.__getitem__)):
+                    labels[i] = (rank + 1,)
+            bijection = {}
+            for i, pid in enumerate(pids):    # parents come first
+                if parents[i] >= 0:
+                    labels[i] = labels[parents[i]] + labels[i]
+                bijection[pid] = labels[i]
+            tmp = marking.copy()
+            tmp.update_pids(bijection)
+            return tmp.__pack__(), bijection, tmp
+
+        def first_path(colours):
+            while True:
+                colours = refine(colours)
+                cell = target(colours)
+                if cell is None:
+                    return leaf(colours)
+                colours = individualize(colours, cell, colours.index(cell))
+
+        def search(colours):
+            colours = refine(colours)
+            cell = target(colours)
+            if cell is None:
+                found = leaf(colours)
+                return found, found
+            members = [ i for i, c in enumerate(colours) if c == cell ]
+            best, first = search(individualize(colours, cell, members[0]))
+            for v in members[1:]:
+                path = first_path(individualize(colours, cell, v))
+                if path[0] == first[0] and path[1][pids[v]] == first[1][pids[members[0]]]:
+                    # equal markings, labelling first[1]^-1 . path[1] is an
+                    # automorphism mapping members[0] to v
+                    continue
+                found, _ = search(individualize(colours, cell, v))
+                if found[0] < best[0]:
+                    best = found
+            return best, first
+
+        best, _ = search([ int(node.is_next_pid()) for node in nodes ])
+        return best[1], best[2]
+
+    def build_map(self):
+        """
+        >>> from pprint import pprint
+        >>> n = PidTree(0)
+        >>> n.add_marking([2,42,7], None)
+        >>> n.add_marking([2,31,8], None)
+        >>> n.add_marking([2,32,8], None)
+        >>> n.add_marking([22,32,9], None)
+        >>> n.order_tree()
+        >>> new_pid_dict = n.build_map()
+        >>> n.print_structure()
+        |-1-
+        | |-1-
+        | | |-1-
+        | |-2-
+        | | |-1-
+        | |-3-
+        |   |-1-
+        |-2-
+          |-1-
+            |-1-
+        >>> pprint(sorted(new_pid_dict.iteritems()))
+        [((2,), (1,)),
+         ((2, 31), (1, 1)),
+         ((2, 31, 8), (1, 1, 1)),
+         ((2, 32), (1, 2)),
+         ((2, 32, 8), (1, 2, 1)),
+         ((2, 42), (1, 3)),
+         ((2, 42, 7), (1, 3, 1)),
+         ((22,), (2,)),
+         ((22, 32), (2, 1)),
+         ((22, 32, 9), (2, 1, 1))]
+        """
+
+#        print
+#        self.print_structure()
+        old_prefix = []
+        new_prefix = []
+        bijection = {}
+        self._update_map(old_prefix, new_prefix, bijection)
+        return bijection
+
+    def _update_map(self, old_prefix, new_prefix, bijection):
+        # children are assumed ordered
+        # normalize pids
+
+        i = 1
+        for child in self.children:
+            old_prefix.append(child.frag)
+            new_prefix.append(i)
+            i += 1
+            bijection[tuple(old_prefix)] = tuple(new_prefix)
+            child._update_map(old_prefix, new_prefix, bijection)
+            old_prefix.pop()
+            new_prefix.pop()
+
+    def print_structure(self, child_prefix = '', prefix = ''):
+        """
+        >>> n = PidTree(0)
+        >>> n.order_tree()
+        >>> n.print_structure()
+
+        >>> n = PidTree(0)
+        >>> _ = n.add_marking([1,1,1], None)
+        >>> n.order_tree()
+        >>> n.print_structure()
+        |-1-
+          |-1-
+            |-1-
+        >>> n = PidTree(0)
+        >>> _ = n.add_marking([1,1,1], None)
+        >>> _ = n.add_marking([1,2], None)
+        >>> n.order_tree()
+        >>> n.print_structure()
+        |-1-
+          |-1-
+          | |-1-
+          |-2-
+        >>> n = PidTree(0)
+        >>> _ = n.add_marking([1,1,1], None)
+        >>> _ = n.add_marking([1,2], None)
+        >>> _ = n.add_marking([1], None)
+        >>> n.order_tree()
+        >>> n.print_structure()
+        |-1-
+          |-1-
+          | |-1-
+          |-2-
+        """
+        if child_prefix:
+            print "{}".format(child_prefix)
+        length = len(self.children) - 1
+        child_prefix = prefix + '|-'
+        for i, child in enumerate(self.children):
+            child_prefix = prefix + '|-{}- {}'.format(child.frag,
+                                                      child.marking.__line_dump__() if child.marking != 'next_pid' else 'next_pid')
+            new_prefix = prefix + '| ' if i < length else prefix + '  '
+            child.print_structure(child_prefix, new_prefix)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,143 @@
+""" Structural place bounds from place invariants.
+
+P-semiflows are non negative integer weightings M{y} of places such
+that M{y.M} is the same for every reachable marking M{M}. A place
+covered by a semiflow M{y} holds at most M{y.M0 / y(p)} tokens.
+"""
+
+from fractions import gcd
+
+def arc_weight(arc):
+    """ Number of tokens consumed or produced by an arc.
+
+    @return: arc weight, C{None} if it cannot be known statically.
+    @rtype: C{int}
+    """
+    if arc.is_Variable or arc.is_Value or arc.is_Tuple or arc.is_Expression:
+        return 1
+    elif arc.is_Test:
+        return 0
+    elif arc.is_MultiArc:
+        weights = [ arc_weight(sub_arc) for sub_arc in arc.sub_arcs ]
+        if None in weights:
+            return None
+        return sum(weights)
+    # flush and generator arcs move a variable number of tokens
+    return None
+
+def incidence(net_info):
+    """ Incidence matrix restricted to the places whose arcs have known weights.
+
+    @return: place infos and their rows, one column per transition.
+    @rtype: C{tuple(list(PlaceInfo), list(list(int)))}
+    """
+    transitions = net_info.transitions
+    rows = dict( (place.name, [ 0 ] * len(transitions)) for place in net_info.places )
+    unknown = set()
+    for j, transition in enumerate(transitions):
+        for arcs, sign in [ (transition.input_arcs, -1), (transition.outputs, 1) ]:
+            for arc in arcs:
+                weight = arc_weight(arc)
+                if weight is None:
+                    unknown.add(arc.place_name)
+                else:
+                    rows[arc.place_name][j] += sign * weight
+
+    places = [ place for place in net_info.places if place.name not in unknown ]
+    return places, [ rows[place.name] for place in places ]
+
+def _normalize(row):
+    divisor = reduce(gcd, (abs(x) for x in row if x), 0)
+    if divisor > 1:
+        return [ x / divisor for x in row ]
+    return row
+
+def semiflows(matrix, limit = 10000):
+    """ Minimal support P-semiflows of an incidence matrix (Farkas algorithm).
+
+    >>> sorted(semiflows([[-1, 1], [1, -1], [1, -1]]))
+    [[1, 0, 1], [1, 1, 0]]
+    >>> semiflows([[1], [0]])
+    [[0, 1]]
+    >>> semiflows([[-1, 1], [2, -2]])
+    [[2, 1]]
+
+    @param matrix: incidence matrix, one row per place.
+    @type matrix: C{list(list(int))}
+    @param limit: maximal number of intermediate rows, no semiflow is
+    returned if it is exceeded.
+    @type limit: C{int}
+    @return: semiflows as lists of place weights.
+    @rtype: C{list(list(int))}
+    """
+    n = len(matrix)
+    if n == 0:
+        return []
+    columns = len(matrix[0])
+    # rows are (incidence part, weight part)
+    rows = [ (list(matrix[i]), [ int(i == k) for k in xrange(n) ]) for i in xrange(n) ]
+
+    for j in xrange(columns):
+        kept = [ row for row in rows if row[0][j] == 0 ]
+        positive = [ row for row in rows if row[0][j] > 0 ]
+        negative = [ row for row in rows if row[0][j] < 0 ]
+        for c1, y1 in positive:
+            for c2, y2 in negative:
+                a, b = c1[j], -c2[j]
+                combined = _normalize([ b * x1 + a * x2 for x1, x2 in zip(c1 + y1, c2 + y2) ])
+                kept.append((combined[:columns], combined[columns:]))
+
+        # only keep rows of minimal support
+        supports = [ frozenset(k for k, w in enumerate(y) if w) for _, y in kept ]
+        rows = []
+        seen = set()
+        for i, row in enumerate(kept):
+            support = supports[i]
+            if support in seen:
+                continue
+            if any(other < support for other in supports):
+                continue
+            seen.add(support)
+            rows.append(row)
+        if len(rows) > limit:
+            return []
+
+    return [ y for _, y in rows ]
+
+def place_bounds(net_info):
+    """ Structural bounds of the places covered by a P-semiflow.
+
+    @return: map from place names to their bound.
+    @rtype: C{dict(str -> int)}
+    """
+    places, matrix = incidence(net_info)
+    initial = [ len(place.tokens) for place in places ]
+
+    bounds = {}
+    for flow in semiflows(matrix):
+        total = sum(w * m for w, m in zip(flow, initial))
+        for place, weight in zip(places, flow):
+            if weight:
+                bound = total / weight
+                if bounds.get(place.name, bound) >= bound:
+                    bounds[place.name] = bound
+    return bounds
+
+def infer_bounds(net_info):
+    """ Record structural bounds in place infos.
+
+    Places bounded by 1 holding black tokens, integers or user types
+    become one-safe, other bounded places get their C{bound} updated.
+
+    @return: map from place names to their bound.
+    @rtype: C{dict(str -> int)}
+    """
+    bounds = place_bounds(net_info)
+    for place in net_info.places:
+        if place.name in bounds:
+            place.restrict_bound(bounds[place.name])
+    return bounds
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
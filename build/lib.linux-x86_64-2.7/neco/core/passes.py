@@ -0,0 +1,594 @@
+""" Optimization passes over netir.
+
+Passes rewrite successor functions in place before they are handed to
+a backend. They rely on variables introduced by the compiler being
+bound only once, and count the rewrites they perform.
+"""
+
+import ast
+from collections import defaultdict
+from neco.utils import flatten_lists
+import netir, typeinfer
+from info import VariableInfo, TokenInfo, ArcInfo, ExpressionInfo, TypeInfo
+
+################################################################################
+# helpers
+################################################################################
+
+class Opaque(Exception):
+    """ Raised when the variables read by a node cannot be known. """
+    pass
+
+# python nodes that can be evaluated without side effects and are
+# not expected to fail on well typed operands
+_PURE_NODES = (ast.Expression, ast.Name, ast.Num, ast.Str, ast.Tuple, ast.List,
+               ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+               ast.expr_context, ast.boolop, ast.unaryop, ast.cmpop,
+               ast.Add, ast.Sub, ast.Mult, ast.BitAnd, ast.BitOr, ast.BitXor)
+
+def parse(source):
+    try:
+        return ast.parse(source.strip(), mode = 'eval')
+    except SyntaxError:
+        return None
+
+def source_of(expr):
+    """ Source of a C{PyExpr} node, C{None} for other expressions. """
+    if isinstance(expr, netir.PyExpr):
+        if isinstance(expr.expr, ExpressionInfo):
+            return expr.expr.raw.strip()
+        return str(expr.expr).strip()
+    return None
+
+def is_pure(source):
+    """ Check if an expression can be evaluated speculatively.
+
+    >>> is_pure('(x + 1, y and not z)'), is_pure('f(x)'), is_pure('x / y')
+    (True, False, False)
+    """
+    tree = parse(source)
+    return tree is not None and all( isinstance(node, _PURE_NODES) for node in ast.walk(tree) )
+
+def expression_names(source):
+    tree = parse(source)
+    if tree is None:
+        raise Opaque(source)
+    return set( node.id for node in ast.walk(tree) if isinstance(node, ast.Name) )
+
+def _data_names(info):
+    names = set()
+    for key in ('local_variable', 'index'):
+        try:
+            value = info.data[key]
+        except KeyError:
+            continue
+        if isinstance(value, VariableInfo):
+            names.add(value.name)
+    return names
+
+def token_names(info):
+    """ Names used by a token info and its components. """
+    names = _data_names(info)
+    if isinstance(info, VariableInfo):
+        names.add(info.name)
+    elif info.is_Expression:
+        names.update(expression_names(info.raw))
+    elif info.is_Tuple:
+        for component in info.components:
+            names.update(token_names(component))
+    return names
+
+def arc_names(arc):
+    names = _data_names(arc)
+    names.update(arc.variables().keys())
+    for attribute in ('variable', 'tuple', 'inner', 'expr'):
+        info = getattr(arc, attribute, None)
+        if isinstance(info, TokenInfo):
+            names.update(token_names(info))
+    for sub_arc in getattr(arc, 'sub_arcs', []):
+        names.update(arc_names(sub_arc))
+    return names
+
+def read_names(node, names):
+    """ Collect the names a node may read, binders are included. """
+    if isinstance(node, list):
+        for child in node:
+            read_names(child, names)
+    elif isinstance(node, netir.PyExpr):
+        names.update(expression_names(source_of(node)))
+    elif isinstance(node, netir.Name):
+        names.add(node.name)
+    elif isinstance(node, netir.FunctionDef):
+        read_names(node.body, names)
+    elif isinstance(node, ast.AST):
+        for field in node._fields:
+            if isinstance(node, netir.Assign) and field == 'variable':
+                continue
+            read_names(getattr(node, field, None), names)
+    elif isinstance(node, TokenInfo):
+        names.update(token_names(node))
+    elif isinstance(node, ArcInfo):
+        names.update(arc_names(node))
+    return names
+
+def binders(node):
+    """ Names bound by a statement for its body, or after it for assignments. """
+    if isinstance(node, netir.Assign):
+        return set([ node.variable.name ])
+    elif isinstance(node, (netir.TokenEnumeration, netir.TokenLookup)):
+        names = set([ node.token_var.name ])
+        if node.arc is not None:
+            names.update(_data_names(node.arc))
+        return names
+    elif isinstance(node, netir.FlushIn):
+        return set([ node.token_var.name ])
+    elif isinstance(node, netir.MultiTokenEnumeration):
+        names = set()
+        for sub_arc in node.multiarc.sub_arcs:
+            names.update(_data_names(sub_arc))
+        return names
+    elif isinstance(node, netir.Match):
+        return set( component.data['local_variable'].name for component in node.tuple_info )
+    return set()
+
+def statement_lists(node):
+    """ Statement lists held by a node. """
+    return [ getattr(node, field) for field in ('body', 'orelse')
+             if isinstance(getattr(node, field, None), list) ]
+
+def walk(statements):
+    """ Iterate over statements and their nested statements. """
+    for stmt in statements:
+        yield stmt
+        for body in statement_lists(stmt):
+            for child in walk(body):
+                yield child
+
+def flatten_bodies(node):
+    for body in statement_lists(node):
+        body[:] = flatten_lists(body)
+        for stmt in body:
+            flatten_bodies(stmt)
+
+def assignment_counts(function):
+    counts = defaultdict(int)
+    for stmt in walk(function.body):
+        if isinstance(stmt, netir.Assign):
+            counts[stmt.variable.name] += 1
+    return counts
+
+def function_arguments(function):
+    return set( getattr(function, field).name for field in function._fields
+                if isinstance(getattr(function, field, None), VariableInfo) )
+
+################################################################################
+# passes
+################################################################################
+
+class OptimisationPass(object):
+    """ Base class of netir optimization passes. """
+
+    name = None
+    level = 2
+
+    def __init__(self):
+        self.changes = 0
+
+    def transform_ast(self, net_info, node):
+        """ Rewrite a function node.
+
+        @param net_info: net info.
+        @type net_info: C{NetInfo}
+        @param node: function node.
+        @type node: C{netir.FunctionDef}
+        @return: rewritten node.
+        """
+        if isinstance(node, netir.FunctionDef):
+            flatten_bodies(node)
+            try:
+                self.transform_function(net_info, node)
+            except Opaque:
+                pass
+        return node
+
+    def transform_function(self, net_info, function):
+        raise NotImplementedError
+
+    def report(self):
+        return "netir pass {}: {} changes".format(self.name, self.changes)
+
+class TypeInference(OptimisationPass):
+    """ Type intermediate variables from the expressions assigned to them.
+
+    Variables holding integers or tuples get native declarations, type
+    checks that always succeed are removed.
+    """
+
+    name = 'type-inference'
+
+    # guards narrowing the type of a variable
+    _NARROWING = { 'int' : TypeInfo.Int, 'str' : TypeInfo.String }
+
+    def transform_function(self, net_info, function):
+        self.counts = assignment_counts(function)
+        types = {}
+        for field in function._fields:
+            argument = getattr(function, field, None)
+            if isinstance(argument, VariableInfo) and not argument.type.is_AnyType:
+                types[argument.name] = argument.type
+        self.visit(function.body, types)
+
+    def expr_type(self, expr, types):
+        if isinstance(expr, netir.Name):
+            return types.get(expr.name, TypeInfo.AnyType)
+        source = source_of(expr)
+        if source is None:
+            return TypeInfo.AnyType
+        return typeinfer.expression_type(source, types) or TypeInfo.AnyType
+
+    def narrowed(self, condition):
+        """ Variable typed by an C{isinstance} guard. """
+        source = source_of(condition)
+        tree = parse(source) if source is not None else None
+        if tree is None:
+            return None
+        call = tree.body
+        if (isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id == 'isinstance'
+            and len(call.args) == 2 and all( isinstance(arg, ast.Name) for arg in call.args )
+            and call.args[1].id in self._NARROWING):
+            return call.args[0].id, self._NARROWING[call.args[1].id]
+        return None
+
+    def bound_types(self, stmt):
+        """ Types of the variables bound by a block for its body. """
+        if isinstance(stmt, (netir.TokenEnumeration, netir.TokenLookup)):
+            return [ (stmt.token_var.name, stmt.token_var.type) ]
+        elif isinstance(stmt, netir.Match):
+            return [ (component.data['local_variable'].name, component.type)
+                     for component in stmt.tuple_info ]
+        elif isinstance(stmt, netir.MultiTokenEnumeration):
+            return [ (sub_arc.data['local_variable'].name, stmt.multiarc.place_info.type)
+                     for sub_arc in stmt.multiarc.sub_arcs if sub_arc.is_Variable ]
+        return []
+
+    def visit(self, statements, types):
+        types = dict(types)
+        index = 0
+        while index < len(statements):
+            stmt = statements[index]
+            if isinstance(stmt, netir.Assign):
+                variable = stmt.variable
+                inferred = self.expr_type(stmt.expr, types)
+                if (variable.type.is_AnyType and self.counts[variable.name] == 1 and
+                    not inferred.is_AnyType and (inferred.is_Int or inferred.is_TupleType)):
+                    variable.update_type(inferred)
+                    self.changes += 1
+                # declared types are not enforced by every backend
+                types[variable.name] = inferred
+
+            elif isinstance(stmt, netir.CheckType):
+                if typeinfer.same_type(types.get(stmt.variable.name), stmt.type):
+                    statements[index:index + 1] = stmt.body
+                    self.changes += 1
+                    continue
+
+            elif isinstance(stmt, netir.CheckTuple):
+                tuple_type = types.get(stmt.tuple_var.name)
+                if (tuple_type is not None and not tuple_type.is_AnyType and tuple_type.is_TupleType
+                    and len(tuple_type) == len(stmt.tuple_info)):
+                    statements[index:index + 1] = stmt.body
+                    self.changes += 1
+                    continue
+
+            inner = dict(types)
+            for name in binders(stmt):
+                inner.pop(name, None)
+            for name, bound_type in self.bound_types(stmt):
+                if not bound_type.is_AnyType:
+                    inner[name] = bound_type
+            if isinstance(stmt, netir.GuardCheck):
+                narrowed = self.narrowed(stmt.condition)
+                if narrowed:
+                    inner[narrowed[0]] = narrowed[1]
+            for body in statement_lists(stmt):
+                self.visit(body, inner)
+            index += 1
+
+class LoopInvariantHoisting(OptimisationPass):
+    """ Move assignments and guard checks out of token enumerations.
+
+    Assignments of pure expressions that only read variables bound
+    before an enumeration are evaluated once before it, guard checks
+    ending an enumeration body are evaluated around it. Hoisted
+    expressions may be evaluated for empty places.
+    """
+
+    name = 'loop-invariant-hoisting'
+    level = 3
+
+    loops = (netir.TokenEnumeration, netir.MultiTokenEnumeration)
+
+    def transform_function(self, net_info, function):
+        self.counts = assignment_counts(function)
+        bound = function_arguments(function)
+        for stmt in walk(function.body):
+            bound.update(binders(stmt))
+        transition_info = getattr(function, 'transition_info', None)
+        if transition_info is not None:
+            for arc in transition_info.input_arcs:
+                bound.update(arc.variables().keys())
+        self.bound = bound
+        self.hoist(function.body, function_arguments(function))
+
+    def invariant(self, expr, available):
+        if isinstance(expr, netir.Value):
+            return True
+        if isinstance(expr, netir.Name):
+            names = set([ expr.name ])
+        else:
+            source = source_of(expr)
+            if source is None or not is_pure(source):
+                return False
+            names = expression_names(source)
+        return all( name in available or name not in self.bound for name in names )
+
+    def hoist(self, statements, available):
+        available = set(available)
+        i = 0
+        while i < len(statements):
+            stmt = statements[i]
+            inner = available | binders(stmt)
+            for body in statement_lists(stmt):
+                self.hoist(body, inner)
+
+            if isinstance(stmt, self.loops):
+                hoisted = self.extract(stmt.body, set(available))
+                statements[i:i] = hoisted
+                i += len(hoisted)
+                available.update( assign.variable.name for assign in hoisted )
+                self.changes += len(hoisted)
+
+                check = self.extract_guard(stmt, available)
+                if check is not None:
+                    statements[i] = check
+                    self.changes += 1
+
+            elif isinstance(stmt, netir.Assign):
+                available.add(stmt.variable.name)
+            i += 1
+
+    def extract(self, statements, available):
+        hoisted = []
+        kept = []
+        for stmt in statements:
+            if (isinstance(stmt, netir.Assign) and self.counts[stmt.variable.name] == 1
+                and self.invariant(stmt.expr, available)):
+                hoisted.append(stmt)
+                available.add(stmt.variable.name)
+                continue
+            kept.append(stmt)
+            for body in statement_lists(stmt):
+                hoisted.extend(self.extract(body, available))
+        statements[:] = kept
+        return hoisted
+
+    def extract_guard(self, loop, available):
+        # pure guard checks commute, look along the chain ending the body
+        parent = loop
+        while parent.body and isinstance(parent.body[-1], netir.GuardCheck):
+            for stmt in parent.body[:-1]:
+                if not isinstance(stmt, (netir.Assign, netir.Comment)):
+                    return None
+            check = parent.body[-1]
+            if self.invariant(check.condition, available):
+                parent.body[-1:] = check.body
+                check.body = [ loop ]
+                return check
+            parent = check
+        return None
+
+class CommonSubexpressions(OptimisationPass):
+    """ Reuse the value of an expression already assigned to a variable. """
+
+    name = 'common-subexpressions'
+
+    def transform_function(self, net_info, function):
+        self.counts = assignment_counts(function)
+        self.visit(function.body, {})
+
+    def kill(self, table, names):
+        for source, (variable, reads) in table.items():
+            if variable in names or reads & names:
+                del table[source]
+
+    def visit(self, statements, table):
+        table = dict(table)
+        for stmt in statements:
+            if isinstance(stmt, netir.Assign):
+                variable = stmt.variable.name
+                source = source_of(stmt.expr)
+                self.kill(table, set([ variable ]))
+                if source is not None:
+                    if source in table:
+                        stmt.expr = netir.Name(table[source][0])
+                        self.changes += 1
+                    elif self.counts[variable] == 1 and is_pure(source) and not self.trivial(source):
+                        reads = expression_names(source)
+                        if variable not in reads:
+                            table[source] = (variable, reads)
+
+            elif isinstance(stmt, netir.GuardCheck):
+                source = source_of(stmt.condition)
+                if source in table:
+                    stmt.condition = netir.Name(table[source][0])
+                    self.changes += 1
+
+            inner = dict(table)
+            self.kill(inner, binders(stmt))
+            if isinstance(stmt, (netir.MultiTokenEnumeration, netir.Match)):
+                # these blocks bind names that are not visible in netir
+                inner = {}
+            for body in statement_lists(stmt):
+                self.visit(body, inner)
+
+    def trivial(self, source):
+        return isinstance(parse(source).body, (ast.Name, ast.Num, ast.Str))
+
+class DeadStores(OptimisationPass):
+    """ Remove assignments of pure expressions to variables never read. """
+
+    name = 'dead-stores'
+
+    def transform_function(self, net_info, function):
+        while True:
+            reads = read_names(function, set())
+            removed = self.remove(function.body, reads)
+            if not removed:
+                return
+            self.changes += removed
+
+    def removable(self, expr):
+        if isinstance(expr, (netir.Name, netir.Value, netir.Pickle)):
+            return True
+        source = source_of(expr)
+        return source is not None and is_pure(source)
+
+    def remove(self, statements, reads):
+        kept = []
+        removed = 0
+        for stmt in statements:
+            if (isinstance(stmt, netir.Assign) and stmt.variable.name not in reads
+                and self.removable(stmt.expr)):
+                removed += 1
+                continue
+            kept.append(stmt)
+            for body in statement_lists(stmt):
+                removed += self.remove(body, reads)
+        statements[:] = kept
+        return removed
+
+class MergeTokenMoves(OptimisationPass):
+    """ Cancel the removal and the production of a same token.
+
+    A token consumed and produced again on a place leaves it unchanged,
+    places left untouched are then shared with the parent marking.
+    """
+
+    name = 'merge-token-moves'
+
+    # statements using a marking without changing it
+    neutral = (netir.MarkingCopy, netir.AddMarking, netir.UpdateHashSet, netir.Comment)
+
+    def transform_function(self, net_info, function):
+        # single assignments give names to other names or expressions
+        self.aliases = {}
+        self.values = {}
+        counts = assignment_counts(function)
+        for stmt in walk(function.body):
+            if isinstance(stmt, netir.Assign) and counts[stmt.variable.name] == 1:
+                if isinstance(stmt.expr, netir.Name):
+                    self.aliases[stmt.variable.name] = stmt.expr.name
+                elif isinstance(stmt.expr, (netir.PyExpr, netir.Value)):
+                    self.values[stmt.variable.name] = stmt.expr
+
+        changes = self.changes
+        self.visit(function.body)
+        if self.changes > changes:
+            for stmt in walk(function.body):
+                if isinstance(stmt, netir.MarkingCopy):
+                    self.prune(function, stmt)
+
+    def resolve(self, name):
+        seen = set()
+        while name in self.aliases and name not in seen:
+            seen.add(name)
+            name = self.aliases[name]
+        return name
+
+    def token_key(self, expr):
+        if isinstance(expr, list):
+            if len(expr) != 1:
+                return None
+            expr = expr[0]
+        if isinstance(expr, netir.Name):
+            name = self.resolve(expr.name)
+            if name in self.values:
+                return self.token_key(self.values[name])
+            return ('name', name)
+        if isinstance(expr, netir.Value):
+            source = repr(expr.value.raw)
+        else:
+            source = source_of(expr)
+            if source is None or not is_pure(source):
+                return None
+        try:
+            return ('value', repr(ast.literal_eval(source)))
+        except (ValueError, SyntaxError):
+            return ('expr', source)
+
+    def touches(self, stmt, marking, place):
+        """ Check if a statement may use a place of a marking. """
+        if not marking in read_names(stmt, set()):
+            return False
+        if isinstance(stmt, self.neutral):
+            return False
+        return getattr(stmt, 'place_name', place) == place or bool(statement_lists(stmt))
+
+    def visit(self, statements):
+        i = 0
+        while i < len(statements):
+            stmt = statements[i]
+            for body in statement_lists(stmt):
+                self.visit(body)
+
+            if isinstance(stmt, netir.RemToken):
+                marking = stmt.marking_var.name
+                key = self.token_key(stmt.token_expr)
+                for j in range(i + 1, len(statements)):
+                    other = statements[j]
+                    if not self.touches(other, marking, stmt.place_name):
+                        continue
+                    if (isinstance(other, netir.AddToken) and other.place_name == stmt.place_name
+                        and key is not None and self.token_key(other.token_expr) == key):
+                        del statements[j]
+                        del statements[i]
+                        self.changes += 1
+                        i -= 1
+                    break
+            i += 1
+
+    def prune(self, function, copy):
+        marking = copy.dst.name
+        touched = set()
+        for stmt in walk(function.body):
+            if stmt is copy or statement_lists(stmt) or not marking in read_names(stmt, set()):
+                continue
+            if isinstance(stmt, self.neutral):
+                continue
+            if isinstance(stmt, netir.UpdateFlow):
+                touched.add(stmt.place_info.name)
+            elif getattr(stmt, 'place_name', None) is not None:
+                touched.add(stmt.place_name)
+            else:
+                return
+        copy.mod = [ place_info for place_info in copy.mod
+                     if place_info.flow_control or place_info.name in touched ]
+
+def for_level(level):
+    """ Passes enabled at an optimization level, in application order.
+
+    >>> [ opt.name for opt in for_level(2) ]
+    ['type-inference', 'common-subexpressions', 'merge-token-moves', 'dead-stores']
+    >>> len(for_level(3)), for_level(1)
+    (5, [])
+
+    @param level: optimization level.
+    @type level: C{int}
+    @rtype: C{list(OptimisationPass)}
+    """
+    classes = [ TypeInference, LoopInvariantHoisting, CommonSubexpressions, MergeTokenMoves, DeadStores ]
+    return [ cls() for cls in classes if cls.level <= level ]
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,225 @@
+cdef extern from "ctypes.h":
+        void __Pyx_INCREF(object o)
+        cdef cppclass TGenericPlaceType[T]:
+                TGenericPlaceType()
+                TGenericPlaceType(TGenericPlaceType[T]&)
+
+                void decrement_ref()
+                void increment_ref()
+
+                int equals(TGenericPlaceType[T]&)
+                int compare(TGenericPlaceType[T]&)
+                int hash()
+                int not_empty()
+
+                clean()
+
+                void add(T& value)
+                void remove_by_value(T&)
+                void remove_by_index(int)
+
+                T& get(int)
+                int size()
+                void update(TGenericPlaceType[T]&)
+                char* cstr()
+
+        cdef cppclass TRunLengthPlaceType[T]:
+                TRunLengthPlaceType()
+                TRunLengthPlaceType(TRunLengthPlaceType[T]&)
+
+                void decrement_ref()
+                void increment_ref()
+
+                int equals(TRunLengthPlaceType[T]&)
+                int compare(TRunLengthPlaceType[T]&)
+                int hash()
+                int not_empty()
+
+                void add(T& value)
+                void add(T& value, int count)
+                void remove_by_value(T&)
+                void remove_by_index(int)
+
+                T& get(int)
+                int count(int)
+                int index_of(T&)
+                int count_of(T&)
+                int size()
+                int runs()
+                char* cstr()
+
+        cdef cppclass TPid[T]:
+                TPid()
+                TPid(int i)
+                TPid(TPid[T]& pid)
+                TPid(TPid[T]& pid, int next)
+                bint operator == (TPid[T]& right)
+                int compare(TPid[T]& right)
+
+        cdef cppclass Pair[T1, T2]:
+                T1 get_first()
+                T2 get_second()
+
+        cdef cppclass TGeneratorPlaceType[PidType, CounterType]:
+                TGeneratorPlaceType()
+                TGeneratorPlaceType(TGeneratorPlaceType[PidType, CounterType]&)
+
+                void increment_ref()
+                void decrement_ref()
+
+                void update_pid_counter(PidType&, CounterType&)
+                void remove_pid(PidType&)
+                char* cstr()
+                Pair[PidType, CounterType] get(int)
+
+                int size()
+                int hash()
+                int compare(TGeneratorPlaceType[PidType, CounterType]&)
+
+        cdef cppclass neco_list_t:
+                neco_list_t()
+                void push_back(void*)
+                int size()
+
+    # ctypedef struct neco_list_node_t:
+    #     pass
+
+    # ctypedef struct neco_list_t:
+    #     pass
+
+    # neco_list_t* neco_list_new()
+    # void neco_list_push_front(neco_list_t* list, object elt)
+    # void neco_list_delete(neco_list_t* list, deletion_callback del)
+    # neco_list_node_t* neco_list_first(neco_list_t* list)
+    # neco_list_node_t* neco_list_node_next(neco_list_node_t* node)
+
+
+cdef class MultiSet:
+        cdef dict _data
+
+        cdef MultiSet copy(MultiSet self)
+        cdef void add(MultiSet self, object elt)
+        cdef add_items(self, items)
+        cdef void remove(MultiSet self, elt)
+        cdef int size(MultiSet self)
+        cdef int hash(MultiSet self)
+        cdef int compare(MultiSet self, MultiSet other)
+        cdef void update(MultiSet self, MultiSet other)
+        cdef list domain(MultiSet self)
+        cpdef __dump__(MultiSet self)
+        cdef has_key(MultiSet self, object key)
+        cdef int count(MultiSet self, object key)
+        cdef tuple pack(MultiSet self)
+
+cdef api class Pid[object Pid, type Pid]:
+        cdef TPid[int]* mPid
+
+# cdef class Pid:
+#       cdef list data
+
+#       cpdef copy_update(Pid self, Pid other)
+#       cpdef Pid copy(Pid self)
+#       cpdef append(Pid self, int frag)
+#       cpdef Pid subpid(Pid self, int begin, int end)
+#       cpdef int at(Pid self, int i)
+#       cpdef Pid prefix(Pid self)
+#       cpdef Pid suffix(Pid self)
+#       cpdef int ends_with(Pid self)
+#       cdef int cmp(Pid self, Pid other)
+#       cpdef Pid next(Pid self, int pid_component)
+#       cpdef int parent(Pid self, Pid other)
+#       cpdef int parent1(Pid self, Pid other)
+#       cpdef int sibling(Pid self, Pid other)
+#       cpdef int sibling1(Pid self, Pid other)
+#       cdef int hash(Pid self)
+
+# cdef Pid initial_pid()
+
+# cdef list pid_place_type_copy(list origin)
+# cdef int pid_place_type_hash(list place)
+# cdef int pid_place_type_cmp(list l, list r)
+
+# cdef MultiSet int_place_type_to_multiset(int_place_type_t* pt)
+
+# cdef int list_hash(list l)
+# cdef int generator_place_type_hash(dict generator)
+# cdef dict generator_place_type_copy(dict generator)
+# cdef generator_place_type_cstr(dict generator)
+# cdef int generator_place_type_cmp(dict left, dict right)
+# cdef pid_place_type_cstr(list pid)
+
+cdef MultiSet int_place_type_to_multiset(TGenericPlaceType[int]* place_type)
+
+cdef tuple int_place_type_pack(TGenericPlaceType[int]* place_type)
+cdef TGenericPlaceType[int]* int_place_type_unpack(tuple items)
+
+cdef MultiSet int_run_place_type_to_multiset(TRunLengthPlaceType[int]* place_type)
+cdef list int_run_place_type_tokens(TRunLengthPlaceType[int]* place_type)
+cdef tuple int_run_place_type_pack(TRunLengthPlaceType[int]* place_type)
+cdef TRunLengthPlaceType[int]* int_run_place_type_unpack(tuple items)
+cdef MultiSet multiset_unpack(tuple items)
+
+cdef class VisitedStore:
+        cdef object directory, records, reader, table_file
+        cdef unsigned long long* slots
+        cdef unsigned long long mask, flushed
+        cdef readonly unsigned long long capacity, count, end
+
+        cdef _map_table(VisitedStore self, unsigned long long capacity)
+        cdef _unmap_table(VisitedStore self)
+        cdef _grow(VisitedStore self)
+        cdef _place(VisitedStore self, unsigned long long h, unsigned long long ref)
+        cdef bytes _read(VisitedStore self, unsigned long long offset)
+        cdef long long _lookup(VisitedStore self, unsigned long long h, bytes key)
+        cpdef list merge(VisitedStore self, list keys)
+        cpdef close(VisitedStore self)
+
+cdef inline unsigned long long mix64(unsigned long long h):
+        """ 64 bits finalizer (splitmix64), spreads hash bits. """
+        h = (h ^ (h >> 30)) * 0xBF58476D1CE4E5B9ULL
+        h = (h ^ (h >> 27)) * 0x94D049BB133111EBULL
+        return h ^ (h >> 31)
+
+cdef class BitState:
+        cdef unsigned char* bits
+        cdef readonly unsigned long long size, count, set_bits
+        cdef readonly int hashes
+        cdef readonly double expected_omissions
+
+        cpdef bint add(BitState self, unsigned long long fp)
+        cpdef double omission_probability(BitState self)
+
+cdef class FingerprintSet:
+        cdef unsigned long long* table
+        cdef readonly unsigned long long capacity, count
+
+        cdef unsigned long long _index(FingerprintSet self, unsigned long long fp)
+        cdef _grow(FingerprintSet self)
+        cpdef bint add(FingerprintSet self, unsigned long long fp)
+        cpdef double omission_probability(FingerprintSet self)
+
+cdef class CollapsedStore:
+        cdef list tables, contents
+        cdef set states
+
+        cdef tuple _key(CollapsedStore self, tuple components, bint intern)
+        cpdef bint add(CollapsedStore self, tuple components)
+        cpdef list sizes(CollapsedStore self)
+
+cdef class Checkpoint:
+        cdef object directory, manifest, frontier, child
+        cdef list writing
+        cdef readonly unsigned long long generation, offset, count
+
+        cdef _read_manifest(Checkpoint self)
+        cdef list _read_records(Checkpoint self, name, end=*)
+        cdef bint _reap(Checkpoint self, int options)
+        cpdef bint save(Checkpoint self, list visited, frontier, pack=*)
+        cpdef bint wait(Checkpoint self)
+        cpdef tuple load(Checkpoint self)
+
+cpdef bytes neco_pack(object obj)
+cpdef object neco_unpack(bytes string)
+cpdef unsigned long long neco_fingerprint(bytes string)
+cpdef __neco_compare__(object left, object right)
+
@@ -0,0 +1,495 @@
+import multiprocessing
+import sys
+from time import time
+
+cdef class NecoCtx:
+    def __cinit__(self):
+        self.state_space = set()
+        self.pid_free_hash = set()
+        self.remaining = set() 
+
+cdef public api NecoCtx neco_ctx(Marking mrk):
+    cdef NecoCtx ctx = NecoCtx()
+    ctx.remaining = set([mrk])
+    return ctx
+
+cpdef dump(object obj):
+    if hasattr(obj, '__dump__'):
+        return obj.__dump__()
+    else:
+        return repr(obj)
+
+cpdef state_space():
+    cdef set visited
+    cdef set visit
+    cdef set succ
+    cdef NecoCtx ctx = NecoCtx()
+    
+    
+    #cdef int last_count = 0
+    try:
+        visited = set()
+        visit = set([init()])
+        succ = set()
+        count = 0
+        
+        ctx.remaining = visit
+        ctx.state_space = visited
+        ctx.pid_free_hash = set()
+
+        while True:
+            m = visit.pop()
+            visited.add(m)
+            succ = succs(m, ctx)
+            visit.update(succ.difference(visited))
+    except KeyError:
+        return visited
+    return visited
+
+cdef set _por_fire(list fired, int i, Marking m, NecoCtx ctx):
+    cdef set succ = fired[i]
+    if succ is None:
+        succ = set()
+        neco_por_fire(i, m, succ, ctx)
+        fired[i] = succ
+    return succ
+
+cpdef set succs_por(Marking m, NecoCtx ctx, dict stats):
+    """ Successors of m by a stubborn set of transitions, grown from
+    the first enabled transition (deadlocks are preserved). """
+    cdef int count = len(neco_por_conflicts)
+    cdef list fired = [ None ] * count
+    cdef set stubborn
+    cdef list stack
+    cdef set succ
+    cdef int seed = 0
+    cdef int i, j
+    stats['states'] += 1
+
+    while seed < count and not _por_fire(fired, seed, m, ctx):
+        seed += 1
+    if seed == count:
+        return set()
+
+    stubborn = set([seed])
+    stack = [seed]
+    while stack and len(stubborn) < count:
+        i = stack.pop()
+        if _por_fire(fired, i, m, ctx):
+            dependent = neco_por_conflicts[i]
+        else:
+            dependent = neco_por_enablers[i]
+        for j in dependent:
+            if not j in stubborn:
+                stubborn.add(j)
+                stack.append(j)
+
+    succ = set()
+    for i in stubborn:
+        succ.update(_por_fire(fired, i, m, ctx))
+
+    if len(stubborn) < count:
+        stats['reduced'] += 1
+        stats['skipped'] += count - len(stubborn)
+    return succ
+
+cpdef state_space_por():
+    """ State space exploration using partial order reduction
+    (stubborn sets), returns visited markings and reduction counters. """
+    cdef NecoCtx ctx = NecoCtx()
+    cdef dict stats = { 'states' : 0, 'reduced' : 0, 'skipped' : 0 }
+    cdef set done = set()
+    cdef set todo
+    cdef Marking m
+    cdef Marking s
+
+    todo = set([init()])
+    ctx.remaining = todo
+    ctx.state_space = done
+    ctx.pid_free_hash = set()
+
+    try:
+        while True:
+            m = todo.pop()
+            done.add(m)
+            for s in succs_por(m, ctx, stats):
+                if not s in done:
+                    todo.add(s)
+    except KeyError:
+        pass
+    return done, stats
+
+cpdef state_space_incremental():
+    """ State space exploration re-evaluating only transitions that may
+    be enabled: those enabled in the predecessor and those reading a
+    place modified by the fired transition. Returns visited markings
+    and the number of skipped transition evaluations. """
+    cdef NecoCtx ctx = NecoCtx()
+    cdef int transitions = len(neco_affected)
+    cdef list affected = [ frozenset(indexes) for indexes in neco_affected ]
+    cdef long long skipped = 0
+    cdef set done = set()
+    cdef set todo
+    cdef dict candidates
+    cdef list fired
+    cdef set succ
+    cdef int i
+    cdef Marking m
+    cdef Marking s
+
+    m = init()
+    todo = set([m])
+    candidates = { m : frozenset(range(transitions)) }
+    ctx.remaining = todo
+    ctx.state_space = done
+    ctx.pid_free_hash = set()
+
+    try:
+        while True:
+            m = todo.pop()
+            done.add(m)
+            fired = []
+            evaluated = candidates.pop(m)
+            for i in evaluated:
+                succ = set()
+                neco_por_fire(i, m, succ, ctx)
+                if succ:
+                    fired.append((i, succ))
+            skipped += transitions - len(evaluated)
+
+            enabled = frozenset([ i for i, _ in fired ])
+            for i, succ in fired:
+                next_candidates = enabled | affected[i]
+                for s in succ:
+                    if s in done:
+                        continue
+                    if s in todo:
+                        # both sets contain the transitions enabled in s
+                        candidates[s] &= next_candidates
+                    else:
+                        todo.add(s)
+                        candidates[s] = next_candidates
+    except KeyError:
+        pass
+    return done, skipped
+
+cpdef state_space_packed():
+    """ State space exploration storing packed markings only,
+    markings are rebuilt when removed from the frontier. """
+    cdef set done = set()
+    cdef set todo
+    cdef bytes key
+    cdef int count = 0
+    cdef NecoCtx ctx = NecoCtx()
+    cdef Marking m
+    cdef Marking s
+
+    todo = set([init().__pack__()])
+    ctx.remaining = todo
+    ctx.state_space = done
+    ctx.pid_free_hash = set()
+
+    try:
+        while True:
+            count += 1
+            key = todo.pop()
+            done.add(key)
+            m = neco_marking_unpack(key)
+            for s in succs(m, ctx):
+                key = s.__pack__()
+                if not key in done:
+                    todo.add(key)
+    except KeyError:
+        return done
+    return done
+
+cpdef state_space_checkpointed(directory, double every=600, bint resume=False):
+    """ State space exploration periodically saving visited markings
+    and frontier to directory, checkpoints are written by a forked
+    process and only markings visited since the previous checkpoint
+    are appended to disk. """
+    cdef NecoCtx ctx = NecoCtx()
+    cdef ctypes_ext.Checkpoint checkpoint = ctypes_ext.Checkpoint(directory)
+    cdef set done
+    cdef set todo
+    cdef list new = []
+    cdef int count
+    cdef Marking m
+    cdef Marking s
+    next_checkpoint = time() + every
+
+    if resume:
+        visited, frontier = checkpoint.load()
+        done = set([ neco_marking_unpack(key) for key in visited ])
+        todo = set([ neco_marking_unpack(key) for key in frontier ])
+    else:
+        done = set()
+        todo = set([init()])
+    count = len(done)
+
+    ctx.remaining = todo
+    ctx.state_space = done
+    ctx.pid_free_hash = set()
+
+    try:
+        while True:
+            count += 1
+            m = todo.pop()
+            done.add(m)
+            new.append(m)
+            for s in succs(m, ctx):
+                if not s in done:
+                    todo.add(s)
+            if (count % 250 == 0):
+                new_time = time()
+                if new_time >= next_checkpoint and checkpoint.save(new, todo):
+                    new = []
+                    next_checkpoint = new_time + every
+    except KeyError:
+        pass
+
+    checkpoint.wait()
+    checkpoint.save(new, todo)
+    checkpoint.wait()
+    return done
+
+cpdef state_space_external(directory, long long memory=256 << 20):
+    """ Breadth first exploration storing visited markings on disk,
+    successors of a layer are buffered then sorted and merged against
+    the store (delayed duplicate detection) each time the buffer
+    exceeds memory bytes. """
+    cdef NecoCtx ctx = NecoCtx()
+    cdef ctypes_ext.VisitedStore store = ctypes_ext.VisitedStore(directory)
+    cdef list buffer
+    cdef long long size
+    cdef unsigned long long layer_start = 0
+    cdef unsigned long long layer_end
+    cdef int layer = 0
+    cdef bytes key
+    cdef Marking s
+
+    store.merge([init().__pack__()])
+    while layer_start < store.end:
+        layer_end = store.end
+        buffer = []
+        size = 0
+        for key in store.keys(layer_start, layer_end):
+            for s in succs(neco_marking_unpack(key), ctx):
+                key = s.__pack__()
+                buffer.append(key)
+                size += len(key) + 64    # rough per entry overhead
+                if size > memory:
+                    store.merge(buffer)
+                    buffer = []
+                    size = 0
+        store.merge(buffer)
+        layer_start = layer_end
+        layer += 1
+
+    return store
+
+cpdef state_space_bitstate(unsigned long long size, int hashes=3):
+    """ Depth first exploration storing visited markings in a bit
+    array (supertrace), some markings may be omitted. """
+    cdef NecoCtx ctx = NecoCtx()
+    cdef ctypes_ext.BitState visited = ctypes_ext.BitState(size, hashes)
+    cdef list todo
+    cdef Marking m
+    cdef Marking s
+
+    m = init()
+    visited.add(m.__fingerprint__())
+    todo = [m]
+
+    while todo:
+        m = todo.pop()
+        for s in succs(m, ctx):
+            if visited.add(s.__fingerprint__()):
+                todo.append(s)
+    return visited
+
+cpdef state_space_fingerprints():
+    """ Depth first exploration storing 64 bits fingerprints of visited
+    markings only (hash compaction), some markings may be omitted. """
+    cdef NecoCtx ctx = NecoCtx()
+    cdef ctypes_ext.FingerprintSet visited = ctypes_ext.FingerprintSet()
+    cdef list todo
+    cdef Marking m
+    cdef Marking s
+
+    m = init()
+    visited.add(m.__fingerprint__())
+    todo = [m]
+
+    while todo:
+        m = todo.pop()
+        for s in succs(m, ctx):
+            if visited.add(s.__fingerprint__()):
+                todo.append(s)
+    return visited
+
+cpdef state_space_collapsed():
+    """ Depth first exploration storing visited markings as vectors of
+    interned place contents (collapse compression). """
+    cdef NecoCtx ctx = NecoCtx()
+    cdef ctypes_ext.CollapsedStore visited = ctypes_ext.CollapsedStore()
+    cdef list todo
+    cdef Marking m
+    cdef Marking s
+
+    m = init()
+    visited.add(m.__components__())
+    todo = [m]
+
+    while todo:
+        m = todo.pop()
+        for s in succs(m, ctx):
+            if visited.add(s.__components__()):
+                todo.append(s)
+    return visited
+
+cpdef state_space_graph():
+    cdef set visit
+    cdef set visited = set()
+    cdef set succ
+    cdef int next = 1
+    cdef dict graph = {}
+    cdef dict mrk_id_map = {}
+    cdef list succ_list = []
+
+    cdef NecoCtx ctx = NecoCtx()
+    
+    cdef Marking m = init()
+    cdef Marking s_mrk
+
+    visit = set([m])
+    mrk_id_map[m] = next
+    next += 1
+
+    ctx.remaining = visit
+    ctx.state_space = visited
+    ctx.pid_free_hash = set()
+    
+    try:
+        while True:
+            m = visit.pop()
+            visited.add(m)
+
+            # new marking, get the id
+            current_node_id = mrk_id_map[m]
+            succ = succs(m, ctx)
+            succ_list = []
+
+            for s_mrk in succ:
+                if mrk_id_map.has_key(s_mrk):
+                    node_id = mrk_id_map[s_mrk]
+                    succ_list.append(node_id)
+                else:
+                    node_id = next
+                    next += 1
+                    succ_list.append(node_id)
+                    mrk_id_map[s_mrk] = node_id
+
+            graph[current_node_id] = succ_list
+
+            visit.update(succ.difference(visited))
+    except KeyError:
+        return graph, mrk_id_map
+    return graph, mrk_id_map
+
+cdef int _owner(object marking, int workers):
+    return hash(marking) % workers
+
+cdef _flush_batch(list buffers, int owner, list queues, object pending):
+    cdef list batch = buffers[owner]
+    if batch:
+        with pending.get_lock():
+            pending.value += 1
+        queues[owner].put(batch)
+        buffers[owner] = []
+
+def _state_space_worker(int me, int workers, list queues, object pending, object results, collect, int batch_size):
+    """ Explore the slice of the state space owned by worker C{me}. """
+    cdef NecoCtx ctx = NecoCtx()
+    cdef set done = set()
+    cdef set todo = set()
+    cdef list buffers = [ [] for _ in range(workers) ]
+    cdef list buffer
+    cdef int owner
+    cdef Marking m
+    cdef Marking s
+    inbox = queues[me]
+
+    ctx.state_space = done
+    ctx.remaining = todo
+    ctx.pid_free_hash = set()
+
+    while True:
+        batch = inbox.get()
+        if batch is None:
+            break
+
+        for key in batch:
+            m = neco_marking_unpack(key)
+            if not m in done:
+                todo.add(m)
+
+        try:
+            while True:
+                m = todo.pop()
+                done.add(m)
+                for s in succs(m, ctx):
+                    owner = _owner(s, workers)
+                    if owner == me:
+                        if not s in done:
+                            todo.add(s)
+                    else:
+                        buffer = buffers[owner]
+                        buffer.append(s.__pack__())
+                        if len(buffer) >= batch_size:
+                            _flush_batch(buffers, owner, queues, pending)
+        except KeyError:
+            pass
+
+        for owner in range(workers):
+            _flush_batch(buffers, owner, queues, pending)
+
+        with pending.get_lock():
+            pending.value -= 1
+            finished = (pending.value == 0)
+        if finished:
+            for queue in queues:
+                queue.put(None)
+
+    results.put((me, len(done), [ m.__pack__() for m in done ] if collect else None))
+
+def state_space_parallel(int workers, collect=False, int batch_size=256):
+    """ Explore the state space using C{workers} processes, markings
+    are partitioned using their hash and sent packed between processes. """
+    cdef list queues = [ multiprocessing.Queue() for _ in range(workers) ]
+    cdef set visited = set()
+    cdef int count = 0
+    results = multiprocessing.Queue()
+    pending = multiprocessing.Value('l', 1)
+
+    processes = [ multiprocessing.Process(target=_state_space_worker,
+                                          args=(i, workers, queues, pending, results, collect, batch_size))
+                  for i in range(workers) ]
+    for process in processes:
+        process.start()
+
+    m = init()
+    queues[_owner(m, workers)].put([m.__pack__()])
+
+    for _ in range(workers):
+        _, size, done = results.get()
+        count += size
+        if collect:
+            visited.update([ neco_marking_unpack(key) for key in done ])
+
+    for process in processes:
+        process.join()
+
+    if collect:
+        return visited
+    return count
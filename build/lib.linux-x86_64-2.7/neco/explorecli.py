@@ -0,0 +1,404 @@
+""" CLI for neco exploration tool.
+
+This module provides a CLI for neco that supports python 2.7.
+
+The loading of the module will raise a runtime error
+if loaded with wrong python version.
+"""
+
+from neco import g_logo
+from neco.utils import fatal_error
+from time import time
+import argparse
+import bz2
+import gzip
+import imp
+import os
+import sys
+if (2, 7, 0) <= sys.version_info < (3, 0, 0) :
+    VERSION = (2, 7)
+else:
+    raise RuntimeError("unsupported python version")
+
+
+def try_open_file(file_name):
+    """ Helper function to open files with compression support (bz2, gz).
+    """
+    try:
+        std_map = { 'stdout' : sys.stdout, 'stderr' : sys.stderr }
+        out_file = std_map[file_name]
+    except KeyError:
+        _, extension = os.path.splitext(file_name)
+        if extension == '.bz2':
+            print "bz2 compression enabled for file {}".format(file_name)
+            out_file = bz2.BZ2File(file_name, 'w', 2048, compresslevel=6)
+        elif extension == '.gz':
+            print "gzip compression enabled for file {}".format(file_name)
+            out_file = gzip.GzipFile(file_name, 'w', compresslevel=6)
+        elif extension == '':
+            print "raw text output for file {}".format(file_name)
+            out_file = open(file_name, 'w')
+        else:
+            print >> sys.stderr, "unsupported extension: {}".format(extension)
+            print >> sys.stderr, "supported extensions: .bz2 .gz"
+            exit(-1)
+    return out_file
+
+def parse_size(string):
+    """ Helper function to parse sizes with an optional unit suffix (K, M, G).
+
+    >>> parse_size('512'), parse_size('64K'), parse_size('2G')
+    (512, 65536, 2147483648)
+    """
+    units = { 'K' : 1 << 10, 'M' : 1 << 20, 'G' : 1 << 30 }
+    try:
+        factor = units[string[-1:].upper()]
+        string = string[:-1]
+    except KeyError:
+        factor = 1
+    try:
+        return int(string) * factor
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid size: {}".format(string))
+
+def parse_duration(string):
+    """ Helper function to parse durations with an optional unit suffix (s, m, h).
+
+    >>> parse_duration('45'), parse_duration('10m'), parse_duration('2h')
+    (45.0, 600.0, 7200.0)
+    """
+    units = { 's' : 1, 'm' : 60, 'h' : 3600 }
+    try:
+        factor = units[string[-1:].lower()]
+        string = string[:-1]
+    except KeyError:
+        factor = 1
+    try:
+        return float(string) * factor
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid duration: {}".format(string))
+
+
+class Main(object):
+
+    _instance_ = None
+
+    def __init__(self, progname, logo=False):
+
+        assert(not self.__class__._instance_) # assert called only once
+        self.__class__._instance_ = self # setup the unique instance
+
+        # parse arguments
+        parser = argparse.ArgumentParser(progname,
+                                         argument_default=argparse.SUPPRESS,
+                                         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+        parser.add_argument('--dump', '-d', default=None, dest='dump', metavar='DUMPFILE', type=str,
+                            help='dump markings to file (supports bz2 and gz compression)')
+
+        parser.add_argument('--graph', '-g', default=None, dest='graph', nargs=2, metavar=('MAPFILE',
+                                                                                          'GRAPHFILE'),
+                            help='produce reachability graph (supports bz2 and gz compression)')
+
+        parser.add_argument('--profile', '-p', default=False, dest='profile', action='store_true',
+                            help='enable profiling support')
+
+        parser.add_argument('--packed', default=False, dest='packed', action='store_true',
+                            help='store packed markings only (lower memory usage)')
+
+        parser.add_argument('--external', '-e', default=None, dest='external', metavar='DIR', type=str,
+                            help='store visited markings on disk in DIR (breadth first exploration with delayed duplicate detection)')
+
+        parser.add_argument('--memory', '-m', default='256M', dest='memory', metavar='SIZE', type=parse_size,
+                            help='memory budget for successors buffered by external exploration (suffixes K, M, G)')
+
+        parser.add_argument('--bitstate', '-b', default=None, dest='bitstate', metavar='SIZE', type=parse_size,
+                            help='store visited markings in a bit array of SIZE bytes (supertrace, some markings may be omitted)')
+
+        parser.add_argument('--hashes', '-k', default=3, dest='hashes', metavar='K', type=int,
+                            help='number of bits per marking used by bitstate exploration')
+
+        parser.add_argument('--hash-compaction', '-c', default=False, dest='hash_compaction', action='store_true',
+                            help='store 64 bits fingerprints of visited markings only (some markings may be omitted)')
+
+        parser.add_argument('--collapse', default=False, dest='collapse', action='store_true',
+                            help='store visited markings as vectors of interned place contents (lower memory usage)')
+
+        parser.add_argument('--por', default=False, dest='por', action='store_true',
+                            help='partial order reduction using stubborn sets (preserves deadlocks)')
+
+        parser.add_argument('--incremental', default=False, dest='incremental', action='store_true',
+                            help='only evaluate transitions that may have been enabled by the last firing')
+
+        parser.add_argument('--checkpoint', default=None, dest='checkpoint', metavar='DIR', type=str,
+                            help='periodically save visited markings and frontier to DIR')
+
+        parser.add_argument('--checkpoint-every', default='10m', dest='checkpoint_every', metavar='DURATION', type=parse_duration,
+                            help='delay between two checkpoints (suffixes s, m, h)')
+
+        parser.add_argument('--resume', default=None, dest='resume', metavar='DIR', type=str,
+                            help='resume exploration from the last checkpoint in DIR, and keep checkpointing there')
+
+        parser.add_argument('--workers', '-w', default=0, dest='workers', metavar='N', type=int,
+                            help='explore using N processes, markings are partitioned using their hash (0 means sequential exploration)')
+
+        parser.add_argument('--normalization-cache', default=4096, dest='normalization_cache', metavar='N', type=int,
+                            help='number of pid normalizations remembered (0 disables the cache)')
+
+        parser.add_argument('--arc-profile', default=None, dest='arc_profile', metavar='FILE', type=str,
+                            help='save the arc profile of a net compiled with --instrument-arcs to FILE')
+
+        parser.add_argument('--print-mcc', default=False, dest='print_mcc', action='store_true',
+                            help='prints only states count as output (ignored if any other option is given).')
+
+        args = parser.parse_args()
+
+        profile = args.profile
+        dump_markings = args.dump
+        graph = args.graph
+
+        # setup config
+        self.print_mcc = args.print_mcc
+        self.workers = args.workers
+        self.packed = args.packed
+        self.external = args.external
+        self.memory = args.memory
+        self.bitstate = args.bitstate
+        self.hashes = args.hashes
+        self.hash_compaction = args.hash_compaction
+        self.collapse = args.collapse
+        self.por = args.por
+        self.incremental = args.incremental
+        self.checkpoint = args.checkpoint
+        self.checkpoint_every = args.checkpoint_every
+        self.resume = args.resume
+        self.normalization_cache = args.normalization_cache
+        self.arc_profile = args.arc_profile
+        self.profile=profile,
+
+        if not args.print_mcc:
+            print "{} uses python {}".format(progname, sys.version)
+            if logo:
+                print g_logo
+
+
+        self.dump_markings = dump_markings
+        self.graph = bool(graph)
+        if graph:
+            map_file, graph_file = graph
+            self.map_file, self.graph_file = map_file, graph_file
+
+        if dump_markings:
+            if graph:
+                fatal_error("dump markings option cannot be used with graph option.")
+
+        if self.workers < 0:
+            fatal_error("number of workers must be positive.")
+        if self.external and not os.path.isdir(self.external):
+            fatal_error("{} is not a directory.".format(self.external))
+        if self.hashes < 1:
+            fatal_error("number of hashes must be positive.")
+        if self.resume and not os.path.exists(os.path.join(self.resume, 'manifest')):
+            fatal_error("no checkpoint found in {}.".format(self.resume))
+        if self.checkpoint_every <= 0:
+            fatal_error("checkpoint delay must be positive.")
+        if self.normalization_cache < 0:
+            fatal_error("normalization cache size must be positive.")
+
+        # alternative exploration modes are exclusive
+        modes = [ name for name, enabled in [ ('graph', graph),
+                                              ('workers', self.workers),
+                                              ('packed', self.packed),
+                                              ('external', self.external),
+                                              ('bitstate', self.bitstate),
+                                              ('hash-compaction', self.hash_compaction),
+                                              ('collapse', self.collapse),
+                                              ('por', self.por),
+                                              ('incremental', self.incremental),
+                                              ('checkpoint', self.checkpoint),
+                                              ('resume', self.resume) ] if enabled ]
+        if len(modes) > 1:
+            fatal_error("options {} cannot be used together.".format(", ".join(modes)))
+        if dump_markings and (self.bitstate or self.hash_compaction):
+            fatal_error("dump markings option cannot be used with bitstate or hash-compaction options.")
+        if self.arc_profile and self.workers:
+            fatal_error("arc profiles cannot be collected by parallel exploration.")
+
+        # load module
+        try:
+            fp, pathname, description = imp.find_module("net")
+            self.compiled_net = imp.load_module("net", fp, pathname, description)
+        except ImportError:
+            fatal_error("No net module in PYTHONPATH", -1)
+
+        if getattr(self.compiled_net, 'neco_native', False) and (modes or self.arc_profile):
+            fatal_error("option {} is not available for nets compiled with the cpp backend.".format((modes or ['arc-profile'])[0]))
+
+        if (self.packed or self.external) and not hasattr(self.compiled_net.Marking, '__pack__'):
+            fatal_error("packed and external exploration need packed markings, not available for this net.")
+        if (self.checkpoint or self.resume) and not hasattr(self.compiled_net.Marking, '__pack__'):
+            fatal_error("checkpoints need packed markings, not available for this net.")
+        if (self.bitstate or self.hash_compaction) and not hasattr(self.compiled_net.Marking, '__fingerprint__'):
+            fatal_error("bitstate and hash-compaction need marking fingerprints, not available for this net.")
+        if self.collapse and not hasattr(self.compiled_net.Marking, '__components__'):
+            fatal_error("collapse compression needs packed markings, not available for this net.")
+        if self.arc_profile and not hasattr(self.compiled_net, 'neco_arc_profile'):
+            fatal_error("arc profiles need a net compiled with --instrument-arcs.")
+
+        cache = getattr(self.compiled_net, 'normalization_cache', None)
+        if cache is not None:
+            cache.size = self.normalization_cache
+
+        # explore
+        if profile:
+            # produce exploration trace
+            import cProfile
+            if not dump_markings and not graph:
+                cProfile.run('neco.explorecli.Main._instance_.explore()', 'explore.prof')
+
+            elif self.dump_markings:
+                # produce exploration trace with marking dump
+                cProfile.run('neco.explorecli.Main._instance_.dump_markings()', 'explore_dump.prof')
+
+            elif self.graph:
+                # produce exploration trace with reachability graph
+                cProfile.run('neco.explorecli.Main._instance_.dump_graph()', 'explore_graph.prof')
+
+        else: # without profiler
+            if not dump_markings and not graph:
+                self.explore()
+
+            elif dump_markings:
+                self.explore_dump()
+
+            elif graph:
+                self.explore_graph()
+
+        if self.arc_profile:
+            self.compiled_net.neco_arc_profile.save(self.arc_profile)
+            print "arc profile saved to {}".format(self.arc_profile)
+
+    def explore(self):
+        """ Explore state space. """
+
+        net = self.compiled_net
+        start = time()
+        if self.workers:
+            count = net.state_space_parallel(self.workers)
+        elif self.packed:
+            count = len(net.state_space_packed())
+        elif self.external:
+            store = net.state_space_external(self.external, self.memory)
+            count = len(store)
+            store.close()
+        elif self.bitstate:
+            visited = net.state_space_bitstate(self.bitstate, self.hashes)
+            count = len(visited)
+        elif self.hash_compaction:
+            visited = net.state_space_fingerprints()
+            count = len(visited)
+        elif self.collapse:
+            visited = net.state_space_collapsed()
+            count = len(visited)
+        elif self.por:
+            visited, stats = net.state_space_por()
+            count = len(visited)
+        elif self.incremental:
+            visited, skipped = net.state_space_incremental()
+            count = len(visited)
+        elif self.checkpoint or self.resume:
+            count = len(net.state_space_checkpointed(self.checkpoint or self.resume,
+                                                     self.checkpoint_every,
+                                                     resume=bool(self.resume)))
+        else:
+            count = len(net.state_space())
+        end = time()
+        if self.print_mcc:
+            print count
+        else:
+            print "exploration time: ", end - start
+            print "len visited = %d" % (count)
+            if self.bitstate or self.hash_compaction:
+                print "estimated omission probability = %g" % (visited.omission_probability())
+            if self.collapse:
+                print "distinct place contents = %d" % (sum(visited.sizes()))
+            if self.por:
+                print "reduced states = %d (%d fully expanded), skipped transitions = %d" % (stats['reduced'],
+                                                                                             stats['states'] - stats['reduced'],
+                                                                                             stats['skipped'])
+            if self.incremental:
+                print "skipped transition evaluations = %d" % (skipped)
+            cache = getattr(net, 'normalization_cache', None)
+            if cache is not None and (cache.hits or cache.misses):
+                print "normalization cache: %d hits, %d misses" % (cache.hits, cache.misses)
+
+    def explore_dump(self):
+        """ Explore state space. """
+
+        dfile = try_open_file(self.dump_markings)
+
+        net = self.compiled_net
+        store = None
+        start = time()
+        if self.workers:
+            ss = net.state_space_parallel(self.workers, collect=True)
+        elif self.packed:
+            ss = [ net.neco_marking_unpack(key) for key in net.state_space_packed() ]
+        elif self.external:
+            # markings are read back from disk while dumping
+            store = net.state_space_external(self.external, self.memory)
+            ss = ( net.neco_marking_unpack(key) for key in store )
+        elif self.collapse:
+            ss = [ net.neco_marking_from_components(components) for components in net.state_space_collapsed() ]
+        elif self.por:
+            ss, _ = net.state_space_por()
+        elif self.incremental:
+            ss, _ = net.state_space_incremental()
+        elif self.checkpoint or self.resume:
+            ss = net.state_space_checkpointed(self.checkpoint or self.resume,
+                                              self.checkpoint_every,
+                                              resume=bool(self.resume))
+        else:
+            ss = net.state_space()
+        end = time()
+        print "exploration time: ", end - start
+        print "len visited = %d" % (len(store) if store is not None else len(ss))
+
+        dfile.write('[')
+        for s in ss:
+            dfile.write(s.__dump__())
+            dfile.write(', ')
+        dfile.write(']')
+        if store is not None:
+            store.close()
+        return (end - start, ss)
+
+    def explore_graph(self):
+        """ Build reachability graph. """
+        # select output stream
+        map_file = try_open_file(self.map_file)
+        graph_file = try_open_file(self.graph_file)
+
+        net = self.compiled_net
+
+        start = time()
+        graph, map = net.state_space_graph()
+        end = time()
+        print "exploration time: ", end - start
+        print "len visited = %d" % (len(map.keys()))
+
+        #map_file.write('{\n')
+        for key, value in map.iteritems():
+            map_file.write("{} : {}\n".format(repr(value), key.__dump__()))
+        #map_file.write('}\n')
+
+        #graph_file.write('{\n')
+        for key, value in graph.iteritems():
+            graph_file.write("{} : {}\n".format(repr(key), repr(value)))
+        #graph_file.write('}\n')
+
+        return (end - start, graph.keys())
+
+
+if __name__ == '__main__':
+    Main('explorecli')
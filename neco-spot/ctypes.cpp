@@ -0,0 +1 @@
+../neco/ctypes/ctypes.cpp
\ No newline at end of file
@@ -0,0 +1 @@
+../neco/ctypes/ctypes.h
\ No newline at end of file
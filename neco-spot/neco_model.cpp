@@ -1,6 +1,7 @@
 #include "neco_model.h"
 #include "debug.h"
 #include <cassert>
+#include <cstdlib>
 #include <iostream>
 
 namespace neco {
@@ -15,10 +16,12 @@ namespace neco {
             PyErr_Print();
         }
 
+#ifndef NECO_NATIVE_NET
         std::cout << "importing checker" << std::endl;
         if (import_checker() != 0) {
             PyErr_Print();
         }
+#endif
     }
 
     //////////////////////////////////////////////////
@@ -104,7 +107,13 @@ namespace neco {
     int Model::check(const struct Marking* m, int atom) const
     {
         NECO_DEBUG_TRACE("Model::check");
+#ifdef NECO_NATIVE_NET
+        // atomic propositions are compiled by the cython checker only
+        std::cerr << "atomic propositions are not supported by nets compiled with the cpp backend" << std::endl;
+        std::abort();
+#else
         return neco_check(const_cast<struct Marking*>(m), atom);
+#endif
     }
 
     //////////////////////////////////////////////////
@@ -3,7 +3,9 @@
 
 #include "Python.h"
 #include "ctypes.h"
+#ifndef NECO_NATIVE_NET
 #include "checker_api.h"
+#endif
 #include "net_api.h"
 #include "ctypes.h"
 #include <map>
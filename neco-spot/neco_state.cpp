@@ -8,14 +8,21 @@ namespace neco {
     state::state(const struct Marking* marking)
             : m_marking(marking)
     {
+#ifndef NECO_NATIVE_NET
         Py_INCREF(marking);
+#endif
     }
 
     //////////////////////////////////////////////////
 
     state::~state()
     {
+#ifdef NECO_NATIVE_NET
+        // native markings are owned by states
+        neco_marking_delete(const_cast<struct Marking*>(m_marking));
+#else
         Py_DECREF(m_marking);
+#endif
     }
 
     //////////////////////////////////////////////////
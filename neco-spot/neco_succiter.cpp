@@ -20,8 +20,14 @@ namespace neco {
 
     succ_iterator::~succ_iterator()
     {
+#ifdef NECO_NATIVE_NET
+        // states hold copies of native markings
+        neco_list_delete_elts(m_list, neco_marking_delete);
+        delete m_list;
+#else
         // do not delete elements
         neco_list_delete_elts(m_list, 0 /* deletion callback */ );
+#endif
     }
 
     //////////////////////////////////////////////////
@@ -57,7 +63,11 @@ namespace neco {
         NECO_DEBUG_TRACE("succ_iterator::current_state");
         void* elt = (*m_list)[m_node_index];
         assert(elt);
+#ifdef NECO_NATIVE_NET
+        return new neco::state( Model::instance().marking_copy(static_cast<struct Marking*>(elt)) );
+#else
         return new neco::state( static_cast<struct Marking*>(elt) );
+#endif
     }
 
     //////////////////////////////////////////////////
@@ -85,7 +85,12 @@ namespace neco {
         if (list->size() == 0) {
             cond &= m_dead_prop;
             // Add a self-loop.
+#ifdef NECO_NATIVE_NET
+            // list elements are deleted with the iterator
+            list->push_back( const_cast<struct Marking*>(Model::instance().marking_copy(st->get_marking())) );
+#else
             list->push_back( const_cast<struct Marking*>(st->get_marking()) );
+#endif
         } else {
             cond &= m_alive_prop;
         }
@@ -0,0 +1,1759 @@
+# this file has been automatically generated running:
+# setup.py build build_ext --inplace
+# timestamp: 2026-10-18 12:04:40.211910
+
+from snakes.lang import ast
+from ast import *
+
+class _AST (ast.AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self, **ARGS):
+        ast.AST.__init__(self)
+        for k, v in ARGS.items():
+            setattr(self, k, v)
+    
+    def isAdd(self):
+        return False
+    
+    def isAnd(self):
+        return False
+    
+    def isAssert(self):
+        return False
+    
+    def isAssign(self):
+        return False
+    
+    def isAttribute(self):
+        return False
+    
+    def isAugAssign(self):
+        return False
+    
+    def isAugLoad(self):
+        return False
+    
+    def isAugStore(self):
+        return False
+    
+    def isBinOp(self):
+        return False
+    
+    def isBitAnd(self):
+        return False
+    
+    def isBitOr(self):
+        return False
+    
+    def isBitXor(self):
+        return False
+    
+    def isBoolOp(self):
+        return False
+    
+    def isBreak(self):
+        return False
+    
+    def isCDef(self):
+        return False
+    
+    def isCFor(self):
+        return False
+    
+    def isCFunction(self):
+        return False
+    
+    def isCImport(self):
+        return False
+    
+    def isCImportFrom(self):
+        return False
+    
+    def isCStruct(self):
+        return False
+    
+    def isCVar(self):
+        return False
+    
+    def isCall(self):
+        return False
+    
+    def isCast(self):
+        return False
+    
+    def isClassDef(self):
+        return False
+    
+    def isComment(self):
+        return False
+    
+    def isCompare(self):
+        return False
+    
+    def isContinue(self):
+        return False
+    
+    def isCpDef(self):
+        return False
+    
+    def isDef(self):
+        return False
+    
+    def isDel(self):
+        return False
+    
+    def isDelete(self):
+        return False
+    
+    def isDict(self):
+        return False
+    
+    def isDictComp(self):
+        return False
+    
+    def isDiv(self):
+        return False
+    
+    def isEllipsis(self):
+        return False
+    
+    def isEq(self):
+        return False
+    
+    def isExceptHandler(self):
+        return False
+    
+    def isExec(self):
+        return False
+    
+    def isExpr(self):
+        return False
+    
+    def isExpression(self):
+        return False
+    
+    def isExtSlice(self):
+        return False
+    
+    def isExtern(self):
+        return False
+    
+    def isExternFrom(self):
+        return False
+    
+    def isFloorDiv(self):
+        return False
+    
+    def isFor(self):
+        return False
+    
+    def isFunctionDecl(self):
+        return False
+    
+    def isFunctionDef(self):
+        return False
+    
+    def isGeneratorExp(self):
+        return False
+    
+    def isGlobal(self):
+        return False
+    
+    def isGt(self):
+        return False
+    
+    def isGtE(self):
+        return False
+    
+    def isIf(self):
+        return False
+    
+    def isIfExp(self):
+        return False
+    
+    def isImport(self):
+        return False
+    
+    def isImportFrom(self):
+        return False
+    
+    def isIn(self):
+        return False
+    
+    def isIndex(self):
+        return False
+    
+    def isInteractive(self):
+        return False
+    
+    def isInvert(self):
+        return False
+    
+    def isIs(self):
+        return False
+    
+    def isIsNot(self):
+        return False
+    
+    def isLShift(self):
+        return False
+    
+    def isLambda(self):
+        return False
+    
+    def isList(self):
+        return False
+    
+    def isListComp(self):
+        return False
+    
+    def isLoad(self):
+        return False
+    
+    def isLt(self):
+        return False
+    
+    def isLtE(self):
+        return False
+    
+    def isMod(self):
+        return False
+    
+    def isModule(self):
+        return False
+    
+    def isMult(self):
+        return False
+    
+    def isNComment(self):
+        return False
+    
+    def isName(self):
+        return False
+    
+    def isNonlocal(self):
+        return False
+    
+    def isNot(self):
+        return False
+    
+    def isNotEq(self):
+        return False
+    
+    def isNotIn(self):
+        return False
+    
+    def isNum(self):
+        return False
+    
+    def isOr(self):
+        return False
+    
+    def isParam(self):
+        return False
+    
+    def isPass(self):
+        return False
+    
+    def isPow(self):
+        return False
+    
+    def isPrint(self):
+        return False
+    
+    def isRShift(self):
+        return False
+    
+    def isRaise(self):
+        return False
+    
+    def isReturn(self):
+        return False
+    
+    def isSet(self):
+        return False
+    
+    def isSetComp(self):
+        return False
+    
+    def isSlice(self):
+        return False
+    
+    def isStarred(self):
+        return False
+    
+    def isStore(self):
+        return False
+    
+    def isStr(self):
+        return False
+    
+    def isSub(self):
+        return False
+    
+    def isSubscript(self):
+        return False
+    
+    def isSuite(self):
+        return False
+    
+    def isTryExcept(self):
+        return False
+    
+    def isTryFinally(self):
+        return False
+    
+    def isTuple(self):
+        return False
+    
+    def isUAdd(self):
+        return False
+    
+    def isUSub(self):
+        return False
+    
+    def isUnaryOp(self):
+        return False
+    
+    def isWhile(self):
+        return False
+    
+    def isWith(self):
+        return False
+    
+    def isalias(self):
+        return False
+    
+    def isarg(self):
+        return False
+    
+    def isarguments(self):
+        return False
+    
+    def isboolop(self):
+        return False
+    
+    def iscdecl(self):
+        return False
+    
+    def iscmpop(self):
+        return False
+    
+    def iscomprehension(self):
+        return False
+    
+    def isexcepthandler(self):
+        return False
+    
+    def isexpr(self):
+        return False
+    
+    def isexpr_context(self):
+        return False
+    
+    def iskeyword(self):
+        return False
+    
+    def islanguage(self):
+        return False
+    
+    def ismod(self):
+        return False
+    
+    def isoperator(self):
+        return False
+    
+    def isslice(self):
+        return False
+    
+    def isstmt(self):
+        return False
+    
+    def istype_name_spec(self):
+        return False
+    
+    def isunaryop(self):
+        return False
+
+class excepthandler (_AST):
+    _fields = ()
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isexcepthandler(self):
+        return True
+
+class mod (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def ismod(self):
+        return True
+
+class expr (_AST):
+    _fields = ()
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isexpr(self):
+        return True
+
+class slice (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isslice(self):
+        return True
+
+class type_name_spec (_AST):
+    _fields = ('o', 't')
+    _attributes = ()
+    
+    def __init__ (self, o, t,  **ARGS):
+        _AST.__init__(self, **ARGS)
+        self.o = o
+        self.t = t
+    
+    def istype_name_spec(self):
+        return True
+
+class stmt (_AST):
+    _fields = ()
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isstmt(self):
+        return True
+
+class boolop (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isboolop(self):
+        return True
+
+class language (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def islanguage(self):
+        return True
+
+class comprehension (_AST):
+    _fields = ('target', 'iter', 'ifs')
+    _attributes = ()
+    
+    def __init__ (self, target, iter, ifs=[],  **ARGS):
+        _AST.__init__(self, **ARGS)
+        self.target = target
+        self.iter = iter
+        self.ifs = list(ifs)
+    
+    def iscomprehension(self):
+        return True
+
+class operator (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isoperator(self):
+        return True
+
+class unaryop (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isunaryop(self):
+        return True
+
+class cmpop (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def iscmpop(self):
+        return True
+
+class keyword (_AST):
+    _fields = ('arg', 'value')
+    _attributes = ()
+    
+    def __init__ (self, arg, value,  **ARGS):
+        _AST.__init__(self, **ARGS)
+        self.arg = arg
+        self.value = value
+    
+    def iskeyword(self):
+        return True
+
+class expr_context (_AST):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        _AST.__init__(self, **ARGS)
+    
+    def isexpr_context(self):
+        return True
+
+class arg (_AST):
+    _fields = ('arg', 'annotation')
+    _attributes = ()
+    
+    def __init__ (self, arg, annotation=None,  **ARGS):
+        _AST.__init__(self, **ARGS)
+        self.arg = arg
+        self.annotation = annotation
+    
+    def isarg(self):
+        return True
+
+class arguments (_AST):
+    _fields = ('args', 'vararg', 'varargannotation', 'kwonlyargs', 'kwarg', 'kwargannotation', 'defaults', 'kw_defaults')
+    _attributes = ()
+    
+    def __init__ (self, args=[], vararg=None, varargannotation=None, kwonlyargs=[], kwarg=None, kwargannotation=None, defaults=[], kw_defaults=[],  **ARGS):
+        _AST.__init__(self, **ARGS)
+        self.args = list(args)
+        self.vararg = vararg
+        self.varargannotation = varargannotation
+        self.kwonlyargs = list(kwonlyargs)
+        self.kwarg = kwarg
+        self.kwargannotation = kwargannotation
+        self.defaults = list(defaults)
+        self.kw_defaults = list(kw_defaults)
+    
+    def isarguments(self):
+        return True
+
+class alias (_AST):
+    _fields = ('name', 'asname')
+    _attributes = ()
+    
+    def __init__ (self, name, asname=None,  **ARGS):
+        _AST.__init__(self, **ARGS)
+        self.name = name
+        self.asname = asname
+    
+    def isalias(self):
+        return True
+
+class Raise (stmt):
+    _fields = ('exc', 'cause')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, exc=None, cause=None,  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.exc = exc
+        self.cause = cause
+    
+    def isRaise(self):
+        return True
+
+class Param (expr_context):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        expr_context.__init__(self, **ARGS)
+    
+    def isParam(self):
+        return True
+
+class IsNot (cmpop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        cmpop.__init__(self, **ARGS)
+    
+    def isIsNot(self):
+        return True
+
+class Suite (mod):
+    _fields = ('body',)
+    _attributes = ()
+    
+    def __init__ (self, body=[],  **ARGS):
+        mod.__init__(self, **ARGS)
+        self.body = list(body)
+    
+    def isSuite(self):
+        return True
+
+class Div (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isDiv(self):
+        return True
+
+class NComment (stmt):
+    _fields = ('message',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, message,  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.message = message
+    
+    def isNComment(self):
+        return True
+
+class CFor (stmt):
+    _fields = ('start', 'start_op', 'target', 'stop_op', 'stop', 'body')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, start, start_op, target, stop_op, stop, body=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.start = start
+        self.start_op = start_op
+        self.target = target
+        self.stop_op = stop_op
+        self.stop = stop
+        self.body = list(body)
+    
+    def isCFor(self):
+        return True
+
+class CDef (language):
+    _fields = ('public', 'api')
+    _attributes = ()
+    
+    def __init__ (self, public=None, api=None,  **ARGS):
+        language.__init__(self, **ARGS)
+        self.public = public
+        self.api = api
+    
+    def isCDef(self):
+        return True
+
+class Exec (stmt):
+    _fields = ('body', 'globals', 'locals')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, body, globals=None, locals=None,  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.body = body
+        self.globals = globals
+        self.locals = locals
+    
+    def isExec(self):
+        return True
+
+class FloorDiv (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isFloorDiv(self):
+        return True
+
+class TryFinally (stmt):
+    _fields = ('body', 'finalbody')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, body=[], finalbody=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.body = list(body)
+        self.finalbody = list(finalbody)
+    
+    def isTryFinally(self):
+        return True
+
+class Not (unaryop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        unaryop.__init__(self, **ARGS)
+    
+    def isNot(self):
+        return True
+
+class Interactive (mod):
+    _fields = ('body',)
+    _attributes = ()
+    
+    def __init__ (self, body=[],  **ARGS):
+        mod.__init__(self, **ARGS)
+        self.body = list(body)
+    
+    def isInteractive(self):
+        return True
+
+class Mult (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isMult(self):
+        return True
+
+class ImportFrom (stmt):
+    _fields = ('module', 'names', 'level')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, module, names=[], level=None,  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.module = module
+        self.names = list(names)
+        self.level = level
+    
+    def isImportFrom(self):
+        return True
+
+class Load (expr_context):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        expr_context.__init__(self, **ARGS)
+    
+    def isLoad(self):
+        return True
+
+class AugAssign (stmt):
+    _fields = ('target', 'op', 'value')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, target, op, value,  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.target = target
+        self.op = op
+        self.value = value
+    
+    def isAugAssign(self):
+        return True
+
+class ExternFrom (stmt):
+    _fields = ('hfile', 'body')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, hfile=None, body=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.hfile = hfile
+        self.body = list(body)
+    
+    def isExternFrom(self):
+        return True
+
+class While (stmt):
+    _fields = ('test', 'body', 'orelse')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, test, body=[], orelse=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.test = test
+        self.body = list(body)
+        self.orelse = list(orelse)
+    
+    def isWhile(self):
+        return True
+
+class Starred (expr):
+    _fields = ('value', 'ctx')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, value, ctx=None,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.value = value
+        self.ctx = ctx
+    
+    def isStarred(self):
+        return True
+
+class Or (boolop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        boolop.__init__(self, **ARGS)
+    
+    def isOr(self):
+        return True
+
+class FunctionDef (stmt):
+    _fields = ('name', 'args', 'body', 'returns', 'lang', 'decl')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, name, args, lang, body=[], returns=None, decl=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.name = name
+        self.args = args
+        self.body = list(body)
+        self.returns = returns
+        self.lang = lang
+        self.decl = list(decl)
+    
+    def isFunctionDef(self):
+        return True
+
+class Gt (cmpop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        cmpop.__init__(self, **ARGS)
+    
+    def isGt(self):
+        return True
+
+class Global (stmt):
+    _fields = ('names',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, names=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.names = list(names)
+    
+    def isGlobal(self):
+        return True
+
+class BoolOp (expr):
+    _fields = ('op', 'values')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, op, values=[],  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.op = op
+        self.values = list(values)
+    
+    def isBoolOp(self):
+        return True
+
+class Index (slice):
+    _fields = ('value',)
+    _attributes = ()
+    
+    def __init__ (self, value,  **ARGS):
+        slice.__init__(self, **ARGS)
+        self.value = value
+    
+    def isIndex(self):
+        return True
+
+class For (stmt):
+    _fields = ('target', 'iter', 'body', 'orelse')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, target, iter, body=[], orelse=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.target = target
+        self.iter = iter
+        self.body = list(body)
+        self.orelse = list(orelse)
+    
+    def isFor(self):
+        return True
+
+class UnaryOp (expr):
+    _fields = ('op', 'operand')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, op, operand,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.op = op
+        self.operand = operand
+    
+    def isUnaryOp(self):
+        return True
+
+class Invert (unaryop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        unaryop.__init__(self, **ARGS)
+    
+    def isInvert(self):
+        return True
+
+class FunctionDecl (stmt):
+    _fields = ('name', 'args', 'returns', 'lang')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, name, args, lang, returns=None,  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.name = name
+        self.args = args
+        self.returns = returns
+        self.lang = lang
+    
+    def isFunctionDecl(self):
+        return True
+
+class DictComp (expr):
+    _fields = ('key', 'value', 'generators')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, key, value, generators=[],  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.key = key
+        self.value = value
+        self.generators = list(generators)
+    
+    def isDictComp(self):
+        return True
+
+class LShift (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isLShift(self):
+        return True
+
+class Ellipsis (expr):
+    _fields = ()
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self,  **ARGS):
+        expr.__init__(self, **ARGS)
+    
+    def isEllipsis(self):
+        return True
+
+class Print (stmt):
+    _fields = ('dest', 'values', 'nl')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, nl, dest=None, values=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.dest = dest
+        self.values = list(values)
+        self.nl = nl
+    
+    def isPrint(self):
+        return True
+
+class Subscript (expr):
+    _fields = ('value', 'slice', 'ctx')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, value, slice, ctx=None,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.value = value
+        self.slice = slice
+        self.ctx = ctx
+    
+    def isSubscript(self):
+        return True
+
+class CImportFrom (stmt):
+    _fields = ('module', 'names')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, module, names=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.module = module
+        self.names = list(names)
+    
+    def isCImportFrom(self):
+        return True
+
+class ExceptHandler (excepthandler):
+    _fields = ('type', 'name', 'body')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, type=None, name=None, body=[],  **ARGS):
+        excepthandler.__init__(self, **ARGS)
+        self.type = type
+        self.name = name
+        self.body = list(body)
+    
+    def isExceptHandler(self):
+        return True
+
+class ClassDef (stmt):
+    _fields = ('name', 'bases', 'body', 'lang', 'spec', 'decl')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, name, lang, bases=[], body=[], spec=None, decl=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.name = name
+        self.bases = list(bases)
+        self.body = list(body)
+        self.lang = lang
+        self.spec = spec
+        self.decl = list(decl)
+    
+    def isClassDef(self):
+        return True
+
+class CpDef (language):
+    _fields = ('public', 'api')
+    _attributes = ()
+    
+    def __init__ (self, public=None, api=None,  **ARGS):
+        language.__init__(self, **ARGS)
+        self.public = public
+        self.api = api
+    
+    def isCpDef(self):
+        return True
+
+class Delete (stmt):
+    _fields = ('targets',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, targets=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.targets = list(targets)
+    
+    def isDelete(self):
+        return True
+
+class Comment (stmt):
+    _fields = ('message',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, message,  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.message = message
+    
+    def isComment(self):
+        return True
+
+class NotEq (cmpop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        cmpop.__init__(self, **ARGS)
+    
+    def isNotEq(self):
+        return True
+
+class LtE (cmpop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        cmpop.__init__(self, **ARGS)
+    
+    def isLtE(self):
+        return True
+
+class Pass (stmt):
+    _fields = ()
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self,  **ARGS):
+        stmt.__init__(self, **ARGS)
+    
+    def isPass(self):
+        return True
+
+class Eq (cmpop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        cmpop.__init__(self, **ARGS)
+    
+    def isEq(self):
+        return True
+
+class Add (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isAdd(self):
+        return True
+
+class Import (stmt):
+    _fields = ('names',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, names=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.names = list(names)
+    
+    def isImport(self):
+        return True
+
+class TryExcept (stmt):
+    _fields = ('body', 'handlers', 'orelse')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, body=[], handlers=[], orelse=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.body = list(body)
+        self.handlers = list(handlers)
+        self.orelse = list(orelse)
+    
+    def isTryExcept(self):
+        return True
+
+class Store (expr_context):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        expr_context.__init__(self, **ARGS)
+    
+    def isStore(self):
+        return True
+
+class Sub (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isSub(self):
+        return True
+
+class GtE (cmpop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        cmpop.__init__(self, **ARGS)
+    
+    def isGtE(self):
+        return True
+
+class Tuple (expr):
+    _fields = ('elts', 'ctx')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, elts=[], ctx=None,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.elts = list(elts)
+        self.ctx = ctx
+    
+    def isTuple(self):
+        return True
+
+class Break (stmt):
+    _fields = ()
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self,  **ARGS):
+        stmt.__init__(self, **ARGS)
+    
+    def isBreak(self):
+        return True
+
+class USub (unaryop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        unaryop.__init__(self, **ARGS)
+    
+    def isUSub(self):
+        return True
+
+class Extern (stmt):
+    _fields = ('type', 'name', 'args')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, type, name, args=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.type = type
+        self.name = name
+        self.args = list(args)
+    
+    def isExtern(self):
+        return True
+
+class SetComp (expr):
+    _fields = ('elt', 'generators')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, elt, generators=[],  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.elt = elt
+        self.generators = list(generators)
+    
+    def isSetComp(self):
+        return True
+
+class Del (expr_context):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        expr_context.__init__(self, **ARGS)
+    
+    def isDel(self):
+        return True
+
+class Str (expr):
+    _fields = ('s',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, s,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.s = s
+    
+    def isStr(self):
+        return True
+
+class Expression (mod):
+    _fields = ('body',)
+    _attributes = ()
+    
+    def __init__ (self, body,  **ARGS):
+        mod.__init__(self, **ARGS)
+        self.body = body
+    
+    def isExpression(self):
+        return True
+
+class Assign (stmt):
+    _fields = ('targets', 'value')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, value, targets=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.targets = list(targets)
+        self.value = value
+    
+    def isAssign(self):
+        return True
+
+class Def (language):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        language.__init__(self, **ARGS)
+    
+    def isDef(self):
+        return True
+
+class Lambda (expr):
+    _fields = ('args', 'body')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, args, body,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.args = args
+        self.body = body
+    
+    def isLambda(self):
+        return True
+
+class And (boolop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        boolop.__init__(self, **ARGS)
+    
+    def isAnd(self):
+        return True
+
+class ExtSlice (slice):
+    _fields = ('dims',)
+    _attributes = ()
+    
+    def __init__ (self, dims=[],  **ARGS):
+        slice.__init__(self, **ARGS)
+        self.dims = list(dims)
+    
+    def isExtSlice(self):
+        return True
+
+class Compare (expr):
+    _fields = ('left', 'ops', 'comparators')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, left, ops=[], comparators=[],  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.left = left
+        self.ops = list(ops)
+        self.comparators = list(comparators)
+    
+    def isCompare(self):
+        return True
+
+class Set (expr):
+    _fields = ('elts',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, elts=[],  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.elts = list(elts)
+    
+    def isSet(self):
+        return True
+
+class Attribute (expr):
+    _fields = ('value', 'attr', 'ctx')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, value, attr, ctx=None,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.value = value
+        self.attr = attr
+        self.ctx = ctx
+    
+    def isAttribute(self):
+        return True
+
+class Num (expr):
+    _fields = ('n',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, n,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.n = n
+    
+    def isNum(self):
+        return True
+
+class Call (expr):
+    _fields = ('func', 'args', 'keywords', 'starargs', 'kwargs')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, func, args=[], keywords=[], starargs=None, kwargs=None,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.func = func
+        self.args = list(args)
+        self.keywords = list(keywords)
+        self.starargs = starargs
+        self.kwargs = kwargs
+    
+    def isCall(self):
+        return True
+
+class Mod (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isMod(self):
+        return True
+
+class Slice (slice):
+    _fields = ('lower', 'upper', 'step')
+    _attributes = ()
+    
+    def __init__ (self, lower=None, upper=None, step=None,  **ARGS):
+        slice.__init__(self, **ARGS)
+        self.lower = lower
+        self.upper = upper
+        self.step = step
+    
+    def isSlice(self):
+        return True
+
+class cdecl (stmt):
+    _fields = ()
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self,  **ARGS):
+        stmt.__init__(self, **ARGS)
+    
+    def iscdecl(self):
+        return True
+
+class Nonlocal (stmt):
+    _fields = ('names',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, names=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.names = list(names)
+    
+    def isNonlocal(self):
+        return True
+
+class Lt (cmpop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        cmpop.__init__(self, **ARGS)
+    
+    def isLt(self):
+        return True
+
+class Dict (expr):
+    _fields = ('keys', 'values')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, keys=[], values=[],  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.keys = list(keys)
+        self.values = list(values)
+    
+    def isDict(self):
+        return True
+
+class AugLoad (expr_context):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        expr_context.__init__(self, **ARGS)
+    
+    def isAugLoad(self):
+        return True
+
+class BitOr (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isBitOr(self):
+        return True
+
+class Return (stmt):
+    _fields = ('value',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, value=None,  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.value = value
+    
+    def isReturn(self):
+        return True
+
+class Assert (stmt):
+    _fields = ('test', 'msg')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, test, msg=None,  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.test = test
+        self.msg = msg
+    
+    def isAssert(self):
+        return True
+
+class CImport (stmt):
+    _fields = ('names',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, names=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.names = list(names)
+    
+    def isCImport(self):
+        return True
+
+class UAdd (unaryop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        unaryop.__init__(self, **ARGS)
+    
+    def isUAdd(self):
+        return True
+
+class With (stmt):
+    _fields = ('context_expr', 'optional_vars', 'body')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, context_expr, optional_vars=None, body=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.context_expr = context_expr
+        self.optional_vars = optional_vars
+        self.body = list(body)
+    
+    def isWith(self):
+        return True
+
+class NotIn (cmpop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        cmpop.__init__(self, **ARGS)
+    
+    def isNotIn(self):
+        return True
+
+class RShift (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isRShift(self):
+        return True
+
+class Name (expr):
+    _fields = ('id', 'ctx')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, id, ctx=None,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.id = id
+        self.ctx = ctx
+    
+    def isName(self):
+        return True
+
+class BinOp (expr):
+    _fields = ('left', 'op', 'right')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, left, op, right,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.left = left
+        self.op = op
+        self.right = right
+    
+    def isBinOp(self):
+        return True
+
+class Expr (stmt):
+    _fields = ('value',)
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, value,  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.value = value
+    
+    def isExpr(self):
+        return True
+
+class List (expr):
+    _fields = ('elts', 'ctx')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, elts=[], ctx=None,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.elts = list(elts)
+        self.ctx = ctx
+    
+    def isList(self):
+        return True
+
+class Cast (expr):
+    _fields = ('target', 'value')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, target, value,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.target = target
+        self.value = value
+    
+    def isCast(self):
+        return True
+
+class Continue (stmt):
+    _fields = ()
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self,  **ARGS):
+        stmt.__init__(self, **ARGS)
+    
+    def isContinue(self):
+        return True
+
+class BitXor (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isBitXor(self):
+        return True
+
+class Pow (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isPow(self):
+        return True
+
+class Is (cmpop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        cmpop.__init__(self, **ARGS)
+    
+    def isIs(self):
+        return True
+
+class BitAnd (operator):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        operator.__init__(self, **ARGS)
+    
+    def isBitAnd(self):
+        return True
+
+class Module (mod):
+    _fields = ('body',)
+    _attributes = ()
+    
+    def __init__ (self, body=[],  **ARGS):
+        mod.__init__(self, **ARGS)
+        self.body = list(body)
+    
+    def isModule(self):
+        return True
+
+class AugStore (expr_context):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        expr_context.__init__(self, **ARGS)
+    
+    def isAugStore(self):
+        return True
+
+class In (cmpop):
+    _fields = ()
+    _attributes = ()
+    
+    def __init__ (self,  **ARGS):
+        cmpop.__init__(self, **ARGS)
+    
+    def isIn(self):
+        return True
+
+class IfExp (expr):
+    _fields = ('test', 'body', 'orelse')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, test, body, orelse,  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.test = test
+        self.body = body
+        self.orelse = orelse
+    
+    def isIfExp(self):
+        return True
+
+class GeneratorExp (expr):
+    _fields = ('elt', 'generators')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, elt, generators=[],  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.elt = elt
+        self.generators = list(generators)
+    
+    def isGeneratorExp(self):
+        return True
+
+class ListComp (expr):
+    _fields = ('elt', 'generators')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, elt, generators=[],  **ARGS):
+        expr.__init__(self, **ARGS)
+        self.elt = elt
+        self.generators = list(generators)
+    
+    def isListComp(self):
+        return True
+
+class If (stmt):
+    _fields = ('test', 'body', 'orelse')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, test, body=[], orelse=[],  **ARGS):
+        stmt.__init__(self, **ARGS)
+        self.test = test
+        self.body = list(body)
+        self.orelse = list(orelse)
+    
+    def isIf(self):
+        return True
+
+class CVar (cdecl):
+    _fields = ('name', 'type', 'init', 'public', 'inner')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, name, type, init=None, public=None, inner=None,  **ARGS):
+        cdecl.__init__(self, **ARGS)
+        self.name = name
+        self.type = type
+        self.init = init
+        self.public = public
+        self.inner = inner
+    
+    def isCVar(self):
+        return True
+
+class CStruct (cdecl):
+    _fields = ('name', 'body', 'public', 'inner')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, name, body=[], public=None, inner=None,  **ARGS):
+        cdecl.__init__(self, **ARGS)
+        self.name = name
+        self.body = list(body)
+        self.public = public
+        self.inner = inner
+    
+    def isCStruct(self):
+        return True
+
+class CFunction (cdecl):
+    _fields = ('type', 'name', 'args')
+    _attributes = ('lineno', 'col_offset')
+    
+    def __init__ (self, type, name, args=[],  **ARGS):
+        cdecl.__init__(self, **ARGS)
+        self.type = type
+        self.name = name
+        self.args = list(args)
+    
+    def isCFunction(self):
+        return True
@@ -3,3 +3,4 @@
 
 import python
 import cython
+import cpp
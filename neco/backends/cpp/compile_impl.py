@@ -0,0 +1,150 @@
+""" C++ backend plugin. """
+
+from neco.asdl.cpp import Verbatim
+from neco.core import CompilingEnvironment
+from neco.core.netir import CannotCompile
+from neco.cpp.cpp import CppHeaderFile, CppSourceFile
+from neco.utils import search_file, OutputProvider
+import imp
+import netir
+import nettypes
+import os
+import subprocess
+
+_backend_ = "cpp"
+
+# functions exported to neco-spot, see neco-spot/net_api.h
+_exported_functions = [ "struct Marking* neco_init(void)",
+                        "struct NecoCtx* neco_ctx(struct Marking* marking)",
+                        "neco_list_t* neco_succs(struct Marking* marking, struct NecoCtx* ctx)",
+                        "char* neco_marking_dump(struct Marking* marking)",
+                        "struct Marking* neco_marking_copy(struct Marking* marking)",
+                        "int neco_marking_compare(struct Marking* left, struct Marking* right)",
+                        "int neco_marking_hash(struct Marking* marking)",
+                        "void neco_marking_delete(void* marking)" ]
+
+class Env(CompilingEnvironment):
+    """ Compiling environment used for compiling with the cpp backend. """
+
+    def __init__(self, config, net_info, word_set, marking_type):
+        CompilingEnvironment.__init__(self, config, net_info)
+
+        self.marking_type = marking_type
+        self.marking_set_type = nettypes.MarkingSetType(marking_type)
+
+        self._variable_provider = []
+
+    @property
+    def variable_provider(self):
+        return self._variable_provider[-1]
+
+    def push_variable_provider(self, provider):
+        self._variable_provider.append(provider)
+
+    def pop_variable_provider(self):
+        self._variable_provider.pop()
+
+def new_marking_type(name, config):
+    return nettypes.StaticMarkingType(config)
+
+def new_compiling_environment(config, net_info, word_set, marking_type):
+    return Env(config, net_info, word_set, marking_type)
+
+def read_lines(file_name, search_paths):
+    f = open(search_file(file_name, search_paths), "r")
+    lines = [ line.rstrip('\n') for line in f ]
+    f.close()
+    return lines
+
+def compile_IR(env, config, compiler_):
+    search_paths = config.search_paths
+    module_name = config.out_module
+
+    # pid normalization, flow optimization and arc profiles need Python objects
+    for enabled, option in [ (config.normalize_pids, '--detect-pid-symmetries'),
+                             (config.optimize_flow, '--optimize-flow'),
+                             (config.instrument_arcs, '--instrument-arcs') ]:
+        if enabled:
+            raise CannotCompile("option {} is not supported by the cpp backend".format(option))
+
+    env.output_provider = OutputProvider()
+
+    module_cpp_file = CppSourceFile(module_name + '.cpp')
+    module_h_file = CppHeaderFile(module_name + '.h')
+    module_api_file = CppHeaderFile(module_name + '_api.h')
+    env.output_provider.register(module_cpp_file)
+    env.output_provider.register(module_h_file)
+    env.output_provider.register(module_api_file)
+
+    base_dir = "build/"
+    try:
+        os.mkdir(base_dir)
+    except OSError:
+        pass
+
+    ################################################################################
+    # produce module source file
+    ################################################################################
+
+    module_cpp_file.declarations.append("// generated by neco, net {}\n".format(module_name))
+    module_cpp_file.declarations.extend(read_lines("neco_native.h", search_paths))
+
+    module_cpp_file.body.append(env.marking_type.generate_api(env))
+
+    compiler = netir.CompilerVisitor(env, config)
+    for node in env.function_nodes():
+        module_cpp_file.body.append(compiler.compile(node))
+
+    module_cpp_file.body.append(Verbatim("\n".join(read_lines("neco_native_driver.cpp", search_paths))))
+
+    ################################################################################
+    # produce neco-spot headers
+    ################################################################################
+
+    module_h_file.declarations.append("#include <vector>\n")
+    module_h_file.declarations.append("struct NecoCtx {};")
+    module_h_file.declarations.append("struct Marking;")
+    module_h_file.declarations.append("typedef std::vector<void*> neco_list_t;\n")
+    module_h_file.body.append(Verbatim('extern "C" {\n' +
+                                       "".join( "    {};\n".format(function) for function in _exported_functions ) +
+                                       "}"))
+
+    module_api_file.declarations.append('#include "{}.h"\n'.format(module_name))
+    # markings are native, the library is linked instead of imported
+    module_api_file.body.append(Verbatim("static int import_{}(void) {{ return 0; }}".format(module_name)))
+
+    for output in env.output_provider:
+        output.write(env, base_dir)
+
+    ################################################################################
+    # compile library
+    ################################################################################
+
+    library_name = 'lib' + module_name + '.so'
+    command = [ os.environ.get('CXX', 'g++'), '-O3', '-std=c++11', '-shared', '-fPIC',
+                '-o', library_name, base_dir + module_name + '.cpp' ]
+
+    if config.debug:
+        print "********************************************************************************"
+        print "running C++ compiler"
+        print " ".join(command)
+        print "********************************************************************************"
+
+    subprocess.check_call(command)
+
+    ################################################################################
+    # produce python interface
+    ################################################################################
+
+    f = open(module_name + '.py', "w")
+    f.write("from __future__ import absolute_import\n\n")
+    f.write("_neco_library = {!r}\n\n".format(library_name))
+    for line in read_lines("neco_native.py.in", search_paths):
+        f.write(line + '\n')
+    f.close()
+
+    return imp.load_source(module_name, module_name + '.py')
+
+################################################################################
+# EOF
+################################################################################
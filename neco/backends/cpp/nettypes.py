@@ -0,0 +1,132 @@
+""" C++ net types, places hold native tokens. """
+
+from neco.asdl.cpp import StructDef, Verbatim
+from neco.core.info import TypeInfo
+from neco.core.netir import CannotCompile
+import neco.core.nettypes as coretypes
+import neco.utils as utils
+import priv.mrkfunctions
+import priv.placetypes
+
+################################################################################
+
+TypeInfo.register_type("MultiSet")
+
+def type2str(type_info):
+    """ Type to C++ type translation, only native types are translated.
+
+    >>> type2str(TypeInfo.Int), type2str(TypeInfo.TupleType([ TypeInfo.Int, TypeInfo.Int ]))
+    ('int', 'std::array<int, 2>')
+
+    @param type_info: type to translate
+    @type type_info: C{TypeInfo}
+    @raise CannotCompile: if the type has no native representation.
+    """
+    if type_info is not None and not type_info.is_AnyType:
+        if type_info.is_TupleType:
+            if all( subtype.is_Int for subtype in type_info ):
+                return "std::array<int, {}>".format(len(type_info))
+        elif type_info.is_Int:
+            return "int"
+        elif type_info.is_Bool:
+            return "bool"
+    raise CannotCompile("type {} has no native representation".format(type_info))
+
+def native_value(raw):
+    """ C++ literal of a native token.
+
+    >>> native_value(3), native_value((1, -2))
+    ('3', 'std::array<int, 2>{{1, -2}}')
+
+    @raise CannotCompile: if the value has no native representation.
+    """
+    if type(raw) is bool:
+        return "true" if raw else "false"
+    elif type(raw) is int and -2 ** 31 <= raw < 2 ** 31:
+        return repr(raw)
+    elif type(raw) is tuple and all( type(elt) is int for elt in raw ):
+        return "{}{{{{{}}}}}".format(type2str(TypeInfo.from_raw(raw)), ", ".join( native_value(elt) for elt in raw ))
+    raise CannotCompile("value {!r} has no native representation".format(raw))
+
+class StaticMarkingType(coretypes.MarkingType):
+    """ C++ marking type implementation, places as structure fields. """
+
+    def __init__(self, config):
+        coretypes.MarkingType.__init__(self,
+                                       TypeInfo.register_type("Marking"),
+                                       TypeInfo.register_type("MarkingSet"),
+                                       config)
+
+        self.id_provider = utils.NameProvider()
+
+        self.add_method_generator(priv.mrkfunctions.EqGenerator())
+        self.add_method_generator(priv.mrkfunctions.LessGenerator())
+        self.add_method_generator(priv.mrkfunctions.HashGenerator())
+        self.add_method_generator(priv.mrkfunctions.DumpGenerator())
+
+    def __str__(self):
+        s = []
+        s.append('Marking:')
+        for name, place_type in self.place_types.iteritems():
+            s.append('{} : {}'.format(name, place_type.__class__))
+        s.append('End')
+        return '\n'.join(s)
+
+    def sorted_place_types(self):
+        return [ self.place_types[name] for name in sorted(self.place_types) ]
+
+    def gen_types(self):
+        """ Build place types, tokens must have native types.
+
+        @raise CannotCompile: if a place has no native representation.
+        """
+        for place_info in self.flow_control_places | self.one_safe_places | self.places:
+            place_name = place_info.name
+            place_type_info = place_info.type
+
+            if place_type_info.is_BlackToken:
+                place_type = priv.placetypes.BTPlaceType(place_info, marking_type = self)
+            else:
+                try:
+                    if place_type_info.is_Bool:
+                        raise CannotCompile("bool places are not supported")
+                    token_cpp_type = type2str(place_type_info)
+                except CannotCompile:
+                    raise CannotCompile("place {} of type {} has no native representation, "
+                                        "declare an int or int tuple type".format(place_name, place_type_info))
+                place_type = priv.placetypes.MultisetPlaceType(place_info, marking_type = self,
+                                                               token_cpp_type = token_cpp_type)
+
+            if self.place_types.has_key(place_name):
+                raise RuntimeError("{name} place exists".format(name = place_name))
+            else:
+                self.place_types[place_name] = place_type
+
+    def new_marking_expr(self, env, *args):
+        return "Marking()"
+
+    def generate_api(self, env):
+        nodes = [ StructDef('NecoCtx', []),
+                  StructDef('Marking', [ place_type.attribute() for place_type in self.sorted_place_types() ]) ]
+        nodes.extend(self.generate_methods(env))
+        nodes.append(Verbatim("typedef std::unordered_set<Marking, MarkingHash> MarkingSet;"))
+        return nodes
+
+################################################################################
+
+class MarkingSetType(coretypes.MarkingSetType):
+    """ C++ implementation of the marking set type. """
+
+    def __init__(self, marking_type):
+        coretypes.MarkingSetType.__init__(self, marking_type)
+
+    def gen_api(self, env):
+        pass
+
+    def add_marking_stmt(self, env, marking_set_name, marking_name):
+        # new markings are not used once added
+        return Verbatim("{}.insert(std::move({}));".format(marking_set_name, marking_name))
+
+################################################################################
+# EOF
+################################################################################
@@ -0,0 +1,83 @@
+from neco.asdl.cpp import Bool, FunctionDef, ParamDecl, UserType, Verbatim
+from neco.core.nettypes import MarkingTypeMethodGenerator
+
+def marking_params():
+    return [ ParamDecl(UserType('const Marking&'), 'left'),
+             ParamDecl(UserType('const Marking&'), 'right') ]
+
+def tie(marking_type, marking_name):
+    fields = [ place_type.place_expr(marking_name) for place_type in marking_type.sorted_place_types() ]
+    return "std::tie({})".format(", ".join(fields))
+
+class EqGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+        body = "return {} == {};".format(tie(marking_type, 'left'), tie(marking_type, 'right'))
+        return FunctionDef(returns = Bool(),
+                           name = 'operator==',
+                           params = marking_params(),
+                           body = [ Verbatim(body) ],
+                           qualifiers = 'inline')
+
+class LessGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+        body = "return {} < {};".format(tie(marking_type, 'left'), tie(marking_type, 'right'))
+        return FunctionDef(returns = Bool(),
+                           name = 'operator<',
+                           params = marking_params(),
+                           body = [ Verbatim(body) ],
+                           qualifiers = 'inline')
+
+class HashGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+        body = [ Verbatim("std::size_t seed = 0;") ]
+        for place_type in marking_type.sorted_place_types():
+            body.append(Verbatim("neco::hash_combine(seed, {});".format(place_type.hash_expr(env, 'marking'))))
+        body.append(Verbatim("return seed;"))
+
+        function = FunctionDef(returns = UserType('std::size_t'),
+                               name = 'marking_hash',
+                               params = [ ParamDecl(UserType('const Marking&'), 'marking') ],
+                               body = body,
+                               qualifiers = 'inline')
+        functor = Verbatim("struct MarkingHash\n"
+                           "{\n"
+                           "    std::size_t operator()(const Marking& marking) const { return marking_hash(marking); }\n"
+                           "};")
+        return [ function, functor ]
+
+class DumpGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+        body = [ Verbatim("std::ostringstream output;"),
+                 Verbatim('output << "{\\n";') ]
+        for place_type in marking_type.sorted_place_types():
+            body.append(Verbatim('output << "{} : ";'.format(cpp_string(repr(place_type.info.name)))))
+            body.append(place_type.dump_stmt(env, 'marking', 'output'))
+            body.append(Verbatim('output << ", \\n";'))
+        body.append(Verbatim('output << "}";'))
+        body.append(Verbatim("return output.str();"))
+
+        return FunctionDef(returns = UserType('std::string'),
+                           name = 'dump',
+                           params = [ ParamDecl(UserType('const Marking&'), 'marking') ],
+                           body = body,
+                           qualifiers = 'static')
+
+def cpp_string(string):
+    """ Escape a string for a C++ string literal.
+
+    >>> print cpp_string('a "b"\\\\')
+    a \\"b\\"\\\\
+    """
+    return string.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,114 @@
+from neco.asdl.cpp import AttrDecl, Block, UserType, Verbatim
+from neco.core.info import TypeInfo
+from neco.core.nettypes import provides_token_lookup
+import neco.core.nettypes as coretypes
+
+################################################################################
+
+class CppPlaceType(object):
+    """ Base class for C++ backend place types. """
+
+    def place_expr(self, marking_name):
+        return "{}.{}".format(marking_name, self.field)
+
+    def attribute(self):
+        """ produce the declaration of the place in the marking structure. """
+        return AttrDecl(UserType(self.cpp_type), self.field)
+
+################################################################################
+
+# multiple inheritance is used to allow type matching.
+
+@provides_token_lookup
+class BTPlaceType(coretypes.BTPlaceType, CppPlaceType):
+    """ C++ black token place type implementation, the number of tokens. """
+
+    cpp_type = 'int'
+
+    def __init__(self, place_info, marking_type):
+        coretypes.BTPlaceType.__init__(self,
+                                       place_info = place_info,
+                                       marking_type = marking_type,
+                                       type_info = TypeInfo.get('Int'),
+                                       token_type = TypeInfo.get('BlackToken'))
+
+        self.field = marking_type.id_provider.get(place_info.name)
+
+    def enumerate(self, env, marking_name, binding, body):
+        return Block("if ({} > 0)".format(self.place_expr(marking_name)), body)
+
+    def lookup(self, env, marking_name, token, body):
+        return Block("if ({} > 0)".format(self.place_expr(marking_name)), body)
+
+    def enumerate_distinct(self, env, marking_name, bindings, body):
+        return Block("if ({} >= {})".format(self.place_expr(marking_name), len(bindings)), body)
+
+    def add_token_stmt(self, env, token, marking_name):
+        return Verbatim("++{};".format(self.place_expr(marking_name)))
+
+    def remove_token_stmt(self, env, token, marking_name):
+        return Verbatim("--{};".format(self.place_expr(marking_name)))
+
+    def hash_expr(self, env, marking_name):
+        return "std::hash<int>()({})".format(self.place_expr(marking_name))
+
+    def dump_stmt(self, env, marking_name, output):
+        return Verbatim("neco::dump_black_tokens({}, {});".format(output, self.place_expr(marking_name)))
+
+################################################################################
+
+@provides_token_lookup
+class MultisetPlaceType(coretypes.PlaceType, CppPlaceType):
+    """ C++ place type implementation for integers and tuples of integers,
+    a sorted vector of distinct tokens with their multiplicities.
+    """
+
+    def __init__(self, place_info, marking_type, token_cpp_type):
+        coretypes.PlaceType.__init__(self,
+                                     place_info = place_info,
+                                     marking_type = marking_type,
+                                     type_info = TypeInfo.get('MultiSet'),
+                                     token_type = place_info.type)
+
+        self.field = marking_type.id_provider.get(place_info.name)
+        self.cpp_type = "neco::multiset<{}>".format(token_cpp_type)
+
+    def enumerate(self, env, marking_name, binding, body):
+        entry = env.variable_provider.new_variable().name
+        return Block("for (const auto& {} : {})".format(entry, self.place_expr(marking_name)),
+                     binding("{}.first".format(entry)) + body)
+
+    def lookup(self, env, marking_name, token, body):
+        return Block("if ({}.count({}) > 0)".format(self.place_expr(marking_name), token), body)
+
+    def enumerate_distinct(self, env, marking_name, bindings, body):
+        """ Enumerate distinct values for each binding, a value is chosen
+        by several bindings only if the place holds enough occurrences.
+        """
+        entries = [ env.variable_provider.new_variable().name for _ in bindings ]
+        for i in reversed(range(len(bindings))):
+            name, binding = bindings[i]
+            inner = binding("{}.first".format(entries[i]))
+            if i > 0:
+                repeats = " + ".join("({} == {})".format(previous, name) for previous, _ in bindings[:i])
+                inner.append(Block("if ({} < {}.second)".format(repeats, entries[i]), body))
+            else:
+                inner.extend(body)
+            body = [ Block("for (const auto& {} : {})".format(entries[i], self.place_expr(marking_name)), inner) ]
+        return body
+
+    def add_token_stmt(self, env, token, marking_name):
+        return Verbatim("{}.add({});".format(self.place_expr(marking_name), token))
+
+    def remove_token_stmt(self, env, token, marking_name):
+        return Verbatim("{}.remove({});".format(self.place_expr(marking_name), token))
+
+    def hash_expr(self, env, marking_name):
+        return "{}.hash()".format(self.place_expr(marking_name))
+
+    def dump_stmt(self, env, marking_name, output):
+        return Verbatim("{}.dump({});".format(self.place_expr(marking_name), output))
+
+################################################################################
+# EOF
+################################################################################
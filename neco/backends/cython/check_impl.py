@@ -243,13 +243,7 @@ class IsFireableGenerator(core.SuccTGenerator):
         builder = self.builder
 
         self.gen_enumerators()
-
-        guard = info.ExpressionInfo(trans.trans.guard._str)
-        try:
-            if eval(guard.raw) != True:
-                builder.begin_GuardCheck(condition = core.netir.PyExpr(guard))
-        except:
-            builder.begin_GuardCheck(condition = core.netir.PyExpr(guard))
+        self.gen_guard()
 
         # guard valid
         success = info.ExpressionInfo("True")
@@ -64,6 +64,10 @@ def compile_IR(env, config, compiler_):
     module_pyx_file.declarations.append("import cPickle, StringIO")
     module_pyx_file.declarations.append("from neco.extsnakes import Pid\n")
 
+    if config.instrument_arcs:
+        module_pyx_file.declarations.append("from neco.core.arcprofile import ArcProfile")
+        module_pyx_file.declarations.append("neco_arc_profile = ArcProfile()\n")
+
     # command line imports
     for mod in config.imports:
         module_pyx_file.declarations.append("from {} import *".format(mod))
@@ -121,6 +125,29 @@ def compile_IR(env, config, compiler_):
     for node in env.function_nodes():
         module_pyx_file.body.append(compiler.compile(node))
 
+    # transition tables and dispatcher used by partial order reduction and incremental exploration
+    transitions = env.net_info.transitions
+    conflicts, enablers = env.net_info.dependency_tables()
+    cases = [ "{} i == {}:\n    {}(m, acc, ctx)".format('if' if i == 0 else 'elif', i, env.get_succ_function_name(transition))
+              for i, transition in enumerate(transitions) ]
+    module_pyx_file.body.append(cyast.Builder.FunctionCDef(name = "neco_por_fire",
+                                                           args = (cyast.A("i", type = "int")
+                                                                   .param("m", type = "Marking")
+                                                                   .param("acc", type = "set")
+                                                                   .param("ctx", type = "NecoCtx")),
+                                                           body = [ cyast.E("\n".join(cases) if cases else "pass") ],
+                                                           lang = cyast.CDef(public = False),
+                                                           returns = cyast.Name("")))
+    module_pyx_file.body.append(cyast.E('neco_por_conflicts = {!r}'.format(conflicts)))
+    module_pyx_file.body.append(cyast.E('neco_por_enablers = {!r}'.format(enablers)))
+    module_pyx_file.body.append(cyast.E('neco_place_dependents = {!r}'.format(env.net_info.place_dependents())))
+    if config.normalize_pids:
+        # pid normalization may rename tokens in any place
+        affected = [ tuple(xrange(len(transitions))) ] * len(transitions)
+    else:
+        affected = env.net_info.affected_transitions()
+    module_pyx_file.body.append(cyast.E('neco_affected = {!r}'.format(affected)))
+
     module_pyx_file.body.append(cyast.E('_neco_trace_ = {!r}'.format(compiler_.produce_compilation_trace())))
 
     ################################################################################
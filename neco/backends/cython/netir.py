@@ -17,6 +17,8 @@ class CompilerVisitor(coreir.CompilerVisitor):
 
     def __init__(self, env):
         self.env = env
+        # markings whose hash is derived from their parent, with modified places
+        self.hashed_markings = {}
 
     def compile_Return(self, node):
         return [ cyast.Return(self.compile(node.expr)) ]
@@ -190,6 +192,13 @@ class CompilerVisitor(coreir.CompilerVisitor):
                                                             value = get_token),
                                               self.compile(node.body) ],
                                         orelse = []) ]
+        elif hasattr(place_type, 'domain_expr'):
+            # each distinct token is visited once
+            self.env.try_declare_cvar(node.token_var.name, node.token_var.type)
+            return cyast.Builder.For(target = cyast.Name(node.token_var.name),
+                                     iter = place_type.domain_expr(env = self.env,
+                                                                   marking_var = node.marking_var),
+                                     body = [ self.compile(node.body) ])
         else:
             self.env.try_declare_cvar(node.token_var.name, node.token_var.type)
             place_type = marking_type.get_place_type_by_name(node.place_name)
@@ -225,9 +234,60 @@ class CompilerVisitor(coreir.CompilerVisitor):
 
         return base, inner
 
+    def compile_TokenLookup(self, node):
+        place_type = self.env.marking_type.get_place_type_by_name(node.place_name)
+        self.env.try_declare_cvar(node.token_var.name, node.token_var.type)
+        return [ cyast.Assign(targets = [ cyast.Name(node.token_var.name) ],
+                              value = self.compile(node.token_expr)),
+                 cyast.If(test = place_type.token_lookup_expr(self.env,
+                                                              node.marking_var,
+                                                              cyast.Name(node.token_var.name)),
+                          body = [ self.compile(node.body) ],
+                          orelse = []) ]
+
+    def gen_distinct_enumeration(self, node, place_type):
+        """ Enumerate distinct values for each sub arc, a value is chosen
+        by several sub arcs only if the place holds enough occurrences.
+        """
+        base = None
+        current = None
+        chosen = []
+        for sub_arc in node.multiarc.sub_arcs:
+            variable = sub_arc.data['local_variable']
+            self.env.try_declare_cvar(variable.name, place_type.token_type)
+
+            enumeration = cyast.For(target = cyast.Name(variable.name),
+                                    iter = place_type.domain_expr(self.env, node.marking_var),
+                                    body = [])
+            if base == None:
+                base = enumeration
+            else:
+                current.body.append(enumeration)
+            current = enumeration
+
+            if chosen:
+                # occurrences of the value among previously chosen ones
+                repeats = cyast.Builder.Helper(cyast.Tuple(elts = list(chosen))).attr('count').call([ cyast.Name(variable.name) ]).ast()
+                check = cyast.If(test = cyast.Compare(left = repeats,
+                                                      ops = [ cyast.Lt() ],
+                                                      comparators = [ place_type.token_count_expr(self.env,
+                                                                                                  node.marking_var,
+                                                                                                  cyast.Name(variable.name)) ]),
+                                 body = [],
+                                 orelse = [])
+                current.body.append(check)
+                current = check
+            chosen.append(cyast.Name(variable.name))
+
+        current.body.append(self.compile(node.body))
+        return base
+
     def compile_MultiTokenEnumeration(self, node):
         place_type = self.env.marking_type.get_place_type_by_name(node.place_name)
 
+        if not place_type.provides_by_index_access and hasattr(place_type, 'token_count_expr'):
+            return self.gen_distinct_enumeration(node, place_type)
+
         base = None
         current = None
         if place_type.provides_by_index_access:
@@ -313,15 +373,25 @@ class CompilerVisitor(coreir.CompilerVisitor):
 
     def compile_MarkingCopy(self, node):
         self.env.try_declare_cvar(node.dst.name, node.dst.type)
-        return self.env.marking_type.gen_copy(env = self.env,
-                                              src_marking = node.src,
-                                              dst_marking = node.dst,
-                                              modified_places = node.mod)
+        marking_type = self.env.marking_type
+        stmts = [ marking_type.gen_copy(env = self.env,
+                                        src_marking = node.src,
+                                        dst_marking = node.dst,
+                                        modified_places = node.mod) ]
+        # pid normalization does not preserve hashes
+        if not marking_type.config.normalize_pids:
+            stmts.extend(marking_type.gen_parent_hash(self.env, node.src, node.dst, node.mod))
+            self.hashed_markings[node.dst] = node.mod
+        return stmts
 
     def compile_AddMarking(self, node):
-        return cyast.stmt(self.env.marking_set_type.add_marking_stmt(env = self.env,
+        stmt = cyast.stmt(self.env.marking_set_type.add_marking_stmt(env = self.env,
                                                                      markingset_var = node.marking_set_var,
                                                                      marking_var = node.marking_var))
+        if node.marking_var not in self.hashed_markings:
+            return stmt
+        return [ self.env.marking_type.gen_update_hash(self.env, node.marking_var, self.hashed_markings[node.marking_var]),
+                 stmt ]
 
     def compile_AddToken(self, node):
         place_type = self.env.marking_type.get_place_type_by_name(node.place_name)
@@ -9,6 +9,7 @@ import neco.utils as utils
 import priv.mrkfunctions
 import priv.mrkmethods
 import priv.mrkpidfunctions
+import sys
 
         
 ################################################################################
@@ -36,6 +37,11 @@ class StaticMarkingType(coretypes.MarkingType):
         self.add_method_generator(priv.mrkmethods.DumpExprGenerator())
         self.add_method_generator(priv.mrkmethods.RichcmpGenerator())
         self.add_method_generator(priv.mrkmethods.HashGenerator())
+        self.add_method_generator(priv.mrkmethods.FingerprintGenerator())
+        if not config.normalize_pids:
+            self.add_method_generator(priv.mrkmethods.PackGenerator())
+            self.add_method_generator(priv.mrkmethods.KeyGenerator())
+            self.add_method_generator(priv.mrkmethods.ComponentsGenerator())
 
         self._C_function_generators = []
 
@@ -48,6 +54,9 @@ class StaticMarkingType(coretypes.MarkingType):
         if config.normalize_pids:
             self.add_C_function_generator(priv.mrkpidfunctions.UpdatePidsGenerator())
             self.add_C_function_generator(priv.mrkpidfunctions.NormalizePidsGenerator())
+        else:
+            self.add_C_function_generator(priv.mrkfunctions.FromComponentsGenerator())
+            self.add_C_function_generator(priv.mrkfunctions.UnpackGenerator())
 
     def add_C_function_generator(self, generator):
         self._C_function_generators.append(generator)
@@ -72,10 +81,16 @@ class StaticMarkingType(coretypes.MarkingType):
             return placetypes.GeneratorPlaceType(place_info, self)
     
         pi_type = place_info.type
-        if   pi_type.is_Int:        return placetypes.IntPlaceType(place_info, marking_type=self)
+        if   pi_type.is_Int:        return placetypes.IntRunPlaceType(place_info, marking_type=self)
         elif pi_type.is_Bool:       return placetypes.ObjectPlaceType(place_info, marking_type=self)
         elif pi_type.is_String:     return placetypes.ObjectPlaceType(place_info, marking_type=self)
-        elif pi_type.is_BlackToken: return placetypes.BTPlaceType(place_info, marking_type=self, packed=False)
+        elif pi_type.is_BlackToken:
+            # k-bounded places are packed as counters if they fit a packed field
+            bound = place_info.bound
+            if (self.config.bit_packing and bound and
+                placetypes.counter_bits(bound) <= self.chunk_manager.packed_field_size):
+                return placetypes.BTCounterPlaceType(place_info, marking_type=self, bound=bound)
+            return placetypes.BTPlaceType(place_info, marking_type=self, packed=False)
         elif pi_type.is_Pid:
             if self.config.normalize_pids:  return placetypes.PidPlaceType(place_info, marking_type=self)
             else:                           return placetypes.ObjectPlaceType(place_info, marking_type=self)
@@ -177,6 +192,9 @@ class StaticMarkingType(coretypes.MarkingType):
             #   place = chunk_place_map[attr_name]
             cls.add_decl(cyast.Comment("{}".format(chunk.hint)))
 
+        # cached hash, 0 if not computed yet
+        cls.add_decl(cyast.CVar(name='_hash', type='int'))
+
         cls.add_method(cyast.FunctionDecl(name='copy',
                                           args=cyast.to_ast(cyast.A("self", cyast.Name(env.type2str(self.type)))),
                                           returns=cyast.Name(env.type2str(self.type)),
@@ -299,6 +317,73 @@ class StaticMarkingType(coretypes.MarkingType):
 
         return cyast.to_ast(nodes)
 
+    def gen_hash_terms(self, env, marking_var, modified_places = None):
+        """ Produce the terms xored together by the marking hash.
+
+        Each term depends on a single attribute, so the hash of a successor
+        can be derived from the one of its parent by replacing the terms of
+        modified attributes.
+
+        @param modified_places: if given, only produce the terms that may
+        change when these places are modified.
+        @type modified_places: C{set}
+        """
+        if modified_places is None:
+            selected = None
+        else:
+            selected = set( place_type.get_attribute_name() for place_type in self.place_types.itervalues()
+                            if place_type.info in modified_places )
+
+        terms = []
+        mult = 0xBADBEEF
+        i = 0
+
+        hashed = set()
+        if self.chunk_manager.packed_bits() > 0:
+            attr_name, _, count = self.chunk_manager.packed_attribute()
+            hashed.add(attr_name)
+            attr = "{}.{}".format(marking_var.name, attr_name)
+
+            for index in range(0, count):
+                # packed fields may be shared with any modified place
+                if selected is None or selected:
+                    terms.append(cyast.BinOp(left = cyast.E('{!s}[{!s}]'.format(attr, index)),
+                                             op = cyast.Mult(),
+                                             right = cyast.Num(mult)))
+                mult = (mult + (82520L + i + i)) % sys.maxint
+                i += 1
+
+        for place_type in self.place_types.itervalues():
+            if place_type.get_attribute_name() in hashed:
+                continue
+
+            if selected is None or place_type.get_attribute_name() in selected:
+                terms.append(cyast.BinOp(left = place_type.hash_expr(env, marking_var = marking_var),
+                                         op = cyast.Mult(),
+                                         right = cyast.Num(mult)))
+            mult = (mult + (82521 * i + i)) % sys.maxint
+            i += 1
+
+        return terms
+
+    def gen_parent_hash(self, env, src_marking, dst_marking, modified_places):
+        """ Start the hash of a successor from the hash of its parent
+        without the terms of modified places.
+        """
+        value = cyast.E('{}._hash'.format(src_marking.name))
+        for term in self.gen_hash_terms(env, src_marking, modified_places):
+            value = cyast.BinOp(left = value, op = cyast.BitXor(), right = term)
+
+        return [ cyast.E('if {0}._hash == 0: hash({0})'.format(src_marking.name)),
+                 cyast.Assign(targets = [ cyast.E('{}._hash'.format(dst_marking.name)) ], value = value) ]
+
+    def gen_update_hash(self, env, marking_var, modified_places):
+        """ Add the terms of modified places to the hash of a successor. """
+        value = cyast.E('{}._hash'.format(marking_var.name))
+        for term in self.gen_hash_terms(env, marking_var, modified_places):
+            value = cyast.BinOp(left = value, op = cyast.BitXor(), right = term)
+        return cyast.Assign(targets = [ cyast.E('{}._hash'.format(marking_var.name)) ], value = value)
+
     def copy_marking_expr(self, env, marking_var):
         return cyast.Call(func=cyast.Attribute(name=marking_var.name,
                                                attr='copy')
@@ -34,6 +34,7 @@ def from_neco_lib(f):
 
 TypeInfo.register_type("MultiSet")
 TypeInfo.register_type("IntPlace")
+TypeInfo.register_type("IntRunPlace")
 TypeInfo.register_type("Char")
 TypeInfo.register_type("Short")
 TypeInfo.register_type("UnsignedInt")
@@ -107,6 +108,7 @@ class CompilingEnvironment(core.CompilingEnvironment):
         self.register_cython_type(TypeInfo.get('Int'), 'int')
         self.register_cython_type(TypeInfo.get('Short'), 'short')
         self.register_cython_type(TypeInfo.get('IntPlace'), from_neco_lib('TGenericPlaceType[int]*'))
+        self.register_cython_type(TypeInfo.get('IntRunPlace'), from_neco_lib('TRunLengthPlaceType[int]*'))
         self.register_cython_type(TypeInfo.get('MultiSet'), 'ctypes_ext.MultiSet')
         self.register_cython_type(TypeInfo.get('UnsignedChar'), 'unsigned char')
         self.register_cython_type(TypeInfo.get('UnsignedInt'), 'unsigned int')
@@ -396,14 +396,19 @@ class Mask(object):
 class MemoryChunk(object):
     '''
     '''
-    def __init__(self, mgr, name, cython_type, packed = False):
+    def __init__(self, mgr, name, cython_type, packed = False, bits = None):
         ''' 
         '''
         self.name = name
         self.chunk_manager = mgr
         self.cython_type = cython_type
         self.packed = packed
-        self.bits = bits_sizeof(cython_type) if packed else 0
+        if not packed:
+            self.bits = 0
+        elif bits is not None:
+            self.bits = bits
+        else:
+            self.bits = bits_sizeof(cython_type)
         # self.bytes = bytes_sizeof(cython_type)
         self.hint = "no hint"
 
@@ -473,10 +478,23 @@ class ChunkManager(object):
         # print " >>>>>>>>>> ", len(fields), fields
         self.packed_field_count = len(fields)
 
-    def new_chunk(self, name, cython_type, packed = False):
-        '''
+    def new_chunk(self, name, cython_type, packed = False, bits = None):
+        ''' New memory chunk.
+
+        Packed chunks use C{bits} bits of the packed attribute, or the
+        size of C{cython_type} if not given. A chunk never spans two
+        packed fields.
+
+        >>> chunk_manager = ChunkManager('reserved_name')
+        >>> c1 = chunk_manager.new_chunk('p1', TypeInfo.Bool, True)
+        >>> c2 = chunk_manager.new_chunk('p2', TypeInfo.UnsignedChar, True, bits = 3)
+        >>> c3 = chunk_manager.new_chunk('p3', TypeInfo.UnsignedChar, True, bits = 6)
+        >>> c1.offset(), c2.offset(), c3.offset()
+        ((0, 6), (1, 0), (0, 0))
+        >>> int(c2.mask()), int(c3.mask())
+        (7, 63)
         '''
-        chunk = MemoryChunk(self, name, cython_type, packed)
+        chunk = MemoryChunk(self, name, cython_type, packed, bits)
         if name in self.named_chunks:
             raise RuntimeError
 
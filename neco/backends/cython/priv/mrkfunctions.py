@@ -1,3 +1,4 @@
+from common import from_neco_lib
 from neco.core.info import VariableProvider, TypeInfo
 from neco.core.nettypes import MarkingTypeMethodGenerator
 import cyast
@@ -152,3 +153,58 @@ class CopyGenerator(MarkingTypeMethodGenerator):
         builder.emit_Return(cyast.E('self.copy()'))
         builder.end_FunctionDef()
         return cyast.to_ast(builder)
+
+class FromComponentsGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        items = list(marking_type.place_types.iteritems())
+        items.sort(lambda (n1, t1), (n2, t2) : cmp(n1, n2))
+
+        vp = VariableProvider()
+        marking_var = vp.new_variable(marking_type.type, 'm')
+
+        builder = cyast.Builder()
+        builder.begin_FunctionCPDef(name = "neco_marking_from_components",
+                                    args = cyast.A("values", type = "tuple"),
+                                    returns = cyast.E("Marking"),
+                                    decl = [ cyast.Builder.CVar(name = marking_var.name, type = 'Marking') ])
+        builder.emit(cyast.E("{} = Marking()".format(marking_var.name)))
+
+        position = 0
+        unpacked = set()
+        if marking_type.chunk_manager.packed_bits() > 0:
+            attr_name, _, count = marking_type.chunk_manager.packed_attribute()
+            unpacked.add(attr_name)
+            for index in range(0, count):
+                builder.emit(cyast.E("{object}.{attribute}[{index!s}] = values[{position}][{index!s}]".format(object = marking_var.name,
+                                                                                                            attribute = attr_name,
+                                                                                                            index = index,
+                                                                                                            position = position)))
+            position += 1
+
+        for (_, place_type) in items:
+            attr_name = place_type.get_attribute_name()
+            if attr_name in unpacked:
+                continue
+            unpacked.add(attr_name)
+            value_expr = cyast.E("values[{}]".format(position))
+            builder.emit(place_type.unpack_stmt(env, marking_var, value_expr))
+            position += 1
+
+        builder.emit_Return(cyast.E(marking_var.name))
+        builder.end_FunctionDef()
+        return cyast.to_ast(builder)
+
+class UnpackGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        builder = cyast.Builder()
+        builder.begin_FunctionCPDef(name = "neco_marking_unpack",
+                                    args = cyast.A("string", type = "bytes"),
+                                    returns = cyast.E("Marking"),
+                                    decl = [])
+        builder.emit_Return(cyast.E("neco_marking_from_components({}(string))".format(from_neco_lib('neco_unpack'))))
+        builder.end_FunctionDef()
+        return cyast.to_ast(builder)
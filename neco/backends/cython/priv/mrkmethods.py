@@ -1,7 +1,7 @@
+from common import from_neco_lib
 from neco.core.info import VariableProvider, TypeInfo
 from neco.core.nettypes import MarkingTypeMethodGenerator
 import cyast
-import sys
 
 class DeallocGenerator(MarkingTypeMethodGenerator):
 
@@ -150,53 +150,39 @@ class HashGenerator(MarkingTypeMethodGenerator):
                                    args = cyast.A("self", type = "Marking"),
                                    decl = [ cyast.Builder.CVar( name = 'h', type = 'int' ) ])
 
-        builder.emit( cyast.E("h = 0xDEADDAD") )
-        mult = 0xBADBEEF
-        i = 0
+        cache = not marking_type.config.normalize_pids
+        if cache:
+            builder.emit( cyast.E("if self._hash != 0: return self._hash") )
 
-        hashed = set()
-        if marking_type.chunk_manager.packed_bits() > 0:
-            attr_name, _, count = marking_type.chunk_manager.packed_attribute()
-            hashed.add(attr_name)
-            attr = "{}.{}".format(self_var.name, attr_name)
-            
-            for index in range(0, count):
-                attr_expr = cyast.E('{!s}[{!s}]'.format(attr, index))
-                builder.emit( cyast.Assign(targets=[cyast.Name('h')],
-                                           value=cyast.BinOp(left = cyast.BinOp(left=cyast.Name('h'),
-                                                                                op=cyast.BitXor(),
-                                                                                right=attr_expr ),
-                                                             op = cyast.Mult(),
-                                                             right = cyast.Num(mult) ) ) )
-                mult = (mult + (82520L + i + i)) % sys.maxint
-                i += 1
+        builder.emit( cyast.E("h = 0xDEADDAD") )
+        for term in marking_type.gen_hash_terms(env, self_var):
+            builder.emit( cyast.Assign(targets = [cyast.Name('h')],
+                                       value = cyast.BinOp(left = cyast.Name('h'),
+                                                           op = cyast.BitXor(),
+                                                           right = term)) )
+        if cache:
+            builder.emit( cyast.E("self._hash = h") )
 
-        for place_type in marking_type.place_types.itervalues():
-#            if place_type.is_packed or place_type.is_helper:
-#                pass
-#            else:
-#                if place_type.type.is_Int or place_type.type.is_Short or place_type.type.is_Char:
-#                    native_place = marking_type.id_provider.get(place_type)
-#                    builder.emit(cyast.E('h = (h ^ self.{place_name}) * {mult}'.format(place_name=native_place,
-#                                                                                 mult=mult))
-#                                 )
-#                else:
-            if place_type.get_attribute_name() in hashed:
-                continue
+        builder.emit_Return(cyast.E("h"))
+        builder.end_FunctionDef()
+        return cyast.to_ast(builder)
 
-            place_hash = place_type.hash_expr(env, marking_var = self_var)
-            builder.emit(cyast.Assign(targets=[cyast.Name('h')],
-                                      value=cyast.BinOp(left=cyast.BinOp(left=cyast.Name('h'),
-                                                                         op=cyast.BitXor(),
-                                                                         right=place_hash),
-                                                        op=cyast.Mult(),
-                                                        right=cyast.Num(mult))
-                                      )
-                         )
-            mult = (mult + (82521 * i + i)) % sys.maxint
-            i += 1
+class FingerprintGenerator(MarkingTypeMethodGenerator):
 
-        builder.emit_Return(cyast.E("h"))
+    def generate(self, env):
+        builder = cyast.Builder()
+        builder.begin_FunctionDef(name = "__fingerprint__",
+                                  args = cyast.A("self", type = "Marking"))
+
+        if env.marking_type.config.normalize_pids:
+            # markings have no keys, fall back to the (weaker) marking hash
+            builder.emit_Return(cyast.Call(func = cyast.E(from_neco_lib('mix64')),
+                                           args = [ cyast.Cast(target = 'unsigned long long',
+                                                               value = cyast.E('hash(self)')) ]))
+        else:
+            # 64 bits, independent of __hash__: digest of the marking key
+            builder.emit_Return(cyast.Call(func = cyast.E(from_neco_lib('neco_fingerprint')),
+                                           args = [ cyast.E('self.__key__()') ]))
         builder.end_FunctionDef()
         return cyast.to_ast(builder)
 
@@ -305,3 +291,79 @@ class DumpExprGenerator(MarkingTypeMethodGenerator):
 
         builder.end_FunctionDef()
         return cyast.to_ast(builder)
+
+def pack_values(env, marking_type, self_var):
+    """ Packed values of attributes, the packed attribute first then
+    places in name order. """
+    items = list(marking_type.place_types.iteritems())
+    items.sort(lambda (n1, t1), (n2, t2) : cmp(n1, n2))
+
+    values = []
+    packed = set()
+    if marking_type.chunk_manager.packed_bits() > 0:
+        attr_name, _, count = marking_type.chunk_manager.packed_attribute()
+        packed.add(attr_name)
+        values.append(cyast.Tuple([ cyast.E('{}.{}[{!s}]'.format(self_var.name, attr_name, index))
+                                    for index in range(0, count) ]))
+
+    for (_, place_type) in items:
+        attr_name = place_type.get_attribute_name()
+        if attr_name in packed:
+            continue
+        packed.add(attr_name)
+        values.append(place_type.pack_expr(env, self_var))
+    return values
+
+class PackGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, 'self')
+
+        builder = cyast.Builder()
+        builder.begin_FunctionDef(name = '__pack__',
+                                  args = cyast.A('self', type = 'Marking'))
+
+        values = pack_values(env, marking_type, self_var)
+        builder.emit_Return(cyast.Call(func = cyast.E(from_neco_lib('neco_pack')),
+                                       args = [ cyast.Tuple(values) ]))
+        builder.end_FunctionDef()
+        return cyast.to_ast(builder)
+
+class KeyGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, 'self')
+
+        builder = cyast.Builder()
+        builder.begin_FunctionDef(name = '__key__',
+                                  args = cyast.A('self', type = 'Marking'))
+
+        # equal markings have equal keys (1 == 1.0 == True)
+        values = pack_values(env, marking_type, self_var)
+        builder.emit_Return(cyast.Call(func = cyast.E(from_neco_lib('neco_pack_key')),
+                                       args = [ cyast.Tuple(values) ]))
+        builder.end_FunctionDef()
+        return cyast.to_ast(builder)
+
+class ComponentsGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, 'self')
+
+        builder = cyast.Builder()
+        builder.begin_FunctionDef(name = '__components__',
+                                  args = cyast.A('self', type = 'Marking'))
+
+        # hashable attribute contents, interned by collapse compression
+        builder.emit_Return(cyast.Tuple(pack_values(env, marking_type, self_var)))
+        builder.end_FunctionDef()
+        return cyast.to_ast(builder)
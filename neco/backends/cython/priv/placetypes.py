@@ -3,7 +3,7 @@ from lowlevel import Mask
 from neco import extsnakes
 from neco.core.info import TypeInfo
 from neco.core.nettypes import provides_by_index_access, \
-    provides_by_index_deletion
+    provides_by_index_deletion, provides_token_lookup
 from neco.utils import should_not_be_called, todo
 import cyast
 import math
@@ -134,6 +134,7 @@ class CythonPlaceType(object):
 ################################################################################
 
 @checking_without_helper
+@provides_token_lookup
 class ObjectPlaceType(coretypes.ObjectPlaceType, CythonPlaceType):
     """ Python implementation of fallback place type. """
 
@@ -167,6 +168,15 @@ class ObjectPlaceType(coretypes.ObjectPlaceType, CythonPlaceType):
     def iterable_expr(self, env, marking_var):
         return self.attribute_expr(env, marking_var)
 
+    def domain_expr(self, env, marking_var):
+        return cyast.Call(func = cyast.Attribute(value = self.attribute_expr(env, marking_var),
+                                                 attr = 'domain'))
+
+    def token_count_expr(self, env, marking_var, compiled_token):
+        return cyast.Call(func = cyast.Attribute(value = self.attribute_expr(env, marking_var),
+                                                 attr = 'count'),
+                          args = [ compiled_token ])
+
     def remove_token_stmt(self, env, token_expr, compiled_token, marking_var):
         return cyast.stmt(cyast.Call(func = cyast.Attribute(value = self.attribute_expr(env, marking_var),
                                                           attr = 'remove'),
@@ -197,6 +207,11 @@ class ObjectPlaceType(coretypes.ObjectPlaceType, CythonPlaceType):
     def not_empty_expr(self, env, marking_var):
         return self.attribute_expr(env, marking_var)
 
+    def token_lookup_expr(self, env, marking_var, compiled_token):
+        return cyast.Call(func = cyast.Attribute(value = self.attribute_expr(env, marking_var),
+                                                 attr = 'has_key'),
+                          args = [ compiled_token ])
+
     def token_expr(self, env, token):
         return cyast.E(repr(token))
 
@@ -208,6 +223,15 @@ class ObjectPlaceType(coretypes.ObjectPlaceType, CythonPlaceType):
     def dump_expr(self, env, marking_var):
         return cyast.E('dump({}.{})'.format(marking_var.name, self.chunk.get_attribute_name()))
 
+
+    def pack_expr(self, env, marking_var):
+        return cyast.Call(func = cyast.Attribute(value = self.attribute_expr(env, marking_var),
+                                                 attr = 'pack'))
+
+    def unpack_stmt(self, env, marking_var, value_expr):
+        return cyast.Assign(targets = [self.attribute_expr(env, marking_var)],
+                            value = cyast.Call(func = cyast.E(from_neco_lib('multiset_unpack')),
+                                               args = [ value_expr ]))
     def add_items_stmt(self, env, multiset, marking_var):
         attribute_expr = self.attribute_expr(env, marking_var)
         return cyast.stmt(cyast.Call(func = cyast.Attribute(value = attribute_expr,
@@ -433,6 +457,92 @@ class IntPlaceType(GenericPlaceType):
         return cyast.Call(func = cyast.E(from_neco_lib("int_place_type_to_multiset")),
                           args = [place_expr])
 
+    def pack_expr(self, env, marking_var):
+        return cyast.Call(func = cyast.E(from_neco_lib("int_place_type_pack")),
+                          args = [ self.attribute_expr(env, marking_var) ])
+
+    def unpack_stmt(self, env, marking_var, value_expr):
+        return cyast.Assign(targets = [self.attribute_expr(env, marking_var)],
+                            value = cyast.Call(func = cyast.E(from_neco_lib("int_place_type_unpack")),
+                                               args = [ value_expr ]))
+
+
+@provides_token_lookup
+class IntRunPlaceType(GenericPlaceType):
+    """ Place type for unbounded 'int' places stored as sorted (value, count) runs.
+
+    Tokens are looked up and removed by binary search, enumeration
+    visits each distinct value once.
+    """
+
+    def __init__(self, place_info, marking_type):
+        assert(place_info.type == TypeInfo.get('Int'))
+        GenericPlaceType.__init__(self, place_info, marking_type,
+                                  TypeInfo.get("IntRunPlace"), TypeInfo.get("Int"))
+        # run indices are not token indices
+        self.disable_by_index_access()
+        self.disable_by_index_deletion()
+
+    def generic_type_name(self, env):
+        return from_neco_lib('TRunLengthPlaceType[int]')
+
+    def iterable_expr(self, env, marking_var):
+        return cyast.Call(func = cyast.E(from_neco_lib("int_run_place_type_tokens")),
+                          args = [ self.attribute_expr(env, marking_var) ])
+
+    def card_expr(self, env, marking_var):
+        return self.get_size_expr(env, marking_var)
+
+    def token_lookup_expr(self, env, marking_var, compiled_token):
+        place_expr = self.attribute_expr(env, marking_var)
+        return cyast.Compare(left = cyast.Call(func = cyast.Builder.Helper(place_expr).attr("count_of").ast(),
+                                               args = [ compiled_token ]),
+                             ops = [ cyast.Gt() ],
+                             comparators = [ cyast.Num(0) ])
+
+    def enumerate(self, env, marking_var, token_var, compiled_body):
+        return self.enumerate_tokens(env, token_var, marking_var, compiled_body)
+
+    def enumerate_tokens(self, env, token_var, marking_var, body):
+        index_var = env.variable_provider.new_variable(variable_type = TypeInfo.get('Int'))
+        runs_var = env.variable_provider.new_variable(variable_type = TypeInfo.get('Int'))
+
+        env.try_declare_cvar(token_var.name, token_var.type)
+        env.try_declare_cvar(index_var.name, TypeInfo.get('Int'))
+        env.try_declare_cvar(runs_var.name, TypeInfo.get('Int'))
+
+        place_expr = self.attribute_expr(env, marking_var)
+        get_token = cyast.Call(func = cyast.Builder.Helper(place_expr).attr("get").ast(),
+                               args = [ cyast.Name(index_var.name) ])
+
+        return [ cyast.Assign(targets = [cyast.Name(runs_var.name)],
+                              value = cyast.Call(func = cyast.Builder.Helper(place_expr).attr("runs").ast())),
+                 cyast.Builder.CFor(start = cyast.Num(0),
+                                    start_op = cyast.LtE(),
+                                    target = cyast.Name(index_var.name),
+                                    stop_op = cyast.Lt(),
+                                    stop = cyast.Name(runs_var.name),
+                                    body = [ cyast.Assign(targets = [cyast.Name(token_var.name)],
+                                                          value = get_token),
+                                             body ],
+                                    orelse = []) ]
+
+    def multiset_expr(self, env, marking_var):
+        check_marking_type(marking_var)
+
+        place_expr = self.attribute_expr(env, marking_var)
+        return cyast.Call(func = cyast.E(from_neco_lib("int_run_place_type_to_multiset")),
+                          args = [place_expr])
+
+    def pack_expr(self, env, marking_var):
+        return cyast.Call(func = cyast.E(from_neco_lib("int_run_place_type_pack")),
+                          args = [ self.attribute_expr(env, marking_var) ])
+
+    def unpack_stmt(self, env, marking_var, value_expr):
+        return cyast.Assign(targets = [self.attribute_expr(env, marking_var)],
+                            value = cyast.Call(func = cyast.E(from_neco_lib("int_run_place_type_unpack")),
+                                               args = [ value_expr ]))
+
 
 class PidPlaceType(GenericPlaceType):
     """ Place type for small unbounded 'int' places. """
@@ -617,11 +727,8 @@ class OneSafePlaceType(coretypes.OneSafePlaceType, CythonPlaceType):
             assign_helper = cyast.E("{}.{} = {}.{}".format(dst, helper_attr, src, helper_attr))
             comment_helper = cyast.Comment(self.helper_chunk.hint)
 
-        if self.info.type in [ TypeInfo.get('BlackToken'),
-                               TypeInfo.get('Int') ]:
-            copy_data = cyast.E("{}.{} = {}.{}".format(dst, attr, dst, attr))
-        else:
-            copy_data = cyast.E("{}.{} = {}.{}.copy()".format(dst, attr, dst, attr))
+        # tokens are immutable and shared, like in multisets
+        copy_data = cyast.E("{}.{} = {}.{}".format(dst, attr, src, attr))
         comment_data = cyast.Comment(self.chunk.hint)
 
         return [ assign_helper, comment_helper, copy_data, comment_data ]
@@ -641,6 +748,21 @@ class OneSafePlaceType(coretypes.OneSafePlaceType, CythonPlaceType):
 
         return cyast.E("'[' + dump({}) + ']' if {} else '[]'".format(place_expr, helper_expr))
 
+    def pack_expr(self, env, marking_var):
+        place_expr = "{}.{}".format(marking_var.name, self.chunk.get_attribute_name())
+        return cyast.IfExp(test = self.not_empty_expr(env, marking_var),
+                           body = cyast.Tuple([ cyast.E(place_expr) ]),
+                           orelse = cyast.Tuple([]))
+
+    def unpack_stmt(self, env, marking_var, value_expr):
+        # a packed helper is restored with the packed attribute
+        body = [ cyast.Assign(targets = [cyast.E("{}.{}".format(marking_var.name, self.chunk.get_attribute_name()))],
+                              value = cyast.Subscript(value = value_expr,
+                                                      slice = cyast.Index(cyast.Num(0)))) ]
+        if not self.helper_chunk.packed:
+            body.append(cyast.E("{}.{} = 1".format(marking_var.name, self.helper_chunk.get_attribute_name())))
+        return cyast.If(test = value_expr, body = body)
+
     def enumerate(self, env, marking_var, token_var, compiled_body):
         getnode = cyast.E("{} = {}.{}".format(token_var.name, marking_var.name, self.chunk.get_attribute_name()))
         ifnode = cyast.Builder.If(test = self.not_empty_expr(env, marking_var = marking_var),
@@ -747,6 +869,15 @@ class BTPlaceType(coretypes.BTPlaceType, CythonPlaceType):
                                                  op = cyast.Add(),
                                                  right = cyast.Str(']')))
 
+    def pack_expr(self, env, marking_var):
+        assert(not self.chunk.packed)
+        return self.attribute_expr(env, marking_var)
+
+    def unpack_stmt(self, env, marking_var, value_expr):
+        assert(not self.chunk.packed)
+        return cyast.Assign(targets = [self.attribute_expr(env, marking_var)],
+                            value = value_expr)
+
     def iterable_expr(self, env, marking_var):
         if self.chunk.packed:
             raise NotImplementedError
@@ -849,6 +980,108 @@ class BTPlaceType(coretypes.BTPlaceType, CythonPlaceType):
                                       body = [ compiled_body ])
             return [ ifnode ]
 
+class BTCounterPlaceType(coretypes.BTPlaceType, CythonPlaceType):
+    """ Black token place type for k-bounded places packed as a counter.
+
+    The number of tokens is stored on ceil(log2(k+1)) bits of the packed
+    attribute, so hash, compare and copy are handled with the packed fields.
+    """
+
+    def __init__(self, place_info, marking_type, bound):
+        coretypes.BTPlaceType.__init__(self,
+                                       place_info = place_info,
+                                       marking_type = marking_type,
+                                       type_info = TypeInfo.get('Short'),
+                                       token_type = TypeInfo.get('Short'))
+
+        self.chunk = marking_type.chunk_manager.new_chunk(marking_type.id_provider.get(self),
+                                                          TypeInfo.get('UnsignedChar'),
+                                                          packed = True,
+                                                          bits = counter_bits(bound))
+
+        self.chunk.hint = "{} - {!s} <= {}".format(place_info.name, place_info.type, bound)
+        self.info = place_info
+        self.marking_type = marking_type
+
+    def field_expr(self, marking_var):
+        byte_offset, _ = self.chunk.offset()
+        return '{}.{}[{}]'.format(marking_var.name, self.chunk.get_attribute_name(), byte_offset)
+
+    def count(self, marking_var):
+        _, bit_offset = self.chunk.offset()
+        return '(({} & {}) >> {})'.format(self.field_expr(marking_var), int(self.chunk.mask()), bit_offset)
+
+    def count_expr(self, marking_var):
+        return cyast.E(self.count(marking_var))
+
+    def delete_stmt(self, env, marking_var):
+        return []
+
+    def new_place_stmt(self, env, marking_var):
+        return []
+
+    def not_empty_expr(self, env, marking_var):
+        return cyast.E('{} & {}'.format(self.field_expr(marking_var), int(self.chunk.mask())))
+
+    def add_token_stmt(self, env, token_expr, compiled_token, marking_var):
+        _, bit_offset = self.chunk.offset()
+        return cyast.E('{} += {}'.format(self.field_expr(marking_var), 1 << bit_offset))
+
+    def remove_token_stmt(self, env, token_expr, compiled_token, marking_var):
+        _, bit_offset = self.chunk.offset()
+        return cyast.E('{} -= {}'.format(self.field_expr(marking_var), 1 << bit_offset))
+
+    @should_not_be_called
+    def copy_stmt(self, env, dst_marking_var, src_marking_var): pass
+
+    @should_not_be_called
+    def light_copy_stmt(self, env, dst_marking_var, src_marking_var): pass
+
+    @should_not_be_called
+    def pack_expr(self, env, marking_var): pass
+
+    @should_not_be_called
+    def unpack_stmt(self, env, marking_var, value_expr): pass
+
+    def token_expr(self, env, token):
+        return cyast.E("dot")
+
+    def dump_expr(self, env, marking_var):
+        return cyast.E("'[' + ', '.join(['dot'] * {}) + ']'".format(self.count(marking_var)))
+
+    def iterable_expr(self, env, marking_var):
+        return cyast.Call(func = cyast.Name('range'),
+                          args = [ cyast.Num(0), self.count_expr(marking_var) ])
+
+    def card_expr(self, env, marking_var):
+        return self.count_expr(marking_var)
+
+    def multiset_expr(self, env, marking_var):
+        ifexp = cyast.IfExp(test = self.not_empty_expr(env, marking_var),
+                            body = [ cyast.Dict([ cyast.E('dot') ], [ self.count_expr(marking_var) ]) ],
+                            orelse = [ cyast.E('{}') ])
+        return cyast.Call(func = cyast.E(env.type2str(TypeInfo.get('MultiSet'))),
+                          args = [ ifexp ])
+
+    def enumerate_tokens(self, checker_env, loop_var, marking_var, body):
+        return cyast.If(test = self.not_empty_expr(checker_env, marking_var),
+                        body = [ cyast.Assign(targets = [cyast.Name(loop_var.name)],
+                                              value = cyast.E("dot")),
+                                 body ],
+                        orelse = [])
+
+    def enumerate(self, env, marking_var, token_var, compiled_body):
+        return [ cyast.Builder.If(test = self.not_empty_expr(env, marking_var),
+                                  body = [ compiled_body ]) ]
+
+def counter_bits(bound):
+    """ Number of bits needed to count up to C{bound} tokens.
+
+    >>> counter_bits(1), counter_bits(2), counter_bits(3), counter_bits(4), counter_bits(255)
+    (1, 2, 2, 3, 8)
+    """
+    return int(math.ceil(math.log(bound + 1, 2)))
+
 ################################################################################
 #
 ################################################################################
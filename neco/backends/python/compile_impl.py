@@ -69,9 +69,15 @@ def compile_IR(env, config, compiler_):
     env.add_declaration("import StringIO")
     env.add_declaration("from time import time")
 
+    if config.instrument_arcs:
+        env.add_declaration("from neco.core.arcprofile import ArcProfile")
+        env.add_declaration("neco_arc_profile = ArcProfile()")
+
     if config.normalize_pids:
         env.add_declaration("from neco.extsnakes import *")
         env.add_declaration("from neco.backends.python.process import PidTree, pid_free_marking_order")
+        # pid bijections of already normalized markings
+        env.add_declaration("normalization_cache = data.NormalizationCache()")
 
     for mod in config.imports:
         env.add_declaration('from {} import *'.format(mod))
@@ -92,6 +98,21 @@ def compile_IR(env, config, compiler_):
     for node in env.function_nodes():
         compiled_nodes.append(compiler.compile(node))
 
+    # transition tables used by partial order reduction and incremental exploration
+    transitions = env.net_info.transitions
+    conflicts, enablers = env.net_info.dependency_tables()
+    names = [ env.get_succ_function_name(transition) for transition in transitions ]
+    compiled_nodes.append(pyast.E('neco_por_succs = [{}]'.format(', '.join(names))))
+    compiled_nodes.append(pyast.E('neco_por_conflicts = {!r}'.format(conflicts)))
+    compiled_nodes.append(pyast.E('neco_por_enablers = {!r}'.format(enablers)))
+    compiled_nodes.append(pyast.E('neco_place_dependents = {!r}'.format(env.net_info.place_dependents())))
+    if config.normalize_pids:
+        # pid normalization may rename tokens in any place
+        affected = [ tuple(xrange(len(transitions))) ] * len(transitions)
+    else:
+        affected = env.net_info.affected_transitions()
+    compiled_nodes.append(pyast.E('neco_affected = {!r}'.format(affected)))
+
     compiled_nodes = env.gen_imports() + compiled_nodes
 
     module_ast = ast.Module(body = compiled_nodes)
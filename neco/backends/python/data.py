@@ -1,12 +1,24 @@
 """ data structures designed for the compiled petrinet """
 
-from collections import Iterable
+from collections import Iterable, OrderedDict
 from copy import copy # a swallow copy is enough here
 from neco.extsnakes import Pid
 from process import PidTree
 from snakes.hashables import hdict, hashable
 from functools import partial
+import array
+import cPickle
+import cStringIO
+import hashlib
+import json
+import mmap
 import operator
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import traceback
 
 def pid_free_tuple_count_compare(ignore_set, left_pair, right_pair):
     left,  left_count  = left_pair
@@ -52,6 +64,734 @@ def dump(e):
     else:
         return repr(e)
 
+def canonical(obj):
+    """ Replace values by a canonical equal value of the same hash.
+
+    Booleans, longs and integral floats become ints, ascii unicode
+    strings become strings, tuples are handled recursively.
+
+    >>> canonical((True, 1L, 2.0, (u'a', 2.5)))
+    (1, 1, 2, ('a', 2.5))
+
+    @param obj: object to normalize.
+    @type obj: C{object}
+    """
+    t = type(obj)
+    if t is tuple:
+        return tuple([ canonical(item) for item in obj ])
+    elif t is bool or t is long:
+        return int(obj)
+    elif t is float:
+        return int(obj) if obj.is_integer() else obj
+    elif t is unicode:
+        try:
+            return str(obj)
+        except UnicodeEncodeError:
+            return obj
+    return obj
+
+def pack(obj):
+    """ Encode an object into a byte string.
+
+    The pickler memo is disabled, thus equal objects holding values
+    of the same types are encoded using equal strings. Values keep
+    their types (see C{pack_key}).
+
+    >>> pack((1, 'a')) == pack((1, ''.join(['a'])))
+    True
+    >>> unpack(pack((1, True, 1.0)))
+    (1, True, 1.0)
+
+    @param obj: object to encode (must not be recursive).
+    @type obj: C{object}
+    @return: encoded object.
+    @rtype: C{str}
+    """
+    output = cStringIO.StringIO()
+    pickler = cPickle.Pickler(output, 2)
+    pickler.fast = 1
+    pickler.dump(obj)
+    return output.getvalue()
+
+def pack_key(obj):
+    """ Encode an object into a byte string identifying it, equal
+    objects are encoded using equal strings.
+
+    Values are made canonical (see C{canonical}) before being
+    encoded, keys are used to compare objects, not to rebuild them.
+
+    >>> pack_key((1, 0, 2)) == pack_key((1L, False, 2.0))
+    True
+    >>> pack_key((1, 'a')) == pack((1, 'a'))
+    True
+
+    @param obj: object to encode (must not be recursive).
+    @type obj: C{object}
+    @rtype: C{str}
+    """
+    return pack(canonical(obj))
+
+def unpack(string):
+    """ Decode a byte string produced by C{pack}.
+
+    @param string: encoded object.
+    @type string: C{str}
+    """
+    return cPickle.loads(string)
+
+class VisitedStore(object):
+    """ Disk backed map from marking keys to packed markings.
+
+    Records (key and value) are appended to a record file, an open
+    addressing hash table indexing them by key is memory mapped from
+    a second file. Records are inserted by batches (C{merge}) sorted
+    by slot such that the table is swept in order instead of being
+    randomly accessed. A value equal to its key is not written twice.
+
+    >>> import tempfile, shutil
+    >>> directory = tempfile.mkdtemp()
+    >>> store = VisitedStore(directory, 4)
+    >>> sorted(store.merge([('b', 'B'), ('a', 'a'), ('b', 'C'), ('c', 'c')]))
+    ['B', 'a', 'c']
+    >>> sorted(store.merge([ (key, key) for key in ['c', 'd'] + [ str(i) for i in range(16) ] ]))[:2]
+    ['0', '1']
+    >>> len(store), 'd' in store, 'e' in store, 'B' in store
+    (20, True, False, False)
+    >>> sorted(store)[-4:], sorted(store.values())[-4:]
+    (['a', 'b', 'c', 'd'], ['B', 'a', 'c', 'd'])
+    >>> store.close()
+    >>> shutil.rmtree(directory)
+    """
+
+    _slot = struct.Struct('<QQ')
+    _length = struct.Struct('<I')
+
+    def __init__(self, directory, capacity=1 << 20):
+        """ Initialize the store in a fresh subdirectory of C{directory}.
+
+        @param directory: where store files are created.
+        @type directory: C{str}
+        @param capacity: initial number of table slots (power of 2).
+        @type capacity: C{int}
+        """
+        self.directory = tempfile.mkdtemp(prefix='neco-', dir=directory)
+        self.records = open(os.path.join(self.directory, 'records'), 'w+b')
+        self.reader = open(self.records.name, 'rb')
+        self.end = 0
+        self.flushed = 0
+        self.count = 0
+        self._map_table(capacity)
+
+    def _map_table(self, capacity):
+        name = os.path.join(self.directory, 'table.{}'.format(capacity))
+        table_file = open(name, 'w+b')
+        table_file.truncate(capacity * self._slot.size)
+        self.table_file = table_file
+        self.table = mmap.mmap(table_file.fileno(), 0)
+        self.capacity = capacity
+        self.mask = capacity - 1
+
+    def _grow(self):
+        old_file, old_table, old_capacity = self.table_file, self.table, self.capacity
+        self._map_table(old_capacity * 2)
+        slot_size = self._slot.size
+        for index in xrange(old_capacity):
+            h, ref = self._slot.unpack_from(old_table, index * slot_size)
+            if ref:
+                self._place(h, ref)
+        old_table.close()
+        old_file.close()
+        os.remove(old_file.name)
+
+    def _place(self, h, ref):
+        table, mask, slot_size = self.table, self.mask, self._slot.size
+        index = h & mask
+        while self._slot.unpack_from(table, index * slot_size)[1]:
+            index = (index + 1) & mask
+        self._slot.pack_into(table, index * slot_size, h, ref)
+
+    def _read(self, offset):
+        """ Key and value of the record at C{offset}, and offset of the
+        next record. An empty value stands for the key itself. """
+        if offset >= self.flushed:
+            self.records.flush()
+            self.flushed = self.end
+        reader, length = self.reader, self._length
+        reader.seek(offset)
+        key_length, = length.unpack(reader.read(length.size))
+        key = reader.read(key_length)
+        value_length, = length.unpack(reader.read(length.size))
+        value = reader.read(value_length) if value_length else key
+        return key, value, offset + 2 * length.size + key_length + value_length
+
+    def _lookup(self, h, key):
+        table, mask, slot_size = self.table, self.mask, self._slot.size
+        index = h & mask
+        while True:
+            slot_h, ref = self._slot.unpack_from(table, index * slot_size)
+            if not ref:
+                return index
+            if slot_h == h and self._read(ref - 1)[0] == key:
+                return -1
+            index = (index + 1) & mask
+
+    def merge(self, items):
+        """ Insert a batch of records (delayed duplicate detection).
+
+        @param items: (key, packed marking) pairs, keys may appear
+        several times, the first value of a key is kept.
+        @type items: C{list}
+        @return: values of keys that were not already in the store,
+        in table order.
+        @rtype: C{list}
+        """
+        while (self.count + len(items)) * 2 > self.capacity:
+            self._grow()
+
+        mask = self.mask
+        batch = [ (hash(key) & 0xFFFFFFFFFFFFFFFF, key, value) for key, value in items ]
+        # stable sort, the first value of a key comes first
+        batch.sort(key=lambda (h, key, value): (h & mask, h, key))
+
+        added = []
+        last = None
+        self.records.seek(self.end)
+        for h, key, value in batch:
+            if (h, key) == last:
+                continue
+            last = (h, key)
+            index = self._lookup(h, key)
+            if index < 0:
+                continue
+            self._slot.pack_into(self.table, index * self._slot.size, h, self.end + 1)
+            stored = '' if value == key else value
+            self.records.write(self._length.pack(len(key)))
+            self.records.write(key)
+            self.records.write(self._length.pack(len(stored)))
+            self.records.write(stored)
+            self.end += 2 * self._length.size + len(key) + len(stored)
+            added.append(value)
+
+        self.count += len(added)
+        return added
+
+    def items(self, start=0, end=None):
+        """ Iterate over stored (key, value) pairs in insertion order.
+
+        @param start: offset of the first record.
+        @param end: offset after the last record (defaults to the end).
+        """
+        if end is None:
+            end = self.end
+        offset = start
+        while offset < end:
+            key, value, offset = self._read(offset)
+            yield key, value
+
+    def keys(self, start=0, end=None):
+        """ Iterate over stored keys in insertion order (see C{items}). """
+        for key, _ in self.items(start, end):
+            yield key
+
+    def values(self, start=0, end=None):
+        """ Iterate over stored packed markings in insertion order
+        (see C{items}). """
+        for _, value in self.items(start, end):
+            yield value
+
+    def __iter__(self):
+        return self.keys()
+
+    def __contains__(self, key):
+        return self._lookup(hash(key) & 0xFFFFFFFFFFFFFFFF, key) < 0
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        """ Release the store and remove its files. """
+        self.table.close()
+        self.table_file.close()
+        self.reader.close()
+        self.records.close()
+        shutil.rmtree(self.directory)
+
+def mix64(h):
+    """ 64 bits finalizer (splitmix64), spreads hash bits.
+
+    >>> mix64(1) != mix64(2), 0 <= mix64(-1) < 2 ** 64
+    (True, True)
+
+    @param h: value to mix (truncated to 64 bits).
+    @type h: C{int}
+    @rtype: C{int}
+    """
+    h &= 0xFFFFFFFFFFFFFFFF
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return h ^ (h >> 31)
+
+_fingerprint = struct.Struct('<Q')
+
+def fingerprint(string):
+    """ 64 bits fingerprint of a byte string, ie., the first bits of
+    its md5 digest. Markings are fingerprinted from their keys (see
+    C{pack_key}), builtin hashes collide too often to be used.
+
+    >>> fingerprint(pack_key((-1,))) != fingerprint(pack_key((-2,)))
+    True
+    >>> 0 <= fingerprint('') < 2 ** 64
+    True
+
+    @param string: marking key.
+    @type string: C{str}
+    @rtype: C{int}
+    """
+    return _fingerprint.unpack_from(hashlib.md5(string).digest())[0]
+
+# marking hashes are sums of token hashes, masked to keep them small
+TOKEN_HASH_MASK = 0xFFFFFFFFFFFF
+
+def token_hash(salt, token):
+    """ Contribution of a token to the hash of a marking.
+
+    Python tuple hashes are close to linear in their items, they are
+    mixed so that sums of contributions of distinct markings differ.
+
+    >>> token_hash(7, 1) + token_hash(7, 4) != token_hash(7, 2) + token_hash(7, 3)
+    True
+
+    @param salt: place specific salt.
+    @type salt: C{int}
+    @param token: token of the place.
+    @rtype: C{int}
+    """
+    return mix64(hash((salt, token))) & TOKEN_HASH_MASK
+
+class BitState(object):
+    """ Fixed size bit array of visited markings (supertrace).
+
+    A marking is represented by C{hashes} bits selected using its 64 bits
+    fingerprint, markings whose bits are all already set are considered
+    visited, some states may thus be omitted. Fingerprints are used
+    rather than C{__hash__} values that are more likely to collide.
+
+    >>> bitstate = BitState(1024, 3)
+    >>> bitstate.add(mix64(1)), bitstate.add(mix64(1))
+    (True, False)
+    >>> len(bitstate), bitstate.omission_probability() < 1e-6
+    (1, True)
+    """
+
+    def __init__(self, size, hashes=3):
+        """ Initialize an empty bit array.
+
+        @param size: size of the bit array in bytes.
+        @type size: C{int}
+        @param hashes: number of bits per marking.
+        @type hashes: C{int}
+        """
+        self.bits = bytearray(size)
+        self.size = size * 8
+        self.hashes = hashes
+        self.count = 0
+        self.set_bits = 0
+        self.expected_omissions = 0.0
+
+    def add(self, fp):
+        """ Set the bits of a marking.
+
+        Bit indexes are obtained by double hashing from C{fp}.
+
+        @param fp: fingerprint of the marking (see C{__fingerprint__}).
+        @type fp: C{int}
+        @return: C{True} if the marking was not already visited.
+        @rtype: C{bool}
+        """
+        bits, size = self.bits, self.size
+        h1 = mix64(fp)
+        h2 = mix64(h1) | 1
+        new = False
+        for i in xrange(self.hashes):
+            index = (h1 + i * h2) % size
+            byte, mask = index >> 3, 1 << (index & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                self.set_bits += 1
+                new = True
+        if new:
+            self.count += 1
+            # chance that the next new marking finds its bits set
+            self.expected_omissions += (float(self.set_bits) / size) ** self.hashes
+        return new
+
+    def omission_probability(self):
+        """ Estimated probability that a reachable marking was omitted.
+
+        @rtype: C{float}
+        """
+        if not self.count:
+            return 0.0
+        return min(1.0, self.expected_omissions / self.count)
+
+    def __len__(self):
+        return self.count
+
+class FingerprintSet(object):
+    """ Set of 64 bits marking fingerprints (hash compaction).
+
+    Fingerprints are stored in an open addressing table of unsigned
+    longs, thus a marking uses 8 to 16 bytes. Markings with equal
+    fingerprints are considered equal, some states may be omitted.
+
+    >>> fingerprints = FingerprintSet(4)
+    >>> [ fingerprints.add(fp) for fp in [1, 2, 1, 5, 6] ]
+    [True, True, False, True, True]
+    >>> len(fingerprints), 2 in fingerprints, 3 in fingerprints
+    (4, True, False)
+    """
+
+    def __init__(self, capacity=1 << 16):
+        """ Initialize an empty set.
+
+        @param capacity: initial number of slots (power of 2).
+        @type capacity: C{int}
+        """
+        self.table = array.array('L', [0]) * capacity
+        self.mask = capacity - 1
+        self.count = 0
+
+    def _index(self, fp):
+        table, mask = self.table, self.mask
+        index = mix64(fp) & mask
+        while table[index] and table[index] != fp:
+            index = (index + 1) & mask
+        return index
+
+    def _grow(self):
+        old_table = self.table
+        self.table = array.array('L', [0]) * (len(old_table) * 2)
+        self.mask = len(self.table) - 1
+        for fp in old_table:
+            if fp:
+                self.table[self._index(fp)] = fp
+
+    def add(self, fp):
+        """ Add a fingerprint.
+
+        @param fp: 64 bits fingerprint (0 is mapped to 1).
+        @type fp: C{int}
+        @return: C{True} if the fingerprint was not in the set.
+        @rtype: C{bool}
+        """
+        fp = fp or 1
+        index = self._index(fp)
+        if self.table[index]:
+            return False
+        self.table[index] = fp
+        self.count += 1
+        if self.count * 4 > len(self.table) * 3:
+            self._grow()
+        return True
+
+    def omission_probability(self):
+        """ Estimated probability that a reachable marking was omitted.
+
+        @rtype: C{float}
+        """
+        return min(1.0, self.count / 2.0 ** 65)
+
+    def __contains__(self, fp):
+        return self.table[self._index(fp or 1)] != 0
+
+    def __len__(self):
+        return self.count
+
+class CollapsedStore(object):
+    """ Set of markings stored as vectors of interned place contents
+    (collapse compression).
+
+    Each distinct content of a place is stored once in a per place
+    intern table, markings are tuples of indices in these tables,
+    thus equality and hashing only involve shared small integers.
+
+    >>> store = CollapsedStore()
+    >>> [ store.add(c) for c in [((1,), ()), ((1,), ('a',)), ((1,), ())] ]
+    [True, True, False]
+    >>> len(store), store.sizes()
+    (2, [1, 2])
+    >>> ((1,), ('a',)) in store, ((2,), ()) in store
+    (True, False)
+    >>> sorted(store)
+    [((1,), ()), ((1,), ('a',))]
+    """
+
+    def __init__(self):
+        self.tables = None      # content -> index, one per place
+        self.contents = None    # index -> content, one per place
+        self.states = set()
+
+    def _key(self, components, intern):
+        if self.tables is None:
+            self.tables = [ {} for _ in components ]
+            self.contents = [ [] for _ in components ]
+        key = []
+        for table, contents, component in zip(self.tables, self.contents, components):
+            index = table.get(component)
+            if index is None:
+                if not intern:
+                    return None
+                index = table[component] = len(contents)
+                contents.append(component)
+            key.append(index)
+        return tuple(key)
+
+    def add(self, components):
+        """ Add a marking.
+
+        @param components: place contents, see C{Marking.__components__}.
+        @type components: C{tuple}
+        @return: C{True} if the marking was not in the set.
+        @rtype: C{bool}
+        """
+        key = self._key(components, True)
+        if key in self.states:
+            return False
+        self.states.add(key)
+        return True
+
+    def sizes(self):
+        """ Number of distinct contents of each place.
+
+        @rtype: C{list(int)}
+        """
+        return [ len(contents) for contents in self.contents or [] ]
+
+    def __contains__(self, components):
+        return self._key(components, False) in self.states
+
+    def __iter__(self):
+        for key in self.states:
+            yield tuple( contents[index] for contents, index in zip(self.contents, key) )
+
+    def __len__(self):
+        return len(self.states)
+
+class Checkpoint(object):
+    """ Periodic on disk snapshot of an exploration.
+
+    The directory holds an append only C{visited} file of packed
+    markings, a C{frontier.<generation>} file and a C{manifest}
+    telling which prefix of C{visited} and which frontier belong to
+    the last complete checkpoint. Checkpoints are written by a forked
+    process working on a copy on write snapshot of the explorer, the
+    manifest is replaced atomically once all data is on disk.
+
+    >>> import tempfile, shutil
+    >>> directory = tempfile.mkdtemp()
+    >>> checkpoint = Checkpoint(directory)
+    >>> checkpoint.save(['a', 'b'], ['c'], pack=str), checkpoint.wait()
+    (True, True)
+    >>> checkpoint.save(['c'], ['d', 'e'], pack=str), checkpoint.wait()
+    (True, True)
+    >>> visited, frontier = Checkpoint(directory).load()
+    >>> visited, frontier
+    (['a', 'b', 'c'], ['d', 'e'])
+    >>> shutil.rmtree(directory)
+    """
+
+    _length = struct.Struct('<I')
+
+    def __init__(self, directory):
+        """ Initialize checkpointing in C{directory}, created if needed.
+
+        @param directory: checkpoint directory.
+        @type directory: C{str}
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.directory = directory
+        self.manifest = os.path.join(directory, 'manifest')
+        self.generation = 0
+        self.offset = 0
+        self.count = 0
+        self.frontier = None
+        self.child = None
+        self.writing = []
+        if os.path.exists(self.manifest):
+            self._read_manifest()
+
+    def _read_manifest(self):
+        with open(self.manifest) as f:
+            manifest = json.load(f)
+        self.generation = manifest['generation']
+        self.offset = manifest['visited_offset']
+        self.count = manifest['visited_count']
+        self.frontier = manifest['frontier']
+
+    def _write_records(self, f, keys):
+        size = 0
+        for key in keys:
+            f.write(self._length.pack(len(key)))
+            f.write(key)
+            size += self._length.size + len(key)
+        return size
+
+    def _read_records(self, name, end=None):
+        keys = []
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            offset = 0
+            while end is None or offset < end:
+                header = f.read(self._length.size)
+                if len(header) < self._length.size:
+                    break
+                length, = self._length.unpack(header)
+                keys.append(f.read(length))
+                offset += self._length.size + length
+        return keys
+
+    def _write(self, visited, frontier, pack):
+        """ Write a checkpoint, runs in the forked process. """
+        generation = self.generation + 1
+        name = os.path.join(self.directory, 'visited')
+        with open(name, 'ab') as f:
+            # drop records left by an interrupted checkpoint
+            f.truncate(self.offset)
+            offset = self.offset + self._write_records(f, ( pack(m) for m in visited ))
+            f.flush()
+            os.fsync(f.fileno())
+
+        frontier_name = 'frontier.{}'.format(generation)
+        with open(os.path.join(self.directory, frontier_name), 'wb') as f:
+            self._write_records(f, ( pack(m) for m in frontier ))
+            f.flush()
+            os.fsync(f.fileno())
+
+        manifest = { 'generation' : generation,
+                     'visited_offset' : offset,
+                     'visited_count' : self.count + len(visited),
+                     'frontier' : frontier_name }
+        with open(self.manifest + '.tmp', 'w') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(self.manifest + '.tmp', self.manifest)
+
+        if self.frontier and self.frontier != frontier_name:
+            os.remove(os.path.join(self.directory, self.frontier))
+
+    def _reap(self, options):
+        pid, status = os.waitpid(self.child, options)
+        if not pid:
+            return False
+        self.child = None
+        if status == 0:
+            self._read_manifest()
+            self.writing = []
+        else:
+            print >> sys.stderr, "checkpoint failed, will retry"
+        return True
+
+    def save(self, visited, frontier, pack=operator.methodcaller('__pack__')):
+        """ Start writing a checkpoint in the background.
+
+        Nothing is done if the previous checkpoint is still being
+        written, the caller should then keep accumulating markings.
+
+        @param visited: markings visited since the last call that returned C{True}.
+        @type visited: C{list}
+        @param frontier: markings to be explored.
+        @type frontier: C{iterable}
+        @param pack: function returning the packed form of a marking.
+        @return: C{True} if a checkpoint was started.
+        @rtype: C{bool}
+        """
+        if self.child is not None and not self._reap(os.WNOHANG):
+            return False
+        # markings of a failed checkpoint are written again
+        self.writing.extend(visited)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                self._write(self.writing, frontier, pack)
+                status = 0
+            except:
+                traceback.print_exc()
+            finally:
+                os._exit(status)
+        self.child = pid
+        return True
+
+    def wait(self):
+        """ Wait for the checkpoint being written.
+
+        @return: C{True} if the last checkpoint is complete.
+        @rtype: C{bool}
+        """
+        if self.child is not None:
+            self._reap(0)
+        return not self.writing
+
+    def load(self):
+        """ Read the last complete checkpoint.
+
+        @return: packed visited markings and packed frontier.
+        @rtype: C{tuple}
+        """
+        if self.frontier is None:
+            return [], []
+        return (self._read_records('visited', self.offset),
+                self._read_records(self.frontier))
+
+class NormalizationCache(object):
+    """ Bounded LRU cache of pid normalization recipes, indexed by
+    pid-free structural keys (markings only differing by a renaming
+    of their pids share their entry).
+
+    >>> cache = NormalizationCache(2)
+    >>> cache.put('a', 1); cache.put('b', 2)
+    >>> cache.get('a'), cache.get('c')
+    (1, None)
+    >>> cache.put('c', 3)
+    >>> cache.get('b'), cache.get('a'), len(cache)
+    (None, 1, 2)
+    >>> cache.hits, cache.misses
+    (2, 2)
+    """
+
+    def __init__(self, size=4096):
+        """ Initialize an empty cache.
+
+        @param size: maximal number of entries, 0 disables the cache.
+        @type size: C{int}
+        """
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """ Recipe stored for C{key}, None if missing. """
+        try:
+            value = self.entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self.entries[key] = value    # most recently used
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
 class multiset(hdict):
     """
     """
@@ -59,6 +799,25 @@ class multiset(hdict):
     def __hash__(self):
         return reduce(operator.xor, (hash(i) for i in self.items()), 252756382)
 
+    def token_hash(self, salt):
+        """ Sum of the contributions of the tokens to a marking hash.
+
+        Each token contributes C{token_hash(salt, token)}, generated
+        successor functions update marking hashes using the same function
+        when tokens are added or removed.
+
+        >>> m = multiset(['foo', 'foo', 'bar'])
+        >>> m.token_hash(7) == 2 * token_hash(7, 'foo') + token_hash(7, 'bar')
+        True
+        >>> multiset().token_hash(7)
+        0
+
+        @param salt: place specific salt.
+        @type salt: C{int}
+        @rtype: C{int}
+        """
+        return sum([ token_hash(salt, token) * count for token, count in self.iteritems() ])
+
     def __init__(self, initial_data=[]):
         """ builds a brand new multiset from some initial data
 
@@ -211,6 +970,17 @@ class multiset(hdict):
         """
         return dict.__len__(self)
 
+    def count(self, elt):
+        """ number of occurrences of an element
+
+        >>> m = multiset(['foo', 'bar', 'foo'])
+        >>> m.count('foo'), m.count('bar'), m.count('baz')
+        (2, 1, 0)
+
+        @rtype: C{int}
+        """
+        return self.get(elt, 0)
+
     def __eq__(self, other):
         """ test for equality
 
@@ -475,6 +1245,33 @@ class multiset(hdict):
         """
         return self.keys()
 
+    def pack(self):
+        """ Canonical representation of the multiset, ie., sorted
+        (token, count) pairs.
+
+        >>> multiset(['foo', 'bar', 'foo']).pack()
+        (('bar', 1), ('foo', 2))
+
+        @rtype: C{tuple}
+        """
+        return tuple(sorted(self.iteritems()))
+
+    @classmethod
+    def unpack(cls, items):
+        """ Build a multiset from its canonical representation.
+
+        >>> multiset.unpack((('bar', 1), ('foo', 2))) == multiset(['foo', 'bar', 'foo'])
+        True
+
+        @param items: (token, count) pairs.
+        @type items: C{tuple}
+        @rtype: C{multiset}
+        """
+        result = cls()
+        for token, count in items:
+            result[token] = count
+        return result
+
     def __dump__(self):
         l = ['[']
         for token in self:
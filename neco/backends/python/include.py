@@ -1,4 +1,5 @@
 from time import time
+import multiprocessing
 import pprint
 import sys
 import pdb
@@ -12,61 +13,52 @@ class NecoCtx(object):
         self.remaining = set()
 
 
-perm_log = open('perm_log', 'w')
-calls = 0
+def neco_normalization_key(marking, pid_tree):
+    """ Normalization cache key of C{marking}: shape of its pid tree
+    and marking relabelled with its positional pids (markings only
+    differing by a renaming of their pids share their key).
+
+    @return: the key and the positional map of C{marking}.
+    """
+    shape, positions = pid_tree.positional_map()
+    relabelled = marking.copy()
+    relabelled.update_pids(positions)
+    return (shape, relabelled.__pack__()), positions
+
 def full_normalize_marking(marking, hash_set, current_set, todo_set, state_space):
+    # the canonical form only depends on the marking, visited sets are unused
     pid_tree = marking.buildPidTree()
     pid_tree.strip()
-    pid_tree.order_tree(pid_free_marking_order)
-    default_tree = pid_tree
-    bijection = default_tree.build_map()
-    default_marking = marking.copy()
-    default_marking.update_pids(bijection)
-
-    if not default_marking.__pid_free_hash__() in hash_set:
-        perm_log.write("h")
-        return default_marking
-
-    if ((default_marking in state_space) or
-        (default_marking in todo_set) or
-        (default_marking in current_set)):
-        return default_marking
-
-    iter_trees = pid_tree.itertrees()
-    perm_log.write(".")
-
-    perm_log.write("+")
-    c = 0
-    # print "begin permutations !"
-    global calls
-#    calls += 1
-#    print calls
-    for tree in iter_trees:
-        c += 1
-        perm_log.write("*")
-        # print "tree ", c
-        # tree.print_structure()
-        bijection = tree.build_map()
-        tmp = marking.copy()
-        tmp.update_pids(bijection)
-
-        if tmp in state_space:
-            return tmp
-        if tmp in current_set:
-            return tmp
-        if tmp in todo_set:
-            return tmp
-
-    perm_log.write("{}%".format(c))
-
-    return default_marking
+    key = None
+    if normalization_cache.size > 0:
+        # cached recipes map positional pids to canonical pids
+        key, positions = neco_normalization_key(marking, pid_tree)
+        recipe = normalization_cache.get(key)
+        if recipe is not None:
+            normalized = marking.copy()
+            normalized.update_pids(dict( (pid, recipe[position]) for pid, position in positions.iteritems() ))
+            return normalized
+    bijection, normalized = pid_tree.canonical_form(marking)
+    if key is not None:
+        normalization_cache.put(key, dict( (positions[pid], new) for pid, new in bijection.iteritems() ))
+    return normalized
 
 def normalize_marking(marking, current_set, state_space, hash_set, todo_set):
     pid_tree = marking.buildPidTree()
-    pid_tree.order_tree_without_orbits(pid_free_marking_order)
-    bijection = pid_tree.build_map()
+    key = None
+    recipe = None
+    if normalization_cache.size > 0:
+        # cached recipes map positional pids to normalized pids
+        key, positions = neco_normalization_key(marking, pid_tree)
+        recipe = normalization_cache.get(key)
+    if recipe is None:
+        pid_tree.order_tree_without_orbits(pid_free_marking_order)
+        bijection = pid_tree.build_map()
+        if key is not None:
+            normalization_cache.put(key, dict( (positions[pid], new) for pid, new in bijection.iteritems() ))
+    else:
+        bijection = dict( (pid, recipe[position]) for pid, position in positions.iteritems() )
     marking.update_pids(bijection)
-    perm_log.write(".")
     return marking
 
 def state_space():
@@ -112,6 +104,469 @@ def state_space():
     return done
 
 
+def _por_fire(fired, i, m, ctx):
+    succ = fired[i]
+    if succ is None:
+        succ = set()
+        neco_por_succs[i](m, succ, ctx)
+        fired[i] = succ
+    return succ
+
+def succs_por(m, ctx, stats):
+    """ Successors of C{m} by a stubborn set of transitions.
+
+    The stubborn set grows from the first enabled transition, adding
+    transitions dependent with enabled ones and transitions that may
+    enable disabled ones. Transitions are evaluated lazily, deadlocks
+    are preserved.
+
+    @param stats: reduction counters, updated in place.
+    @type stats: C{dict}
+    @rtype: C{set}
+    """
+    count = len(neco_por_succs)
+    fired = [ None ] * count
+    stats['states'] += 1
+
+    seed = 0
+    while seed < count and not _por_fire(fired, seed, m, ctx):
+        seed += 1
+    if seed == count:
+        return set()
+
+    stubborn = set([seed])
+    stack = [seed]
+    while stack and len(stubborn) < count:
+        i = stack.pop()
+        if _por_fire(fired, i, m, ctx):
+            dependent = neco_por_conflicts[i]
+        else:
+            dependent = neco_por_enablers[i]
+        for j in dependent:
+            if not j in stubborn:
+                stubborn.add(j)
+                stack.append(j)
+
+    succ = set()
+    for i in stubborn:
+        succ.update(_por_fire(fired, i, m, ctx))
+
+    if len(stubborn) < count:
+        stats['reduced'] += 1
+        stats['skipped'] += count - len(stubborn)
+    return succ
+
+def state_space_por():
+    """ State space exploration using partial order reduction
+    (stubborn sets), the reduced state space preserves deadlocks.
+
+    @return: visited markings and reduction counters.
+    @rtype: C{tuple(set, dict)}
+    """
+    ctx = NecoCtx()
+    stats = { 'states' : 0, 'reduced' : 0, 'skipped' : 0 }
+    count = 0
+    start = time()
+    last_time = start
+
+    done = set()
+    todo = set([init()])
+
+    ctx.state_space = done
+    ctx.remaining = todo
+    ctx.pid_free_hash = set()
+
+    try:
+        while True:
+            m = todo.pop()
+            count += 1
+
+            done.add(m)
+            for s in succs_por(m, ctx, stats):
+                if not s in done:
+                    todo.add(s)
+
+            if (count % 250 == 0):
+                new_time = time()
+                elapsed_time = new_time - start
+                sys.stdout.write('\r{}st {:5.3f}s (global {:5.0f}st/s, since last log {:5.0f}st/s)'.format(count,
+                                                                                                           elapsed_time,
+                                                                                                           count / elapsed_time,
+                                                                                                           250 / (new_time - last_time)))
+                sys.stdout.flush()
+                last_time = new_time
+
+    except KeyError:
+        pass
+    print
+    return done, stats
+
+def state_space_incremental():
+    """ State space exploration re-evaluating only transitions that may
+    be enabled.
+
+    Each pending marking carries its candidate transitions: those
+    enabled in its predecessor, and those reading a place modified by
+    the fired transition. Other transitions were disabled in the
+    predecessor and still are.
+
+    Only transition filtering is done, bindings are not carried: each
+    candidate, including a transition enabled in the predecessor whose
+    input places are unchanged, enumerates its bindings again.
+
+    @return: visited markings and the number of skipped transition evaluations.
+    @rtype: C{tuple(set, int)}
+    """
+    ctx = NecoCtx()
+    transitions = len(neco_por_succs)
+    affected = [ frozenset(indexes) for indexes in neco_affected ]
+    skipped = 0
+    count = 0
+    start = time()
+    last_time = start
+
+    done = set()
+    m = init()
+    todo = set([m])
+    candidates = { m : frozenset(xrange(transitions)) }
+
+    ctx.state_space = done
+    ctx.remaining = todo
+    ctx.pid_free_hash = set()
+
+    try:
+        while True:
+            m = todo.pop()
+            count += 1
+
+            done.add(m)
+            fired = []
+            evaluated = candidates.pop(m)
+            for i in evaluated:
+                succ = set()
+                neco_por_succs[i](m, succ, ctx)
+                if succ:
+                    fired.append((i, succ))
+            skipped += transitions - len(evaluated)
+
+            enabled = frozenset( i for i, _ in fired )
+            for i, succ in fired:
+                next_candidates = enabled | affected[i]
+                for s in succ:
+                    if s in done:
+                        continue
+                    if s in todo:
+                        # both sets contain the transitions enabled in s
+                        candidates[s] &= next_candidates
+                    else:
+                        todo.add(s)
+                        candidates[s] = next_candidates
+
+            if (count % 250 == 0):
+                new_time = time()
+                elapsed_time = new_time - start
+                sys.stdout.write('\r{}st {:5.3f}s (global {:5.0f}st/s, since last log {:5.0f}st/s)'.format(count,
+                                                                                                           elapsed_time,
+                                                                                                           count / elapsed_time,
+                                                                                                           250 / (new_time - last_time)))
+                sys.stdout.flush()
+                last_time = new_time
+
+    except KeyError:
+        pass
+    print
+    return done, skipped
+
+def neco_marking_unpack(string):
+    """ Rebuild a marking from its packed representation. """
+    return Marking.__unpack__(string)
+
+def neco_marking_from_components(components):
+    """ Rebuild a marking from its place contents. """
+    return Marking.__from_components__(components)
+
+def state_space_packed():
+    """ State space exploration storing packed markings only.
+
+    Visited markings are identified by their keys (C{__key__}, equal
+    markings have equal keys) and stored packed (C{__pack__}), they
+    are rebuilt when removed from the frontier.
+
+    @return: the list of visited packed markings.
+    """
+    ctx = NecoCtx()
+    count = 0
+    start = time()
+    last_time = start
+
+    marking = init()
+    packed = marking.__pack__()
+    done = { marking.__key__() : packed }
+    todo = set([packed])
+
+    ctx.state_space = done
+    ctx.remaining = todo
+    ctx.pid_free_hash = set()
+
+    try:
+        while True:
+            m = neco_marking_unpack(todo.pop())
+            count += 1
+
+            for s in succs(m, ctx):
+                key = s.__key__()
+                if not key in done:
+                    packed = s.__pack__()
+                    done[key] = packed
+                    todo.add(packed)
+
+            if (count % 250 == 0):
+                new_time = time()
+                elapsed_time = new_time - start
+                sys.stdout.write('\r{}st {:5.3f}s (global {:5.0f}st/s, since last log {:5.0f}st/s)'.format(count,
+                                                                                                           elapsed_time,
+                                                                                                           count / elapsed_time,
+                                                                                                           250 / (new_time - last_time)))
+                sys.stdout.flush()
+                last_time = new_time
+
+    except KeyError:
+        pass
+    print
+    return done.values()
+
+def state_space_checkpointed(directory, every=600, resume=False):
+    """ State space exploration periodically saving visited markings
+    and frontier to C{directory}.
+
+    Checkpoints are written by a forked process, only markings
+    visited since the previous checkpoint are appended to disk.
+
+    @param directory: checkpoint directory.
+    @type directory: C{str}
+    @param every: delay between two checkpoints in seconds.
+    @type every: C{float}
+    @param resume: start from the last checkpoint in C{directory}.
+    @type resume: C{bool}
+    @return: the set of visited markings.
+    """
+    ctx = NecoCtx()
+    checkpoint = data.Checkpoint(directory)
+    start = time()
+    last_time = start
+    next_checkpoint = start + every
+
+    if resume:
+        visited, frontier = checkpoint.load()
+        done = set( neco_marking_unpack(key) for key in visited )
+        todo = set( neco_marking_unpack(key) for key in frontier )
+        print "resuming from {} visited and {} pending states".format(len(done), len(todo))
+    else:
+        done = set()
+        todo = set([init()])
+    count = len(done)
+    new = []
+
+    ctx.state_space = done
+    ctx.remaining = todo
+    ctx.pid_free_hash = set()
+
+    try:
+        while True:
+            m = todo.pop()
+            count += 1
+
+            done.add(m)
+            new.append(m)
+            for s in succs(m, ctx):
+                if not s in done:
+                    todo.add(s)
+
+            if (count % 250 == 0):
+                new_time = time()
+                elapsed_time = new_time - start
+                sys.stdout.write('\r{}st {:5.3f}s (global {:5.0f}st/s, since last log {:5.0f}st/s)'.format(count,
+                                                                                                           elapsed_time,
+                                                                                                           count / elapsed_time,
+                                                                                                           250 / (new_time - last_time)))
+                sys.stdout.flush()
+                last_time = new_time
+                if new_time >= next_checkpoint and checkpoint.save(new, todo):
+                    new = []
+                    next_checkpoint = new_time + every
+
+    except KeyError:
+        pass
+    print
+
+    # final checkpoint, resuming from it terminates immediately
+    checkpoint.wait()
+    checkpoint.save(new, todo)
+    checkpoint.wait()
+    return done
+
+def state_space_external(directory, memory=256 << 20):
+    """ Breadth first exploration storing visited markings on disk.
+
+    Successors of a layer are buffered in memory, then sorted and
+    merged against the disk store (delayed duplicate detection)
+    each time the buffer exceeds C{memory} bytes. New markings form
+    the next layer. Records map marking keys (C{__key__}) to packed
+    markings (C{__pack__}).
+
+    @param directory: where store files are created.
+    @type directory: C{str}
+    @param memory: size of the successor buffer in bytes.
+    @type memory: C{int}
+    @return: the store of visited packed markings (to be closed).
+    @rtype: C{data.VisitedStore}
+    """
+    ctx = NecoCtx()
+    store = data.VisitedStore(directory)
+    marking = init()
+    store.merge([ (marking.__key__(), marking.__pack__()) ])
+
+    start = time()
+    layer_start, layer = 0, 0
+    while layer_start < store.end:
+        layer_end = store.end
+        buffer = []
+        size = 0
+        for packed in store.values(layer_start, layer_end):
+            for s in succs(neco_marking_unpack(packed), ctx):
+                key, packed = s.__key__(), s.__pack__()
+                buffer.append((key, packed))
+                size += len(key) + len(packed) + 96    # rough per entry overhead
+                if size > memory:
+                    store.merge(buffer)
+                    buffer = []
+                    size = 0
+        store.merge(buffer)
+        layer_start = layer_end
+        layer += 1
+
+        elapsed_time = time() - start
+        sys.stdout.write('\rlayer {} {}st {:5.3f}s'.format(layer, len(store), elapsed_time))
+        sys.stdout.flush()
+
+    print
+    return store
+
+def state_space_bitstate(size, hashes=3):
+    """ Depth first exploration storing visited markings in a bit
+    array (supertrace), some markings may be omitted.
+
+    @param size: size of the bit array in bytes.
+    @type size: C{int}
+    @param hashes: number of bits per marking.
+    @type hashes: C{int}
+    @return: the bit array, its length is the number of visited markings.
+    @rtype: C{data.BitState}
+    """
+    ctx = NecoCtx()
+    count = 0
+    start = time()
+    last_time = start
+
+    visited = data.BitState(size, hashes)
+    m = init()
+    visited.add(m.__fingerprint__())
+    todo = [m]
+
+    while todo:
+        m = todo.pop()
+        count += 1
+        for s in succs(m, ctx):
+            if visited.add(s.__fingerprint__()):
+                todo.append(s)
+
+        if (count % 250 == 0):
+            new_time = time()
+            elapsed_time = new_time - start
+            sys.stdout.write('\r{}st {:5.3f}s (global {:5.0f}st/s, since last log {:5.0f}st/s)'.format(count,
+                                                                                                       elapsed_time,
+                                                                                                       count / elapsed_time,
+                                                                                                       250 / (new_time - last_time)))
+            sys.stdout.flush()
+            last_time = new_time
+
+    print
+    return visited
+
+def state_space_fingerprints():
+    """ Depth first exploration storing 64 bits fingerprints of visited
+    markings only (hash compaction), some markings may be omitted.
+
+    @return: visited fingerprints, its length is the number of visited markings.
+    @rtype: C{data.FingerprintSet}
+    """
+    ctx = NecoCtx()
+    count = 0
+    start = time()
+    last_time = start
+
+    visited = data.FingerprintSet()
+    m = init()
+    visited.add(m.__fingerprint__())
+    todo = [m]
+
+    while todo:
+        m = todo.pop()
+        count += 1
+        for s in succs(m, ctx):
+            if visited.add(s.__fingerprint__()):
+                todo.append(s)
+
+        if (count % 250 == 0):
+            new_time = time()
+            elapsed_time = new_time - start
+            sys.stdout.write('\r{}st {:5.3f}s (global {:5.0f}st/s, since last log {:5.0f}st/s)'.format(count,
+                                                                                                       elapsed_time,
+                                                                                                       count / elapsed_time,
+                                                                                                       250 / (new_time - last_time)))
+            sys.stdout.flush()
+            last_time = new_time
+
+    print
+    return visited
+
+def state_space_collapsed():
+    """ Depth first exploration storing visited markings as vectors of
+    interned place contents (collapse compression).
+
+    @return: visited markings.
+    @rtype: C{data.CollapsedStore}
+    """
+    ctx = NecoCtx()
+    count = 0
+    start = time()
+    last_time = start
+
+    visited = data.CollapsedStore()
+    m = init()
+    visited.add(m.__components__())
+    todo = [m]
+
+    while todo:
+        m = todo.pop()
+        count += 1
+        for s in succs(m, ctx):
+            if visited.add(s.__components__()):
+                todo.append(s)
+
+        if (count % 250 == 0):
+            new_time = time()
+            elapsed_time = new_time - start
+            sys.stdout.write('\r{}st {:5.3f}s (global {:5.0f}st/s, since last log {:5.0f}st/s)'.format(count,
+                                                                                                       elapsed_time,
+                                                                                                       count / elapsed_time,
+                                                                                                       250 / (new_time - last_time)))
+            sys.stdout.flush()
+            last_time = new_time
+
+    print
+    return visited
+
 def state_space_graph():
     ctx = NecoCtx()
     done = set()
@@ -173,3 +628,113 @@ def state_space_graph():
     print
     return graph, mrk_id_map
 
+
+def _owner(marking, workers):
+    return hash(marking) % workers
+
+def _flush_batch(buffers, owner, queues, pending):
+    batch = buffers[owner]
+    if batch:
+        with pending.get_lock():
+            pending.value += 1
+        queues[owner].put(batch)
+        buffers[owner] = []
+
+def _state_space_worker(me, workers, queues, pending, results, collect, batch_size):
+    """ Explore the slice of the state space owned by worker C{me}.
+
+    Markings whose owner is another worker are buffered and sent in
+    batches to their owner queue. C{pending} counts the batches that
+    are queued or being processed, when it drops to zero every worker
+    is idle and the exploration is over.
+    """
+    ctx = NecoCtx()
+    done = set()
+    todo = set()
+    buffers = [ [] for _ in xrange(workers) ]
+    inbox = queues[me]
+
+    ctx.state_space = done
+    ctx.remaining = todo
+    ctx.pid_free_hash = set()
+
+    while True:
+        batch = inbox.get()
+        if batch is None:
+            break
+
+        for m in batch:
+            if not m in done:
+                todo.add(m)
+
+        try:
+            while True:
+                m = todo.pop()
+                done.add(m)
+                for s in succs(m, ctx):
+                    owner = _owner(s, workers)
+                    if owner == me:
+                        if not s in done:
+                            todo.add(s)
+                    else:
+                        buffer = buffers[owner]
+                        buffer.append(s)
+                        if len(buffer) >= batch_size:
+                            _flush_batch(buffers, owner, queues, pending)
+        except KeyError:
+            pass
+
+        for owner in xrange(workers):
+            _flush_batch(buffers, owner, queues, pending)
+
+        with pending.get_lock():
+            pending.value -= 1
+            finished = (pending.value == 0)
+        if finished:
+            for queue in queues:
+                queue.put(None)
+
+    results.put((me, len(done), done if collect else None))
+
+def state_space_parallel(workers, collect=False, batch_size=256):
+    """ Explore the state space using C{workers} processes.
+
+    Markings are partitioned using their hash, each worker owns the
+    visited markings of its partition.
+
+    @param workers: number of worker processes.
+    @type workers: C{int}
+    @param collect: gather visited markings in the calling process.
+    @type collect: C{bool}
+    @param batch_size: number of markings sent at once to another worker.
+    @type batch_size: C{int}
+    @return: the set of visited markings if C{collect} is set, the number
+    of visited markings otherwise.
+    """
+    queues = [ multiprocessing.Queue() for _ in xrange(workers) ]
+    results = multiprocessing.Queue()
+    pending = multiprocessing.Value('l', 1)
+
+    processes = [ multiprocessing.Process(target=_state_space_worker,
+                                          args=(i, workers, queues, pending, results, collect, batch_size))
+                  for i in xrange(workers) ]
+    for process in processes:
+        process.start()
+
+    m = init()
+    queues[_owner(m, workers)].put([m])
+
+    count = 0
+    visited = set()
+    for _ in xrange(workers):
+        _, size, done = results.get()
+        count += size
+        if collect:
+            visited.update(done)
+
+    for process in processes:
+        process.join()
+
+    if collect:
+        return visited
+    return count
@@ -19,6 +19,12 @@ class CompilerVisitor(coreir.CompilerVisitor):
     def __init__(self, env, config):
         self.env = env
         self.config = config
+        # markings whose hash is updated while tokens are moved
+        self.hashed_markings = set()
+
+    def update_hash_stmt(self, marking_var, op, value):
+        target = pyast.E(self.env.marking_type.get_field('_hash').access_from(marking_var))
+        return pyast.AugAssign(target = target, op = op, value = value)
 
     def compile_Print(self, node):
         return pyast.Print(dest = None,
@@ -132,14 +138,25 @@ class CompilerVisitor(coreir.CompilerVisitor):
 
     def compile_RemAllTokens(self, node):
         destination_place = self.env.marking_type.get_place_type_by_name(node.place_name)
-        return [destination_place.clear_stmt(self.env, node.marking_var) ]
+        stmts = [ destination_place.clear_stmt(self.env, node.marking_var) ]
+        if node.marking_var in self.hashed_markings:
+            stmts.insert(0, self.update_hash_stmt(node.marking_var, pyast.Sub(),
+                                                  destination_place.hash_expr(self.env, node.marking_var)))
+        return stmts
 
     def compile_FlushOut(self, node):
         destination_place = self.env.marking_type.get_place_type_by_name(node.place_name)
         multiset = self.compile(node.token_expr)
-        return destination_place.add_items_stmt(env = self.env,
-                                                 multiset = multiset,
-                                                 marking_var = node.marking_var)
+        stmt = destination_place.add_items_stmt(env = self.env,
+                                                multiset = multiset,
+                                                marking_var = node.marking_var)
+        if node.marking_var not in self.hashed_markings:
+            return stmt
+        return [ self.update_hash_stmt(node.marking_var, pyast.Sub(),
+                                       destination_place.hash_expr(self.env, node.marking_var)),
+                 stmt,
+                 self.update_hash_stmt(node.marking_var, pyast.Add(),
+                                       destination_place.hash_expr(self.env, node.marking_var)) ]
 
     def gen_tuple(self, tuple_info):
         elts = []
@@ -163,9 +180,19 @@ class CompilerVisitor(coreir.CompilerVisitor):
         tuple_info = node.tuple_info
         compiled_tuple = self.gen_tuple(tuple_info)
         place_type = self.env.marking_type.get_place_type_by_name(node.place_name)
-        return place_type.add_token_stmt(env = self.env,
-                                         compiled_token = compiled_tuple,
-                                         marking_var = node.marking_var)
+        if node.marking_var not in self.hashed_markings:
+            return place_type.add_token_stmt(env = self.env,
+                                             compiled_token = compiled_tuple,
+                                             marking_var = node.marking_var)
+
+        # the tuple may hold expressions, build it only once
+        token_var = self.env.variable_provider.new_variable()
+        return [ pyast.Assign(targets = [ pyast.Name(id = token_var.name) ], value = compiled_tuple),
+                 place_type.add_token_stmt(env = self.env,
+                                           compiled_token = pyast.Name(id = token_var.name),
+                                           marking_var = node.marking_var),
+                 self.update_hash_stmt(node.marking_var, pyast.Add(),
+                                       place_type.token_hash_expr(self.env, pyast.Name(id = token_var.name))) ]
 
     def compile_NotEmpty(self, node):
         return self.env.marking_type.gen_not_empty_function_call(env = self.env,
@@ -183,6 +210,16 @@ class CompilerVisitor(coreir.CompilerVisitor):
                            body = [ self.compile(node.body) ])
 
 
+    def compile_TokenLookup(self, node):
+        place_type = self.env.marking_type.get_place_type_by_name(node.place_name)
+        return [ pyast.Assign(targets = [ pyast.Name(node.token_var.name) ],
+                              value = self.compile(node.token_expr)),
+                 pyast.If(test = place_type.token_lookup_expr(self.env,
+                                                              node.marking_var,
+                                                              pyast.Name(node.token_var.name)),
+                          body = self.compile(node.body),
+                          orelse = []) ]
+
     def gen_different(self, indices):
 
         base = None
@@ -209,9 +246,47 @@ class CompilerVisitor(coreir.CompilerVisitor):
 
         return base, inner
 
+    def gen_distinct_enumeration(self, node, place_type):
+        """ Enumerate distinct values for each sub arc, a value is chosen
+        by several sub arcs only if the place holds enough occurrences.
+        """
+        base = None
+        current = None
+        chosen = []
+        for sub_arc in node.multiarc.sub_arcs:
+            variable = pyast.Name(sub_arc.data['local_variable'].name)
+            enumeration = pyast.For(target = variable,
+                                    iter = place_type.domain_expr(self.env, node.marking_var),
+                                    body = [])
+            if base == None:
+                base = enumeration
+            else:
+                current.body.append(enumeration)
+            current = enumeration
+
+            if chosen:
+                # occurrences of the value among previously chosen ones
+                repeats = pyast.B(pyast.Tuple(elts = list(chosen))).attr('count').call([ variable ]).ast()
+                check = pyast.If(test = pyast.Compare(left = repeats,
+                                                      ops = [ pyast.Lt() ],
+                                                      comparators = [ place_type.token_count_expr(self.env,
+                                                                                                  node.marking_var,
+                                                                                                  variable) ]),
+                                 body = [],
+                                 orelse = [])
+                current.body.append(check)
+                current = check
+            chosen.append(variable)
+
+        current.body.append(self.compile(node.body))
+        return base
+
     def compile_MultiTokenEnumeration(self, node):
         place_type = self.env.marking_type.get_place_type_by_name(node.place_name)
 
+        if not place_type.provides_by_index_access and hasattr(place_type, 'token_count_expr'):
+            return self.gen_distinct_enumeration(node, place_type)
+
         base = None
         current = None
         if place_type.provides_by_index_access:
@@ -295,21 +370,20 @@ class CompilerVisitor(coreir.CompilerVisitor):
         for info in node.mod:
             names[info.name] = info
 
+        # places that are not modified by the transition are shared
+        # between both markings, successors never update them in place
         for (place, place_type) in self.env.marking_type.place_types.iteritems():
-#            dst_place_expr = place_type.place_expr(self.env, marking_var = node.dst)
-#            src_place_expr = place_type.place_expr(self.env, marking_var = node.src)
             if names.has_key(place):
                 nodes.append(place_type.copy_stmt(self.env, node.dst, node.src))
-#                nodes.append( pyast.Assign(targets=[dst_place_expr],
-#                                         value=place_type.copy_expr(self.env, node.src)
-#                                         )
-#                              )
             else:
-                nodes.append(place_type.copy_stmt(self.env, node.dst, node.src))
-#                nodes.append( pyast.Assign(targets=[dst_place_expr],
-#                                         value=src_place_expr
-#                                         )
-#                              )
+                nodes.append(place_type.light_copy_stmt(self.env, node.dst, node.src))
+
+        # the hash of the new marking is updated by each token move,
+        # pid normalization uses its own hash function
+        if not self.config.normalize_pids:
+            hash_field = self.env.marking_type.get_field('_hash')
+            nodes.append(pyast.E("{} = {}.__hash__()".format(hash_field.access_from(node.dst), node.src.name)))
+            self.hashed_markings.add(node.dst)
         return nodes
 
     def compile_AddMarking(self, node):
@@ -319,21 +393,36 @@ class CompilerVisitor(coreir.CompilerVisitor):
 
     def compile_AddToken(self, node):
         place_type = self.env.marking_type.get_place_type_by_name(node.place_name)
-        return place_type.add_token_stmt(env = self.env,
+        stmt = place_type.add_token_stmt(env = self.env,
                                          compiled_token = self.compile(node.token_expr),
                                          marking_var = node.marking_var)
+        if node.marking_var not in self.hashed_markings:
+            return stmt
+        return [ stmt,
+                 self.update_hash_stmt(node.marking_var, pyast.Add(),
+                                       place_type.token_hash_expr(self.env, self.compile(node.token_expr))) ]
 
     def compile_RemToken(self, node):
         place_type = self.env.marking_type.get_place_type_by_name(node.place_name)
-        return place_type.remove_token_stmt(env = self.env,
+        stmt = place_type.remove_token_stmt(env = self.env,
                                             compiled_token = self.compile(node.token_expr),
                                             marking_var = node.marking_var)
+        if node.marking_var not in self.hashed_markings:
+            return stmt
+        return [ stmt,
+                 self.update_hash_stmt(node.marking_var, pyast.Sub(),
+                                       place_type.token_hash_expr(self.env, self.compile(node.token_expr))) ]
 
     def compile_RemTuple(self, node):
         place_type = self.env.marking_type.get_place_type_by_name(node.place_name)
-        return place_type.remove_token_stmt(env = self.env,
+        stmt = place_type.remove_token_stmt(env = self.env,
                                             compiled_token = self.compile(node.tuple_expr),
                                             marking_var = node.marking_var)
+        if node.marking_var not in self.hashed_markings:
+            return stmt
+        return [ stmt,
+                 self.update_hash_stmt(node.marking_var, pyast.Sub(),
+                                       place_type.token_hash_expr(self.env, self.compile(node.tuple_expr))) ]
 
     def compile_Token(self, node):
         place_type = self.env.marking_type.get_place_type_by_name(node.place_name)
@@ -400,9 +489,15 @@ class CompilerVisitor(coreir.CompilerVisitor):
                                                    process_name = node.process_name)
 
     def compile_UpdateFlow(self, node):
-        return self.env.marking_type.gen_update_flow(env = self.env,
+        stmt = self.env.marking_type.gen_update_flow(env = self.env,
                                                      marking_var = node.marking_var,
                                                      place_info = node.place_info)
+        if node.marking_var not in self.hashed_markings:
+            return stmt
+        place_type = self.env.marking_type.get_place_type_by_name(node.place_info.process_name)
+        return [ self.update_hash_stmt(node.marking_var, pyast.Sub(), place_type.hash_expr(self.env, node.marking_var)),
+                 stmt,
+                 self.update_hash_stmt(node.marking_var, pyast.Add(), place_type.hash_expr(self.env, node.marking_var)) ]
 
     ################################################################################
     # Marking normalization
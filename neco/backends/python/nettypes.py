@@ -66,6 +66,12 @@ class StaticMarkingType(coretypes.MarkingType):
         self.add_method_generator(priv.mrkmethods.ReprGenerator())
         self.add_method_generator(priv.mrkmethods.DumpGenerator())
         self.add_method_generator(priv.mrkmethods.LineDumpGenerator())
+        self.add_method_generator(priv.mrkmethods.PackGenerator())
+        self.add_method_generator(priv.mrkmethods.UnpackGenerator())
+        self.add_method_generator(priv.mrkmethods.KeyGenerator())
+        self.add_method_generator(priv.mrkmethods.ComponentsGenerator())
+        self.add_method_generator(priv.mrkmethods.FromComponentsGenerator())
+        self.add_method_generator(priv.mrkmethods.FingerprintGenerator())
         
         if self.config.normalize_pids:
             self.add_method_generator(priv.mrkpidmethods.EqGenerator())
@@ -81,17 +81,37 @@ class HashGenerator(MarkingTypeMethodGenerator):
         builder.emit_Return(pyast.E('self.{}'.format(marking_type.get_field('_hash').name)))
         builder.end_If()
 
+        # sum of token contributions, successor functions derive the hash
+        # of new markings from the one of their parent (see CompilerVisitor)
         builder.emit(pyast.E('h = 0'))
 
-        for (name, place_type) in marking_type.place_types.iteritems():
-            magic = hash(name)
-            builder.emit(pyast.E('h ^= hash(' + place_type.field.access_from(self_var) + ') * ' + str(magic)))
+        for place_type in marking_type.place_types.itervalues():
+            builder.emit(pyast.AugAssign(target = pyast.Name(id = 'h'),
+                                         op = pyast.Add(),
+                                         value = place_type.hash_expr(env, self_var)))
 
+        builder.emit(pyast.E('self.{} = h'.format(marking_type.get_field('_hash').name)))
         # builder.emit(pyast.E("print h"))
         builder.emit_Return(pyast.E("h"))
         builder.end_FunctionDef()
         return builder.ast()
 
+class FingerprintGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, 'self')
+
+        function = pyast.FunctionDef(name = '__fingerprint__',
+                                     args = pyast.A(self_var.name).ast())
+
+        # 64 bits, independent of __hash__: digest of the marking key
+        function.body = [ pyast.Return(pyast.Call(func = pyast.E('data.fingerprint'),
+                                                  args = [ pyast.E('{}.__key__()'.format(self_var.name)) ])) ]
+        return function
+
 class ReprGenerator(MarkingTypeMethodGenerator):
 
     def generate(self, env):
@@ -157,6 +177,93 @@ class DumpGenerator(MarkingTypeMethodGenerator):
         builder.end_FunctionDef()
         return builder.ast()
 
+def pack_values(env, marking_type, self_var):
+    """ Per place packed values, in place name order. """
+    items = list(marking_type.place_types.iteritems())
+    items.sort(lambda (n1, t1), (n2, t2) : cmp(n1, n2))
+    return [ place_type.pack_expr(env, self_var) for (_, place_type) in items ]
+
+class PackGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, name = 'self')
+
+        function = pyast.FunctionDef(name = '__pack__',
+                                     args = pyast.A(self_var.name).ast())
+
+        values = pack_values(env, marking_type, self_var)
+        function.body = [ pyast.Return(pyast.Call(func = pyast.E('data.pack'),
+                                                  args = [ pyast.Tuple(values) ])) ]
+        return function
+
+class KeyGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, name = 'self')
+
+        function = pyast.FunctionDef(name = '__key__',
+                                     args = pyast.A(self_var.name).ast())
+
+        # equal markings have equal keys (1 == 1.0 == True)
+        values = pack_values(env, marking_type, self_var)
+        function.body = [ pyast.Return(pyast.Call(func = pyast.E('data.pack_key'),
+                                                  args = [ pyast.Tuple(values) ])) ]
+        return function
+
+class ComponentsGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        vp = VariableProvider()
+        self_var = vp.new_variable(marking_type.type, name = 'self')
+
+        function = pyast.FunctionDef(name = '__components__',
+                                     args = pyast.A(self_var.name).ast())
+
+        # hashable place contents, interned by collapse compression
+        function.body = [ pyast.Return(pyast.Tuple(pack_values(env, marking_type, self_var))) ]
+        return function
+
+class FromComponentsGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        marking_type = env.marking_type
+
+        items = list(marking_type.place_types.iteritems())
+        items.sort(lambda (n1, t1), (n2, t2) : cmp(n1, n2))
+
+        vp = VariableProvider()
+        marking_var = vp.new_variable(marking_type.type)
+
+        function = pyast.FunctionDef(name = '__from_components__',
+                                     args = pyast.A('values').ast(),
+                                     decorator_list = [ pyast.Name(id = 'staticmethod') ])
+
+        body = [ pyast.E('{} = Marking(False)'.format(marking_var.name)) ]
+        for index, (_, place_type) in enumerate(items):
+            value_expr = pyast.E('values[{}]'.format(index))
+            body.append(place_type.unpack_stmt(env, marking_var, value_expr))
+        body.append(pyast.Return(pyast.Name(id = marking_var.name)))
+
+        function.body = body
+        return function
+
+class UnpackGenerator(MarkingTypeMethodGenerator):
+
+    def generate(self, env):
+        function = pyast.FunctionDef(name = '__unpack__',
+                                     args = pyast.A('string').ast(),
+                                     decorator_list = [ pyast.Name(id = 'staticmethod') ])
+        function.body = [ pyast.E('return Marking.__from_components__(data.unpack(string))') ]
+        return function
+
 class LineDumpGenerator(MarkingTypeMethodGenerator):
 
     def generate(self, env):
@@ -1,8 +1,10 @@
 from mrkpidmethods import stubs
+from neco.backends.python import data
 from neco.backends.python.priv import pyast
 from neco.core.info import TypeInfo, VariableProvider
 from neco.utils import should_not_be_called
 import neco.core.nettypes as coretypes
+from neco.core.nettypes import provides_token_lookup
 
 ################################################################################
 
@@ -14,6 +16,40 @@ class PythonPlaceType(object):
     def place_expr(self, env, marking_var):
         return pyast.E(self.field.access_from(marking_var))
 
+    def light_copy_stmt(self, env, dst_marking_var, src_marking_var):
+        """ produce a statement sharing the place between two markings.
+
+        The shared place must not be updated in place afterwards.
+        """
+        return pyast.E("{} = {}".format(self.field.access_from(dst_marking_var),
+                                        self.field.access_from(src_marking_var)))
+
+    @property
+    def hash_salt(self):
+        return hash(self.info.name)
+
+    def token_hash_expr(self, env, compiled_token):
+        """ produce the contribution of a token to the marking hash.
+
+        @param env: compiling environment
+        @type env: C{Env}
+        @param compiled_token: token expression
+        @type compiled_token: C{ast}
+        """
+        return pyast.Call(func=pyast.E('data.token_hash'),
+                          args=[pyast.Num(self.hash_salt), compiled_token])
+
+    def hash_expr(self, env, marking_var):
+        """ produce the contribution of the place to the marking hash, ie.,
+        the sum of the contributions of its tokens.
+
+        @param env: compiling environment
+        @type env: C{Env}
+        @param marking_var: marking storing the place
+        @type marking_var: C{VariableInfo}
+        """
+        raise NotImplementedError
+
     @property
     def is_ProcessPlace(self):
         return False
@@ -22,6 +58,7 @@ class PythonPlaceType(object):
 
 # multiple inheritance is used to allow type matching.
 
+@provides_token_lookup
 class ObjectPlaceType(coretypes.ObjectPlaceType, PythonPlaceType):
     """ Python implementation of the fallback place type. """
 
@@ -45,6 +82,13 @@ class ObjectPlaceType(coretypes.ObjectPlaceType, PythonPlaceType):
     def iterable_expr(self, env, marking_var):
         return pyast.E("{}".format(self.field.access_from(marking_var)))
 
+    def domain_expr(self, env, marking_var):
+        return pyast.E("{}.domain()".format(self.field.access_from(marking_var)))
+
+    def token_count_expr(self, env, marking_var, compiled_token):
+        count_expr = pyast.E("{}.count".format(self.field.access_from(marking_var)))
+        return pyast.Call(func = count_expr, args = [ compiled_token ])
+
     def remove_token_stmt(self, env, compiled_token, marking_var, *args):
         remove_expr = pyast.E("{}.remove".format(self.field.access_from(marking_var)))
         return pyast.stmt(pyast.Call(func=remove_expr, args=[compiled_token]))
@@ -60,19 +104,22 @@ class ObjectPlaceType(coretypes.ObjectPlaceType, PythonPlaceType):
         return pyast.E("{} = {}.copy()".format(self.field.access_from(dst_marking_var),
                                                self.field.access_from(src_marking_var)))
 
-    def light_copy_stmt(self, env, dst_marking_var, src_marking_var):
-        return pyast.E("{} = {}".format(self.field.access_from(dst_marking_var),
-                                        self.field.access_from(src_marking_var)))
-
     def clear_stmt(self, env, marking_var):
         return pyast.E("{} = multiset()".format(self.field.access_from(marking_var)))
 
+    def hash_expr(self, env, marking_var):
+        return pyast.E("{}.token_hash({})".format(self.field.access_from(marking_var), self.hash_salt))
+
     def assign_multiset_stmt(self, env, token_var, marking_var):
         return pyast.E('{} = {}'.format(token_var.name, self.field.access_from(marking_var)))
 
     def not_empty_expr(self, env, marking_var):
         return pyast.E(self.field.access_from(marking_var))
 
+    def token_lookup_expr(self, env, marking_var, compiled_token):
+        return pyast.Compare(left = compiled_token,
+                             ops = [ pyast.In() ],
+                             comparators = [ pyast.E(self.field.access_from(marking_var)) ])
 
     def add_multiset_stmt(self, env, multiset, marking_var):
         update_attr_expr = pyast.E('{}.update'.format(self.field.access_from(marking_var)))
@@ -84,6 +131,14 @@ class ObjectPlaceType(coretypes.ObjectPlaceType, PythonPlaceType):
 
     def dump_expr(self, env, marking_var):
         return pyast.E("{}.__dump__()".format(self.field.access_from(marking_var)))
+
+    def pack_expr(self, env, marking_var):
+        return pyast.E("{}.pack()".format(self.field.access_from(marking_var)))
+
+    def unpack_stmt(self, env, marking_var, value_expr):
+        return pyast.Assign(targets=[self.place_expr(env, marking_var)],
+                            value=pyast.Call(func=pyast.E('multiset.unpack'),
+                                             args=[value_expr]))
     
     def update_pids_stmt(self, env, marking_var, new_pid_dict_var):
         stub_name = stubs['object_place_type_update_pids']
@@ -94,8 +149,9 @@ class ObjectPlaceType(coretypes.ObjectPlaceType, PythonPlaceType):
     
         
     def enumerate(self, env, marking_var, token_var, compiled_body):
+        # each distinct token is visited once
         return pyast.For(target=pyast.Name(token_var.name), 
-                         iter = self.iterable_expr(env, marking_var),
+                         iter = self.domain_expr(env, marking_var),
                          body = compiled_body,
                          orelse = [])
     
@@ -232,9 +288,17 @@ class OneSafePlaceType(coretypes.OneSafePlaceType, PythonPlaceType):
         return pyast.E("{} = copy.deepcopy({})".format(self.field.access_from(dst_marking_var),
                                                        self.field.access_from(src_marking_var)))
 
+    def hash_expr(self, env, marking_var):
+        place = self.field.access_from(marking_var)
+        return pyast.E("data.token_hash({salt}, {place}) if {place} is not None else 0".format(salt=self.hash_salt,
+                                                                                                 place=place))
+
     def dump_expr(self, env, marking_var):
         place_expr = pyast.E(self.field.access_from(marking_var))
-        return pyast.IfExp(test=place_expr,
+        # falsy tokens such as 0 are valid
+        return pyast.IfExp(test=pyast.Compare(left=place_expr,
+                                              ops=[pyast.IsNot()],
+                                              comparators=[pyast.Name(id='None')]),
                            body=pyast.BinOp(left=pyast.Str('['),
                                             op=pyast.Add(),
                                             right=pyast.BinOp(left=pyast.Call(func=pyast.Name('dump'),
@@ -243,6 +307,12 @@ class OneSafePlaceType(coretypes.OneSafePlaceType, PythonPlaceType):
                                                               right=pyast.Str(']'))),
                            orelse=pyast.Str('[]'))
 
+    def pack_expr(self, env, marking_var):
+        return self.place_expr(env, marking_var)
+
+    def unpack_stmt(self, env, marking_var, value_expr):
+        return pyast.Assign(targets=[self.place_expr(env, marking_var)], value=value_expr)
+
     def enumerate(self, env, marking_var, token_var, compiled_body):
         place_expr = pyast.E(self.field.access_from(marking_var))
         getnode = pyast.Assign(targets=[pyast.Name(id=token_var.name)],
@@ -295,12 +365,29 @@ class BTPlaceType(coretypes.BTPlaceType, PythonPlaceType):
         return pyast.E("{} = {}".format(self.field.access_from(dst_marking_var),
                                         self.field.access_from(src_marking_var))) 
 
+    @property
+    def token_hash(self):
+        # black tokens all have the same contribution
+        return data.mix64(self.hash_salt) & data.TOKEN_HASH_MASK
+
+    def token_hash_expr(self, env, compiled_token):
+        return pyast.Num(self.token_hash)
+
+    def hash_expr(self, env, marking_var):
+        return pyast.E("{} * {}".format(self.field.access_from(marking_var), self.token_hash))
+
     def token_expr(self, env, value):
         return pyast.E('dot')
 
     def dump_expr(self, env, marking_var):
         return pyast.E("'[' + ','.join(['dot'] * {}) + ']'".format(self.field.access_from(marking_var)))
 
+    def pack_expr(self, env, marking_var):
+        return self.place_expr(env, marking_var)
+
+    def unpack_stmt(self, env, marking_var, value_expr):
+        return pyast.Assign(targets=[self.place_expr(env, marking_var)], value=value_expr)
+
     def enumerate(self, env, marking_var, token_var, compiled_body):
         place_expr = pyast.E(self.field.access_from(marking_var))
         getnode = pyast.Assign(targets=[pyast.Name(id=token_var.name)],
@@ -373,6 +460,12 @@ class FlowPlaceType(coretypes.PlaceType, PythonPlaceType):
         field = self.field
         return pyast.E("{} = {}".format(field.access_from(dst_marking_var), field.access_from(src_marking_var)))
 
+    @should_not_be_called
+    def token_hash_expr(self, *args, **kwargs): pass
+
+    def hash_expr(self, env, marking_var):
+        return pyast.E("data.token_hash({}, {})".format(self.hash_salt, self.field.access_from(marking_var)))
+
     def add_place(self, place_info):
         """ Adds a flow control place.
 
@@ -401,6 +494,12 @@ class FlowPlaceType(coretypes.PlaceType, PythonPlaceType):
     def gen_read_flow(self, env, marking_var):
         return pyast.E(self.field.access_from(marking_var))
 
+    def pack_expr(self, env, marking_var):
+        return self.place_expr(env, marking_var)
+
+    def unpack_stmt(self, env, marking_var, value_expr):
+        return pyast.Assign(targets=[self.place_expr(env, marking_var)], value=value_expr)
+
     def dump_expr(self, env, marking_var, variable):
         place_expr = pyast.E(self.field.access_from(marking_var))
         l = []
@@ -1,4 +1,4 @@
-import itertools
+from copy import copy
 from neco.extsnakes import Pid
 
 def sibling_order(left, right):
@@ -36,21 +36,16 @@ class mydefaultdict(dict):
 
 NEXT_PID = "next_pid"
 
-def perm(l):
-    if not l:
-        yield l
-    for i, e in enumerate(l):
-        tail = l[0:i] + l[i + 1:]
-        for t in perm(tail):
-            yield [e] + t
-
-def prod_perm(l):
-    if not l:
-        yield l
-    else:
-        for p in perm(l[0]):
-            for tail in prod_perm(l[1:]):
-                yield p + tail
+class _References(dict):
+    """ Identity pid mapping recording the pids it is queried for. """
+
+    def __init__(self):
+        dict.__init__(self)
+        self.pids = set()
+
+    def __missing__(self, pid):
+        self.pids.add(pid)
+        return pid
 
 
 class PidTree(object):
@@ -144,35 +139,170 @@ class PidTree(object):
             child.order_tree_without_orbits(compare)
         self.children = sorted(list(self.children.itervalues()), cmp = compare)
 
-    def permutable_children(self):
-        identities = set()
-        permutable_children = []
-
-        for child in self.children:
-            value = self.orbits[child.frag]
-
-            identity = id(value)
-            if not identity in identities:
-                identities.add(identity)
-                permutable_children.append(list(value))
-
-        return permutable_children
-
-    def permutations(self):
-        permutable = self.permutable_children()
-        return prod_perm(permutable)
-        # for permutation in itertools.product(*[itertools.permutations(p) for p in permutable]):
-        #      yield itertools.chain.from_iterable(permutation)
-
-    def itertrees(self, n = 0):
-        for permutation in self.permutations():
-            tmp = list(permutation)
-            for children in itertools.product(*(child.itertrees(n + 1) for child in tmp)):    # permutation) ):
-
-                tree = PidTree(self.frag)
-                tree.marking = self.marking
-                tree.children = children
-                yield tree
+    def _flatten(self, prefix, parent, nodes, pids, parents, groups):
+        group = []
+        for child in self.children.itervalues():
+            index = len(nodes)
+            prefix.append(child.frag)
+            nodes.append(child)
+            pids.append(tuple(prefix))
+            parents.append(parent)
+            group.append(index)
+            child._flatten(prefix, index, nodes, pids, parents, groups)
+            prefix.pop()
+        if group:
+            groups[parent] = group
+
+    def canonical_form(self, marking):
+        """ Compute the canonical representative of C{marking} with
+        respect to pid permutations.
+
+        Pids are labelled by partition refinement in the spirit of
+        nauty: nodes are coloured, colours are refined using the
+        colours of parents, children, and pids referenced by or
+        referencing their tokens, then ties between siblings are
+        broken by individualization.
+        The smallest packed marking reached is kept, and branches
+        reaching a marking through an automorphism of an already
+        explored branch are pruned. The tree must be stripped but
+        not ordered.
+
+        >>> from neco.backends.python.data import multiset
+        >>> class M(object):
+        ...     def __init__(self, tokens): self.p = multiset(tokens)
+        ...     def copy(self): return M(self.p)
+        ...     def update_pids(self, d):
+        ...         self.p = multiset( tuple(Pid.from_list(d[tuple(x.data)]) for x in t) for t in self.p )
+        ...     def __pack__(self): return repr(self.p.pack())
+        >>> def canonical(tokens):
+        ...     m, tree = M(tokens), PidTree(0)
+        ...     for t in tokens: tree.add_marking(t[0], M([t]))
+        ...     tree.strip()
+        ...     return tree.canonical_form(m)[1].p.pack()
+        >>> p1, p2, p3, p4 = [ Pid.from_str(s) for s in ('1', '2', '3', '4') ]
+        >>> canonical([(p1, p2), (p2, p1), (p3, p3)]) == canonical([(p4, p4), (p1, p3), (p3, p1)])
+        True
+        >>> canonical([(p1, p2), (p2, p1), (p3, p3)]) == canonical([(p1, p1), (p2, p3), (p3, p2)])
+        True
+        >>> canonical([(p1, p2), (p2, p1), (p3, p3)]) == canonical([(p1, p2), (p2, p3), (p3, p1)])
+        False
+
+        @param marking: marking the tree was built from.
+        @return: pid bijection (see L{build_map}) and normalized copy
+        of C{marking}.
+        """
+        nodes, pids, parents, groups = [], [], [], {}
+        self._flatten([], -1, nodes, pids, parents, groups)
+
+        # referrers[j] lists nodes owning tokens that reference pid j
+        index = dict( (pid, i) for i, pid in enumerate(pids) )
+        referrers = [ [] for _ in nodes ]
+        references = [ () for _ in nodes ]
+        for i, node in enumerate(nodes):
+            if not node.is_next_pid():
+                recorder = _References()
+                copy(node.marking).update_pids(recorder)
+                references[i] = tuple(recorder.pids)
+                for pid in recorder.pids:
+                    if index[pid] != i:
+                        referrers[index[pid]].append(i)
+
+        contents = {}
+
+        def content(i, relabel):
+            # only depends on the labels of referenced pids
+            key = (i, tuple( relabel[pid] for pid in references[i] ))
+            try:
+                return contents[key]
+            except KeyError:
+                # update_pids replaces places, no need for a deep copy
+                tmp = copy(nodes[i].marking)
+                tmp.update_pids(relabel)
+                contents[key] = value = tmp.__pack__()
+                return value
+
+        refined_cache = {}
+
+        def refine(colours):
+            key = tuple(colours)
+            if key in refined_cache:
+                return refined_cache[key]
+            while True:
+                relabel = dict( (pid, (colours[i],)) for i, pid in enumerate(pids) )
+                signatures = []
+                for i, node in enumerate(nodes):
+                    own = None if node.is_next_pid() else content(i, relabel)
+                    # how the node is seen by nodes referencing it
+                    relabel[pids[i]] = (-1,)
+                    seen = tuple(sorted( (colours[j], content(j, relabel)) for j in referrers[i] ))
+                    relabel[pids[i]] = (colours[i],)
+                    parent = colours[parents[i]] if parents[i] >= 0 else -1
+                    children = tuple(sorted( colours[j] for j in groups.get(i, ()) ))
+                    signatures.append( (colours[i], parent, own, seen, children) )
+                ranks = dict( (s, r) for r, s in enumerate(sorted(set(signatures))) )
+                refined = [ ranks[s] for s in signatures ]
+                if len(ranks) == len(set(colours)):
+                    refined_cache[key] = refined
+                    return refined
+                colours = refined
+
+        def target(colours):
+            # smallest colour shared by two siblings
+            cell = None
+            for group in groups.itervalues():
+                seen = set()
+                for i in group:
+                    if colours[i] in seen and (cell is None or colours[i] < cell):
+                        cell = colours[i]
+                    seen.add(colours[i])
+            return cell
+
+        def individualize(colours, cell, v):
+            return [ 2 * c + (c == cell and i != v) for i, c in enumerate(colours) ]
+
+        def leaf(colours):
+            labels = {}
+            for group in groups.itervalues():
+                for rank, i in enumerate(sorted(group, key = colours.__getitem__)):
+                    labels[i] = (rank + 1,)
+            bijection = {}
+            for i, pid in enumerate(pids):    # parents come first
+                if parents[i] >= 0:
+                    labels[i] = labels[parents[i]] + labels[i]
+                bijection[pid] = labels[i]
+            tmp = marking.copy()
+            tmp.update_pids(bijection)
+            return tmp.__pack__(), bijection, tmp
+
+        def first_path(colours):
+            while True:
+                colours = refine(colours)
+                cell = target(colours)
+                if cell is None:
+                    return leaf(colours)
+                colours = individualize(colours, cell, colours.index(cell))
+
+        def search(colours):
+            colours = refine(colours)
+            cell = target(colours)
+            if cell is None:
+                found = leaf(colours)
+                return found, found
+            members = [ i for i, c in enumerate(colours) if c == cell ]
+            best, first = search(individualize(colours, cell, members[0]))
+            for v in members[1:]:
+                path = first_path(individualize(colours, cell, v))
+                if path[0] == first[0] and path[1][pids[v]] == first[1][pids[members[0]]]:
+                    # equal markings, labelling first[1]^-1 . path[1] is an
+                    # automorphism mapping members[0] to v
+                    continue
+                found, _ = search(individualize(colours, cell, v))
+                if found[0] < best[0]:
+                    best = found
+            return best, first
+
+        best, _ = search([ int(node.is_next_pid()) for node in nodes ])
+        return best[1], best[2]
 
     def build_map(self):
         """
@@ -230,6 +360,54 @@ class PidTree(object):
             old_prefix.pop()
             new_prefix.pop()
 
+    def positional_map(self):
+        """ Map pids to their positions in the tree, siblings being
+        ordered by pid-free content (C{__pid_free_hash__}) and shape
+        of their subtrees, then by fragment.
+
+        Trees of markings that only differ by a renaming of their pids
+        have the same shape, and relabelling these markings with their
+        positional maps makes them equal (provided the renaming keeps
+        the order of siblings with the same content and shape).
+
+        >>> from pprint import pprint
+        >>> n = PidTree(0)
+        >>> n.add_marking([5, 3], None)
+        >>> n.add_marking([2], None)
+        >>> n.add_marking([2, 7], None)
+        >>> shape, positions = n.positional_map()
+        >>> pprint(sorted(positions.iteritems()))
+        [((2,), (1,)), ((2, 7), (1, 1)), ((5,), (2,)), ((5, 3), (2, 1))]
+        >>> m = PidTree(0)
+        >>> m.add_marking([1, 4], None)
+        >>> m.add_marking([3, 1], None)
+        >>> m.positional_map()[0] == shape
+        True
+
+        @return: tree shape and pid bijection (see L{build_map}).
+        """
+        shape, positions = self._positional_map()
+        return shape, dict(positions)
+
+    def _positional_map(self):
+        children = []
+        for child in self.children.itervalues():
+            shape, positions = child._positional_map()
+            children.append((shape, child.frag, positions))
+        children.sort(key = lambda (shape, frag, _): (shape, frag))
+
+        positions = []
+        for rank, (_, frag, child_positions) in enumerate(children):
+            positions.append( ((frag,), (rank + 1,)) )
+            for old, new in child_positions:
+                positions.append( ((frag,) + old, (rank + 1,) + new) )
+
+        if self.marking is None or self.is_next_pid():
+            content = self.marking
+        else:
+            content = self.marking.__pid_free_hash__()
+        return (content, tuple( shape for shape, _, _ in children )), positions
+
     def print_structure(self, child_prefix = '', prefix = ''):
         """
         >>> n = PidTree(0)
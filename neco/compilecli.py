@@ -29,6 +29,8 @@ g_produced_files = ["*.pyc",
                     "net.py",
                     "net.pyc",
                     "net.pyo",
+                    "net.cpp",
+                    "libnet.so",
                     "ctypes.h",
                     "ctypes_ext.pxd",
                     "trace"]
@@ -51,7 +53,7 @@ class Main(object):
                                          argument_default = argparse.SUPPRESS,
                                          formatter_class = argparse.ArgumentDefaultsHelpFormatter)
 
-        parser.add_argument('--lang', '-l', default = 'python', dest = 'language', choices = ['python', 'cython'],
+        parser.add_argument('--lang', '-l', default = 'python', dest = 'language', choices = ['python', 'cython', 'cpp'],
                             help = 'set target language')
 
         model_group = parser.add_argument_group('Model related options')
@@ -67,12 +69,17 @@ class Main(object):
                                  help = 'add additional files to be imported')
 
         optimize_group = parser.add_argument_group('Optimizations')
-        optimize_group.add_argument('--optimize', '-O', default = False, dest = 'optimize', action = 'store_true',
-                                    help = 'enable optimizations.')
+        optimize_group.add_argument('--optimize', '-O', default = 0, dest = 'optimize_level', metavar = 'LEVEL', type = int,
+                                    nargs = '?', const = 1,
+                                    help = 'enable optimizations, level 2 adds type inference and netir passes, level 3 hoists loop invariants.')
         optimize_group.add_argument('--optimize-pack', '-Op', default = False, dest = 'bit_packing', action = 'store_true',
-                                    help = 'enable bit packing. [cython only]')
+                                    help = 'enable bit packing of one-safe and bounded black token places. [cython only]')
         optimize_group.add_argument('--optimize-flow', '-Of', default = False, dest = 'optimize_flow', action = 'store_true',
                                     help = 'enable flow control optimizations.')
+        optimize_group.add_argument('--instrument-arcs', default = False, dest = 'instrument_arcs', action = 'store_true',
+                                    help = 'count token bindings and guard evaluations, saved by neco-explore --arc-profile. (implies -O)')
+        optimize_group.add_argument('--arc-profile', default = None, dest = 'arc_profile', metavar = 'FILE', type = str,
+                                    help = 'order input arcs using a profile produced by an instrumented net. (implies -O)')
 
         pid_group = parser.add_argument_group('Dynamic process creation')
         pid_group.add_argument('--detect-pid-symmetries', '-dps', default = False, dest = 'detect_pid_symmetries', action = 'store_true',
@@ -91,6 +98,8 @@ class Main(object):
                                  help = 'enable profiling support')
         print_group.add_argument('--no-stats', default = False, dest = 'no_stats', action = 'store_true',
                                  help = 'disable dynamic stats (transitions/sec, etc.)')
+        print_group.add_argument('--dump', default = False, dest = 'dump_enabled', action = 'store_true',
+                                 help = 'print compiler internals (marking structure, successor functions, netir pass rewrites)')
 
         other_group = parser.add_argument_group('Cython specific options')
         other_group.add_argument('--trace', '-t', default = 'trace', dest = 'trace', metavar = 'TRACEFILE', type = str,
@@ -118,8 +127,12 @@ class Main(object):
         self.profile = profile
         model_file = None
 
-        if args.optimize_flow:
-            args.optimize = True
+        if args.optimize_flow or args.instrument_arcs or args.arc_profile:
+            args.optimize_level = max(args.optimize_level, 1)
+        args.optimize = args.optimize_level > 0
+
+        if args.arc_profile and not os.path.isfile(args.arc_profile):
+            fatal_error("{} is not a file.".format(args.arc_profile))
 
         try:
             env_includes = os.environ['NECO_INCLUDE'].split(":")
@@ -150,12 +163,16 @@ class Main(object):
         # setup config
         self.config = Config()
         self.config.set_options(optimize = args.optimize,
+                                optimize_level = args.optimize_level,
                                 bit_packing = args.bit_packing,
                                 backend = args.language,
                                 profile = args.profile,
                                 imports = args.imports,
                                 no_stats = args.no_stats,
+                                dump_enabled = args.dump_enabled,
                                 optimize_flow = args.optimize_flow,
+                                instrument_arcs = args.instrument_arcs,
+                                arc_profile = args.arc_profile,
                                 search_paths = args.includes,
                                 trace_calls = False,
                                 trace_file = trace,
@@ -8,6 +8,7 @@ class Config(object):
         self.set_options(backend='python',
                          profile=False,
                          optimize=False,
+                         optimize_level=1,
                          optimize_flow=False,
                          bit_packing=False,
                          debug=False,
@@ -19,6 +20,8 @@ class Config(object):
                          imports=[],
                          model=[],
                          normalize_pids=False,
+                         instrument_arcs=False,
+                         arc_profile=None,
                          out_module='net')
         self.set_options(**kwargs)
         
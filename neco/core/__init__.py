@@ -5,7 +5,7 @@ from collections import defaultdict
 from snakes.nets import *
 import neco.config as config
 from neco.utils import flatten_lists
-import netir, nettypes
+import netir, nettypes, invariants, guards, arcprofile, passes, typeinfer
 from info import *
 from itertools import izip_longest
 
@@ -177,6 +177,8 @@ class SuccTGenerator(object):
     This class is used for building a transition specific succ function.
     """
 
+    instrument = False
+
     def __init__(self, env, net_info, builder, transition, function_name, marking_type, config):
         """ Builds the transition specific succ function generator.
 
@@ -196,6 +198,7 @@ class SuccTGenerator(object):
         self.transition = transition
         self.function_name = function_name
         self.marking_type = marking_type
+        self.instrument = config.instrument_arcs
 
         # this helper will create new variables and take care of shared instances
         helper = SharedVariableHelper(transition.shared_input_variables(),
@@ -253,8 +256,104 @@ class SuccTGenerator(object):
                     return True
             return False
 
+    def split_guard(self):
+        """ Split the guard into conjuncts checked as soon as possible.
+
+        Only used when optimizing, tautological conjuncts are dropped.
+        """
+        if not self.config.optimize:
+            self.pending_guards = None
+            return
+
+        variables = set(self.transition.variables().keys())
+        self.pending_guards = [ (conjunct, guards.expression_names(conjunct) & variables)
+                                for conjunct in guards.split_conjuncts(self.transition.trans.guard._str)
+                                if not guards.is_tautology(conjunct) ]
+
+    def gen_ready_guards(self):
+        """ Produces checks of pending guard conjuncts whose variables are bound.
+
+        Conjuncts that may raise keep the short-circuit order of C{and}:
+        they are only checked once all previous conjuncts were checked.
+        """
+        if self.pending_guards is None:
+            return
+
+        pending = []
+        for conjunct, names in self.pending_guards:
+            if ( all(self.variable_helper.is_bound(name) for name in names)
+                 and (not pending or passes.is_pure(conjunct)) ):
+                self.gen_guard_check(conjunct)
+            else:
+                pending.append((conjunct, names))
+        self.pending_guards = pending
+
+    def gen_guard(self):
+        """ Produces the check of the guard, or of its remaining conjuncts.
+        """
+        if self.pending_guards is not None:
+            for conjunct, _ in self.pending_guards:
+                self.gen_guard_check(conjunct)
+            self.pending_guards = []
+            return
+
+        guard = self.transition.trans.guard._str
+        try:
+            if eval(guard) != True:
+                self.gen_guard_check(guard)
+        except:
+            self.gen_guard_check(guard)
+
+    def gen_guard_check(self, source):
+        """ Produces a guard check block, counting evaluations when instrumented.
+        """
+        self.gen_profile_count(source, 'eval')
+        self.builder.begin_GuardCheck(condition = netir.PyExpr(ExpressionInfo(source)))
+        self.gen_profile_count(source, 'pass')
+
+    def gen_profile_count(self, *key):
+        """ Produces the update of a profile counter if instrumented,
+        see C{neco.core.arcprofile}.
+        """
+        if self.instrument:
+            arguments = [ netir.PyExpr(ExpressionInfo(repr(part))) for part in (self.transition.name,) + key ]
+            self.builder.emit_ProcedureCall(function_name = 'neco_arc_profile.count',
+                                            arguments = arguments)
+
+    def lookup_token_expr(self, input_arc, inner):
+        """ Get the token consumed by an arc if it is known before visiting its place.
+
+        This is the case of values and of shared variables bound by a
+        previous arc, the place is then checked by lookup instead of
+        being enumerated. Only used when optimizing.
+
+        @return: token expression, C{None} if the place must be enumerated.
+        @rtype: C{netir.Expr}
+        """
+        if not self.config.optimize:
+            return None
+
+        place_type = self.marking_type.get_place_type_by_name(input_arc.place_name)
+        if (not place_type.provides_token_lookup or
+            input_arc.place_info in self.transition.input_multi_places):
+            return None
+
+        if inner.is_Value:
+            return netir.Value(value = input_arc.value, place_name = input_arc.place_name)
+
+        elif inner.is_Variable and inner.name in self.bound_tokens:
+            local_variable, token_type = self.bound_tokens[inner.name]
+            # tokens of a different type cannot be looked up in typed places
+            if token_type == place_type.token_type or isinstance(place_type, nettypes.ObjectPlaceType):
+                return netir.Name(local_variable.name)
+
+        return None
+
     def gen_enumerators(self):
         """ Produces all the token enumeration blocs.
+
+        When optimizing, guard conjuncts are checked right after the
+        last of their variables is bound.
         """
 
         builder = self.builder
@@ -263,6 +362,12 @@ class SuccTGenerator(object):
 
         trans.variable_helper = variable_helper
 
+        self.split_guard()
+        self.gen_ready_guards()
+
+        # variables bound by an input arc: name -> (local variable, token type)
+        self.bound_tokens = {}
+
         # places that provides multiple tokens, _cannot_ be used with by index access
         multi_places = trans.input_multi_places
         for place in multi_places:
@@ -279,6 +384,8 @@ class SuccTGenerator(object):
 
             builder.emit_Comment("Enumerate {input_arc} - place: {place}".format(input_arc = input_arc,
                                                                                  place = input_arc.place_name))
+            if not input_arc.is_Flush:
+                self.gen_profile_count(input_arc.place_name, 'visit')
 
             # use index access if available
             place_type = self.marking_type.get_place_type_by_name(input_arc.place_info.name)
@@ -300,10 +407,20 @@ class SuccTGenerator(object):
                 # notify that the variable is used
                 variable_helper.mark_as_used(variable, local_variable)
 
-                builder.begin_TokenEnumeration(arc = input_arc,
-                                                token_var = local_variable,
-                                                marking_var = self.arg_marking_var,
-                                                place_name = input_arc.place_name)
+                token_expr = self.lookup_token_expr(input_arc, variable)
+                if token_expr is not None:
+                    index = None
+                    builder.begin_TokenLookup(arc = input_arc,
+                                               token_var = local_variable,
+                                               token_expr = token_expr,
+                                               marking_var = self.arg_marking_var,
+                                               place_name = input_arc.place_name)
+                else:
+                    builder.begin_TokenEnumeration(arc = input_arc,
+                                                    token_var = local_variable,
+                                                    marking_var = self.arg_marking_var,
+                                                    place_name = input_arc.place_name)
+                    self.bound_tokens.setdefault(variable.name, (local_variable, place_type.token_type))
 
                 input_arc.data.register('local_variable', local_variable)
                 input_arc.data.register('index', index)
@@ -320,10 +437,20 @@ class SuccTGenerator(object):
                     local_variable = variable_helper.new_variable_occurence(variable)
                     variable_helper.mark_as_used(variable, local_variable)
 
-                    builder.begin_TokenEnumeration(arc = input_arc,
-                                                    token_var = local_variable,
-                                                    marking_var = self.arg_marking_var,
-                                                    place_name = input_arc.place_name)
+                    token_expr = self.lookup_token_expr(input_arc, variable)
+                    if token_expr is not None:
+                        index = None
+                        builder.begin_TokenLookup(arc = input_arc,
+                                                   token_var = local_variable,
+                                                   token_expr = token_expr,
+                                                   marking_var = self.arg_marking_var,
+                                                   place_name = input_arc.place_name)
+                    else:
+                        builder.begin_TokenEnumeration(arc = input_arc,
+                                                        token_var = local_variable,
+                                                        marking_var = self.arg_marking_var,
+                                                        place_name = input_arc.place_name)
+                        self.bound_tokens.setdefault(variable.name, (local_variable, place_type.token_type))
 
                     self.try_unify_shared_variable(variable)
                     input_arc.data.register('local_variable', local_variable)
@@ -335,13 +462,22 @@ class SuccTGenerator(object):
 
                     local_variable = variable_helper.new_variable(variable_type = place_type.token_type)
 
-                    # get a token
-                    builder.begin_TokenEnumeration(arc = input_arc,
-                                                    token_var = local_variable,
-                                                    marking_var = self.arg_marking_var,
-                                                    place_name = input_arc.place_name)
+                    token_expr = self.lookup_token_expr(input_arc, inner)
+                    if token_expr is not None:
+                        index = None
+                        builder.begin_TokenLookup(arc = input_arc,
+                                                   token_var = local_variable,
+                                                   token_expr = token_expr,
+                                                   marking_var = self.arg_marking_var,
+                                                   place_name = input_arc.place_name)
+                    else:
+                        # get a token
+                        builder.begin_TokenEnumeration(arc = input_arc,
+                                                        token_var = local_variable,
+                                                        marking_var = self.arg_marking_var,
+                                                        place_name = input_arc.place_name)
 
-                    if not place_info.type.is_BlackToken:
+                    if token_expr is None and not place_info.type.is_BlackToken:
                         # check token value
                         builder.begin_If(netir.Compare(left = netir.Name(name = local_variable.name),
                                                          ops = [ netir.EQ() ],
@@ -384,16 +520,25 @@ class SuccTGenerator(object):
 
                 local_variable = variable_helper.new_variable(place_type.token_type)
 
-                # get a token
-                builder.begin_TokenEnumeration(arc = input_arc,
-                                                token_var = local_variable,
-                                                marking_var = self.arg_marking_var,
-                                                place_name = input_arc.place_name)
+                token_expr = self.lookup_token_expr(input_arc, input_arc)
+                if token_expr is not None:
+                    index = None
+                    builder.begin_TokenLookup(arc = input_arc,
+                                               token_var = local_variable,
+                                               token_expr = token_expr,
+                                               marking_var = self.arg_marking_var,
+                                               place_name = input_arc.place_name)
+                else:
+                    # get a token
+                    builder.begin_TokenEnumeration(arc = input_arc,
+                                                    token_var = local_variable,
+                                                    marking_var = self.arg_marking_var,
+                                                    place_name = input_arc.place_name)
 
                 input_arc.data.register('local_variable', local_variable)
                 input_arc.data.register('index', index)
 
-                if not place_info.type.is_BlackToken:
+                if token_expr is None and not place_info.type.is_BlackToken:
                     # check token value
                     builder.begin_If(netir.Compare(left = netir.Name(name = local_variable.name),
                                                      ops = [ netir.EQ() ],
@@ -487,6 +632,10 @@ class SuccTGenerator(object):
             else:
                 raise NotImplementedError, input_arc.arc_annotation.__class__
 
+            if not input_arc.is_Flush:
+                self.gen_profile_count(input_arc.place_name, 'bind')
+            self.gen_ready_guards()
+
     def _gen_names(self, token_info):
         """ Produce names for intermediary variables when handling tuples.
 
@@ -792,12 +941,7 @@ class SuccTGenerator(object):
                 i += 1
 
         # guard
-        guard = ExpressionInfo(trans.trans.guard._str)
-        try:
-            if eval(guard.raw) != True:
-                builder.begin_GuardCheck(condition = netir.PyExpr(guard))
-        except:
-            builder.begin_GuardCheck(condition = netir.PyExpr(guard))
+        self.gen_guard()
 
         computed_productions = defaultdict(list)
         for output in trans.outputs:
@@ -924,6 +1068,28 @@ class Compiler(object):
                 print >> sys.stderr, "pid normalization require fully typed nets."
                 exit(-1)
 
+        if self.config.optimize and not self.config.normalize_pids:
+            if self.config.optimize_level >= 2:
+                # native types for untyped places holding integers
+                place_types = typeinfer.infer_place_types(self.net_info)
+                if self.config.dump_enabled:
+                    for name, place_type in sorted(place_types.iteritems()):
+                        print "place {} has type {}".format(name, place_type)
+
+            # structural bounds allow more compact place types
+            bounds = invariants.infer_bounds(self.net_info)
+            if self.config.dump_enabled:
+                for name, bound in sorted(bounds.iteritems()):
+                    print "place {} is {}-bounded".format(name, bound)
+
+        if self.config.arc_profile:
+            # order input arcs using profiled branching factors
+            counts = arcprofile.load(self.config.arc_profile)
+            for transition in self.net_info.transitions:
+                transition.arc_scores = arcprofile.arc_scores(transition, counts)
+                if self.config.dump_enabled:
+                    print "transition {} arc scores {}".format(transition.name, transition.arc_scores)
+
         self.markingtype_class = "StaticMarkingType"
         self.marking_type = backend.new_marking_type(self.markingtype_class, self.config)
         self.optimisations = []
@@ -931,6 +1097,10 @@ class Compiler(object):
         self.env = backend.new_compiling_environment(self.config, self.net_info, WordSet(), self.marking_type)
         self.rebuild_marking_type()
 
+        if self.config.optimize:
+            for opt in passes.for_level(self.config.optimize_level):
+                self.add_optimisation(opt)
+
     def check_typed(self):
         for place in self.net_info.places:
             if place.type.is_AnyType:
@@ -977,11 +1147,9 @@ class Compiler(object):
         """ Add an optimization.
 
         @param opt: optimization pass.
-        @type opt: C{neco.opt.OptimisationPass}
+        @type opt: C{neco.core.passes.OptimisationPass}
         """
         self.optimisations.append(opt)
-        self.marking_type = self.backend.new_marking_type(self.markingtype_class)
-        self.rebuild_marking_type()
 
     def optimize_netir(self):
         """ Run optimization passes on AST. """
@@ -993,6 +1161,8 @@ class Compiler(object):
                                                      for node in env.process_successor_function_nodes ]
             env.successor_function_nodes = flatten_lists(env.successor_function_nodes)
             env.process_successor_function_nodes = flatten_lists(env.process_successor_function_nodes)
+            if self.config.dump_enabled:
+                print opt.report()
 
     def _gen_all_spec_succs(self):
         """ Build all needed instances of transition specific
@@ -0,0 +1,119 @@
+""" Guard analysis helpers.
+
+Guards are split into conjuncts so that each one can be checked as
+soon as the variables it uses are bound.
+"""
+
+import ast
+import tokenize
+from StringIO import StringIO
+
+CONSTANT_NAMES = frozenset(['True', 'False', 'None'])
+
+def _parse(source):
+    try:
+        return ast.parse(source.strip(), mode = 'eval').body
+    except SyntaxError:
+        return None
+
+def _cut(source):
+    """ Cut an expression at its top level C{and} keywords. """
+    lines = StringIO(source).readlines()
+    starts = [ 0 ]
+    for line in lines:
+        starts.append(starts[-1] + len(line))
+
+    pieces = []
+    depth = 0
+    begin = 0
+    try:
+        for kind, text, (row, col), end, _ in tokenize.generate_tokens(StringIO(source).readline):
+            if kind == tokenize.OP and text in '([{':
+                depth += 1
+            elif kind == tokenize.OP and text in ')]}':
+                depth -= 1
+            elif kind == tokenize.NAME and text == 'and' and depth == 0:
+                offset = starts[row - 1] + col
+                pieces.append(source[begin:offset])
+                begin = offset + len(text)
+    except tokenize.TokenError:
+        return [ source ]
+    pieces.append(source[begin:])
+    return pieces
+
+def split_conjuncts(source):
+    """ Split a guard into its conjuncts.
+
+    Conjuncts are cut at top level C{and} keywords, parenthesized
+    conjunctions are split too. Expressions that cannot be split safely
+    are returned as a single conjunct.
+
+    >>> split_conjuncts('x > 1 and (y < 2 and z) and f(a and b)')
+    ['x > 1', 'y < 2', 'z', 'f(a and b)']
+    >>> split_conjuncts('x if a and b else y')
+    ['x if a and b else y']
+    >>> split_conjuncts('not a and b or c')
+    ['not a and b or c']
+
+    @param source: Python expression.
+    @type source: C{str}
+    @rtype: C{list(str)}
+    """
+    source = source.strip()
+    tree = _parse(source)
+    if tree is None or not (isinstance(tree, ast.BoolOp) and isinstance(tree.op, ast.And)):
+        return [ source ]
+
+    pieces = [ piece.strip() for piece in _cut(source) ]
+    if len(pieces) == 1:
+        # strip enclosing parentheses
+        if source.startswith('(') and source.endswith(')'):
+            inner = _parse(source[1:-1])
+            if inner is not None and ast.dump(inner) == ast.dump(tree):
+                return split_conjuncts(source[1:-1])
+        return [ source ]
+
+    trees = [ _parse(piece) for piece in pieces ]
+    if (len(pieces) != len(tree.values) or None in trees or
+        [ ast.dump(t) for t in trees ] != [ ast.dump(value) for value in tree.values ]):
+        return [ source ]
+
+    conjuncts = []
+    for piece in pieces:
+        conjuncts.extend(split_conjuncts(piece))
+    return conjuncts
+
+def expression_names(source):
+    """ Names read by an expression.
+
+    >>> sorted(expression_names('f(x) + y.z > len([ w for w in v ])'))
+    ['f', 'len', 'v', 'w', 'x', 'y']
+
+    @rtype: C{set(str)}
+    """
+    tree = _parse(source)
+    if tree is None:
+        return set()
+    return set( node.id for node in ast.walk(tree) if isinstance(node, ast.Name) )
+
+def is_tautology(source):
+    """ Check if an expression is a constant true value.
+
+    >>> is_tautology('True'), is_tautology('1 == 1 and not False'), is_tautology('x or True')
+    (True, True, False)
+
+    @rtype: C{bool}
+    """
+    tree = _parse(source)
+    if tree is None or not expression_names(source) <= CONSTANT_NAMES:
+        return False
+    try:
+        constants = dict( (name, eval(name)) for name in CONSTANT_NAMES )
+        constants['__builtins__'] = {}
+        return bool(eval(compile(ast.Expression(tree), '<guard>', 'eval'), constants))
+    except Exception:
+        return False
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
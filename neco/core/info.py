@@ -720,6 +720,21 @@ class ArcInfo(object):
             if other:
                 self.variable.update_type(other.type)
 
+    def update_types(self):
+        """ Type the variables bound by an input arc from the place type. """
+        if not self.is_input:
+            return
+        place_type = self.place_info.type
+        if self.is_Variable:
+            self.variable.update_type(place_type)
+        elif self.is_Test and self.inner.is_Variable:
+            self.inner.update_type(place_type)
+        elif self.is_Tuple:
+            self.tuple.update_type(place_type)
+        elif self.is_MultiArc:
+            for arc in self.sub_arcs:
+                arc.update_types()
+
     def variables(self):
         return self._vars
 
@@ -796,6 +811,8 @@ class TransitionInfo(object):
         self._pre = set()
         self._process_name = ""
         self.generator_arc = None
+        # profiled branching factors of input arcs, see neco.core.arcprofile
+        self.arc_scores = None
 
         input_arcs = []
         for place, arc_annotation in trans.input():
@@ -829,7 +846,10 @@ class TransitionInfo(object):
                 vardict[name] += occurences
 
         self._vars = vardict
+        self.type_outputs()
 
+    def type_outputs(self):
+        """ Type output variables from the variables bound by input arcs. """
         input_vars = []
         for input_arc in self.input_arcs:
             input_vars.extend(input_arc.variables_info)
@@ -837,6 +857,12 @@ class TransitionInfo(object):
         for output in self.outputs:
             output.type_vars(input_vars)
 
+    def update_types(self):
+        """ Retype arcs after place types changed. """
+        for input_arc in self.input_arcs:
+            input_arc.update_types()
+        self.type_outputs()
+
     @property
     def process_name(self):
         return self._process_name
@@ -891,7 +917,15 @@ class TransitionInfo(object):
                 return 5
             else:
                 return 6
-        self.input_arcs.sort(key = transform)
+
+        if self.arc_scores:
+            # profiled arcs first, most selective first
+            def key(p):
+                score = self.arc_scores.get(p.place_name)
+                return (score is None, score, transform(p))
+            self.input_arcs.sort(key = key)
+        else:
+            self.input_arcs.sort(key = transform)
 
     def shared_input_variables(self):
         variables = self.input_variables()
@@ -967,6 +1001,8 @@ class PlaceInfo(object):
     def __init__(self, place, one_safe = False, bound = None, process_name = None, flow_control = False):
 
         self._1safe = place.one_safe if hasattr(place, 'one_safe') else one_safe
+        # explicit one safeness is kept by bound inference
+        self._1safe_fixed = hasattr(place, 'one_safe')
         if not self._1safe:
             try:
                 capacity = place.label('capacity') if hasattr(place, 'label') else None
@@ -976,9 +1012,13 @@ class PlaceInfo(object):
                 (_, high) = capacity
                 if high == 1:
                     self._1safe = True
+                elif bound is None:
+                    bound = high
 
         self.snk_place = place
         self._name = place.name
+        # maximal number of tokens, None if unknown
+        self.bound = 1 if self._1safe else bound
         self.instance[self.name] = self
         self._type = TypeInfo.from_snakes_checker(place.checker())
         self.tokens = [ token for token in place.tokens ]
@@ -1039,10 +1079,36 @@ class PlaceInfo(object):
     def one_safe(self):
         return self._1safe
 
+    def restrict_bound(self, bound):
+        """ Tighten the place bound.
+
+        Places bounded by one become one-safe if their type has a
+        one-safe representation, unless one safeness was set explicitly.
+
+        @param bound: maximal number of tokens.
+        @type bound: C{int}
+        """
+        if self.bound is None or bound < self.bound:
+            self.bound = bound
+        if self.bound <= 1 and not self._1safe and not self._1safe_fixed:
+            place_type = self.type
+            if (place_type.is_BlackToken or place_type.is_Int or
+                place_type.is_UserType or place_type.is_AnyType):
+                self._1safe = True
+                self.bound = 1
+
     @property
     def type(self):
         return self._type
 
+    def specialize_type(self, type_info):
+        """ Replace the place type by a more precise inferred type.
+
+        @param type_info: new token type.
+        @type type_info: C{TypeInfo}
+        """
+        self._type = type_info
+
     @classmethod
     def Dummy(cls, name, one_safe = False, process_name = None, flow_control = False):
         place = Place(name)
@@ -1151,6 +1217,50 @@ class NetInfo(object):
                 return t
         raise LookupError("transition of ID {} does not exist".format(name))
 
+    def dependency_tables(self):
+        """ Static transition dependencies used by partial order reduction.
+
+        Transitions are identified by their index in C{self.transitions}.
+        Two transitions are dependent if one of them modifies a place
+        the other one reads (including test arcs). A disabled transition
+        may only be enabled by transitions modifying its input places.
+
+        @return: dependent transitions and enabling transitions of each transition.
+        @rtype: C{tuple(list(tuple(int)), list(tuple(int)))}
+        """
+        modified = [ trans.modified_places() for trans in self.transitions ]
+        conflicts, enablers = [], []
+        for i, trans in enumerate(self.transitions):
+            enabling = [ j for j in xrange(len(self.transitions))
+                         if j != i and modified[j] & trans.pre ]
+            dependent = [ j for j in xrange(len(self.transitions))
+                          if j != i and (j in enabling or modified[i] & self.transitions[j].pre) ]
+            conflicts.append(tuple(dependent))
+            enablers.append(tuple(enabling))
+        return conflicts, enablers
+
+    def place_dependents(self):
+        """ Transitions whose enabling depends on each place.
+
+        @return: map from place names to indexes of transitions reading them.
+        @rtype: C{dict(str -> tuple(int))}
+        """
+        dependents = dict( (place.name, []) for place in self.places )
+        for i, trans in enumerate(self.transitions):
+            for place in trans.pre:
+                dependents[place.name].append(i)
+        return dict( (name, tuple(indexes)) for name, indexes in dependents.iteritems() )
+
+    def affected_transitions(self):
+        """ Transitions whose enabling may change when a transition fires.
+
+        @return: indexes of transitions reading places modified by each transition.
+        @rtype: C{list(tuple(int))}
+        """
+        dependents = self.place_dependents()
+        return [ tuple(sorted(set( j for place in trans.modified_places() for j in dependents[place.name] )))
+                 for trans in self.transitions ]
+
 class AtomInfo(object):
     """ Atomic proposition related informations.
     """
@@ -1432,6 +1542,18 @@ class SharedVariableHelper(VariableProvider):
     def set_unified(self, variable):
         self._unified[variable.name] = True
 
+    def is_bound(self, name):
+        """ Check if a variable has a value, ie., it was used and all
+        its shared instances were unified.
+
+        @param name: variable name.
+        @type name: C{str}
+        @rtype: C{bool}
+        """
+        if name in self._shared:
+            return self._unified[name]
+        return self._used[name] > 0
+
 
 ################################################################################
 # formula related info structures
@@ -17,6 +17,14 @@ class CurrentBlockError(Exception):
     def __str__(self):
         return "expected {exp!r} / got {got!r}".format(exp=self.exp, got=self.got)
 
+class CannotCompile(Exception):
+    """ Exception raised when a backend cannot compile a node or a net. """
+    def __init__(self, string):
+        self._str = string
+
+    def __str__(self):
+        return self._str
+
 class CompilerVisitor(object):
     """ Base class implementing the visitor pattern for compiling an ast. """
 
@@ -34,11 +42,6 @@ class CompilerVisitor(object):
 
     def cannot_compile(self, node):
         """Called if no explicit compile function exists for a node."""
-        class CannotCompile(Exception):
-            def __init__(self, string):
-                self._str = string
-            def __str__(self):
-                return self._str
         raise CannotCompile(self.backend + " backend cannot compile %s" % node.__class__.__name__)
 
 
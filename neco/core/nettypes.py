@@ -13,6 +13,10 @@ def provides_by_index_deletion(cls):
     cls._by_index_deletion_ = True
     return cls
 
+def provides_token_lookup(cls):
+    cls._token_lookup_ = True
+    return cls
+
 class PlaceType(object):
     """ Common base class for place types.
     """
@@ -21,6 +25,7 @@ class PlaceType(object):
 
     _by_index_access_   = False
     _by_index_deletion_ = False
+    _token_lookup_      = False
 
     def __init__(self, place_info, marking_type, type_info, token_type):
         """ Initialise the place type_info.
@@ -32,6 +37,7 @@ class PlaceType(object):
 
         self._by_index_access   = self.__class__._by_index_access_
         self._by_index_deletion = self.__class__._by_index_deletion_
+        self._token_lookup      = self.__class__._token_lookup_
 
     def one_safe(self):
         return self.info.one_safe
@@ -56,6 +62,13 @@ class PlaceType(object):
     def provides_by_index_deletion(self):
         return self._by_index_deletion
 
+    @property
+    def provides_token_lookup(self):
+        """ Place type can check a token membership without enumerating
+        the place, see C{token_lookup_expr}.
+        """
+        return self._token_lookup
+
     def disable_by_index_access(self):
         self._by_index_access = False
 
@@ -0,0 +1,301 @@
+""" Static type inference.
+
+Places declared without a type often hold integers only, or tuples of
+integers of a fixed arity. Such places are given a precise type so that
+backends can choose native representations for them and declare the
+variables bound from them with native types.
+
+Types are inferred from initial markings and from the types of the
+expressions produced by transitions. Type C{None} stands for an unknown
+type, C{TypeInfo.AnyType} for a value that cannot be typed precisely.
+"""
+
+import ast
+from info import TypeInfo
+
+def same_type(left, right):
+    """ Compare two types, C{AnyType} and C{None} are equal to themselves.
+
+    @rtype: C{bool}
+    """
+    if left is None or right is None:
+        return left is right
+    if left.is_AnyType or right.is_AnyType:
+        return left.is_AnyType and right.is_AnyType
+    return left == right
+
+def join(left, right):
+    """ Least common type of two types.
+
+    >>> str(join(None, TypeInfo.Int)), str(join(TypeInfo.Int, TypeInfo.String))
+    ('Int', 'AnyType')
+
+    @rtype: C{TypeInfo}
+    """
+    if left is None:
+        return right
+    if right is None or same_type(left, right):
+        return left
+    return TypeInfo.AnyType
+
+def is_native(type_info):
+    """ Check if a type has a native representation: integers and fixed
+    arity tuples of integers.
+
+    @rtype: C{bool}
+    """
+    if type_info is None or type_info.is_AnyType:
+        return False
+    if type_info.is_TupleType:
+        return all( subtype.is_Int for subtype in type_info )
+    return type_info.is_Int
+
+_INT_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+                  ast.LShift, ast.RShift, ast.BitOr, ast.BitXor, ast.BitAnd)
+
+def _is(type_info, name):
+    return type_info is not None and getattr(type_info, 'is_' + name)
+
+def _type(node, types):
+    if isinstance(node, ast.Num):
+        return TypeInfo.Int if type(node.n) is int else TypeInfo.AnyType
+
+    elif isinstance(node, ast.Str):
+        return TypeInfo.String if type(node.s) is str else TypeInfo.AnyType
+
+    elif isinstance(node, ast.Name):
+        if node.id in types:
+            return types[node.id]
+        elif node.id in ('True', 'False'):
+            return TypeInfo.Bool
+        return TypeInfo.AnyType
+
+    elif isinstance(node, ast.Tuple):
+        subtypes = [ _type(element, types) for element in node.elts ]
+        if None in subtypes:
+            return None
+        return TypeInfo.TupleType(subtypes)
+
+    elif isinstance(node, ast.BinOp):
+        left, right = _type(node.left, types), _type(node.right, types)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, _INT_OPERATORS) and _is(left, 'Int') and _is(right, 'Int'):
+            return TypeInfo.Int
+        if isinstance(node.op, ast.Add) and _is(left, 'String') and _is(right, 'String'):
+            return TypeInfo.String
+        if isinstance(node.op, ast.Mult) and ((_is(left, 'String') and _is(right, 'Int')) or
+                                              (_is(left, 'Int') and _is(right, 'String'))):
+            return TypeInfo.String
+        return TypeInfo.AnyType
+
+    elif isinstance(node, ast.UnaryOp):
+        if isinstance(node.op, ast.Not):
+            return TypeInfo.Bool
+        operand = _type(node.operand, types)
+        if operand is None:
+            return None
+        return TypeInfo.Int if _is(operand, 'Int') else TypeInfo.AnyType
+
+    elif isinstance(node, ast.Compare):
+        return TypeInfo.Bool
+
+    elif isinstance(node, (ast.BoolOp, ast.IfExp)):
+        # the value of a boolean operation is one of its operands
+        if isinstance(node, ast.BoolOp):
+            operands = node.values
+        else:
+            operands = [ node.body, node.orelse ]
+        result = None
+        for operand in operands:
+            operand_type = _type(operand, types)
+            if operand_type is None:
+                return None
+            result = join(result, operand_type)
+        return result
+
+    return TypeInfo.AnyType
+
+def expression_type(source, types):
+    """ Infer the type of a Python expression.
+
+    >>> types = { 'x' : TypeInfo.Int, 's' : TypeInfo.String }
+    >>> str(expression_type('(x + 1) * 2', types)), str(expression_type('(x, -x)', types))
+    ('Int', '(Int, Int)')
+    >>> str(expression_type('x < 2 and not y', types)), str(expression_type("s + 'b'", types))
+    ('Bool', 'String')
+    >>> str(expression_type('x + y', types)), expression_type('x + y', { 'x' : TypeInfo.Int, 'y' : None })
+    ('AnyType', None)
+
+    @param source: Python expression.
+    @type source: C{str}
+    @param types: types of variables, names missing are globals.
+    @type types: C{dict(str -> TypeInfo)}
+    @return: expression type, C{None} if it depends on unknown types.
+    @rtype: C{TypeInfo}
+    """
+    try:
+        tree = ast.parse(source.strip(), mode = 'eval').body
+    except SyntaxError:
+        return TypeInfo.AnyType
+    return _type(tree, types)
+
+def _tokens_type(tokens):
+    result = None
+    for token in tokens:
+        result = join(result, TypeInfo.from_raw(token))
+    return result
+
+def _component_types(tuple_info, tuple_type, variables):
+    """ Bind the components of an input tuple. """
+    for index, component in enumerate(tuple_info.components):
+        if tuple_type is None:
+            component_type = None
+        elif tuple_type.is_TupleType and len(tuple_type) == len(tuple_info):
+            component_type = tuple_type.split()[index]
+        else:
+            component_type = TypeInfo.AnyType
+
+        if component.is_Variable:
+            variables[component.name] = join(variables.get(component.name), component_type)
+        elif component.is_Tuple:
+            _component_types(component, component_type, variables)
+
+def _variable_types(transition, place_type):
+    """ Types of the variables bound by input arcs. """
+    variables = {}
+    def bind(arc, token):
+        if token.is_Variable:
+            variables[token.name] = join(variables.get(token.name), place_type(arc))
+        elif token.is_Tuple:
+            _component_types(token, place_type(arc), variables)
+
+    for arc in transition.input_arcs:
+        if arc.is_Variable:
+            bind(arc, arc.variable)
+        elif arc.is_Test:
+            bind(arc, arc.inner)
+        elif arc.is_Tuple:
+            bind(arc, arc.tuple)
+        elif arc.is_MultiArc:
+            for sub_arc in arc.sub_arcs:
+                if sub_arc.is_Variable:
+                    bind(sub_arc, sub_arc.variable)
+                elif sub_arc.is_Tuple:
+                    bind(sub_arc, sub_arc.tuple)
+    return variables
+
+def _token_type(token, variables):
+    if token.is_Variable:
+        return variables.get(token.name, TypeInfo.AnyType)
+    elif token.is_Value:
+        return TypeInfo.from_raw(token.raw)
+    elif token.is_Expression:
+        return expression_type(token.raw, variables)
+    elif token.is_Tuple:
+        subtypes = [ _token_type(component, variables) for component in token.components ]
+        if None in subtypes:
+            return None
+        return TypeInfo.TupleType(subtypes)
+    return TypeInfo.AnyType
+
+def _produced_type(arc, variables):
+    """ Type of the tokens produced by an output arc. """
+    if arc.is_Variable:
+        return variables.get(arc.variable.name, TypeInfo.AnyType)
+    elif arc.is_Value:
+        return TypeInfo.from_raw(arc.value.raw)
+    elif arc.is_Expression:
+        return expression_type(arc.expr.raw, variables)
+    elif arc.is_Tuple:
+        return _token_type(arc.tuple, variables)
+    elif arc.is_MultiArc:
+        result = None
+        for sub_arc in arc.sub_arcs:
+            sub_type = _produced_type(sub_arc, variables)
+            if sub_type is None:
+                return None
+            result = join(result, sub_type)
+        return result
+    return TypeInfo.AnyType
+
+def _accepts(arc, place_type):
+    """ Check if an input arc can consume tokens of a native type. """
+    if place_type is None or arc.is_Variable:
+        return True
+    elif arc.is_Value:
+        return same_type(TypeInfo.from_raw(arc.value.raw), place_type)
+    elif arc.is_Tuple or (arc.is_Test and arc.inner.is_Tuple):
+        tuple_info = arc.tuple
+        return (place_type.is_TupleType and len(place_type) == len(tuple_info) and
+                not any( component.is_Tuple for component in tuple_info.components ))
+    elif arc.is_Test:
+        return arc.inner.is_Variable or same_type(TypeInfo.from_raw(arc.inner.raw), place_type)
+    elif arc.is_MultiArc:
+        return all( _accepts(sub_arc, place_type) for sub_arc in arc.sub_arcs )
+    return False
+
+def infer_place_types(net_info):
+    """ Give precise types to untyped places holding integers or tuples
+    of integers.
+
+    Candidate places start with the type of their initial tokens and
+    lose their candidacy as soon as a transition produces a token of
+    another type or consumes tokens in a way that native representations
+    do not support. One-safe places are only specialized to integers.
+
+    @param net_info: net to update, input arcs and output variables
+    of transitions are retyped.
+    @type net_info: C{neco.core.info.NetInfo}
+    @return: specialized places with their new types.
+    @rtype: C{dict(str -> TypeInfo)}
+    """
+    types = {}
+    for place in net_info.places:
+        if place.type.is_AnyType and not place.flow_control and not place.is_generator_place:
+            place_type = _tokens_type(place.tokens)
+            if place_type is not None and not is_native(place_type):
+                continue
+            if place.one_safe and place_type is not None and place_type.is_TupleType:
+                continue
+            types[place.name] = place_type
+
+    def place_type(arc):
+        return types.get(arc.place_name, arc.place_info.type)
+
+    changed = True
+    while changed:
+        changed = False
+        for transition in net_info.transitions:
+            for arc in transition.input_arcs + transition.outputs:
+                name = arc.place_name
+                if name not in types or (types[name] is not None and types[name].is_AnyType):
+                    continue
+                if arc.is_input:
+                    new_type = types[name] if _accepts(arc, types[name]) else TypeInfo.AnyType
+                else:
+                    variables = _variable_types(transition, place_type)
+                    new_type = join(types[name], _produced_type(arc, variables))
+                    if new_type is not None and not is_native(new_type):
+                        new_type = TypeInfo.AnyType
+                    if (new_type is not None and new_type.is_TupleType and
+                        net_info.place_by_name(name).one_safe):
+                        new_type = TypeInfo.AnyType
+                if not same_type(new_type, types[name]):
+                    types[name] = new_type
+                    changed = True
+
+    specialized = {}
+    for name, place_type in types.iteritems():
+        if is_native(place_type):
+            net_info.place_by_name(name).specialize_type(place_type)
+            specialized[name] = place_type
+
+    if specialized:
+        for transition in net_info.transitions:
+            transition.update_types()
+    return specialized
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,5 +1,6 @@
 from neco.asdl.cpp import * #@UnusedWildImport
 from neco.utils import flatten_ast, OutputProviderPredicate
+import os
 import sys
 
 class CppHeaderFile(object):
@@ -10,18 +11,18 @@ class CppHeaderFile(object):
         self.body = []
 
     def write(self, env, base_dir = './'):
-        module_ast = flatten_ast(body=self.body)
+        module_ast = flatten_ast(self.body)
 
         f = open(base_dir + self.name, "w")
-        last = self.name.rfind('/')
-        guard = self.name[last:-1].replace('.', '_')
-        f.write("#ifndef __{}__".format(guard))
-        f.write("#define __{}__".format(guard))
-        
+        guard = os.path.basename(self.name).replace('.', '_').upper()
+        f.write("#ifndef __{}__\n".format(guard))
+        f.write("#define __{}__\n\n".format(guard))
+
         f.write("\n".join(self.declarations))
+        f.write("\n")
         CppUnparser(f).unparse(module_ast)
-        
-        f.write("#endif // __{}__".format(guard))
+
+        f.write("\n#endif // __{}__\n".format(guard))
         f.close()
 
 
@@ -31,8 +32,31 @@ class IsCppHeaderFile(OutputProviderPredicate):
         return isinstance(output, CppHeaderFile)
 
 
+class CppSourceFile(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.declarations = []
+        self.body = []
+
+    def write(self, env, base_dir = './'):
+        module_ast = flatten_ast(self.body)
+
+        f = open(base_dir + self.name, "w")
+        f.write("\n".join(self.declarations))
+        f.write("\n")
+        CppUnparser(f).unparse(module_ast)
+        f.close()
+
+
+class IsCppSourceFile(OutputProviderPredicate):
+
+    def __call__(self, output):
+        return isinstance(output, CppSourceFile)
+
+
 class CppUnparser(object):
-    
+
     __native_type_map__ = { 'Void' : 'void',
                             'Bool' : 'bool',
                             'Char' : 'char',
@@ -41,30 +65,38 @@ class CppUnparser(object):
                             'Long' : 'long',
                             'Float' : 'float',
                             'Double' : 'double', }
-    
+
     def __init__(self, output):
         self.output = output
         self.ident = 0
         self.new_line = True
-        
+
     def _ident_write(self, txt = ''):
         self.output.write('    ' * self.ident)
         self.output.write(txt)
-        
+
     def _write(self, txt):
         self.output.write(txt)
-        
+
     def _new_line(self):
         self.output.write('\n')
-        
+
     def _start_block(self):
         self._write('{')
         self.ident += 1
-        
+
     def _end_block(self):
-        self._write('}')
         self.ident -= 1
-        
+        self._ident_write('}')
+
+    def _body(self, stmts):
+        self._start_block()
+        self._new_line()
+        for stmt in stmts:
+            self.unparse(stmt)
+            self._new_line()
+        self._end_block()
+
     def unparse(self, node):
         cls_name = node.__class__.__name__
         if isinstance(node, list):
@@ -72,31 +104,28 @@ class CppUnparser(object):
                 self.unparse(e)
                 self._write('\n')
 
-        elif node.isNative():
+        elif node.isNative() or node.isNativeInt() or node.isNativeDec():
             self._NativeType(node, cls_name)
 
         else:
             attr = getattr(self, '_' + cls_name)
             attr(node)
-    
+
     def _NativeType(self, node, cls_name):
-        """	
+        """
         >>> CppUnparser(sys.stdout).unparse([ Void(), Bool() ])
-        void 
-        bool  
-        
+        void
+        bool
         >>> CppUnparser(sys.stdout).unparse([ Char(), Short(), Int(), Long() ])
-        char 
-        short 
-        int 
+        char
+        short
+        int
         long
-        
         >>> CppUnparser(sys.stdout).unparse([ Unsigned(Char()), Unsigned(Short()), Unsigned(Int()), Unsigned(Long()) ])
-        unsigned char 
-        unsigned short 
-        unsigned int 
+        unsigned char
+        unsigned short
+        unsigned int
         unsigned long
-        
         >>> CppUnparser(sys.stdout).unparse([ Float(), Double() ])
         float
         double
@@ -112,23 +141,24 @@ class CppUnparser(object):
 
     def _TemplateType(self, node):
         self._write(node.name)
-        
+
     def _ClassDef(self, node):
         """
         >>> CppUnparser(sys.stdout).unparse( ClassDef(name='foo', attributes = []) )
         class foo {
         };
         """
-        self._write('class {} '.format(node.name))
+        self._ident_write('class {} '.format(node.name))
         self._start_block()
         self._new_line()
-        
+
         for attr in node.attributes:
             self.unparse(attr)
-        
+            self._new_line()
+
         self._end_block()
         self._write(';')
-    
+
     def _StructDef(self, node):
         """
         >>> CppUnparser(sys.stdout).unparse( StructDef(name='foo', attributes = []) )
@@ -145,17 +175,17 @@ class CppUnparser(object):
             bool b;
         };
         """
-        self._write('struct {} '.format(node.name))
+        self._ident_write('struct {} '.format(node.name))
         self._start_block()
         self._new_line()
-        
+
         for attr in node.attributes:
             self.unparse(attr)
             self._new_line()
-        
+
         self._end_block()
         self._write(';')
-        
+
     def _AttrDecl(self, node):
         self._ident_write() # fix position
         self.unparse(node.type)
@@ -164,7 +194,58 @@ class CppUnparser(object):
         else:
             self._write(' {};'.format(node.name))
 
+    def _FunctionDef(self, node):
+        """
+        >>> body = [ Block('if (a < b)', [ Verbatim('return b;') ]), Verbatim('return a;') ]
+        >>> CppUnparser(sys.stdout).unparse( FunctionDef(Int(), 'max', [ ParamDecl(Int(), 'a'), ParamDecl(Int(), 'b') ], body, 'static') )
+        static int max(int a, int b)
+        {
+            if (a < b) {
+                return b;
+            }
+            return a;
+        }
+        """
+        self._ident_write()
+        if node.qualifiers:
+            self._write(node.qualifiers + ' ')
+        self.unparse(node.returns)
+        self._write(' {}('.format(node.name))
+        for i, param in enumerate(node.params):
+            if i > 0:
+                self._write(', ')
+            self.unparse(param)
+        self._write(')')
+        self._new_line()
+        self._ident_write()
+        self._body(node.body)
+
+    def _ParamDecl(self, node):
+        self.unparse(node.type)
+        self._write(' ' + node.name)
+
+    def _Block(self, node):
+        """
+        >>> CppUnparser(sys.stdout).unparse( Block('', [ Verbatim('int i = 0;\\n++i;') ]) )
+        {
+            int i = 0;
+            ++i;
+        }
+        """
+        if node.head:
+            self._ident_write(node.head + ' ')
+        else:
+            self._ident_write()
+        self._body(node.body)
+
+    def _Verbatim(self, node):
+        lines = node.code.split('\n')
+        for i, line in enumerate(lines):
+            if i > 0:
+                self._new_line()
+            if line:
+                self._ident_write(line)
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(optionflags=doctest.NORMALIZE_WHITESPACE)
-    
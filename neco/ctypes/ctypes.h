@@ -6,12 +6,16 @@
 #include <cstdlib>
 #include <cstring>
 #include <vector>
+#include <string>
 #include <utility>
 #include <iostream>
 
 #define INT_INIT_MAX_SIZE 2
 #define INT_RESIZE 4
 
+// number of tokens (or runs) stored inline before spilling to the heap
+#define PLACE_INLINE_SIZE 2
+
 /////////////////////////////////////////////////////
 // int place type
 /////////////////////////////////////////////////////
@@ -98,7 +102,8 @@ template< typename DataType, \
 #define TGenericPlaceType_CLS \
 TGenericPlaceType<DataType, DataTypeHandler>
 
-// T is assumed to be a POD type
+// T is assumed to be a POD type, the first PLACE_INLINE_SIZE tokens are
+// stored inline and the array only moves to the heap on overflow.
 template< typename DataType,
 		  template <typename> class DataTypeHandler = TDefaultDataTypeHandler >
 class TGenericPlaceType {
@@ -136,6 +141,7 @@ protected:
 	int 					mSize;
 	int 					mMaxSize;
 	DataType*				mData;
+	DataType 				mInline[ PLACE_INLINE_SIZE ];
 };
 
 //
@@ -144,8 +150,8 @@ TGenericPlaceType_TARGS
 TGenericPlaceType_CLS::TGenericPlaceType()
 		: mRefs(1)
 		, mSize(0)
-		, mMaxSize(INT_INIT_MAX_SIZE)
-		, mData(new DataType[ INT_INIT_MAX_SIZE ])
+		, mMaxSize(PLACE_INLINE_SIZE)
+		, mData(mInline)
 {
 }
 
@@ -153,16 +159,21 @@ TGenericPlaceType_TARGS
 TGenericPlaceType_CLS::TGenericPlaceType(const TGenericPlaceType& src)
 		: mRefs(1)
 		, mSize(src.mSize)
-		, mMaxSize(src.mMaxSize)
-		, mData(new DataType[ src.mMaxSize ])
+		, mMaxSize(PLACE_INLINE_SIZE)
+		, mData(mInline)
 {
+	if (mSize > PLACE_INLINE_SIZE) {
+		mMaxSize = mSize;
+		mData = new DataType[ mMaxSize ];
+	}
 	memcpy(mData, src.mData, src.mSize * sizeof(DataType));
 }
 
 TGenericPlaceType_TARGS
 TGenericPlaceType_CLS::~TGenericPlaceType()
 {
-	delete[] mData;
+	if (mData != mInline)
+		delete[] mData;
 }
 
 TGenericPlaceType_TARGS
@@ -290,7 +301,8 @@ void TGenericPlaceType_CLS::add(DataType value)
 		for (int i = 0; i < mSize; ++i) {
 			new_data[i] = mData[i];
 		}
-		delete mData;
+		if (mData != mInline)
+			delete[] mData;
 		mData = new_data;
     }
     // find suitable index
@@ -302,7 +314,7 @@ void TGenericPlaceType_CLS::add(DataType value)
     }
 
     // shift values
-    for (j = mSize+1; j > i; j--) {
+    for (j = mSize; j > i; j--) {
     	mData[j] = mData[j-1];
     }
 
@@ -366,6 +378,303 @@ int TGenericPlaceType_CLS::index_of(const DataType& value) const
 #undef TGenericPlaceType_CLS
 
 
+/////////////////////////////////////////////////////
+// run length place type
+/////////////////////////////////////////////////////
+
+#define TRunLengthPlaceType_TARGS \
+template< typename DataType, \
+		  template <typename> class DataTypeHandler >
+
+#define TRunLengthPlaceType_CLS \
+TRunLengthPlaceType<DataType, DataTypeHandler>
+
+// Tokens are stored as a sorted array of (value, count) runs, lookups
+// and removals are binary searches over the runs. Run indices are
+// used by get/count/remove_by_index, size is the number of tokens.
+// As in TGenericPlaceType, the first runs are stored inline.
+template< typename DataType,
+		  template <typename> class DataTypeHandler = TDefaultDataTypeHandler >
+class TRunLengthPlaceType {
+	typedef typename DataTypeHandler<DataType>::ComparisonProvider_t 	ComparisonProvider_t;
+	typedef typename DataTypeHandler<DataType>::HashProvider_t 			HashProvider_t;
+	typedef typename DataTypeHandler<DataType>::Formatter_t 			Formatter_t;
+
+	struct Run {
+		DataType 	value;
+		int 		count;
+	};
+
+public:
+	inline 					TRunLengthPlaceType();
+	inline 					TRunLengthPlaceType(const TRunLengthPlaceType& src);
+	inline 					~TRunLengthPlaceType();
+
+	inline void 			decrement_ref();
+	inline void 			increment_ref();
+
+	void 					add(DataType value, int count = 1);
+	inline void 			remove_by_index(int index);
+	void 					remove_by_value(DataType value);
+
+	inline int 				size() const;
+	inline int 				runs() const;
+	inline bool 			not_empty() const;
+	inline const DataType& 	get(int index) const;
+	inline int 				count(int index) const;
+	int 					index_of(const DataType& value) const;
+	int 					count_of(const DataType& value) const;
+
+	int 					equals(const TRunLengthPlaceType& right) const;
+	int 					compare(const TRunLengthPlaceType& right) const;
+	int 					hash() const;
+
+	const char* 			cstr() const;
+
+protected:
+	int 					search(const DataType& value) const;
+
+	int 					mRefs;
+	int 					mSize;
+	int 					mRuns;
+	int 					mMaxRuns;
+	Run* 					mData;
+	Run 					mInline[ PLACE_INLINE_SIZE ];
+};
+
+//
+
+TRunLengthPlaceType_TARGS
+TRunLengthPlaceType_CLS::TRunLengthPlaceType()
+		: mRefs(1)
+		, mSize(0)
+		, mRuns(0)
+		, mMaxRuns(PLACE_INLINE_SIZE)
+		, mData(mInline)
+{
+}
+
+TRunLengthPlaceType_TARGS
+TRunLengthPlaceType_CLS::TRunLengthPlaceType(const TRunLengthPlaceType& src)
+		: mRefs(1)
+		, mSize(src.mSize)
+		, mRuns(src.mRuns)
+		, mMaxRuns(PLACE_INLINE_SIZE)
+		, mData(mInline)
+{
+	if (mRuns > PLACE_INLINE_SIZE) {
+		mMaxRuns = mRuns;
+		mData = new Run[ mMaxRuns ];
+	}
+	memcpy(mData, src.mData, src.mRuns * sizeof(Run));
+}
+
+TRunLengthPlaceType_TARGS
+TRunLengthPlaceType_CLS::~TRunLengthPlaceType()
+{
+	if (mData != mInline)
+		delete[] mData;
+}
+
+TRunLengthPlaceType_TARGS
+void TRunLengthPlaceType_CLS::decrement_ref()
+{
+	mRefs--;
+	if (mRefs == 0)
+		delete this;
+}
+
+TRunLengthPlaceType_TARGS
+void TRunLengthPlaceType_CLS::increment_ref()
+{
+	mRefs++;
+}
+
+TRunLengthPlaceType_TARGS
+int TRunLengthPlaceType_CLS::size() const
+{
+	return mSize;
+}
+
+TRunLengthPlaceType_TARGS
+int TRunLengthPlaceType_CLS::runs() const
+{
+	return mRuns;
+}
+
+TRunLengthPlaceType_TARGS
+bool TRunLengthPlaceType_CLS::not_empty() const
+{
+	return mSize > 0;
+}
+
+TRunLengthPlaceType_TARGS
+const DataType& TRunLengthPlaceType_CLS::get(int index) const
+{
+	return mData[index].value;
+}
+
+TRunLengthPlaceType_TARGS
+int TRunLengthPlaceType_CLS::count(int index) const
+{
+	return mData[index].count;
+}
+
+// index of the first run whose value is not lower than value
+TRunLengthPlaceType_TARGS
+int TRunLengthPlaceType_CLS::search(const DataType& value) const
+{
+	int low = 0;
+	int high = mRuns;
+	while (low < high) {
+		int middle = (low + high) / 2;
+		if (ComparisonProvider_t::compare(mData[middle].value, const_cast<DataType&>(value)) < 0)
+			low = middle + 1;
+		else
+			high = middle;
+	}
+	return low;
+}
+
+TRunLengthPlaceType_TARGS
+int TRunLengthPlaceType_CLS::index_of(const DataType& value) const
+{
+	int index = search(value);
+	if (index < mRuns && ComparisonProvider_t::compare(mData[index].value, const_cast<DataType&>(value)) == 0)
+		return index;
+	return -1;
+}
+
+TRunLengthPlaceType_TARGS
+int TRunLengthPlaceType_CLS::count_of(const DataType& value) const
+{
+	int index = index_of(value);
+	return index < 0 ? 0 : mData[index].count;
+}
+
+TRunLengthPlaceType_TARGS
+void TRunLengthPlaceType_CLS::add(DataType value, int count)
+{
+	int index = search(value);
+	mSize += count;
+	if (index < mRuns && ComparisonProvider_t::compare(mData[index].value, value) == 0) {
+		mData[index].count += count;
+		return;
+	}
+
+	if (mRuns >= mMaxRuns) {
+		mMaxRuns *= 2;
+		Run* new_data = new Run[mMaxRuns];
+		memcpy(new_data, mData, mRuns * sizeof(Run));
+		if (mData != mInline)
+			delete[] mData;
+		mData = new_data;
+	}
+	memmove(mData + index + 1, mData + index, (mRuns - index) * sizeof(Run));
+	mData[index].value = value;
+	mData[index].count = count;
+	mRuns++;
+}
+
+TRunLengthPlaceType_TARGS
+void TRunLengthPlaceType_CLS::remove_by_index(int index)
+{
+	mSize--;
+	if (--mData[index].count == 0) {
+		mRuns--;
+		memmove(mData + index, mData + index + 1, (mRuns - index) * sizeof(Run));
+	}
+}
+
+TRunLengthPlaceType_TARGS
+void TRunLengthPlaceType_CLS::remove_by_value(DataType value)
+{
+	int index = index_of(value);
+	if (index >= 0)
+		remove_by_index(index);
+}
+
+TRunLengthPlaceType_TARGS
+int TRunLengthPlaceType_CLS::equals(const TRunLengthPlaceType& right) const
+{
+	if (this == &right)
+		return 1;
+
+	if (mSize != right.mSize || mRuns != right.mRuns)
+		return 0;
+
+	for (int i = mRuns-1; i >= 0; i--) {
+		if (mData[i].count != right.mData[i].count)
+			return 0;
+		if (ComparisonProvider_t::compare(mData[i].value, right.mData[i].value) != 0)
+			return 0;
+	}
+	return 1;
+}
+
+TRunLengthPlaceType_TARGS
+int TRunLengthPlaceType_CLS::compare(const TRunLengthPlaceType& right) const
+{
+	int tmp;
+
+	if (this == &right)
+		return 0;
+
+	tmp = mSize - right.mSize;
+	if (tmp != 0)
+		return tmp;
+
+	tmp = mRuns - right.mRuns;
+	if (tmp != 0)
+		return tmp;
+
+	for (int i = mRuns-1; i >= 0; i--) {
+		tmp = ComparisonProvider_t::compare(mData[i].value, right.mData[i].value);
+		if (tmp != 0)
+			return tmp;
+		tmp = mData[i].count - right.mData[i].count;
+		if (tmp != 0)
+			return tmp;
+	}
+	return 0;
+}
+
+TRunLengthPlaceType_TARGS
+int TRunLengthPlaceType_CLS::hash() const
+{
+	int hash = 0;
+	for (int i = mRuns-1; i >= 0; i--) {
+		hash ^= hash << 5;
+		hash = (hash ^ HashProvider_t::hash(mData[i].value));
+		hash ^= hash << 5;
+		hash = (hash ^ mData[i].count);
+	}
+	return hash;
+}
+
+TRunLengthPlaceType_TARGS
+const char* TRunLengthPlaceType_CLS::cstr() const
+{
+	static std::string s_buf;
+	char tmp[32];
+
+	s_buf = "[";
+	for (int i = 0; i < mRuns; i++) {
+		Formatter_t::format(tmp, mData[i].value);
+		for (int j = 0; j < mData[i].count; j++) {
+			if (s_buf.size() > 1)
+				s_buf += ", ";
+			s_buf += tmp;
+		}
+	}
+	s_buf += "]";
+	return s_buf.c_str();
+}
+
+#undef TRunLengthPlaceType_TARGS
+#undef TRunLengthPlaceType_CLS
+
+
 #define TPid_TARGS 		template< typename T >
 #define TPid_CLS		TPid<T>
 
@@ -0,0 +1,46 @@
+/* Generated by Cython 0.29.37 */
+
+#ifndef __PYX_HAVE__neco__ctypes__ctypes_ext
+#define __PYX_HAVE__neco__ctypes__ctypes_ext
+
+#include "Python.h"
+struct Pid;
+
+/* "neco/ctypes/ctypes_ext.pxd":114
+ *         cdef tuple pack(MultiSet self)
+ * 
+ * cdef api class Pid[object Pid, type Pid]:             # <<<<<<<<<<<<<<
+ *         cdef TPid[int]* mPid
+ * 
+ */
+struct Pid {
+  PyObject_HEAD
+  TPid<int>  *mPid;
+};
+
+#ifndef __PYX_HAVE_API__neco__ctypes__ctypes_ext
+
+#ifndef __PYX_EXTERN_C
+  #ifdef __cplusplus
+    #define __PYX_EXTERN_C extern "C"
+  #else
+    #define __PYX_EXTERN_C extern
+  #endif
+#endif
+
+#ifndef DL_IMPORT
+  #define DL_IMPORT(_T) _T
+#endif
+
+#endif /* !__PYX_HAVE_API__neco__ctypes__ctypes_ext */
+
+/* WARNING: the interface of the module init function changed in CPython 3.5. */
+/* It now returns a PyModuleDef instance instead of a PyModule instance. */
+
+#if PY_MAJOR_VERSION < 3
+PyMODINIT_FUNC initctypes_ext(void);
+#else
+PyMODINIT_FUNC PyInit_ctypes_ext(void);
+#endif
+
+#endif /* !__PYX_HAVE__neco__ctypes__ctypes_ext */
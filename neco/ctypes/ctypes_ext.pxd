@@ -23,6 +23,31 @@ cdef extern from "ctypes.h":
                 void update(TGenericPlaceType[T]&)
                 char* cstr()
 
+        cdef cppclass TRunLengthPlaceType[T]:
+                TRunLengthPlaceType()
+                TRunLengthPlaceType(TRunLengthPlaceType[T]&)
+
+                void decrement_ref()
+                void increment_ref()
+
+                int equals(TRunLengthPlaceType[T]&)
+                int compare(TRunLengthPlaceType[T]&)
+                int hash()
+                int not_empty()
+
+                void add(T& value)
+                void add(T& value, int count)
+                void remove_by_value(T&)
+                void remove_by_index(int)
+
+                T& get(int)
+                int count(int)
+                int index_of(T&)
+                int count_of(T&)
+                int size()
+                int runs()
+                char* cstr()
+
         cdef cppclass TPid[T]:
                 TPid()
                 TPid(int i)
@@ -83,6 +108,8 @@ cdef class MultiSet:
         cdef list domain(MultiSet self)
         cpdef __dump__(MultiSet self)
         cdef has_key(MultiSet self, object key)
+        cdef int count(MultiSet self, object key)
+        cdef tuple pack(MultiSet self)
 
 cdef api class Pid[object Pid, type Pid]:
         cdef TPid[int]* mPid
@@ -123,3 +150,77 @@ cdef api class Pid[object Pid, type Pid]:
 
 cdef MultiSet int_place_type_to_multiset(TGenericPlaceType[int]* place_type)
 
+cdef tuple int_place_type_pack(TGenericPlaceType[int]* place_type)
+cdef TGenericPlaceType[int]* int_place_type_unpack(tuple items)
+
+cdef MultiSet int_run_place_type_to_multiset(TRunLengthPlaceType[int]* place_type)
+cdef list int_run_place_type_tokens(TRunLengthPlaceType[int]* place_type)
+cdef tuple int_run_place_type_pack(TRunLengthPlaceType[int]* place_type)
+cdef TRunLengthPlaceType[int]* int_run_place_type_unpack(tuple items)
+cdef MultiSet multiset_unpack(tuple items)
+
+cdef class VisitedStore:
+        cdef object directory, records, reader, table_file
+        cdef unsigned long long* slots
+        cdef unsigned long long mask, flushed
+        cdef readonly unsigned long long capacity, count, end
+
+        cdef _map_table(VisitedStore self, unsigned long long capacity)
+        cdef _unmap_table(VisitedStore self)
+        cdef _grow(VisitedStore self)
+        cdef _place(VisitedStore self, unsigned long long h, unsigned long long ref)
+        cdef tuple _read(VisitedStore self, unsigned long long offset)
+        cdef long long _lookup(VisitedStore self, unsigned long long h, bytes key)
+        cpdef list merge(VisitedStore self, list items)
+        cpdef close(VisitedStore self)
+
+cdef inline unsigned long long mix64(unsigned long long h):
+        """ 64 bits finalizer (splitmix64), spreads hash bits. """
+        h = (h ^ (h >> 30)) * 0xBF58476D1CE4E5B9ULL
+        h = (h ^ (h >> 27)) * 0x94D049BB133111EBULL
+        return h ^ (h >> 31)
+
+cdef class BitState:
+        cdef unsigned char* bits
+        cdef readonly unsigned long long size, count, set_bits
+        cdef readonly int hashes
+        cdef readonly double expected_omissions
+
+        cpdef bint add(BitState self, unsigned long long fp)
+        cpdef double omission_probability(BitState self)
+
+cdef class FingerprintSet:
+        cdef unsigned long long* table
+        cdef readonly unsigned long long capacity, count
+
+        cdef unsigned long long _index(FingerprintSet self, unsigned long long fp)
+        cdef _grow(FingerprintSet self)
+        cpdef bint add(FingerprintSet self, unsigned long long fp)
+        cpdef double omission_probability(FingerprintSet self)
+
+cdef class CollapsedStore:
+        cdef list tables, contents
+        cdef set states
+
+        cdef tuple _key(CollapsedStore self, tuple components, bint intern)
+        cpdef bint add(CollapsedStore self, tuple components)
+        cpdef list sizes(CollapsedStore self)
+
+cdef class Checkpoint:
+        cdef object directory, manifest, frontier, child
+        cdef list writing
+        cdef readonly unsigned long long generation, offset, count
+
+        cdef _read_manifest(Checkpoint self)
+        cdef list _read_records(Checkpoint self, name, end=*)
+        cdef bint _reap(Checkpoint self, int options)
+        cpdef bint save(Checkpoint self, list visited, frontier, pack=*)
+        cpdef bint wait(Checkpoint self)
+        cpdef tuple load(Checkpoint self)
+
+cpdef bytes neco_pack(object obj)
+cpdef bytes neco_pack_key(object obj)
+cpdef object neco_unpack(bytes string)
+cpdef unsigned long long neco_fingerprint(bytes string)
+cpdef __neco_compare__(object left, object right)
+
@@ -1,6 +1,11 @@
 cimport ctypes_ext # this line will be replaced in profiler mode !
+from libc.stdlib cimport calloc, free
+from posix.mman cimport mmap, munmap, PROT_READ, PROT_WRITE, MAP_SHARED, MAP_FAILED
 
-import operator, sys, traceback
+import cPickle, cStringIO, hashlib, json, operator, os, shutil, struct, sys, tempfile, traceback
+
+_record_length = struct.Struct('<I')
+_fingerprint = struct.Struct('<Q')
 
 ################################################################################
 # Multisets
@@ -12,6 +17,63 @@ cpdef dump(object obj):
         return repr(obj)
 
 
+cdef object neco_canonical(object obj):
+    """ Replace values by a canonical equal value of the same hash:
+    booleans, longs and integral floats become ints, ascii unicode
+    strings become strings, tuples are handled recursively.
+    """
+    t = type(obj)
+    if t is tuple:
+        return tuple([ neco_canonical(item) for item in <tuple> obj ])
+    elif t is bool or t is long:
+        return int(obj)
+    elif t is float:
+        return int(obj) if obj.is_integer() else obj
+    elif t is unicode:
+        try:
+            return str(obj)
+        except UnicodeEncodeError:
+            return obj
+    return obj
+
+cdef object neco_order_class(object obj):
+    """ Class used to order values of different types, numbers and
+    strings are compared by value across types (1 == 1.0 == True, as
+    in neco_canonical).
+    """
+    t = type(obj)
+    if t is bool or t is long or t is float:
+        return int
+    elif t is unicode:
+        return str
+    return t
+
+cpdef bytes neco_pack(object obj):
+    """ Encode an object into a byte string, neco_unpack gives back
+    an equal object of the same types (pickler memo is disabled).
+    """
+    output = cStringIO.StringIO()
+    pickler = cPickle.Pickler(output, 2)
+    pickler.fast = 1
+    pickler.dump(obj)
+    return output.getvalue()
+
+cpdef bytes neco_pack_key(object obj):
+    """ Encode an object into a byte string, equal objects are
+    encoded using equal strings (values are made canonical).
+    """
+    return neco_pack(neco_canonical(obj))
+
+cpdef object neco_unpack(bytes string):
+    return cPickle.loads(string)
+
+cpdef unsigned long long neco_fingerprint(bytes string):
+    """ 64 bits fingerprint of a byte string, ie., the first bits of
+    its md5 digest. Markings are fingerprinted from their keys,
+    builtin hashes collide too often to be used.
+    """
+    return _fingerprint.unpack_from(hashlib.md5(string).digest())[0]
+
 cpdef __neco_compare__(object left, object right):
     if left < right:
         return -1
@@ -171,9 +233,9 @@ cdef class MultiSet:
             lkey = self_keys[i]
             rkey = other_keys[i]
             
-            if lkey.__class__ < rkey.__class__:
+            if neco_order_class(lkey) < neco_order_class(rkey):
                 return -1
-            elif lkey.__class__ > rkey.__class__:
+            elif neco_order_class(lkey) > neco_order_class(rkey):
                 return 1
 
             if lkey < rkey:
@@ -230,6 +292,22 @@ cdef class MultiSet:
     cdef has_key(MultiSet self, object key):
         return self._data.has_key(key)
 
+    cdef int count(MultiSet self, object key):
+        """ number of occurrences of an element
+        """
+        return self._data.get(key, 0)
+
+    cdef tuple pack(MultiSet self):
+        """ canonical representation of the MultiSet, ie.,
+        sorted (token, count) pairs.
+        """
+        return tuple(sorted(self._data.iteritems()))
+
+cdef MultiSet multiset_unpack(tuple items):
+    cdef MultiSet ms = MultiSet()
+    ms._data.update(items)
+    return ms
+
 
 
 cdef MultiSet int_place_type_to_multiset(TGenericPlaceType[int]* place_type):
@@ -241,6 +319,563 @@ cdef MultiSet int_place_type_to_multiset(TGenericPlaceType[int]* place_type):
 
     return ms
 
+cdef tuple int_place_type_pack(TGenericPlaceType[int]* place_type):
+    cdef list l = []
+    cdef int size = place_type.size()
+
+    # tokens are kept ordered
+    for 0 <= i < size:
+        l.append(<int> place_type.get(i))
+
+    return tuple(l)
+
+cdef TGenericPlaceType[int]* int_place_type_unpack(tuple items):
+    cdef TGenericPlaceType[int]* place_type = new TGenericPlaceType[int]()
+    cdef int value
+
+    for value in items:
+        place_type.add(value)
+
+    return place_type
+
+cdef MultiSet int_run_place_type_to_multiset(TRunLengthPlaceType[int]* place_type):
+    cdef MultiSet ms = MultiSet()
+    cdef int runs = place_type.runs()
+
+    for 0 <= i < runs:
+        ms._data[<int> place_type.get(i)] = place_type.count(i)
+
+    return ms
+
+cdef list int_run_place_type_tokens(TRunLengthPlaceType[int]* place_type):
+    cdef list l = []
+    cdef int runs = place_type.runs()
+
+    for 0 <= i < runs:
+        l.extend([ <int> place_type.get(i) ] * place_type.count(i))
+
+    return l
+
+cdef tuple int_run_place_type_pack(TRunLengthPlaceType[int]* place_type):
+    cdef list l = []
+    cdef int runs = place_type.runs()
+
+    # runs are kept ordered
+    for 0 <= i < runs:
+        l.append((<int> place_type.get(i), place_type.count(i)))
+
+    return tuple(l)
+
+cdef TRunLengthPlaceType[int]* int_run_place_type_unpack(tuple items):
+    cdef TRunLengthPlaceType[int]* place_type = new TRunLengthPlaceType[int]()
+    cdef int value, count
+
+    for value, count in items:
+        place_type.add(value, count)
+
+    return place_type
+
+################################################################################
+# Disk backed visited set
+################################################################################
+
+cdef class VisitedStore:
+    """ Disk backed map from marking keys to packed markings.
+
+    Records (key and value) are appended to a record file, an open
+    addressing hash table indexing them by key is memory mapped from
+    a second file. Records are inserted by batches (C{merge}) sorted
+    by slot such that the table is swept in order instead of being
+    randomly accessed. A value equal to its key is not written twice.
+
+    Table slots are pairs (hash, record offset + 1), 0 marks an
+    empty slot.
+    """
+
+    def __init__(VisitedStore self, directory, unsigned long long capacity=1 << 20):
+        self.directory = tempfile.mkdtemp(prefix='neco-', dir=directory)
+        self.records = open(os.path.join(self.directory, 'records'), 'w+b')
+        self.reader = open(self.records.name, 'rb')
+        self.end = 0
+        self.flushed = 0
+        self.count = 0
+        self._map_table(capacity)
+
+    cdef _map_table(VisitedStore self, unsigned long long capacity):
+        name = os.path.join(self.directory, 'table.{}'.format(capacity))
+        cdef size_t length = capacity * 2 * sizeof(unsigned long long)
+        cdef void* address
+        table_file = open(name, 'w+b')
+        table_file.truncate(length)
+        address = mmap(NULL, length, PROT_READ | PROT_WRITE, MAP_SHARED, table_file.fileno(), 0)
+        if address == MAP_FAILED:
+            raise OSError("unable to map {}".format(name))
+        self.table_file = table_file
+        self.slots = <unsigned long long*> address
+        self.capacity = capacity
+        self.mask = capacity - 1
+
+    cdef _unmap_table(VisitedStore self):
+        munmap(self.slots, self.capacity * 2 * sizeof(unsigned long long))
+        self.slots = NULL
+        self.table_file.close()
+
+    cdef _grow(VisitedStore self):
+        cdef unsigned long long* old_slots = self.slots
+        cdef unsigned long long old_capacity = self.capacity
+        cdef unsigned long long index
+        old_file = self.table_file
+
+        self._map_table(old_capacity * 2)
+        for 0 <= index < old_capacity:
+            if old_slots[2 * index + 1]:
+                self._place(old_slots[2 * index], old_slots[2 * index + 1])
+
+        munmap(old_slots, old_capacity * 2 * sizeof(unsigned long long))
+        old_file.close()
+        os.remove(old_file.name)
+
+    cdef _place(VisitedStore self, unsigned long long h, unsigned long long ref):
+        cdef unsigned long long index = h & self.mask
+        while self.slots[2 * index + 1]:
+            index = (index + 1) & self.mask
+        self.slots[2 * index] = h
+        self.slots[2 * index + 1] = ref
+
+    cdef tuple _read(VisitedStore self, unsigned long long offset):
+        """ Key and value of the record at offset, and offset of the
+        next record. An empty value stands for the key itself. """
+        if offset >= self.flushed:
+            self.records.flush()
+            self.flushed = self.end
+        reader = self.reader
+        reader.seek(offset)
+        key_length, = _record_length.unpack(reader.read(_record_length.size))
+        key = reader.read(key_length)
+        value_length, = _record_length.unpack(reader.read(_record_length.size))
+        value = reader.read(value_length) if value_length else key
+        return key, value, offset + 2 * _record_length.size + key_length + value_length
+
+    cdef long long _lookup(VisitedStore self, unsigned long long h, bytes key):
+        cdef unsigned long long index = h & self.mask
+        while True:
+            if not self.slots[2 * index + 1]:
+                return index
+            if self.slots[2 * index] == h and self._read(self.slots[2 * index + 1] - 1)[0] == key:
+                return -1
+            index = (index + 1) & self.mask
+
+    cpdef list merge(VisitedStore self, list items):
+        """ Insert a batch of records (delayed duplicate detection).
+
+        @param items: (key, packed marking) pairs, keys may appear
+        several times, the first value of a key is kept.
+        @type items: C{list}
+        @return: values of keys that were not already in the store,
+        in table order.
+        @rtype: C{list}
+        """
+        cdef unsigned long long h
+        cdef long long index
+        cdef list batch
+        cdef list added = []
+        cdef bytes key
+        cdef bytes value
+        cdef bytes stored
+
+        while (self.count + len(items)) * 2 > self.capacity:
+            self._grow()
+
+        # (slot, hash, key, value), stable sort on the first three
+        # fields sorts by slot and keeps the first value of a key first
+        batch = []
+        for key, value in items:
+            h = <unsigned long long> hash(key)
+            batch.append((h & self.mask, h, key, value))
+        batch.sort(key=operator.itemgetter(0, 1, 2))
+
+        last = None
+        self.records.seek(self.end)
+        for _, h, key, value in batch:
+            if (h, key) == last:
+                continue
+            last = (h, key)
+            index = self._lookup(h, key)
+            if index < 0:
+                continue
+            self.slots[2 * index] = h
+            self.slots[2 * index + 1] = self.end + 1
+            stored = b'' if value == key else value
+            self.records.write(_record_length.pack(len(key)))
+            self.records.write(key)
+            self.records.write(_record_length.pack(len(stored)))
+            self.records.write(stored)
+            self.end += 2 * _record_length.size + len(key) + len(stored)
+            added.append(value)
+
+        self.count += len(added)
+        return added
+
+    def items(VisitedStore self, unsigned long long start=0, end=None):
+        """ Iterate over stored (key, value) pairs in insertion order.
+
+        @param start: offset of the first record.
+        @param end: offset after the last record (defaults to the end).
+        """
+        cdef unsigned long long offset = start
+        cdef unsigned long long stop = self.end if end is None else end
+        while offset < stop:
+            key, value, offset = self._read(offset)
+            yield key, value
+
+    def keys(VisitedStore self, unsigned long long start=0, end=None):
+        """ Iterate over stored keys in insertion order (see items). """
+        for key, _ in self.items(start, end):
+            yield key
+
+    def values(VisitedStore self, unsigned long long start=0, end=None):
+        """ Iterate over stored packed markings in insertion order
+        (see items). """
+        for _, value in self.items(start, end):
+            yield value
+
+    def __iter__(VisitedStore self):
+        return self.keys()
+
+    def __contains__(VisitedStore self, bytes key):
+        return self._lookup(<unsigned long long> hash(key), key) < 0
+
+    def __len__(VisitedStore self):
+        return self.count
+
+    cpdef close(VisitedStore self):
+        """ Release the store and remove its files. """
+        self._unmap_table()
+        self.reader.close()
+        self.records.close()
+        shutil.rmtree(self.directory)
+
+
+################################################################################
+# Bitstate hashing (supertrace)
+################################################################################
+
+cdef class BitState:
+    """ Fixed size bit array of visited markings (supertrace).
+
+    A marking is represented by hashes bits selected using its 64 bits
+    fingerprint, markings whose bits are all already set are considered
+    visited, some states may thus be omitted.
+    """
+
+    def __cinit__(BitState self, unsigned long long size, int hashes=3):
+        self.bits = <unsigned char*> calloc(size, sizeof(unsigned char))
+        if self.bits == NULL:
+            raise MemoryError("unable to allocate {} bytes".format(size))
+        self.size = size * 8
+        self.hashes = hashes
+        self.count = 0
+        self.set_bits = 0
+        self.expected_omissions = 0.0
+
+    def __dealloc__(BitState self):
+        free(self.bits)
+
+    cpdef bint add(BitState self, unsigned long long fp):
+        """ Set the bits of a marking, bit indexes are obtained by
+        double hashing from its fingerprint fp. Returns True if the
+        marking was not already visited.
+        """
+        cdef unsigned long long h1 = mix64(fp)
+        cdef unsigned long long h2 = mix64(h1) | 1
+        cdef unsigned long long index
+        cdef unsigned char mask
+        cdef bint new = False
+        cdef int i
+
+        for 0 <= i < self.hashes:
+            index = (h1 + i * h2) % self.size
+            mask = 1 << (index & 7)
+            if not self.bits[index >> 3] & mask:
+                self.bits[index >> 3] |= mask
+                self.set_bits += 1
+                new = True
+        if new:
+            self.count += 1
+            # chance that the next new marking finds its bits set
+            self.expected_omissions += (<double> self.set_bits / self.size) ** self.hashes
+        return new
+
+    cpdef double omission_probability(BitState self):
+        """ Estimated probability that a reachable marking was omitted. """
+        if not self.count:
+            return 0.0
+        return min(1.0, self.expected_omissions / self.count)
+
+    def __len__(BitState self):
+        return self.count
+
+################################################################################
+# Hash compaction
+################################################################################
+
+cdef class FingerprintSet:
+    """ Set of 64 bits marking fingerprints (hash compaction).
+
+    Fingerprints are stored in an open addressing table, thus a
+    marking uses 8 to 16 bytes. Markings with equal fingerprints are
+    considered equal, some states may be omitted. 0 marks an empty
+    slot, fingerprint 0 is stored as 1.
+    """
+
+    def __cinit__(FingerprintSet self, unsigned long long capacity=1 << 16):
+        self.table = <unsigned long long*> calloc(capacity, sizeof(unsigned long long))
+        if self.table == NULL:
+            raise MemoryError("unable to allocate {} fingerprints".format(capacity))
+        self.capacity = capacity
+        self.count = 0
+
+    def __dealloc__(FingerprintSet self):
+        free(self.table)
+
+    cdef unsigned long long _index(FingerprintSet self, unsigned long long fp):
+        cdef unsigned long long mask = self.capacity - 1
+        cdef unsigned long long index = mix64(fp) & mask
+        while self.table[index] and self.table[index] != fp:
+            index = (index + 1) & mask
+        return index
+
+    cdef _grow(FingerprintSet self):
+        cdef unsigned long long* old_table = self.table
+        cdef unsigned long long old_capacity = self.capacity
+        cdef unsigned long long i
+
+        self.table = <unsigned long long*> calloc(2 * old_capacity, sizeof(unsigned long long))
+        if self.table == NULL:
+            self.table = old_table
+            raise MemoryError("unable to allocate {} fingerprints".format(2 * old_capacity))
+        self.capacity = 2 * old_capacity
+        for 0 <= i < old_capacity:
+            if old_table[i]:
+                self.table[self._index(old_table[i])] = old_table[i]
+        free(old_table)
+
+    cpdef bint add(FingerprintSet self, unsigned long long fp):
+        """ Add a fingerprint, returns True if it was not in the set. """
+        cdef unsigned long long index
+        if fp == 0:
+            fp = 1
+        index = self._index(fp)
+        if self.table[index]:
+            return False
+        self.table[index] = fp
+        self.count += 1
+        if self.count * 4 > self.capacity * 3:
+            self._grow()
+        return True
+
+    cpdef double omission_probability(FingerprintSet self):
+        """ Estimated probability that a reachable marking was omitted. """
+        return min(1.0, self.count / 2.0 ** 65)
+
+    def __contains__(FingerprintSet self, unsigned long long fp):
+        return self.table[self._index(fp if fp else 1)] != 0
+
+    def __len__(FingerprintSet self):
+        return self.count
+
+################################################################################
+# Collapse compression
+################################################################################
+
+cdef class CollapsedStore:
+    """ Set of markings stored as vectors of interned place contents
+    (collapse compression).
+
+    Each distinct content of a marking attribute is stored once in an
+    intern table, markings are tuples of indices in these tables, thus
+    equality and hashing only involve shared small integers.
+    """
+
+    def __cinit__(CollapsedStore self):
+        self.tables = None
+        self.contents = None
+        self.states = set()
+
+    cdef tuple _key(CollapsedStore self, tuple components, bint intern):
+        cdef list key = []
+        cdef dict table
+        cdef list contents
+        cdef int i
+        if self.tables is None:
+            self.tables = [ {} for _ in components ]
+            self.contents = [ [] for _ in components ]
+        for i in range(len(components)):
+            table = self.tables[i]
+            index = table.get(components[i])
+            if index is None:
+                if not intern:
+                    return None
+                contents = self.contents[i]
+                index = table[components[i]] = len(contents)
+                contents.append(components[i])
+            key.append(index)
+        return tuple(key)
+
+    cpdef bint add(CollapsedStore self, tuple components):
+        """ Add a marking given by Marking.__components__, returns True
+        if it was not in the set. """
+        cdef tuple key = self._key(components, True)
+        if key in self.states:
+            return False
+        self.states.add(key)
+        return True
+
+    cpdef list sizes(CollapsedStore self):
+        """ Number of distinct contents of each attribute. """
+        return [ len(contents) for contents in self.contents or [] ]
+
+    def __contains__(CollapsedStore self, tuple components):
+        return self._key(components, False) in self.states
+
+    def __iter__(CollapsedStore self):
+        for key in self.states:
+            yield tuple([ self.contents[i][index] for i, index in enumerate(key) ])
+
+    def __len__(CollapsedStore self):
+        return len(self.states)
+
+cdef class Checkpoint:
+    """ Periodic on disk snapshot of an exploration.
+
+    The directory holds an append only visited file of packed
+    markings, a frontier.<generation> file and a manifest telling
+    which prefix of visited and which frontier belong to the last
+    complete checkpoint. Checkpoints are written by a forked process,
+    the manifest is replaced atomically once all data is on disk.
+    """
+
+    def __init__(Checkpoint self, directory):
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.directory = directory
+        self.manifest = os.path.join(directory, 'manifest')
+        self.generation = 0
+        self.offset = 0
+        self.count = 0
+        self.frontier = None
+        self.child = None
+        self.writing = []
+        if os.path.exists(self.manifest):
+            self._read_manifest()
+
+    cdef _read_manifest(Checkpoint self):
+        with open(self.manifest) as f:
+            manifest = json.load(f)
+        self.generation = manifest['generation']
+        self.offset = manifest['visited_offset']
+        self.count = manifest['visited_count']
+        self.frontier = manifest['frontier']
+
+    cdef list _read_records(Checkpoint self, name, end=None):
+        cdef list keys = []
+        cdef unsigned long long offset = 0
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            while end is None or offset < end:
+                header = f.read(_record_length.size)
+                if len(header) < _record_length.size:
+                    break
+                length, = _record_length.unpack(header)
+                keys.append(f.read(length))
+                offset += _record_length.size + length
+        return keys
+
+    def _write(Checkpoint self, visited, frontier, pack):
+        """ Write a checkpoint, runs in the forked process. """
+        cdef unsigned long long offset = self.offset
+        generation = self.generation + 1
+        with open(os.path.join(self.directory, 'visited'), 'ab') as f:
+            # drop records left by an interrupted checkpoint
+            f.truncate(self.offset)
+            for m in visited:
+                key = pack(m)
+                f.write(_record_length.pack(len(key)))
+                f.write(key)
+                offset += _record_length.size + len(key)
+            f.flush()
+            os.fsync(f.fileno())
+
+        frontier_name = 'frontier.{}'.format(generation)
+        with open(os.path.join(self.directory, frontier_name), 'wb') as f:
+            for m in frontier:
+                key = pack(m)
+                f.write(_record_length.pack(len(key)))
+                f.write(key)
+            f.flush()
+            os.fsync(f.fileno())
+
+        manifest = { 'generation' : generation,
+                     'visited_offset' : offset,
+                     'visited_count' : self.count + len(visited),
+                     'frontier' : frontier_name }
+        with open(self.manifest + '.tmp', 'w') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(self.manifest + '.tmp', self.manifest)
+
+        if self.frontier and self.frontier != frontier_name:
+            os.remove(os.path.join(self.directory, self.frontier))
+
+    cdef bint _reap(Checkpoint self, int options):
+        pid, status = os.waitpid(self.child, options)
+        if not pid:
+            return False
+        self.child = None
+        if status == 0:
+            self._read_manifest()
+            self.writing = []
+        else:
+            print >> sys.stderr, "checkpoint failed, will retry"
+        return True
+
+    cpdef bint save(Checkpoint self, list visited, frontier, pack=operator.methodcaller('__pack__')):
+        """ Start writing a checkpoint in the background, returns False
+        if the previous checkpoint is still being written (the caller
+        should then keep accumulating markings). """
+        if self.child is not None and not self._reap(os.WNOHANG):
+            return False
+        # markings of a failed checkpoint are written again
+        self.writing.extend(visited)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                self._write(self.writing, frontier, pack)
+                status = 0
+            except:
+                traceback.print_exc()
+            finally:
+                os._exit(status)
+        self.child = pid
+        return True
+
+    cpdef bint wait(Checkpoint self):
+        """ Wait for the checkpoint being written, returns True if the
+        last checkpoint is complete. """
+        if self.child is not None:
+            self._reap(0)
+        return not self.writing
+
+    cpdef tuple load(Checkpoint self):
+        """ Read the last complete checkpoint, returns packed visited
+        markings and packed frontier. """
+        if self.frontier is None:
+            return [], []
+        return (self._read_records('visited', self.offset),
+                self._read_records(self.frontier))
 
 
 ################################################################################
@@ -78,21 +78,17 @@ class Pid(object):
 
     def __len__(self):
         return len(self.data)
-#
-#    def __lt__(self, other):
-#        sl = len(self.data)
-#        ol = len(other.data)
-#        if sl < ol:
-#            return True
-#        elif ol > sl:
-#            return False
-#        else:
-#            for se, oe in zip(self.data, other.data):
-#                if se < oe:
-#                    continue
-#                else:
-#                    return False
-#            return True
+
+    def __lt__(self, other):
+        """ Lexicographic order on fragments, makes sorted
+        containers of pids canonical.
+
+        >>> Pid.from_str('1.2') < Pid.from_str('1.10'), Pid.from_str('2') < Pid.from_str('1.1')
+        (True, False)
+        """
+        if not isinstance(other, Pid):
+            return NotImplemented
+        return self.data < other.data
 
     def at(self, i):
         return self.data[i]
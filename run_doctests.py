@@ -7,6 +7,7 @@ packages = [ 'neco',
              'neco.backends',
              'neco.backends.python',
              'neco.backends.cython',
+             'neco.backends.cpp',
              'neco.opt' ]
 
 def search_modules(package_str):
@@ -96,12 +96,15 @@ setup(name='Neco',
       packages=['neco',
                 'neco.asdl',
                 'neco.core',
+                'neco.cpp',
                 'neco.ctypes',
                 'neco.backends',
                 'neco.backends.python',
                 'neco.backends.python.priv',
                 'neco.backends.cython',
-                'neco.backends.cython.priv',],
+                'neco.backends.cython.priv',
+                'neco.backends.cpp',
+                'neco.backends.cpp.priv',],
       package_data={'neco.ctypes' : ['include.pxd',
                                      'include.pyx',
                                      'include_no_stats.pyx',
@@ -109,7 +112,10 @@ setup(name='Neco',
                                      'ctypes.h',
                                      'ctypes_spec.h',
                                      'ctypes_ext.h',
-                                     'ctypes.cpp'] },
+                                     'ctypes.cpp'],
+                    'neco.backends.cpp' : ['neco_native.h',
+                                           'neco_native.py.in',
+                                           'neco_native_driver.cpp'] },
       cmdclass={'build_ext':build_ext},
       ext_modules=[Extension('neco.ctypes.ctypes_ext',
                              ['neco/ctypes/ctypes_ext.pyx',
@@ -133,7 +139,7 @@ if prefix:
     print
     print 'export PATH=$PATH:{}bin'.format(prefix)
     print 'export PYTHONPATH=$PYTHONPATH:{}lib/python{}/site-packages'.format(prefix, py_version)
-    print 'export NECO_INCLUDE={prefix}lib/python{py_version}/site-packages/neco/ctypes:{prefix}lib/python{py_version}/site-packages/neco/backends/python:{prefix}lib/python{py_version}/site-packages'.format(prefix=prefix, py_version=py_version)
+    print 'export NECO_INCLUDE={prefix}lib/python{py_version}/site-packages/neco/ctypes:{prefix}lib/python{py_version}/site-packages/neco/backends/python:{prefix}lib/python{py_version}/site-packages/neco/backends/cpp:{prefix}lib/python{py_version}/site-packages'.format(prefix=prefix, py_version=py_version)
     print 'export LD_LIBRARY_PATH=$LD_LIBRARY_PATH:$NECO_INCLUDE'
     print
 
@@ -0,0 +1,39 @@
+from snakes.nets import *
+
+net = PetriNet('Net')
+net.processes = []
+
+s1 = Place('s1', [0], tInteger)
+s1.flow_control = False
+s1.one_safe = False
+s1.process_name = None
+
+s2 = Place('s2', ['mul'], tString)
+s2.flow_control = False
+s2.one_safe = False
+s2.process_name = None
+
+s3 = Place('s3', [], tInteger)
+s3.flow_control = False
+s3.one_safe = False
+s3.process_name = None
+
+net.add_place(s1)
+net.add_place(s2)
+net.add_place(s3)
+
+transition = Transition('t1', Expression('x == 0'))
+net.add_transition(transition)
+
+net.add_input('s1', 't1', Variable('x'))
+net.add_input('s2', 't1', Value('mul'))
+net.add_output('s1', 't1', Value(5))
+net.add_output('s2', 't1', Value('div'))
+
+# 10 / x must not be evaluated before c == 'div'
+transition = Transition('t2', Expression("c == 'div' and 10 / x > 0"))
+net.add_transition(transition)
+
+net.add_input('s1', 't2', Variable('x'))
+net.add_input('s2', 't2', Variable('c'))
+net.add_output('s3', 't2', Expression('10 / x'))
@@ -0,0 +1,52 @@
+import snakes.plugins
+snakes.plugins.load("gv", "snakes.nets", "nets")
+from nets import *
+
+net = PetriNet('Net')
+s1 = Place('s1', [0])
+s1.is_OneSafe = False
+
+s2 = Place('s2', [])
+s2.is_OneSafe = False
+
+s3 = Place('s3', [1.0])
+s3.is_OneSafe = False
+
+s4 = Place('s4', [True])
+s4.is_OneSafe = False
+
+s5 = Place('s5', [u'x'])
+s5.is_OneSafe = False
+
+s6 = Place('s6', [])
+s6.is_OneSafe = False
+
+net.add_place(s1)
+net.add_place(s2)
+net.add_place(s3)
+net.add_place(s4)
+net.add_place(s5)
+net.add_place(s6)
+
+# both transitions reach the same marking (1 == 1.0)
+transition = Transition('t1', Expression('True'))
+net.add_transition(transition)
+net.add_input('s1', 't1', Variable("x"))
+net.add_output('s2', 't1', Expression("x + 1"))
+
+transition = Transition('t2', Expression('True'))
+net.add_transition(transition)
+net.add_input('s1', 't2', Variable("x"))
+net.add_output('s2', 't2', Expression("x + 1.0"))
+
+# output depends on token types, not only on token values
+transition = Transition('t3', Expression('True'))
+net.add_transition(transition)
+net.add_input('s3', 't3', Variable("y"))
+net.add_input('s4', 't3', Variable("z"))
+net.add_input('s5', 't3', Variable("w"))
+net.add_output('s6', 't3', Expression("(y / 2, str(z), repr(w))"))
+
+if __name__ == '__main__':
+    print 'writing net.ps'
+    net.draw("net.ps")
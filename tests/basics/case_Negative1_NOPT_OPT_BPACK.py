@@ -0,0 +1,18 @@
+from snakes.nets import *
+
+net = PetriNet('Net')
+net.processes = []
+
+# hash(-1) == hash(-2), markings must not be identified by builtin hashes
+s1 = Place('s1', [0], tInteger)
+s1.flow_control = False
+s1.one_safe = False
+s1.process_name = None
+
+net.add_place(s1)
+
+transition = Transition('t', Expression('x > -3'))
+net.add_transition(transition)
+
+net.add_input('s1', 't', Variable('x'))
+net.add_output('s1', 't', Expression('x - 1'))
@@ -3,9 +3,12 @@
 from StringIO import StringIO
 from glob import glob
 from snakes.nets import dot    # @UnusedImport needed to rebuild markings
+from neco.core.netir import CannotCompile
 import neco
 import os
+import shutil
 import sys
+import tempfile
 import unittest
 
 # Static config
@@ -16,7 +19,15 @@ except KeyError:
     env_includes = []
 
 backend_prefix = { 'python' : 'py_',
-                   'cython' : 'cy_' }
+                   'cython' : 'cy_',
+                   'cpp'    : 'cpp_' }
+
+# cases the cpp backend cannot compile, they are skipped: their places
+# hold strings, nested tuples or tokens of unknown type
+cpp_unsupported = set([ 'Flush1', 'Flush2', 'Guard1', 'Match3', 'Match6', 'Match7',
+                        'Tuple2', 'Tuple3', 'Tuple4', 'TupleMatch1', 'TupleMatch2' ])
+# cases the cpp backend compiles from -O2 on, once place types are inferred
+cpp_untyped = set([ 'Basic6', 'Match4' ])
 
 
 class Marking(object):
@@ -71,6 +82,11 @@ def read_marking_set(state_space):
     out.write(']')
     return MarkingSet(eval(out.getvalue()))
 
+def deadlocks(net, markings):
+    """ Markings without successors. """
+    ctx = net.NecoCtx()
+    return read_marking_set([ m for m in markings if not net.succs(m, ctx) ])
+
 class Entry:
     """ A file used as a test. """
 
@@ -119,13 +135,20 @@ class CythonBackend(TestBackend):
     def __init__(self, methodName = 'runTest'):
         TestBackend.__init__(self, methodName)
 
+class CppBackend(TestBackend):
+    """ Class that will contain C++ backend tests. """
+
+    def __init__(self, methodName = 'runTest'):
+        TestBackend.__init__(self, methodName)
+
 class NecoTestCase(object):
     # Functor corresponding to a test. Creates a test from an Entry.
 
-    def __init__(self, entry, config, test):
+    def __init__(self, entry, config, test, unsupported = False):
         self.entry = entry
         self.test = test
         self.config = config
+        self.unsupported = unsupported
         if entry.ext == '.py':
             self.load = self.load_net
         else:
@@ -135,11 +158,49 @@ class NecoTestCase(object):
     def __call__(self):
         config = self.config
         model, expected = self.load()
-        net = neco.compile_net(model, config)
+        try:
+            net = neco.compile_net(model, config)
+        except CannotCompile as e:
+            if not self.unsupported:
+                raise
+            raise unittest.SkipTest(str(e))
         self.test.assert_(net, 'compilation_check')
         # state space computation
         markings = read_marking_set(net.state_space())
         self.test.assertEqual(expected, markings, "correct markings")
+        if not getattr(net, 'neco_native', False):
+            self.check_exploration_modes(net, expected)
+
+    def check_exploration_modes(self, net, expected):
+        """ Alternative exploration modes must find the same markings,
+        or as many markings when only fingerprints are kept. """
+        test = self.test
+        count = len(expected.data)
+        unpack = net.neco_marking_unpack
+
+        test.assertEqual(expected, read_marking_set([ unpack(packed) for packed in net.state_space_packed() ]), "packed markings")
+        test.assertEqual(expected, read_marking_set(net.state_space_parallel(2, collect = True)), "parallel markings")
+        test.assertEqual(expected, read_marking_set(net.state_space_incremental()[0]), "incremental markings")
+
+        directory = tempfile.mkdtemp(prefix = 'neco-test-')
+        try:
+            store = net.state_space_external(directory)
+            test.assertEqual(expected, read_marking_set([ unpack(packed) for packed in store.values() ]), "external markings")
+            store.close()
+            checkpoints = os.path.join(directory, 'checkpoints')
+            test.assertEqual(expected, read_marking_set(net.state_space_checkpointed(checkpoints)), "checkpointed markings")
+            test.assertEqual(expected, read_marking_set(net.state_space_checkpointed(checkpoints, resume = True)), "resumed markings")
+        finally:
+            shutil.rmtree(directory)
+
+        # hash compaction must not identify distinct markings of small nets
+        test.assertEqual(count, len(net.state_space_fingerprints()), "fingerprint count")
+        test.assertEqual(count, len(net.state_space_bitstate(1 << 20)), "bitstate count")
+        test.assertEqual(count, len(net.state_space_collapsed()), "collapsed count")
+
+        # reduced state spaces preserve deadlocks
+        reduced, _ = net.state_space_por()
+        test.assertEqual(deadlocks(net, net.state_space()), deadlocks(net, reduced), "por deadlocks")
 
     def load_net(self):
         module_file = self.entry.module_name
@@ -184,6 +245,20 @@ def config_BPACK(backend, entry):
                               bit_packing = True,
                               out_module = backend_prefix[backend] + entry.name + '_BPACK')
 
+def config_O2(backend, entry):
+    return neco.config.Config(backend = backend,
+                              search_paths = env_includes,
+                              optimize = True,
+                              optimize_level = 2,
+                              out_module = backend_prefix[backend] + entry.name + '_O2')
+
+def config_O3(backend, entry):
+    return neco.config.Config(backend = backend,
+                              search_paths = env_includes,
+                              optimize = True,
+                              optimize_level = 3,
+                              out_module = backend_prefix[backend] + entry.name + '_O3')
+
 def config_FLOW(backend, entry):
     return neco.config.Config(backend = backend,
                               search_paths = env_includes,
@@ -229,25 +304,29 @@ def populateTestCases():
     for entry in entries:
         for option in entry.options:
 
+            tests = []
             if option == 'NOPT':
-                config_py = config_NOPT('python', entry)
-                config_cy = config_NOPT('cython', entry)
+                tests.append((PythonBackend, option, config_NOPT('python', entry)))
+                tests.append((CythonBackend, option, config_NOPT('cython', entry)))
             elif option == 'OPT':
-                config_py = config_OPT('python', entry)
-                config_cy = config_OPT('cython', entry)
+                tests.append((PythonBackend, option, config_OPT('python', entry)))
+                tests.append((CythonBackend, option, config_OPT('cython', entry)))
+                for level, config in [ ('O2', config_O2), ('O3', config_O3) ]:
+                    tests.append((PythonBackend, level, config('python', entry)))
+                    tests.append((CythonBackend, level, config('cython', entry)))
+                tests.append((CppBackend, option, config_OPT('cpp', entry)))
+                tests.append((CppBackend, 'O3', config_O3('cpp', entry)))
             elif option == 'BPACK':
-                config_py = None
-                config_cy = config_BPACK('cython', entry)
+                tests.append((CythonBackend, option, config_BPACK('cython', entry)))
             elif option == 'FLOW':
-                config_py = config_FLOW('python', entry)
-                config_cy = config_FLOW('cython', entry)
-
-            test_name = 'test_{case}_{option:_>5}'.format(case = entry.name, option = option)
-            if config_py:
-                setattr(PythonBackend, test_name, NecoTestCase(entry, config_py, PythonBackend))
+                tests.append((PythonBackend, option, config_FLOW('python', entry)))
+                tests.append((CythonBackend, option, config_FLOW('cython', entry)))
 
-            if config_cy:
-                setattr(CythonBackend, test_name, NecoTestCase(entry, config_cy, CythonBackend))
+            for backend, name, config in tests:
+                test_name = 'test_{case}_{option:_>5}'.format(case = entry.name, option = name)
+                unsupported = config.backend == 'cpp' and (entry.name in cpp_unsupported or
+                                                           (name == 'OPT' and entry.name in cpp_untyped))
+                setattr(backend, test_name, NecoTestCase(entry, config, backend, unsupported))
 
 if __name__ == '__main__':
     populateTestCases()
@@ -259,6 +338,9 @@ if __name__ == '__main__':
         for entry in glob('py_*.py'):
             os.remove(entry)
 
+        for entry in glob('cpp_*.py') + glob('libcpp_*.so'):
+            os.remove(entry)
+
         for entry in glob('*.pyc'):
             os.remove(entry)
 